@@ -125,9 +125,10 @@ class AWSCredentialsCache:
         cache_val = self.cache.get(cache_key)
         if cache_val is not None:
             if cache_val.is_expired():
-                del self.cache[cache_key]
+                # pop rather than del - another thread may have already removed this key
+                self.cache.pop(cache_key, None)
             else:
-                return self.cache[cache_key].get_session(region_name=region_name)
+                return cache_val.get_session(region_name=region_name)
         return None
 
     def to_dict(self) -> Dict[str, Any]:
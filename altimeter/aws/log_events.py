@@ -34,6 +34,11 @@ class AWSLogEvents(BaseLogEvent):
     ScanAWSAccountServiceStart: EventName
     ScanAWSAccountServiceEnd: EventName
 
+    ScanUnitHistoryReadError: EventName
+
+    ScanAccountInvariantResourcesStart: EventName
+    ScanAccountInvariantResourcesEnd: EventName
+
     ScanAWSResourcesNonFatalError: EventName
 
     ScanConfigured: EventName
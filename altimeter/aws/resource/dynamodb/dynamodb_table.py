@@ -67,12 +67,15 @@ class DynamoDbTableResourceSpec(DynamoDBResourceSpec):
         for resp in paginator.paginate():
             table_names.extend(resp.get("TableNames", []))
 
-        for table_name in table_names:
+        def enrich_table(table_name: str) -> Dict[str, Any]:
             table_data = get_table_data(client=client, table_name=table_name)
             continuous_backup_data = get_continuous_backup_table_data(
                 client=client, table_name=table_name
             )
             table_data.update(continuous_backup_data)
+            return table_data
+
+        for table_data in cls.enrich(enrich_table, table_names):
             resource_arn = table_data["TableArn"]
             tables[resource_arn] = table_data
         return ListFromAWSResult(resources=tables)
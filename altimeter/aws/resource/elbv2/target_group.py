@@ -71,14 +71,22 @@ class TargetGroupResourceSpec(ELBV2ResourceSpec):
              'target_group_2_arn': {target_group_2_dict},
              ...}
 
-        Where the dicts represent results from describe_target_groups."""
+        Where the dicts represent results from describe_target_groups. Target health is
+        retrieved for target groups concurrently."""
         paginator = client.get_paginator("describe_target_groups")
-        resources = {}
+        target_groups: List[Dict[str, Any]] = []
         for resp in paginator.paginate():
-            for resource in resp.get("TargetGroups", []):
-                resource_arn = resource["TargetGroupArn"]
-                resource["TargetHealthDescriptions"] = get_target_group_health(client, resource_arn)
-                resources[resource_arn] = resource
+            target_groups += resp.get("TargetGroups", [])
+
+        def enrich_target_group(target_group: Dict[str, Any]) -> Dict[str, Any]:
+            target_group["TargetHealthDescriptions"] = get_target_group_health(
+                client, target_group["TargetGroupArn"]
+            )
+            return target_group
+
+        resources = {}
+        for resource in cls.enrich(enrich_target_group, target_groups):
+            resources[resource["TargetGroupArn"]] = resource
         return ListFromAWSResult(resources=resources)
 
 
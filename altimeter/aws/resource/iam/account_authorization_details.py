@@ -0,0 +1,115 @@
+"""Bulk IAM scanning via GetAccountAuthorizationDetails. A single paginated call returns an
+account's roles, groups, users and local managed policies including the details which
+otherwise require per-entity calls (role policy attachments, group memberships, default
+policy versions). The response is fetched once per AWSAccessor and shared between the IAM
+ResourceSpecs scanned with it.
+
+Not every IAM ResourceSpec can be built from this response alone:
+
+* roles still call ListRoles as the response omits MaxSessionDuration, only their policy
+  attachments are taken from it.
+* users are fetched only for the group memberships in their GroupList. IAMUserResourceSpec
+  still scans per entity as the response lacks access keys, login profiles and MFA
+  devices.
+* instance profiles are still scanned per entity as the response only includes instance
+  profiles nested under their roles and so omits instance profiles without roles."""
+import abc
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Type
+
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+
+from altimeter.aws.resource.iam import IAMResourceSpec
+from altimeter.aws.resource.resource_spec import ListFromAWSResult
+from altimeter.aws.scan.aws_accessor import AWSAccessor
+
+ACCOUNT_AUTHORIZATION_DETAILS_SHARED_RESULT_KEY = "iam:account_authorization_details"
+ACCOUNT_AUTHORIZATION_DETAILS_FILTER = ["User", "Role", "Group", "LocalManagedPolicy"]
+ACCOUNT_AUTHORIZATION_DETAILS_DENIED_ERRORS = frozenset(("AccessDenied", "AccessDeniedException"))
+
+
+@dataclass(frozen=True)
+class AccountAuthorizationDetails:
+    """The combined pages of a GetAccountAuthorizationDetails response"""
+
+    users: List[Dict[str, Any]]
+    groups: List[Dict[str, Any]]
+    roles: List[Dict[str, Any]]
+    policies: List[Dict[str, Any]]
+
+
+def get_account_authorization_details(
+    scan_accessor: AWSAccessor,
+) -> Optional[AccountAuthorizationDetails]:
+    """Get the GetAccountAuthorizationDetails response for the account of a scan_accessor.
+    The response is fetched on first use and cached in scan_accessor.shared_results.
+
+    Args:
+        scan_accessor: AWSAccessor object to use for api access
+
+    Returns:
+        AccountAuthorizationDetails object or None if iam:GetAccountAuthorizationDetails is
+        not permitted, in which case callers should fall back to per-entity calls.
+    """
+    if ACCOUNT_AUTHORIZATION_DETAILS_SHARED_RESULT_KEY in scan_accessor.shared_results:
+        return scan_accessor.shared_results[ACCOUNT_AUTHORIZATION_DETAILS_SHARED_RESULT_KEY]
+    client = scan_accessor.client(IAMResourceSpec.service_name)
+    details: Optional[AccountAuthorizationDetails]
+    try:
+        details = AccountAuthorizationDetails(users=[], groups=[], roles=[], policies=[])
+        paginator = client.get_paginator("get_account_authorization_details")
+        for resp in paginator.paginate(Filter=ACCOUNT_AUTHORIZATION_DETAILS_FILTER):
+            details.users.extend(resp.get("UserDetailList", []))
+            details.groups.extend(resp.get("GroupDetailList", []))
+            details.roles.extend(resp.get("RoleDetailList", []))
+            details.policies.extend(resp.get("Policies", []))
+    except ClientError as c_e:
+        error_code = getattr(c_e, "response", {}).get("Error", {}).get("Code", "")
+        if error_code not in ACCOUNT_AUTHORIZATION_DETAILS_DENIED_ERRORS:
+            raise c_e
+        details = None
+    scan_accessor.shared_results[ACCOUNT_AUTHORIZATION_DETAILS_SHARED_RESULT_KEY] = details
+    return details
+
+
+class IAMAccountAuthorizationDetailsResourceSpec(IAMResourceSpec):
+    """Base class for IAM resources which are scanned from a shared
+    GetAccountAuthorizationDetails response. If that call is not permitted `list_from_aws`
+    is used instead."""
+
+    @classmethod
+    def _list_from_aws(
+        cls: Type["IAMAccountAuthorizationDetailsResourceSpec"], scan_accessor: AWSAccessor
+    ) -> ListFromAWSResult:
+        details = get_account_authorization_details(scan_accessor)
+        if details is None:
+            return super()._list_from_aws(scan_accessor)
+        return cls.list_from_account_authorization_details(
+            client=scan_accessor.client(cls.get_client_name()),
+            account_authorization_details=details,
+            account_id=scan_accessor.account_id,
+            region=scan_accessor.region,
+        )
+
+    @classmethod
+    @abc.abstractmethod
+    def list_from_account_authorization_details(
+        cls: Type["IAMAccountAuthorizationDetailsResourceSpec"],
+        client: BaseClient,
+        account_authorization_details: AccountAuthorizationDetails,
+        account_id: str,
+        region: str,
+    ) -> ListFromAWSResult:
+        """Return a ListFromAWSResult object equivalent to that returned by `list_from_aws`
+        using a GetAccountAuthorizationDetails response.
+
+        Args:
+            client: boto3 Client
+            account_authorization_details: AccountAuthorizationDetails for the account
+            account_id: aws account id
+            region: aws region
+
+        Returns:
+            ListFromAWSResult object
+        """
@@ -1,10 +1,13 @@
 """Resource for IAM Groups"""
-from typing import Type
+from typing import Any, Dict, List, Type
 
 from botocore.client import BaseClient
 
 from altimeter.aws.resource.resource_spec import ListFromAWSResult
-from altimeter.aws.resource.iam import IAMResourceSpec
+from altimeter.aws.resource.iam.account_authorization_details import (
+    AccountAuthorizationDetails,
+    IAMAccountAuthorizationDetailsResourceSpec,
+)
 from altimeter.aws.resource.iam.user import IAMUserResourceSpec
 from altimeter.core.graph.field.dict_field import AnonymousEmbeddedDictField
 from altimeter.core.graph.field.list_field import AnonymousListField
@@ -13,7 +16,7 @@ from altimeter.core.graph.field.scalar_field import ScalarField
 from altimeter.core.graph.schema import Schema
 
 
-class IAMGroupResourceSpec(IAMResourceSpec):
+class IAMGroupResourceSpec(IAMAccountAuthorizationDetailsResourceSpec):
     """Resource for IAM Groups"""
 
     type_name = "group"
@@ -49,3 +52,39 @@ class IAMGroupResourceSpec(IAMResourceSpec):
                 group["Users"] = group_resp["Users"]
                 groups[resource_arn] = group
         return ListFromAWSResult(resources=groups)
+
+    @classmethod
+    def list_from_account_authorization_details(
+        cls: Type["IAMGroupResourceSpec"],
+        client: BaseClient,
+        account_authorization_details: AccountAuthorizationDetails,
+        account_id: str,
+        region: str,
+    ) -> ListFromAWSResult:
+        """Return a dict of dicts of the format:
+
+            {'group_1_arn': {group_1_dict},
+             'group_2_arn': {group_2_dict},
+             ...}
+
+        Where the dicts represent groups from GetAccountAuthorizationDetails with their
+        members taken from the group lists of users."""
+        group_names_users: Dict[str, List[Dict[str, Any]]] = {}
+        for user in account_authorization_details.users:
+            group_user = {
+                key: user[key]
+                for key in ("Path", "UserName", "UserId", "Arn", "CreateDate")
+                if key in user
+            }
+            for group_name in user.get("GroupList", []):
+                group_names_users.setdefault(group_name, []).append(group_user)
+        groups = {}
+        for group_details in account_authorization_details.groups:
+            group = {
+                key: group_details[key]
+                for key in ("Path", "GroupName", "GroupId", "Arn", "CreateDate")
+                if key in group_details
+            }
+            group["Users"] = group_names_users.get(group["GroupName"], [])
+            groups[group["Arn"]] = group
+        return ListFromAWSResult(resources=groups)
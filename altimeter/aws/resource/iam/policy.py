@@ -5,16 +5,19 @@ from botocore.client import BaseClient
 
 from altimeter.aws.resource.resource_spec import ListFromAWSResult
 from altimeter.aws.resource.iam import IAMResourceSpec
+from altimeter.aws.resource.iam.account_authorization_details import (
+    AccountAuthorizationDetails,
+    IAMAccountAuthorizationDetailsResourceSpec,
+)
 from altimeter.aws.resource.util import policy_doc_dict_to_sorted_str
 from altimeter.core.graph.field.scalar_field import ScalarField
 from altimeter.core.graph.schema import Schema
 
 
-class IAMPolicyResourceSpec(IAMResourceSpec):
+class IAMPolicyResourceSpec(IAMAccountAuthorizationDetailsResourceSpec):
     """Resource for user-managed IAM Policies"""
 
     type_name = "policy"
-    parallel_scan = True
     schema = Schema(
         ScalarField("PolicyName", "name"),
         ScalarField("PolicyId"),
@@ -53,11 +56,106 @@ class IAMPolicyResourceSpec(IAMResourceSpec):
                 policies[resource_arn] = policy
         return ListFromAWSResult(resources=policies)
 
+    @classmethod
+    def list_from_account_authorization_details(
+        cls: Type["IAMPolicyResourceSpec"],
+        client: BaseClient,
+        account_authorization_details: AccountAuthorizationDetails,
+        account_id: str,
+        region: str,
+    ) -> ListFromAWSResult:
+        """Return a dict of dicts of the format:
+
+            {'policy_1_arn': {policy_1_dict},
+             'policy_2_arn': {policy_2_dict},
+             ...}
+
+        Where the dicts represent local managed policies from GetAccountAuthorizationDetails
+        with the document of their default policy version."""
+        policies = {}
+        for policy_details in account_authorization_details.policies:
+            policy = {
+                key: value for key, value in policy_details.items() if key != "PolicyVersionList"
+            }
+            for policy_version in policy_details.get("PolicyVersionList", []):
+                if policy_version["IsDefaultVersion"]:
+                    policy["DefaultVersionPolicyDocumentText"] = policy_doc_dict_to_sorted_str(
+                        policy_version["Document"]
+                    )
+            policies[policy["Arn"]] = policy
+        return ListFromAWSResult(resources=policies)
+
+
+class IAMAttachedAWSManagedPolicyResourceSpec(IAMAccountAuthorizationDetailsResourceSpec):
+    """Resource for the AWS-managed IAM Policies attached to roles, users or groups in an
+    account. This only references the policies an account uses, their details are scanned
+    once per scan by IAMAWSManagedPolicyResourceSpec."""
+
+    type_name = "policy"
+    schema = Schema(ScalarField("PolicyName", "name"))
+
+    @classmethod
+    def list_from_aws(
+        cls: Type["IAMAttachedAWSManagedPolicyResourceSpec"],
+        client: BaseClient,
+        account_id: str,
+        region: str,
+    ) -> ListFromAWSResult:
+        """Return a dict of dicts of the format:
+
+            {'policy_1_arn': {policy_1_dict},
+             'policy_2_arn': {policy_2_dict},
+             ...}
+
+        Where the dicts represent results from list_policies for attached AWS-managed
+        policies."""
+        policies = {}
+        paginator = client.get_paginator("list_policies")
+        for resp in paginator.paginate(Scope="AWS", OnlyAttached=True):
+            for policy in resp.get("Policies", []):
+                policies[policy["Arn"]] = policy
+        return ListFromAWSResult(resources=policies)
+
+    @classmethod
+    def list_from_account_authorization_details(
+        cls: Type["IAMAttachedAWSManagedPolicyResourceSpec"],
+        client: BaseClient,
+        account_authorization_details: AccountAuthorizationDetails,
+        account_id: str,
+        region: str,
+    ) -> ListFromAWSResult:
+        """Return a dict of dicts of the format:
+
+            {'policy_1_arn': {policy_1_dict},
+             'policy_2_arn': {policy_2_dict},
+             ...}
+
+        Where the dicts represent the AWS-managed policies in the AttachedManagedPolicies of
+        roles, users and groups from GetAccountAuthorizationDetails."""
+        policies = {}
+        for entity in (
+            account_authorization_details.roles
+            + account_authorization_details.users
+            + account_authorization_details.groups
+        ):
+            for attached_policy in entity.get("AttachedManagedPolicies", []):
+                policy_arn = attached_policy["PolicyArn"]
+                if is_aws_managed_policy_arn(policy_arn):
+                    policies[policy_arn] = {
+                        "PolicyName": attached_policy["PolicyName"],
+                        "Arn": policy_arn,
+                    }
+        return ListFromAWSResult(resources=policies)
+
 
 class IAMAWSManagedPolicyResourceSpec(IAMResourceSpec):
-    """Resource for AWS-managed IAM Policies"""
+    """Resource for AWS-managed IAM Policies. AWS-managed policies are the same in every
+    account so these are scanned once per scan. Only the policies referenced by
+    IAMAttachedAWSManagedPolicyResourceSpec in a scanned account are kept, see
+    `altimeter.aws.scan.scan.filter_account_invariant_graph_set_dict`."""
 
     type_name = "policy"
+    account_invariant = True
     schema = Schema(ScalarField("PolicyName", "name"), ScalarField("PolicyId"))
 
     @classmethod
@@ -73,13 +171,28 @@ class IAMAWSManagedPolicyResourceSpec(IAMResourceSpec):
              'role_2_arn': {role_2_dict},
              ...}
 
-        Where the dicts represent results from list_policies and additional info per role from
-        list_targets_by_role."""
+        Where the dicts represent results from list_policies. All AWS-managed policies are
+        listed rather than only those attached in the scanned account as this spec is
+        account_invariant, unattached policies are dropped after accounts are scanned."""
         policies = {}
         paginator = client.get_paginator("list_policies")
 
-        for resp in paginator.paginate(Scope="AWS", OnlyAttached=True):
+        for resp in paginator.paginate(Scope="AWS"):
             for policy in resp.get("Policies", []):
                 resource_arn = policy["Arn"]
                 policies[resource_arn] = policy
         return ListFromAWSResult(resources=policies)
+
+
+def is_aws_managed_policy_arn(policy_arn: str) -> bool:
+    """Determine whether a policy arn is that of an AWS-managed policy, e.g.
+    arn:aws:iam::aws:policy/ReadOnlyAccess
+
+    Args:
+        policy_arn: policy arn
+
+    Returns:
+        True if policy_arn is the arn of an AWS-managed policy
+    """
+    arn_parts = policy_arn.split(":", 5)
+    return len(arn_parts) == 6 and arn_parts[4] == "aws" and arn_parts[5].startswith("policy/")
@@ -5,7 +5,10 @@ from typing import Any, Dict, List, Type
 from botocore.client import BaseClient
 
 from altimeter.aws.resource.resource_spec import ListFromAWSResult
-from altimeter.aws.resource.iam import IAMResourceSpec
+from altimeter.aws.resource.iam.account_authorization_details import (
+    AccountAuthorizationDetails,
+    IAMAccountAuthorizationDetailsResourceSpec,
+)
 from altimeter.aws.resource.iam.policy import IAMPolicyResourceSpec
 from altimeter.aws.resource.util import policy_doc_dict_to_sorted_str
 from altimeter.core.graph.field.dict_field import (
@@ -19,11 +22,10 @@ from altimeter.core.graph.field.scalar_field import EmbeddedScalarField, ScalarF
 from altimeter.core.graph.schema import Schema
 
 
-class IAMRoleResourceSpec(IAMResourceSpec):
+class IAMRoleResourceSpec(IAMAccountAuthorizationDetailsResourceSpec):
     """Resource for IAM Roles"""
 
     type_name = "role"
-    parallel_scan = True
     schema = Schema(
         ScalarField("RoleName", "name"),
         ScalarField("MaxSessionDuration"),
@@ -71,30 +73,63 @@ class IAMRoleResourceSpec(IAMResourceSpec):
              ...}
 
         Where the dicts represent results from list_roles and additional info per role from
-        list_targets_by_role."""
+        list_attached_role_policies."""
         roles = {}
         paginator = client.get_paginator("list_roles")
         for resp in paginator.paginate():
             for role in resp.get("Roles", []):
-                role_name = role["RoleName"]
-                assume_role_policy_document = copy.deepcopy(role["AssumeRolePolicyDocument"])
-                assume_role_policy_document_text = policy_doc_dict_to_sorted_str(
-                    assume_role_policy_document
-                )
-                role["AssumeRolePolicyDocumentText"] = assume_role_policy_document_text
-                for statement in assume_role_policy_document.get("Statement", []):
-                    for obj in statement.get("Condition", {}).values():
-                        for obj_key in obj.keys():
-                            if obj_key.lower() == "sts:externalid":
-                                obj[obj_key] = "REMOVED"
-                policies_result = get_attached_role_policies(client, role_name)
-                policies = policies_result
-                role["PolicyAttachments"] = policies
-                resource_arn = role["Arn"]
-                roles[resource_arn] = role
+                role["PolicyAttachments"] = get_attached_role_policies(client, role["RoleName"])
+                roles[role["Arn"]] = build_role_dict(role)
+        return ListFromAWSResult(resources=roles)
+
+    @classmethod
+    def list_from_account_authorization_details(
+        cls: Type["IAMRoleResourceSpec"],
+        client: BaseClient,
+        account_authorization_details: AccountAuthorizationDetails,
+        account_id: str,
+        region: str,
+    ) -> ListFromAWSResult:
+        """Return a dict of dicts of the format:
+
+            {'role_1_arn': {role_1_dict},
+             'role_2_arn': {role_2_dict},
+             ...}
+
+        Where the dicts represent results from list_roles with policy attachments taken from
+        GetAccountAuthorizationDetails. list_roles is still called as
+        GetAccountAuthorizationDetails does not return MaxSessionDuration."""
+        arns_policy_attachments = {
+            role["Arn"]: role.get("AttachedManagedPolicies", [])
+            for role in account_authorization_details.roles
+        }
+        roles = {}
+        paginator = client.get_paginator("list_roles")
+        for resp in paginator.paginate():
+            for role in resp.get("Roles", []):
+                policy_attachments = arns_policy_attachments.get(role["Arn"])
+                if policy_attachments is None:
+                    # role created after GetAccountAuthorizationDetails was called
+                    policy_attachments = get_attached_role_policies(client, role["RoleName"])
+                role["PolicyAttachments"] = policy_attachments
+                roles[role["Arn"]] = build_role_dict(role)
         return ListFromAWSResult(resources=roles)
 
 
+def build_role_dict(role: Dict[str, Any]) -> Dict[str, Any]:
+    """Add AssumeRolePolicyDocumentText to a role dict and redact sts:ExternalId conditions
+    from its AssumeRolePolicyDocument"""
+    assume_role_policy_document = copy.deepcopy(role["AssumeRolePolicyDocument"])
+    assume_role_policy_document_text = policy_doc_dict_to_sorted_str(assume_role_policy_document)
+    role["AssumeRolePolicyDocumentText"] = assume_role_policy_document_text
+    for statement in assume_role_policy_document.get("Statement", []):
+        for obj in statement.get("Condition", {}).values():
+            for obj_key in obj.keys():
+                if obj_key.lower() == "sts:externalid":
+                    obj[obj_key] = "REMOVED"
+    return role
+
+
 def get_attached_role_policies(client: BaseClient, role_name: str) -> List[Dict[str, Any]]:
     """Get attached role policies"""
     policies = []
@@ -57,33 +57,39 @@ class IAMUserResourceSpec(IAMResourceSpec):
              ...}
 
         Where the dicts represent results from list_users and additional info per user from
-        list_targets_by_user."""
-        users = {}
+        list_access_keys, get_access_key_last_used, list_mfa_devices and get_login_profile.
+        Additional info is retrieved for users concurrently."""
         paginator = client.get_paginator("list_users")
+        resp_users: List[Dict[str, Any]] = []
         for resp in paginator.paginate():
-            for user in resp.get("Users", []):
-                resource_arn = user["Arn"]
-                user_name = user["UserName"]
-                access_keys_paginator = client.get_paginator("list_access_keys")
-                access_keys: List[Dict[str, Any]] = []
-                for access_keys_resp in access_keys_paginator.paginate(UserName=user_name):
-                    for resp_access_key in access_keys_resp["AccessKeyMetadata"]:
-                        access_key = copy.deepcopy(resp_access_key)
-                        access_key_id = access_key["AccessKeyId"]
-                        last_used_resp = client.get_access_key_last_used(AccessKeyId=access_key_id)
-                        access_key["AccessKeyLastUsed"] = last_used_resp["AccessKeyLastUsed"]
-                        access_keys.append(access_key)
-                user["AccessKeys"] = access_keys
-                mfa_devices_paginator = client.get_paginator("list_mfa_devices")
-                mfa_devices: List[Dict[str, Any]] = []
-                for mfa_devices_resp in mfa_devices_paginator.paginate(UserName=user_name):
-                    mfa_devices += mfa_devices_resp["MFADevices"]
-                    user["MfaDevices"] = mfa_devices
-                try:
-                    login_profile_resp = client.get_login_profile(UserName=user_name)
-                    user["LoginProfile"] = login_profile_resp["LoginProfile"]
-                except ClientError as c_e:
-                    if "NoSuchEntity" not in str(c_e):
-                        raise c_e
-                users[resource_arn] = user
+            resp_users += resp.get("Users", [])
+
+        def enrich_user(user: Dict[str, Any]) -> Dict[str, Any]:
+            user_name = user["UserName"]
+            access_keys_paginator = client.get_paginator("list_access_keys")
+            access_keys: List[Dict[str, Any]] = []
+            for access_keys_resp in access_keys_paginator.paginate(UserName=user_name):
+                for resp_access_key in access_keys_resp["AccessKeyMetadata"]:
+                    access_key = copy.deepcopy(resp_access_key)
+                    access_key_id = access_key["AccessKeyId"]
+                    last_used_resp = client.get_access_key_last_used(AccessKeyId=access_key_id)
+                    access_key["AccessKeyLastUsed"] = last_used_resp["AccessKeyLastUsed"]
+                    access_keys.append(access_key)
+            user["AccessKeys"] = access_keys
+            mfa_devices_paginator = client.get_paginator("list_mfa_devices")
+            mfa_devices: List[Dict[str, Any]] = []
+            for mfa_devices_resp in mfa_devices_paginator.paginate(UserName=user_name):
+                mfa_devices += mfa_devices_resp["MFADevices"]
+                user["MfaDevices"] = mfa_devices
+            try:
+                login_profile_resp = client.get_login_profile(UserName=user_name)
+                user["LoginProfile"] = login_profile_resp["LoginProfile"]
+            except ClientError as c_e:
+                if "NoSuchEntity" not in str(c_e):
+                    raise c_e
+            return user
+
+        users = {}
+        for user in cls.enrich(enrich_user, resp_users):
+            users[user["Arn"]] = user
         return ListFromAWSResult(resources=users)
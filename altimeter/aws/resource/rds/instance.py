@@ -1,5 +1,5 @@
 """Resource for RDS"""
-from typing import Type
+from typing import Any, Dict, List, Type
 
 from botocore.client import BaseClient
 
@@ -108,14 +108,19 @@ class RDSInstanceResourceSpec(RDSResourceSpec):
         logger = Logger()
         dbinstances = {}
         paginator = client.get_paginator("describe_db_instances")
+        dbs: List[Dict[str, Any]] = []
         for resp in paginator.paginate():
-            for db in resp.get("DBInstances", []):
-                resource_arn = db["DBInstanceArn"]
-                db["Tags"] = client.list_tags_for_resource(ResourceName=resource_arn).get(
-                    "TagList", []
-                )
-                db["Backup"] = []
-                dbinstances[resource_arn] = db
+            dbs += resp.get("DBInstances", [])
+
+        def enrich_db(db: Dict[str, Any]) -> Dict[str, Any]:
+            db["Tags"] = client.list_tags_for_resource(ResourceName=db["DBInstanceArn"]).get(
+                "TagList", []
+            )
+            db["Backup"] = []
+            return db
+
+        for db in cls.enrich(enrich_db, dbs):
+            dbinstances[db["DBInstanceArn"]] = db
 
         backup_paginator = client.get_paginator("describe_db_instance_automated_backups")
         for resp in backup_paginator.paginate():
@@ -1,10 +1,11 @@
 """AWSResourceSpec is a subclass of ResourceSpec which is used to define
 ResourceSpecs for AWS resources"""
 import abc
+from concurrent.futures import Future, ThreadPoolExecutor
 import inspect
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Dict, Any, List, Tuple, Type
+from typing import Callable, Dict, Any, Iterable, List, Tuple, Type, TypeVar
 
 from botocore.client import BaseClient
 from botocore.exceptions import ClientError
@@ -12,6 +13,7 @@ from botocore.exceptions import ClientError
 from altimeter.aws.scan.aws_accessor import AWSAccessor
 from altimeter.core.graph.exceptions import SchemaParseException
 from altimeter.core.graph.link.links import ResourceLinkLink
+from altimeter.core.log import Logger
 from altimeter.core.resource.resource import Resource
 from altimeter.core.resource.resource_spec import ResourceSpec
 
@@ -19,6 +21,11 @@ AWS_API_IGNORE_ERRORS = frozenset(
     ("NotSignedUp", "OptInRequired", "SubscriptionRequiredException", "InvalidAction")
 )
 
+DEFAULT_ENRICHMENT_MAX_WORKERS = 8
+
+EnrichmentInput = TypeVar("EnrichmentInput")
+EnrichmentOutput = TypeVar("EnrichmentOutput")
+
 
 class ScanGranularity(Enum):
     """ScanGranularities are attached to AWSResourceSpecs and define how resources are scanned."""
@@ -41,13 +48,24 @@ class ListFromAWSResult:
 
 class AWSResourceSpec(ResourceSpec):
     """AWSResourceSpec is a subclass of ResourceSpec which is used to define
-    ResourceSpecs for AWS resources"""
+    ResourceSpecs for AWS resources
+
+    AWSResourceSpecs with account_invariant set to True generate identical resources
+    regardless of the account they are scanned from. These are scanned once per scan using
+    any scanned account rather than once per account. Only the account_invariant resources
+    whose ids are also generated by a per-account AWSResourceSpec in some scanned account
+    are kept.
+
+    enrichment_max_workers is the maximum number of threads `enrich` uses to make
+    per-resource API calls."""
 
     provider_name: str = "aws"
     service_name: str = ""
     scan_granularity: ScanGranularity = ScanGranularity.REGION
     region_whitelist: Tuple[str, ...] = ()
     parallel_scan: bool = False
+    account_invariant: bool = False
+    enrichment_max_workers: int = DEFAULT_ENRICHMENT_MAX_WORKERS
 
     def __init_subclass__(cls: Type["AWSResourceSpec"], **kwargs: Any) -> None:
         if not inspect.isabstract(cls):
@@ -134,6 +152,47 @@ class AWSResourceSpec(ResourceSpec):
         """
         return False
 
+    @classmethod
+    def enrich(
+        cls: Type["AWSResourceSpec"],
+        enrich_func: Callable[[EnrichmentInput], EnrichmentOutput],
+        items: Iterable[EnrichmentInput],
+    ) -> List[EnrichmentOutput]:
+        """Call enrich_func for each of items using up to cls.enrichment_max_workers threads.
+        This is intended for the per-resource API calls list_from_aws implementations make
+        after listing resources. Per-resource error handling belongs in enrich_func.
+
+        Args:
+            enrich_func: function to call for each item
+            items: items to call enrich_func on
+
+        Returns:
+            list of enrich_func results in the same order as items
+
+        Raises:
+            The first exception raised by enrich_func in item order. Calls which have not
+            started when an exception is raised are cancelled.
+        """
+        items = list(items)
+        if len(items) <= 1 or cls.enrichment_max_workers <= 1:
+            return [enrich_func(item) for item in items]
+        logger = Logger()
+        bindings = logger.get_bindings()
+
+        def bound_enrich_func(item: EnrichmentInput) -> EnrichmentOutput:
+            with logger.bind(**bindings):
+                return enrich_func(item)
+
+        max_workers = min(len(items), cls.enrichment_max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures: List[Future] = [executor.submit(bound_enrich_func, item) for item in items]
+            try:
+                return [future.result() for future in futures]
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
     @classmethod
     @abc.abstractmethod
     def list_from_aws(
@@ -1,5 +1,5 @@
 """Resource for S3Buckets"""
-from typing import Dict, List, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 from botocore.client import BaseClient
 from botocore.exceptions import ClientError
@@ -64,11 +64,11 @@ class S3BucketResourceSpec(S3ResourceSpec):
              'bucket_2_arn': {bucket_2_dict},
              ...}
 
-        Where the dicts represent results from list_buckets."""
+        Where the dicts represent results from list_buckets. Region, tags and encryption
+        configuration are retrieved for buckets concurrently."""
         logger = Logger()
-        buckets = {}
-        buckets_resp = client.list_buckets()
-        for bucket in buckets_resp.get("Buckets", []):
+
+        def enrich_bucket(bucket: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
             bucket_name = bucket["Name"]
             try:
                 try:
@@ -78,7 +78,7 @@ class S3BucketResourceSpec(S3ResourceSpec):
                         event=AWSLogEvents.ScanAWSResourcesNonFatalError,
                         msg=f"Unable to determine region for {bucket_name}: {s3ade}",
                     )
-                    continue
+                    return None
                 try:
                     bucket["Tags"] = get_s3_bucket_tags(client, bucket_name)
                 except S3BucketAccessDeniedException as s3ade:
@@ -98,12 +98,20 @@ class S3BucketResourceSpec(S3ResourceSpec):
                 resource_arn = cls.generate_arn(
                     account_id=account_id, region=bucket_region, resource_id=bucket_name
                 )
-                buckets[resource_arn] = bucket
+                return resource_arn, bucket
             except S3BucketDoesNotExistException as s3bdnee:
                 logger.warn(
                     event=AWSLogEvents.ScanAWSResourcesNonFatalError,
                     msg=f"{bucket_name}: No longer exists: {s3bdnee}",
                 )
+                return None
+
+        buckets = {}
+        buckets_resp = client.list_buckets()
+        for bucket_result in cls.enrich(enrich_bucket, buckets_resp.get("Buckets", [])):
+            if bucket_result is not None:
+                resource_arn, bucket = bucket_result
+                buckets[resource_arn] = bucket
         return ListFromAWSResult(resources=buckets)
 
 
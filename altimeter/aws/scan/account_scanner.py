@@ -1,20 +1,41 @@
 """An AccountScanner scans a set of accounts using an AccountScanPlan to define scan
 parameters"""
 from collections import defaultdict
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass
+import heapq
+import itertools
 import random
 import time
 import traceback
-from typing import Any, DefaultDict, Dict, List, Tuple, Type
+from typing import Any, DefaultDict, Dict, List, Optional, Set, Tuple, Type
 
 import boto3
 
+from altimeter.aws.auth.accessor import Accessor
 from altimeter.aws.log_events import AWSLogEvents
 from altimeter.aws.resource.resource_spec import ScanGranularity, AWSResourceSpec
 from altimeter.aws.resource.unscanned_account import UnscannedAccountResourceSpec
 from altimeter.aws.scan.account_scan_plan import AccountScanPlan
 from altimeter.aws.scan.aws_accessor import AWSAccessor
+from altimeter.aws.scan.client_pool import get_client_pool
+from altimeter.aws.scan.rate_limiter import (
+    get_rate_limiter,
+    initialize_rate_limiter,
+    split_rate_limits,
+)
+from altimeter.aws.scan.scan_unit_history import (
+    ScanUnitHistory,
+    ScanUnitHistoryStore,
+    get_scan_unit_key,
+)
 from altimeter.aws.scan.settings import (
     RESOURCE_SPEC_CLASSES,
     INFRA_RESOURCE_SPEC_CLASSES,
@@ -24,7 +45,9 @@ from altimeter.aws.settings import (
     GRAPH_NAME,
     GRAPH_VERSION,
 )
-from altimeter.core.artifact_io.writer import ArtifactWriter
+from altimeter.core.artifact_io import ARTIFACT_FORMAT_BINARY, ARTIFACT_FORMAT_JSON
+from altimeter.core.artifact_io.s3_client import get_shared_s3_client
+from altimeter.core.artifact_io.writer import ArtifactWriter, ArtifactWriteQueue
 from altimeter.core.graph.graph_set import GraphSet
 from altimeter.core.graph.graph_spec import GraphSpec
 from altimeter.core.log import Logger
@@ -32,6 +55,24 @@ from altimeter.core.multilevel_counter import MultilevelCounter
 from altimeter.core.resource.resource import Resource
 
 
+MAX_ACCOUNT_INVARIANT_SCAN_ATTEMPTS = 3
+
+
+def get_resource_spec_classes(scan_sub_accounts: bool) -> Tuple[Type[AWSResourceSpec], ...]:
+    """Get the AWSResourceSpec classes to scan.
+
+    Args:
+        scan_sub_accounts: if True also include organizations resources
+
+    Returns:
+        tuple of AWSResourceSpec classes
+    """
+    resource_spec_classes = RESOURCE_SPEC_CLASSES + INFRA_RESOURCE_SPEC_CLASSES
+    if scan_sub_accounts:
+        resource_spec_classes += ORG_RESOURCE_SPEC_CLASSES
+    return resource_spec_classes
+
+
 def get_all_enabled_regions(session: boto3.Session) -> Tuple[str, ...]:
     """Get all enabled regions -  which are either opted-in or are opt-in-not-required - for
     a given session.
@@ -61,16 +102,48 @@ class ScanUnit:
     token: str
     resource_spec_classes: Tuple[Type[AWSResourceSpec], ...]
 
+    @property
+    def history_key(self) -> str:
+        """Key identifying this ScanUnit in its account's ScanUnitHistory"""
+        return get_scan_unit_key(
+            region_name=self.region_name,
+            service=self.service,
+            resource_spec_classes=self.resource_spec_classes,
+        )
+
 
 class AccountScanner:
     """An AccountScanner scans a set of accounts using an AccountScanPlan to define scan
-    parameters
+    parameters. account_invariant AWSResourceSpecs are not scanned by AccountScanners, see
+    `scan_account_invariant_resources`.
 
     Args:
         account_scan_plan: AccountScanPlan describing scan targets
         artifact_writer: ArtifactWriter for writing out artifacts
+        max_svc_scan_threads: number of threads to use to run ScanUnits
+        preferred_account_scan_regions: regions to use for ACCOUNT granularity resources
+        scan_sub_accounts: if True also scan organizations resources
         graph_name: name of graph
         graph_version: version string for graph
+        max_svc_scan_processes: if set, run ScanUnits in this many processes rather than
+                                max_svc_scan_threads threads.
+        rate_limits: if set, dict of 'service' or 'service.Operation' to maximum AWS API
+                     requests per second per account and region. If max_svc_scan_processes
+                     is set these are divided evenly between the processes.
+        scan_unit_history_store: if set, ScanUnits are scheduled longest-expected-duration
+                                 first using ScanUnitHistory read from this store and
+                                 updated ScanUnitHistory is written back after the scan.
+        artifact_compression: if set, compress account artifacts with this compression, see
+                              altimeter.core.artifact_io.compression
+        artifact_format: format of account artifacts, ARTIFACT_FORMAT_JSON or
+                         ARTIFACT_FORMAT_BINARY, see altimeter.core.artifact_io
+        max_artifact_writer_threads: if set, account artifacts are written in the background
+                                     by this many threads as each account's scan completes
+                                     rather than synchronously.
+        content_artifact_writer: if set, account artifacts are deduplicated by content,
+                                 content artifacts are written by this ArtifactWriter and
+                                 artifact_writer writes refs to them, see
+                                 altimeter.core.artifact_io.dedup
     """
 
     def __init__(
@@ -82,248 +155,482 @@ class AccountScanner:
         scan_sub_accounts: bool,
         graph_name: str = GRAPH_NAME,
         graph_version: str = GRAPH_VERSION,
+        max_svc_scan_processes: Optional[int] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+        scan_unit_history_store: Optional[ScanUnitHistoryStore] = None,
+        artifact_compression: Optional[str] = None,
+        artifact_format: str = ARTIFACT_FORMAT_JSON,
+        max_artifact_writer_threads: Optional[int] = None,
+        content_artifact_writer: Optional[ArtifactWriter] = None,
     ) -> None:
         self.account_scan_plan = account_scan_plan
         self.artifact_writer = artifact_writer
         self.graph_name = graph_name
         self.graph_version = graph_version
         self.max_threads = max_svc_scan_threads
+        self.max_processes = max_svc_scan_processes
+        self.rate_limits = rate_limits
+        self.scan_unit_history_store = scan_unit_history_store
+        self.artifact_compression = artifact_compression
+        self.artifact_format = artifact_format
+        self.max_artifact_writer_threads = max_artifact_writer_threads
+        self.content_artifact_writer = content_artifact_writer
         self.preferred_account_scan_regions = preferred_account_scan_regions
-        self.resource_spec_classes = RESOURCE_SPEC_CLASSES + INFRA_RESOURCE_SPEC_CLASSES
-        if scan_sub_accounts:
-            self.resource_spec_classes += ORG_RESOURCE_SPEC_CLASSES
+        self.resource_spec_classes = tuple(
+            resource_spec_class
+            for resource_spec_class in get_resource_spec_classes(
+                scan_sub_accounts=scan_sub_accounts
+            )
+            if not resource_spec_class.account_invariant
+        )
 
     def scan(self) -> List[Dict[str, Any]]:
         logger = Logger()
         scan_result_dicts = []
         now = int(time.time())
-        prescan_account_ids_errors: DefaultDict[str, List[str]] = defaultdict(list)
-        futures = []
-        with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-            shuffled_account_ids = random.sample(
-                self.account_scan_plan.account_ids, k=len(self.account_scan_plan.account_ids)
-            )
-            for account_id in shuffled_account_ids:
-                with logger.bind(account_id=account_id):
-                    logger.info(event=AWSLogEvents.ScanAWSAccountStart)
-                    try:
-                        session = self.account_scan_plan.accessor.get_session(account_id=account_id)
-                        # sanity check
-                        sts_client = session.client("sts")
-                        sts_account_id = sts_client.get_caller_identity()["Account"]
-                        if sts_account_id != account_id:
-                            raise ValueError(
-                                f"BUG: sts detected account_id {sts_account_id} != {account_id}"
-                            )
-                        if self.account_scan_plan.regions:
-                            scan_regions = tuple(self.account_scan_plan.regions)
-                        else:
-                            scan_regions = get_all_enabled_regions(session=session)
-                        account_gran_scan_region = random.choice(
-                            self.preferred_account_scan_regions
-                        )
-                        # build a dict of regions -> services -> List[AWSResourceSpec]
-                        regions_services_resource_spec_classes: DefaultDict[
-                            str, DefaultDict[str, List[Type[AWSResourceSpec]]]
-                        ] = defaultdict(lambda: defaultdict(list))
-                        resource_spec_class: Type[AWSResourceSpec]
-                        for resource_spec_class in self.resource_spec_classes:
-                            client_name = resource_spec_class.get_client_name()
-                            if resource_spec_class.scan_granularity == ScanGranularity.ACCOUNT:
-                                if resource_spec_class.region_whitelist:
-                                    account_resource_scan_region = resource_spec_class.region_whitelist[
-                                        0
-                                    ]
-                                else:
-                                    account_resource_scan_region = account_gran_scan_region
-                                regions_services_resource_spec_classes[
-                                    account_resource_scan_region
-                                ][client_name].append(resource_spec_class)
-                            elif resource_spec_class.scan_granularity == ScanGranularity.REGION:
-                                if resource_spec_class.region_whitelist:
-                                    resource_scan_regions = tuple(
-                                        region
-                                        for region in scan_regions
-                                        if region in resource_spec_class.region_whitelist
+        account_ids_scan_unit_histories: Dict[str, ScanUnitHistory] = {}
+        account_ids_remaining_scan_units: Dict[str, int] = {}
+        if self.rate_limits is not None:
+            get_rate_limiter().set_rate_limits(self.rate_limits)
+        get_client_pool().set_max_pool_connections(self.max_threads)
+        write_queue: Optional[ArtifactWriteQueue] = None
+        if self.max_artifact_writer_threads:
+            write_queue = ArtifactWriteQueue(max_workers=self.max_artifact_writer_threads)
+            get_shared_s3_client().ensure_max_pool_connections(self.max_artifact_writer_threads)
+        executor: Executor
+        if self.max_processes:
+            if self.rate_limits is not None:
+                # each worker process has its own rate limiter
+                executor = ProcessPoolExecutor(
+                    max_workers=self.max_processes,
+                    initializer=initialize_rate_limiter,
+                    initargs=(split_rate_limits(self.rate_limits, self.max_processes),),
+                )
+            else:
+                executor = ProcessPoolExecutor(max_workers=self.max_processes)
+            max_workers = self.max_processes
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.max_threads)
+            max_workers = self.max_threads
+        try:
+            with executor:
+                dispatcher = ScanUnitDispatcher(
+                    executor=executor,
+                    max_in_flight=max_workers,
+                    account_ids_scan_unit_histories=account_ids_scan_unit_histories,
+                )
+                shuffled_account_ids = random.sample(
+                    self.account_scan_plan.account_ids, k=len(self.account_scan_plan.account_ids)
+                )
+                max_prescan_threads = max(1, min(len(shuffled_account_ids), self.max_threads))
+                account_ids_graph_sets: Dict[str, List[GraphSet]] = defaultdict(list)
+                with ThreadPoolExecutor(max_workers=max_prescan_threads) as prescan_executor:
+                    prescan_futures = {
+                        prescan_executor.submit(self._prescan_account, account_id): account_id
+                        for account_id in shuffled_account_ids
+                    }
+                    # Each account's ScanUnits are queued as soon as its prescan completes and
+                    # its artifact is written as soon as all of its ScanUnits complete.
+                    pending: Set[Future] = set(prescan_futures)
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            if future in prescan_futures:
+                                account_id = prescan_futures[future]
+                                try:
+                                    account_scan_units, scan_unit_history = future.result()
+                                except Exception as ex:
+                                    error_str = str(ex)
+                                    trace_back = traceback.format_exc()
+                                    with logger.bind(account_id=account_id):
+                                        logger.error(
+                                            event=AWSLogEvents.ScanAWSAccountError,
+                                            error=error_str,
+                                            trace_back=trace_back,
+                                        )
+                                    # graph prescan error accounts
+                                    scan_result_dicts.append(
+                                        self._complete_account(
+                                            account_id=account_id,
+                                            graph_sets=[],
+                                            errors=[f"{error_str}\n{trace_back}"],
+                                            now=now,
+                                            write_queue=write_queue,
+                                        )
                                     )
-                                    if not resource_scan_regions:
-                                        resource_scan_regions = resource_spec_class.region_whitelist
-                                else:
-                                    resource_scan_regions = scan_regions
-                                for region in resource_scan_regions:
-                                    regions_services_resource_spec_classes[region][
-                                        client_name
-                                    ].append(resource_spec_class)
-                            else:
-                                raise NotImplementedError(
-                                    f"ScanGranularity {resource_spec_class.scan_granularity} unimplemented"
+                                    continue
+                                if scan_unit_history is not None:
+                                    account_ids_scan_unit_histories[account_id] = scan_unit_history
+                                if account_scan_units:
+                                    account_ids_remaining_scan_units[account_id] = len(
+                                        account_scan_units
+                                    )
+                                dispatcher.add(account_scan_units)
+                                continue
+                            scan_unit = dispatcher.complete(future)
+                            account_id, graph_set, elapsed_sec = future.result()
+                            if not isinstance(graph_set, GraphSet):
+                                # ScanUnits run in worker processes return GraphSet dicts
+                                graph_set = GraphSet.from_dict(graph_set)
+                            account_ids_graph_sets[account_id].append(graph_set)
+                            scan_unit_history = account_ids_scan_unit_histories.get(account_id)
+                            if scan_unit_history is not None and not graph_set.errors:
+                                scan_unit_history.record(
+                                    key=scan_unit.history_key,
+                                    duration_sec=elapsed_sec,
+                                    resource_count=len(graph_set.resources),
                                 )
-                        # Build and submit ScanUnits
-                        shuffed_regions_services_resource_spec_classes = random.sample(
-                            regions_services_resource_spec_classes.items(),
-                            len(regions_services_resource_spec_classes),
-                        )
-                        for (
-                            region,
-                            services_resource_spec_classes,
-                        ) in shuffed_regions_services_resource_spec_classes:
-                            region_session = self.account_scan_plan.accessor.get_session(
-                                account_id=account_id, region_name=region
-                            )
-                            region_creds = region_session.get_credentials()
-                            shuffled_services_resource_spec_classes = random.sample(
-                                services_resource_spec_classes.items(),
-                                len(services_resource_spec_classes),
-                            )
-                            for (
-                                service,
-                                svc_resource_spec_classes,
-                            ) in shuffled_services_resource_spec_classes:
-                                parallel_svc_resource_spec_classes = [
-                                    svc_resource_spec_class
-                                    for svc_resource_spec_class in svc_resource_spec_classes
-                                    if svc_resource_spec_class.parallel_scan
-                                ]
-                                serial_svc_resource_spec_classes = [
-                                    svc_resource_spec_class
-                                    for svc_resource_spec_class in svc_resource_spec_classes
-                                    if not svc_resource_spec_class.parallel_scan
-                                ]
-                                for (
-                                    parallel_svc_resource_spec_class
-                                ) in parallel_svc_resource_spec_classes:
-                                    parallel_future = schedule_scan(
-                                        executor=executor,
-                                        graph_name=self.graph_name,
-                                        graph_version=self.graph_version,
+                            account_ids_remaining_scan_units[account_id] -= 1
+                            if account_ids_remaining_scan_units[account_id] == 0:
+                                graph_sets = account_ids_graph_sets.pop(account_id)
+                                errors = []
+                                for graph_set in graph_sets:
+                                    errors += graph_set.errors
+                                scan_result_dicts.append(
+                                    self._complete_account(
                                         account_id=account_id,
-                                        region_name=region,
-                                        service=service,
-                                        access_key=region_creds.access_key,
-                                        secret_key=region_creds.secret_key,
-                                        token=region_creds.token,
-                                        resource_spec_classes=(parallel_svc_resource_spec_class,),
+                                        graph_sets=graph_sets,
+                                        errors=errors,
+                                        now=now,
+                                        write_queue=write_queue,
                                     )
-                                    futures.append(parallel_future)
-                                serial_future = schedule_scan(
-                                    executor=executor,
-                                    graph_name=self.graph_name,
-                                    graph_version=self.graph_version,
-                                    account_id=account_id,
-                                    region_name=region,
-                                    service=service,
-                                    access_key=region_creds.access_key,
-                                    secret_key=region_creds.secret_key,
-                                    token=region_creds.token,
-                                    resource_spec_classes=tuple(serial_svc_resource_spec_classes),
                                 )
-                                futures.append(serial_future)
-                    except Exception as ex:
-                        error_str = str(ex)
-                        trace_back = traceback.format_exc()
-                        logger.error(
-                            event=AWSLogEvents.ScanAWSAccountError,
-                            error=error_str,
-                            trace_back=trace_back,
-                        )
-                        prescan_account_ids_errors[account_id].append(f"{error_str}\n{trace_back}")
-        account_ids_graph_set_dicts: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-        for future in as_completed(futures):
-            account_id, graph_set_dict = future.result()
-            account_ids_graph_set_dicts[account_id].append(graph_set_dict)
-        # first make sure no account id appears both in account_ids_graph_set_dicts
-        # and prescan_account_ids_errors - this should never happen
-        doubled_accounts = set(account_ids_graph_set_dicts.keys()).intersection(
-            set(prescan_account_ids_errors.keys())
-        )
-        if doubled_accounts:
-            raise Exception(
-                (
-                    f"BUG: Account(s) {doubled_accounts} in both "
-                    "account_ids_graph_set_dicts and prescan_account_ids_errors."
+                        pending.update(dispatcher.dispatch())
+        finally:
+            if write_queue is not None:
+                write_queue.close()
+        for scan_result_dict in scan_result_dicts:
+            output_artifact = scan_result_dict["output_artifact"]
+            if isinstance(output_artifact, Future):
+                scan_result_dict["output_artifact"] = output_artifact.result()
+        if self.scan_unit_history_store is not None:
+            for account_id in account_ids_remaining_scan_units:
+                self.scan_unit_history_store.write(
+                    account_id=account_id,
+                    scan_unit_history=account_ids_scan_unit_histories[account_id],
                 )
+        return scan_result_dicts
+
+    def _complete_account(
+        self,
+        account_id: str,
+        graph_sets: List[GraphSet],
+        errors: List[str],
+        now: int,
+        write_queue: Optional[ArtifactWriteQueue],
+    ) -> Dict[str, Any]:
+        """Build and write the GraphSet for an account whose ScanUnits have all completed.
+
+        Args:
+            account_id: account id
+            graph_sets: GraphSets of the account's ScanUnits
+            errors: errors from the account's prescan or ScanUnits
+            now: scan time
+            write_queue: if set, the artifact is written in the background by this queue
+
+        Returns:
+            scan result dict. If write_queue is set its 'output_artifact' is a Future of
+            the artifact path.
+        """
+        # if there are any errors whatsoever we generate an empty graph with
+        # errors only
+        if errors:
+            unscanned_account_resource = UnscannedAccountResourceSpec.create_resource(
+                account_id=account_id, errors=errors
+            )
+            account_graph_set = GraphSet(
+                name=self.graph_name,
+                version=self.graph_version,
+                start_time=now,
+                end_time=now,
+                resources=[unscanned_account_resource],
+                errors=errors,
+                stats=MultilevelCounter(),  # ENHANCHMENT: could technically get partial stats.
+            )
+            account_graph_set.validate()
+        else:
+            account_graph_set = GraphSet(
+                name=self.graph_name,
+                version=self.graph_version,
+                start_time=now,
+                end_time=now,
+                resources=[],
+                errors=[],
+                stats=MultilevelCounter(),
             )
-        # graph prescan error accounts
-        for account_id, errors in prescan_account_ids_errors.items():
-            with logger.bind(account_id=account_id):
-                unscanned_account_resource = UnscannedAccountResourceSpec.create_resource(
-                    account_id=account_id, errors=errors
+            for graph_set in graph_sets:
+                account_graph_set.merge(graph_set)
+        output_artifact: Any
+        if write_queue is None:
+            output_artifact = self._write_account_graph_set(account_id, account_graph_set)
+        else:
+            output_artifact = write_queue.submit(
+                self._write_account_graph_set, account_id, account_graph_set
+            )
+        return {
+            "account_id": account_id,
+            "output_artifact": output_artifact,
+            "errors": errors,
+            "api_call_stats": account_graph_set.stats.to_dict(),
+        }
+
+    def _write_account_graph_set(self, account_id: str, graph_set: GraphSet) -> str:
+        logger = Logger()
+        with logger.bind(account_id=account_id):
+            if self.content_artifact_writer is not None:
+                output_artifact = self.artifact_writer.write_deduplicated_graph_set(
+                    name=account_id,
+                    graph_set=graph_set,
+                    content_artifact_writer=self.content_artifact_writer,
+                    artifact_format=self.artifact_format,
+                    compression=self.artifact_compression,
                 )
-                account_graph_set = GraphSet(
-                    name=self.graph_name,
-                    version=self.graph_version,
-                    start_time=now,
-                    end_time=now,
-                    resources=[unscanned_account_resource],
-                    errors=errors,
-                    stats=MultilevelCounter(),
+            elif self.artifact_format == ARTIFACT_FORMAT_BINARY:
+                output_artifact = self.artifact_writer.write_graph_set_binary(
+                    name=account_id, graph_set=graph_set, compression=self.artifact_compression
                 )
-                account_graph_set.validate()
-                output_artifact = self.artifact_writer.write_json(
-                    name=account_id, data=account_graph_set.to_dict()
+            else:
+                output_artifact = self.artifact_writer.write_json_stream(
+                    name=account_id,
+                    write=graph_set.write_json,
+                    compression=self.artifact_compression,
                 )
-                logger.info(event=AWSLogEvents.ScanAWSAccountEnd)
-                api_call_stats = account_graph_set.stats.to_dict()
-                scan_result_dicts.append(
-                    {
-                        "account_id": account_id,
-                        "output_artifact": output_artifact,
-                        "errors": errors,
-                        "api_call_stats": api_call_stats,
-                    }
-                )
-        # graph rest
-        for account_id, graph_set_dicts in account_ids_graph_set_dicts.items():
-            with logger.bind(account_id=account_id):
-                # if there are any errors whatsoever we generate an empty graph with
-                # errors only
-                errors = []
-                for graph_set_dict in graph_set_dicts:
-                    errors += graph_set_dict["errors"]
-                if errors:
-                    unscanned_account_resource = UnscannedAccountResourceSpec.create_resource(
-                        account_id=account_id, errors=errors
-                    )
-                    account_graph_set = GraphSet(
-                        name=self.graph_name,
-                        version=self.graph_version,
-                        start_time=now,
-                        end_time=now,
-                        resources=[unscanned_account_resource],
-                        errors=errors,
-                        stats=MultilevelCounter(),  # ENHANCHMENT: could technically get partial stats.
-                    )
-                    account_graph_set.validate()
+            logger.info(event=AWSLogEvents.ScanAWSAccountEnd)
+            return output_artifact
+
+    def _prescan_account(self, account_id: str) -> Tuple[List[ScanUnit], Optional[ScanUnitHistory]]:
+        """Resolve credentials and regions for an account and build its ScanUnits. This is
+        run concurrently for each account in the AccountScanPlan.
+
+        Args:
+            account_id: account id
+
+        Returns:
+            tuple of the account's ScanUnits and its ScanUnitHistory if there is a
+            scan_unit_history_store
+        """
+        logger = Logger()
+        with logger.bind(account_id=account_id):
+            logger.info(event=AWSLogEvents.ScanAWSAccountStart)
+            session = self.account_scan_plan.accessor.get_session(account_id=account_id)
+            # sanity check
+            sts_client = session.client("sts")
+            sts_account_id = sts_client.get_caller_identity()["Account"]
+            if sts_account_id != account_id:
+                raise ValueError(f"BUG: sts detected account_id {sts_account_id} != {account_id}")
+            if self.account_scan_plan.regions:
+                scan_regions = tuple(self.account_scan_plan.regions)
+            else:
+                scan_regions = get_all_enabled_regions(session=session)
+            scan_unit_history: Optional[ScanUnitHistory] = None
+            if self.scan_unit_history_store is not None:
+                scan_unit_history = self.scan_unit_history_store.read(account_id=account_id)
+            account_gran_scan_region = random.choice(self.preferred_account_scan_regions)
+            # build a dict of regions -> services -> List[AWSResourceSpec]
+            regions_services_resource_spec_classes: DefaultDict[
+                str, DefaultDict[str, List[Type[AWSResourceSpec]]]
+            ] = defaultdict(lambda: defaultdict(list))
+            resource_spec_class: Type[AWSResourceSpec]
+            for resource_spec_class in self.resource_spec_classes:
+                client_name = resource_spec_class.get_client_name()
+                if resource_spec_class.scan_granularity == ScanGranularity.ACCOUNT:
+                    if resource_spec_class.region_whitelist:
+                        account_resource_scan_region = resource_spec_class.region_whitelist[0]
+                    else:
+                        account_resource_scan_region = account_gran_scan_region
+                    regions_services_resource_spec_classes[account_resource_scan_region][
+                        client_name
+                    ].append(resource_spec_class)
+                elif resource_spec_class.scan_granularity == ScanGranularity.REGION:
+                    if resource_spec_class.region_whitelist:
+                        resource_scan_regions = tuple(
+                            region
+                            for region in scan_regions
+                            if region in resource_spec_class.region_whitelist
+                        )
+                        if not resource_scan_regions:
+                            resource_scan_regions = resource_spec_class.region_whitelist
+                    else:
+                        resource_scan_regions = scan_regions
+                    for region in resource_scan_regions:
+                        regions_services_resource_spec_classes[region][client_name].append(
+                            resource_spec_class
+                        )
                 else:
-                    account_graph_set = GraphSet(
-                        name=self.graph_name,
-                        version=self.graph_version,
-                        start_time=now,
-                        end_time=now,
-                        resources=[],
-                        errors=[],
-                        stats=MultilevelCounter(),
+                    raise NotImplementedError(
+                        f"ScanGranularity {resource_spec_class.scan_granularity} unimplemented"
                     )
-                    for graph_set_dict in graph_set_dicts:
-                        graph_set = GraphSet.from_dict(graph_set_dict)
-                        account_graph_set.merge(graph_set)
-                output_artifact = self.artifact_writer.write_json(
-                    name=account_id, data=account_graph_set.to_dict()
-                )
-                logger.info(event=AWSLogEvents.ScanAWSAccountEnd)
-                api_call_stats = account_graph_set.stats.to_dict()
-                scan_result_dicts.append(
-                    {
-                        "account_id": account_id,
-                        "output_artifact": output_artifact,
-                        "errors": errors,
-                        "api_call_stats": api_call_stats,
-                    }
+            # Build ScanUnits
+            account_scan_units: List[ScanUnit] = []
+            for (
+                region,
+                services_resource_spec_classes,
+            ) in regions_services_resource_spec_classes.items():
+                region_session = self.account_scan_plan.accessor.get_session(
+                    account_id=account_id, region_name=region
                 )
-        return scan_result_dicts
+                region_creds = region_session.get_credentials()
+                for (service, svc_resource_spec_classes,) in services_resource_spec_classes.items():
+                    parallel_svc_resource_spec_classes = [
+                        svc_resource_spec_class
+                        for svc_resource_spec_class in svc_resource_spec_classes
+                        if svc_resource_spec_class.parallel_scan
+                    ]
+                    serial_svc_resource_spec_classes = [
+                        svc_resource_spec_class
+                        for svc_resource_spec_class in svc_resource_spec_classes
+                        if not svc_resource_spec_class.parallel_scan
+                    ]
+                    for parallel_svc_resource_spec_class in parallel_svc_resource_spec_classes:
+                        parallel_scan_unit = ScanUnit(
+                            graph_name=self.graph_name,
+                            graph_version=self.graph_version,
+                            account_id=account_id,
+                            region_name=region,
+                            service=service,
+                            access_key=region_creds.access_key,
+                            secret_key=region_creds.secret_key,
+                            token=region_creds.token,
+                            resource_spec_classes=(parallel_svc_resource_spec_class,),
+                        )
+                        account_scan_units.append(parallel_scan_unit)
+                    serial_scan_unit = ScanUnit(
+                        graph_name=self.graph_name,
+                        graph_version=self.graph_version,
+                        account_id=account_id,
+                        region_name=region,
+                        service=service,
+                        access_key=region_creds.access_key,
+                        secret_key=region_creds.secret_key,
+                        token=region_creds.token,
+                        resource_spec_classes=tuple(serial_svc_resource_spec_classes),
+                    )
+                    account_scan_units.append(serial_scan_unit)
+            return account_scan_units, scan_unit_history
+
+
+def get_scan_unit_priority(
+    scan_unit: ScanUnit, account_ids_scan_unit_histories: Dict[str, ScanUnitHistory]
+) -> Tuple[int, float]:
+    """Get the sort key of a ScanUnit, ScanUnits with lower keys should be scanned first.
+    ScanUnits without history come first in a random order, followed by ScanUnits with
+    history longest-expected-duration first.
+
+    Args:
+        scan_unit: ScanUnit
+        account_ids_scan_unit_histories: dict of account ids to ScanUnitHistory
+
+    Returns:
+        sort key tuple
+    """
+    expected_duration: Optional[float] = None
+    scan_unit_history = account_ids_scan_unit_histories.get(scan_unit.account_id)
+    if scan_unit_history is not None:
+        expected_duration = scan_unit_history.get_expected_duration(scan_unit.history_key)
+    if expected_duration is None:
+        return (0, random.random())
+    return (1, -expected_duration)
+
 
+def sort_scan_units(
+    scan_units: List[ScanUnit], account_ids_scan_unit_histories: Dict[str, ScanUnitHistory]
+) -> List[ScanUnit]:
+    """Order ScanUnits longest-expected-duration first so that long running ScanUnits do not
+    start last and extend the overall scan time. ScanUnits without history are shuffled and
+    placed first - with no history at all this is a random order.
 
-def scan_scan_unit(scan_unit: ScanUnit) -> Tuple[str, Dict[str, Any]]:
+    Args:
+        scan_units: ScanUnits to sort
+        account_ids_scan_unit_histories: dict of account ids to ScanUnitHistory
+
+    Returns:
+        sorted list of ScanUnits
+    """
+    return sorted(
+        scan_units,
+        key=lambda scan_unit: get_scan_unit_priority(
+            scan_unit=scan_unit, account_ids_scan_unit_histories=account_ids_scan_unit_histories
+        ),
+    )
+
+
+class ScanUnitDispatcher:
+    """Submits ScanUnits to an Executor in the order of `sort_scan_units` across all accounts
+    added to it. At most max_in_flight ScanUnits are submitted at a time, the rest wait in a
+    heap. Accounts are added as their prescans complete, keeping ScanUnits out of the
+    Executor's own FIFO queue lets the long ScanUnits of an account added later start ahead
+    of short ScanUnits of accounts added earlier.
+
+    Args:
+        executor: Executor to submit ScanUnits to
+        max_in_flight: maximum number of submitted, incomplete ScanUnits. This should be the
+                       Executor's number of workers.
+        account_ids_scan_unit_histories: dict of account ids to ScanUnitHistory
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        max_in_flight: int,
+        account_ids_scan_unit_histories: Dict[str, ScanUnitHistory],
+    ):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.account_ids_scan_unit_histories = account_ids_scan_unit_histories
+        self._heap: List[Tuple[Tuple[int, float], int, ScanUnit]] = []
+        self._counter = itertools.count()
+        self._in_flight: Dict[Future, ScanUnit] = {}
+
+    def add(self, scan_units: List[ScanUnit]) -> None:
+        """Queue ScanUnits for submission.
+
+        Args:
+            scan_units: ScanUnits to queue
+        """
+        for scan_unit in scan_units:
+            priority = get_scan_unit_priority(
+                scan_unit=scan_unit,
+                account_ids_scan_unit_histories=self.account_ids_scan_unit_histories,
+            )
+            heapq.heappush(self._heap, (priority, next(self._counter), scan_unit))
+
+    def dispatch(self) -> Dict[Future, ScanUnit]:
+        """Submit queued ScanUnits until max_in_flight ScanUnits are in flight.
+
+        Returns:
+            dict of Futures of newly submitted ScanUnits to ScanUnits
+        """
+        submitted: Dict[Future, ScanUnit] = {}
+        while self._heap and len(self._in_flight) < self.max_in_flight:
+            _, _, scan_unit = heapq.heappop(self._heap)
+            future = schedule_scan(executor=self.executor, scan_unit=scan_unit)
+            self._in_flight[future] = scan_unit
+            submitted[future] = scan_unit
+        return submitted
+
+    def complete(self, future: Future) -> ScanUnit:
+        """Mark the Future of a submitted ScanUnit as complete, freeing its slot.
+
+        Args:
+            future: completed Future returned by `dispatch`
+
+        Returns:
+            the ScanUnit of future
+        """
+        return self._in_flight.pop(future)
+
+
+def scan_scan_unit(scan_unit: ScanUnit) -> Tuple[str, GraphSet, float]:
+    """Scan a ScanUnit.
+
+    Args:
+        scan_unit: ScanUnit to scan
+
+    Returns:
+        tuple of (account id, GraphSet, elapsed seconds)
+    """
     logger = Logger()
     with logger.bind(
         account_id=scan_unit.account_id,
@@ -338,14 +645,18 @@ def scan_scan_unit(scan_unit: ScanUnit) -> Tuple[str, Dict[str, Any]]:
     ):
         start_t = time.time()
         logger.info(event=AWSLogEvents.ScanAWSAccountServiceStart)
-        session = boto3.Session(
-            aws_access_key_id=scan_unit.access_key,
-            aws_secret_access_key=scan_unit.secret_key,
-            aws_session_token=scan_unit.token,
+        client_pool = get_client_pool()
+        session = client_pool.get_session(
+            access_key=scan_unit.access_key,
+            secret_key=scan_unit.secret_key,
+            token=scan_unit.token,
             region_name=scan_unit.region_name,
         )
         scan_accessor = AWSAccessor(
-            session=session, account_id=scan_unit.account_id, region_name=scan_unit.region_name
+            session=session,
+            account_id=scan_unit.account_id,
+            region_name=scan_unit.region_name,
+            client_pool=client_pool,
         )
         graph_spec = GraphSpec(
             name=scan_unit.graph_name,
@@ -366,6 +677,8 @@ def scan_scan_unit(scan_unit: ScanUnit) -> Tuple[str, Dict[str, Any]]:
             )
             error = f"{str(ex)}\n{trace_back}"
             errors.append(error)
+        finally:
+            scan_accessor.close()
         end_time = int(time.time())
         graph_set = GraphSet(
             name=scan_unit.graph_name,
@@ -379,31 +692,126 @@ def scan_scan_unit(scan_unit: ScanUnit) -> Tuple[str, Dict[str, Any]]:
         end_t = time.time()
         elapsed_sec = end_t - start_t
         logger.info(event=AWSLogEvents.ScanAWSAccountServiceEnd, elapsed_sec=elapsed_sec)
-        return (scan_unit.account_id, graph_set.to_dict())
-
-
-def schedule_scan(
-    executor: ThreadPoolExecutor,
-    graph_name: str,
-    graph_version: str,
-    account_id: str,
-    region_name: str,
-    service: str,
-    access_key: str,
-    secret_key: str,
-    token: str,
-    resource_spec_classes: Tuple[Type[AWSResourceSpec], ...],
-) -> Future:
-    scan_unit = ScanUnit(
-        graph_name=graph_name,
-        graph_version=graph_version,
-        account_id=account_id,
-        region_name=region_name,
-        service=service,
-        access_key=access_key,
-        secret_key=secret_key,
-        token=token,
-        resource_spec_classes=resource_spec_classes,
-    )
-    future = executor.submit(lambda: scan_scan_unit(scan_unit=scan_unit))
-    return future
+        return (scan_unit.account_id, graph_set, elapsed_sec)
+
+
+def scan_scan_unit_to_dict(scan_unit: ScanUnit) -> Tuple[str, Dict[str, Any], float]:
+    """Scan a ScanUnit, returning its GraphSet as a dict. This is used when ScanUnits are
+    run in worker processes as dicts are cheaper to pickle than GraphSets.
+
+    Args:
+        scan_unit: ScanUnit to scan
+
+    Returns:
+        tuple of (account id, GraphSet dict, elapsed seconds)
+    """
+    account_id, graph_set, elapsed_sec = scan_scan_unit(scan_unit)
+    return (account_id, graph_set.to_dict(), elapsed_sec)
+
+
+def scan_account_invariant_resources(
+    account_ids: Tuple[str, ...],
+    accessor: Accessor,
+    preferred_account_scan_regions: Tuple[str, ...],
+    scan_sub_accounts: bool,
+    graph_name: str = GRAPH_NAME,
+    graph_version: str = GRAPH_VERSION,
+) -> Dict[str, Any]:
+    """Scan account_invariant AWSResourceSpecs once for a whole scan. Accounts are tried in
+    order until one scans without errors, up to MAX_ACCOUNT_INVARIANT_SCAN_ATTEMPTS accounts.
+
+    Args:
+        account_ids: ids of accounts which can be used to scan
+        accessor: Accessor to access accounts
+        preferred_account_scan_regions: regions to use for ACCOUNT granularity resources
+        scan_sub_accounts: if True also scan account_invariant organizations resources
+        graph_name: name of graph
+        graph_version: version string for graph
+
+    Returns:
+        GraphSet dict
+    """
+    logger = Logger()
+    logger.info(event=AWSLogEvents.ScanAccountInvariantResourcesStart)
+    now = int(time.time())
+    regions_services_resource_spec_classes: DefaultDict[
+        Tuple[str, str], List[Type[AWSResourceSpec]]
+    ] = defaultdict(list)
+    for resource_spec_class in get_resource_spec_classes(scan_sub_accounts=scan_sub_accounts):
+        if resource_spec_class.account_invariant:
+            if resource_spec_class.region_whitelist:
+                region = resource_spec_class.region_whitelist[0]
+            else:
+                region = preferred_account_scan_regions[0]
+            regions_services_resource_spec_classes[
+                (region, resource_spec_class.get_client_name())
+            ].append(resource_spec_class)
+    errors: List[str] = []
+    for account_id in account_ids[:MAX_ACCOUNT_INVARIANT_SCAN_ATTEMPTS]:
+        with logger.bind(account_id=account_id):
+            graph_set = GraphSet(
+                name=graph_name,
+                version=graph_version,
+                start_time=now,
+                end_time=now,
+                resources=[],
+                errors=[],
+                stats=MultilevelCounter(),
+            )
+            try:
+                for (
+                    (region, service),
+                    resource_spec_classes,
+                ) in regions_services_resource_spec_classes.items():
+                    region_session = accessor.get_session(account_id=account_id, region_name=region)
+                    region_creds = region_session.get_credentials()
+                    scan_unit = ScanUnit(
+                        graph_name=graph_name,
+                        graph_version=graph_version,
+                        account_id=account_id,
+                        region_name=region,
+                        service=service,
+                        access_key=region_creds.access_key,
+                        secret_key=region_creds.secret_key,
+                        token=region_creds.token,
+                        resource_spec_classes=tuple(resource_spec_classes),
+                    )
+                    _, scan_unit_graph_set, _ = scan_scan_unit(scan_unit)
+                    if scan_unit_graph_set.errors:
+                        raise Exception("\n".join(scan_unit_graph_set.errors))
+                    graph_set.merge(scan_unit_graph_set)
+                logger.info(event=AWSLogEvents.ScanAccountInvariantResourcesEnd)
+                return graph_set.to_dict()
+            except Exception as ex:
+                error_str = str(ex)
+                trace_back = traceback.format_exc()
+                logger.error(
+                    event=AWSLogEvents.ScanAWSAccountError, error=error_str, trace_back=trace_back
+                )
+                errors.append(f"{error_str}\n{trace_back}")
+    logger.info(event=AWSLogEvents.ScanAccountInvariantResourcesEnd)
+    return GraphSet(
+        name=graph_name,
+        version=graph_version,
+        start_time=now,
+        end_time=now,
+        resources=[],
+        errors=errors,
+        stats=MultilevelCounter(),
+    ).to_dict()
+
+
+def schedule_scan(executor: Executor, scan_unit: ScanUnit) -> Future:
+    """Submit a ScanUnit to an Executor. GraphSets are only converted to dicts if the
+    ScanUnit is run in another process.
+
+    Args:
+        executor: Executor to submit to
+        scan_unit: ScanUnit to scan
+
+    Returns:
+        Future of (account id, GraphSet or GraphSet dict, elapsed seconds)
+    """
+    if isinstance(executor, ProcessPoolExecutor):
+        return executor.submit(scan_scan_unit_to_dict, scan_unit)
+    return executor.submit(scan_scan_unit, scan_unit)
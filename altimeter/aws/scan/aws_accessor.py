@@ -1,11 +1,19 @@
 """AWSAccessor is a wrapper around a boto3 client which provides protection against
-non-Get/List/Describe API calls occurring as well as api call statistic tracking."""
+non-Get/List/Describe API calls occurring, api call statistic tracking and adaptive
+rate limiting."""
 import re
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Optional
 
 from botocore.client import BaseClient
 import boto3
 
+from altimeter.aws.scan.client_pool import AWSClientPool
+from altimeter.aws.scan.rate_limiter import (
+    AdaptiveRateLimiter,
+    get_rate_limiter,
+    is_throttling_response,
+)
 from altimeter.core.multilevel_counter import MultilevelCounter
 
 _PERMITTED_OPERATION_NAMES_STR = "^(Get|List|Describe).*"
@@ -18,9 +26,12 @@ def on_request_created(
     region_name: str,
     service_name: str,
     readonly: bool,
+    rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    api_call_stats_lock: Optional[threading.Lock] = None,
     **kwargs: Any,
 ) -> None:
-    """Called when a boto3 request is created. This handles api call statistics tracking.
+    """Called when a boto3 request is created. This handles api call statistics tracking
+    and rate limiting.
 
     Args:
         api_call_stats: MultilevelCounter to increment
@@ -28,6 +39,8 @@ def on_request_created(
         region_name: request region
         service_name: request service
         readonly: if True only allow readonly calls
+        rate_limiter: if set, block until this rate limiter allows the request
+        api_call_stats_lock: if set, held while incrementing api_call_stats
         kwargs: kwargs which are passed through by the boto event callback.
     """
     _, _, operation_name = kwargs["event_name"].split(".")
@@ -36,28 +49,83 @@ def on_request_created(
             raise Exception(
                 f"Operation name {operation_name} did not match {_PERMITTED_OPERATION_NAMES_STR}"
             )
-    api_call_stats.increment(account_id, region_name, service_name, operation_name)
+    if rate_limiter is not None:
+        rate_limiter.get_bucket(account_id, region_name, service_name, operation_name).acquire()
+    if api_call_stats_lock is not None:
+        with api_call_stats_lock:
+            api_call_stats.increment(account_id, region_name, service_name, operation_name)
+    else:
+        api_call_stats.increment(account_id, region_name, service_name, operation_name)
+
+
+def on_needs_retry(
+    account_id: str,
+    region_name: str,
+    service_name: str,
+    rate_limiter: AdaptiveRateLimiter,
+    **kwargs: Any,
+) -> None:
+    """Called when a boto3 response is received and botocore is deciding whether to retry.
+    This adjusts the rate limit of the request's bucket - decreasing it if the response
+    was a throttling error and increasing it otherwise. Always returns None so botocore's
+    own retry handling is unaffected.
+
+    Args:
+        account_id: request account id
+        region_name: request region
+        service_name: request service
+        rate_limiter: rate limiter to adjust
+        kwargs: kwargs which are passed through by the boto event callback.
+    """
+    response = kwargs.get("response")
+    if kwargs.get("caught_exception") is not None or response is None:
+        return
+    operation_name = kwargs["operation"].name
+    bucket = rate_limiter.get_bucket(account_id, region_name, service_name, operation_name)
+    parsed_response = response[1]
+    if is_throttling_response(parsed_response):
+        bucket.on_throttle()
+    elif "Error" not in parsed_response:
+        bucket.on_success()
 
 
 class AWSAccessor:
     """AWSAccessor is a wrapper around a boto3 client which provides protection against
-    non-Get/List/Describe API calls occurring as well as api call statistic tracking.
+    non-Get/List/Describe API calls occurring, api call statistic tracking and adaptive
+    rate limiting.
 
     Args:
         session: boto3 Session
         account_id: aws account id
         region_name: aws region
+        readonly: if True only allow readonly calls
+        rate_limiter: AdaptiveRateLimiter to use. Defaults to the process-wide rate limiter.
+        client_pool: if set, clients are leased from this AWSClientPool rather than created
+                     from session. Leased clients are returned to the pool by `close`.
     """
 
     def __init__(
-        self, session: boto3.Session, account_id: str, region_name: str, readonly: bool = True
+        self,
+        session: boto3.Session,
+        account_id: str,
+        region_name: str,
+        readonly: bool = True,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        client_pool: Optional[AWSClientPool] = None,
     ):
         self.session = session
         self.account_id = account_id
         self.region = region_name
         self.api_call_stats = MultilevelCounter()
+        # clients may be used from multiple threads, e.g. by AWSResourceSpec.enrich
+        self._api_call_stats_lock = threading.Lock()
         self.client_cache: Dict[str, Any] = {}
+        # results of API calls which are shared between the ResourceSpecs scanned with this
+        # AWSAccessor, e.g. iam GetAccountAuthorizationDetails
+        self.shared_results: Dict[str, Any] = {}
         self.readonly = readonly
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter()
+        self.client_pool = client_pool
 
     def client(self, service_name: str) -> BaseClient:
         """Return a boto3 client for a given AWS service_name.
@@ -71,15 +139,61 @@ class AWSAccessor:
         cached_client = self.client_cache.get(service_name)
         if cached_client:
             return cached_client
-        client = self.session.client(service_name=service_name, region_name=self.region)
+        if self.client_pool is not None:
+            client = self.client_pool.acquire_client(
+                session=self.session, region_name=self.region, service_name=service_name
+            )
+        else:
+            client = self.session.client(service_name=service_name, region_name=self.region)
         create_handler = lambda **kwargs: on_request_created(
             api_call_stats=self.api_call_stats,
             account_id=self.account_id,
             region_name=self.region,
             service_name=service_name,
             readonly=self.readonly,
+            rate_limiter=self.rate_limiter,
+            api_call_stats_lock=self._api_call_stats_lock,
+            **kwargs,
+        )
+        client.meta.events.register(
+            "request-created.*.*",
+            create_handler,
+            unique_id=self._get_handler_unique_id("request-created"),
+        )
+        needs_retry_handler = lambda **kwargs: on_needs_retry(
+            account_id=self.account_id,
+            region_name=self.region,
+            service_name=service_name,
+            rate_limiter=self.rate_limiter,
             **kwargs,
         )
-        client.meta.events.register("request-created.*.*", create_handler)
+        client.meta.events.register(
+            "needs-retry.*.*",
+            needs_retry_handler,
+            unique_id=self._get_handler_unique_id("needs-retry"),
+        )
         self.client_cache[service_name] = client
         return client
+
+    def _get_handler_unique_id(self, event: str) -> str:
+        # botocore's emitter tracks unique_ids across all events, handlers for different
+        # events registered with the same unique_id would be silently dropped
+        return f"altimeter-aws-accessor-{id(self)}-{event}"
+
+    def close(self) -> None:
+        """Unregister this AWSAccessor's event handlers from its clients and return them to
+        client_pool if set. Shared results are discarded."""
+        for service_name, client in self.client_cache.items():
+            for event in ("request-created", "needs-retry"):
+                client.meta.events.unregister(
+                    f"{event}.*.*", unique_id=self._get_handler_unique_id(event)
+                )
+            if self.client_pool is not None:
+                self.client_pool.release_client(
+                    session=self.session,
+                    region_name=self.region,
+                    service_name=service_name,
+                    client=client,
+                )
+        self.client_cache = {}
+        self.shared_results = {}
@@ -0,0 +1,154 @@
+"""An AWSClientPool provides pooled boto3 Sessions and clients for ScanUnits. Creating a
+Session reloads botocore's service models and endpoint data and each new client opens new
+HTTPS connections - pooling both makes the per-ScanUnit setup cost negligible."""
+from collections import OrderedDict, defaultdict
+import threading
+from typing import DefaultDict, Dict, List, Optional, Tuple
+
+import boto3
+from botocore.client import BaseClient
+from botocore.config import Config
+import botocore.loaders
+import botocore.session
+
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+DEFAULT_MAX_SESSIONS = 256
+
+SessionKey = Tuple[str, str, Optional[str], str]
+ClientKey = Tuple[int, str, str]
+
+
+class AWSClientPool:
+    """A pool of boto3 Sessions and clients.
+
+    Sessions are cached by (access key, secret key, token, region) and share a single
+    botocore data loader, so service models are loaded once per process. Clients are
+    cached by (session, region, service) and are leased exclusively - a client acquired via
+    `acquire_client` is not handed out again until it is returned via `release_client`. This
+    allows callers to register per-lease event handlers on clients.
+
+    Args:
+        max_pool_connections: max_pool_connections of created clients
+        max_sessions: maximum number of Sessions to cache. Least recently used sessions and
+                      their idle clients are discarded beyond this.
+    """
+
+    def __init__(
+        self,
+        max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+    ):
+        self.max_pool_connections = max_pool_connections
+        self.max_sessions = max_sessions
+        self._loader = botocore.loaders.create_loader()
+        self._sessions: "OrderedDict[SessionKey, boto3.Session]" = OrderedDict()
+        self._idle_clients: DefaultDict[ClientKey, List[BaseClient]] = defaultdict(list)
+        self._session_locks: Dict[int, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def set_max_pool_connections(self, max_pool_connections: int) -> None:
+        """Set max_pool_connections for clients created after this call.
+
+        Args:
+            max_pool_connections: max_pool_connections of created clients
+        """
+        with self._lock:
+            self.max_pool_connections = max_pool_connections
+
+    def get_session(
+        self, access_key: str, secret_key: str, token: Optional[str], region_name: str
+    ) -> boto3.Session:
+        """Get a pooled boto3 Session for a set of credentials and a region.
+
+        Args:
+            access_key: aws access key
+            secret_key: aws secret key
+            token: aws session token
+            region_name: session region
+
+        Returns:
+            boto3.Session object
+        """
+        session_key = (access_key, secret_key, token, region_name)
+        with self._lock:
+            session = self._sessions.get(session_key)
+            if session is not None:
+                self._sessions.move_to_end(session_key)
+                return session
+            botocore_session = botocore.session.get_session()
+            botocore_session.register_component("data_loader", self._loader)
+            session = boto3.Session(
+                aws_access_key_id=access_key,
+                aws_secret_access_key=secret_key,
+                aws_session_token=token,
+                region_name=region_name,
+                botocore_session=botocore_session,
+            )
+            # boto3 appends its own data path to the shared loader for each Session
+            search_paths = self._loader.search_paths
+            search_paths[:] = list(dict.fromkeys(search_paths))
+            self._sessions[session_key] = session
+            self._session_locks[id(session)] = threading.Lock()
+            while len(self._sessions) > self.max_sessions:
+                _, evicted_session = self._sessions.popitem(last=False)
+                self._session_locks.pop(id(evicted_session), None)
+                for client_key in [
+                    key for key in self._idle_clients if key[0] == id(evicted_session)
+                ]:
+                    del self._idle_clients[client_key]
+            return session
+
+    def acquire_client(
+        self, session: boto3.Session, region_name: str, service_name: str
+    ) -> BaseClient:
+        """Lease a client for a service from the pool, creating one if no idle client
+        is available.
+
+        Args:
+            session: boto3 Session, generally from `get_session`
+            region_name: client region
+            service_name: AWS service name
+
+        Returns:
+            boto3 client
+        """
+        client_key = (id(session), region_name, service_name)
+        with self._lock:
+            idle_clients = self._idle_clients.get(client_key)
+            if idle_clients:
+                return idle_clients.pop()
+            # botocore Sessions are not thread safe, so clients are created under a per-Session
+            # lock - or the pool lock for Sessions which did not come from this pool
+            session_lock = self._session_locks.get(id(session), self._lock)
+            config = Config(max_pool_connections=self.max_pool_connections)
+        with session_lock:
+            return session.client(service_name=service_name, region_name=region_name, config=config)
+
+    def release_client(
+        self, session: boto3.Session, region_name: str, service_name: str, client: BaseClient
+    ) -> None:
+        """Return a leased client to the pool.
+
+        Args:
+            session: boto3 Session the client was acquired with
+            region_name: client region
+            service_name: AWS service name
+            client: client to return
+        """
+        client_key = (id(session), region_name, service_name)
+        with self._lock:
+            # clients of sessions which are not (or are no longer) pooled are discarded
+            if id(session) in self._session_locks:
+                self._idle_clients[client_key].append(client)
+
+
+_CLIENT_POOL = AWSClientPool()
+
+
+def get_client_pool() -> AWSClientPool:
+    """Get the process-wide AWSClientPool
+
+    Returns:
+        AWSClientPool shared by all ScanUnits in this process
+    """
+    return _CLIENT_POOL
@@ -1,6 +1,6 @@
 """Abstract base class for AWSScanMuxers."""
 import abc
-from concurrent.futures import as_completed, Future, ThreadPoolExecutor
+from concurrent.futures import as_completed, Executor, Future, ThreadPoolExecutor
 from typing import Generator
 
 from altimeter.aws.log_events import AWSLogEvents
@@ -42,7 +42,7 @@ class AWSScanMuxer(abc.ABC):
             max_accounts=self.config.concurrency.max_accounts_per_thread
         )
         num_account_batches = len(account_scan_plans)
-        num_threads = min(num_account_batches, self.config.concurrency.max_account_scan_threads)
+        num_threads = min(num_account_batches, self._get_max_workers())
         logger = Logger()
         with logger.bind(
             num_total_accounts=num_total_accounts,
@@ -51,7 +51,7 @@ class AWSScanMuxer(abc.ABC):
             num_muxer_threads=num_threads,
         ):
             logger.info(event=AWSLogEvents.MuxerStart)
-            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            with self._create_executor(max_workers=num_threads) as executor:
                 processed_accounts = 0
                 futures = []
                 for sub_account_scan_plan in account_scan_plans:
@@ -89,11 +89,26 @@ class AWSScanMuxer(abc.ABC):
                     )
             logger.info(event=AWSLogEvents.MuxerEnd)
 
+    def _get_max_workers(self) -> int:
+        """Return the maximum number of account scans to run concurrently."""
+        return self.config.concurrency.max_account_scan_threads
+
+    def _create_executor(self, max_workers: int) -> Executor:
+        """Create the Executor which account scans are scheduled on.
+
+        Args:
+            max_workers: maximum number of workers
+
+        Returns:
+            Executor object
+        """
+        return ThreadPoolExecutor(max_workers=max_workers)
+
     @abc.abstractmethod
     def _schedule_account_scan(
-        self, executor: ThreadPoolExecutor, account_scan_plan: AccountScanPlan
+        self, executor: Executor, account_scan_plan: AccountScanPlan
     ) -> Future:
-        """Given a ThreadPoolExecutor and scan details (date/time/accounts/regions),
+        """Given an Executor and scan details (date/time/accounts/regions),
         schedule an account scan by making a call to executor.submit and return the Future
         returned by executor.submit.
 
@@ -1,5 +1,5 @@
 """AWSScanMuxer that runs account scans one-per-lambda"""
-from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import Executor, Future
 from configparser import ConfigParser
 import json
 from pathlib import Path
@@ -45,7 +45,7 @@ class LambdaAWSScanMuxer(AWSScanMuxer):
                 config_file.write(config_fp)
 
     def _schedule_account_scan(
-        self, executor: ThreadPoolExecutor, account_scan_plan: AccountScanPlan
+        self, executor: Executor, account_scan_plan: AccountScanPlan
     ) -> Future:
         """Schedule an account scan by calling the AccountScan lambda with
         the proper arguments."""
@@ -54,7 +54,12 @@ class LambdaAWSScanMuxer(AWSScanMuxer):
             "account_scan_plan": account_scan_plan.to_dict(),
             "scan_id": self.scan_id,
             "artifact_path": self.config.artifact_path,
+            "artifact_compression": self.config.artifact_compression,
+            "artifact_format": self.config.artifact_format,
+            "artifact_dedup": self.config.artifact_dedup,
             "max_svc_scan_threads": self.config.concurrency.max_svc_scan_threads,
+            "rate_limits": self.config.concurrency.rate_limits,
+            "max_artifact_writer_threads": self.config.concurrency.max_artifact_writer_threads,
             "preferred_account_scan_regions": self.config.scan.preferred_account_scan_regions,
             "scan_sub_accounts": self.config.scan.scan_sub_accounts,
         }
@@ -1,10 +1,13 @@
-"""AWSScanMuxer that runs account scans one-per-thread"""
-from concurrent.futures import Future, ThreadPoolExecutor
-from typing import Any, Dict, List
+"""AWSScanMuxers that run account scans locally, one-per-thread or one-per-process"""
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+import os
+from typing import Any, Dict, List, Optional
 
 from altimeter.aws.scan.muxer import AWSScanMuxer
 from altimeter.aws.scan.account_scan_plan import AccountScanPlan
 from altimeter.aws.scan.account_scanner import AccountScanner
+from altimeter.aws.scan.scan_unit_history import ScanUnitHistoryStore
+from altimeter.core.artifact_io.dedup import CONTENT_ARTIFACT_DIR
 from altimeter.core.artifact_io.writer import ArtifactWriter
 from altimeter.core.config import Config
 
@@ -22,12 +25,24 @@ def local_account_scan(
         artifact_path=config.artifact_path, scan_id=scan_id
     )
     account_scan_plan = AccountScanPlan.from_dict(account_scan_plan_dict=account_scan_plan_dict)
+    content_artifact_writer: Optional[ArtifactWriter] = None
+    if config.artifact_dedup:
+        content_artifact_writer = ArtifactWriter.from_artifact_path(
+            artifact_path=config.artifact_path, scan_id=CONTENT_ARTIFACT_DIR
+        )
     account_scanner = AccountScanner(
         account_scan_plan=account_scan_plan,
         artifact_writer=artifact_writer,
         max_svc_scan_threads=config.concurrency.max_svc_scan_threads,
         preferred_account_scan_regions=config.scan.preferred_account_scan_regions,
         scan_sub_accounts=config.scan.scan_sub_accounts,
+        max_svc_scan_processes=config.concurrency.max_svc_scan_processes,
+        rate_limits=config.concurrency.rate_limits,
+        scan_unit_history_store=ScanUnitHistoryStore(artifact_path=config.artifact_path),
+        artifact_compression=config.artifact_compression,
+        artifact_format=config.artifact_format,
+        max_artifact_writer_threads=config.concurrency.max_artifact_writer_threads,
+        content_artifact_writer=content_artifact_writer,
     )
     return account_scanner.scan()
 
@@ -36,13 +51,13 @@ class LocalAWSScanMuxer(AWSScanMuxer):
     """AWSScanMuxer that runs account scans batches of accounts using local os threads"""
 
     def _schedule_account_scan(
-        self, executor: ThreadPoolExecutor, account_scan_plan: AccountScanPlan
+        self, executor: Executor, account_scan_plan: AccountScanPlan
     ) -> Future:
         """Schedule a local account scan. Note that we serialize the AccountScanPlan
         because boto3 sessions are not thread safe.
 
         Args:
-            executor: ThreadPoolExecutor to submit scan to
+            executor: Executor to submit scan to
             account_scan_plan: AccountScanPlans defining this scan
         """
         scan_lambda = lambda: local_account_scan(
@@ -51,3 +66,48 @@ class LocalAWSScanMuxer(AWSScanMuxer):
             config=self.config,
         )
         return executor.submit(scan_lambda)
+
+
+class ProcessPoolAWSScanMuxer(AWSScanMuxer):
+    """AWSScanMuxer that runs account scans batches of accounts using local os processes.
+    This allows the CPU bound portions of scans (schema parsing, graph generation) of
+    multiple account batches to run in parallel rather than contending for the GIL.
+
+    The number of processes is config.concurrency.max_account_scan_processes, or the number
+    of CPUs if that is not set. Each process scans its account batch using
+    config.concurrency.max_svc_scan_threads threads."""
+
+    def _get_max_workers(self) -> int:
+        """Return the maximum number of account scan processes to run concurrently."""
+        if self.config.concurrency.max_account_scan_processes:
+            return self.config.concurrency.max_account_scan_processes
+        return os.cpu_count() or 1
+
+    def _create_executor(self, max_workers: int) -> Executor:
+        """Create a ProcessPoolExecutor which account scans are scheduled on.
+
+        Args:
+            max_workers: maximum number of processes
+
+        Returns:
+            ProcessPoolExecutor object
+        """
+        return ProcessPoolExecutor(max_workers=max_workers)
+
+    def _schedule_account_scan(
+        self, executor: Executor, account_scan_plan: AccountScanPlan
+    ) -> Future:
+        """Schedule a local account scan in a worker process. The AccountScanPlan is sent to
+        the worker as a dict and the worker returns scan result dicts containing artifact
+        paths.
+
+        Args:
+            executor: ProcessPoolExecutor to submit scan to
+            account_scan_plan: AccountScanPlans defining this scan
+        """
+        return executor.submit(
+            local_account_scan,
+            scan_id=self.scan_id,
+            account_scan_plan_dict=account_scan_plan.to_dict(),
+            config=self.config,
+        )
@@ -0,0 +1,242 @@
+"""Process-wide adaptive rate limiting for AWS API calls. Calls are limited using token
+buckets keyed by account, region, service and operation. Bucket rates adapt to throttling
+responses using additive-increase/multiplicative-decrease (AIMD).
+
+Each process has its own rate limiter. When the calls to an account and region are spread
+across several processes, use `split_rate_limits` and `initialize_rate_limiter` to give
+each process its share of the configured limits."""
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+THROTTLING_ERROR_CODES = frozenset(
+    (
+        "BandwidthLimitExceeded",
+        "EC2ThrottledException",
+        "LimitExceededException",
+        "PriorRequestNotComplete",
+        "ProvisionedThroughputExceededException",
+        "RequestLimitExceeded",
+        "RequestThrottled",
+        "RequestThrottledException",
+        "SlowDown",
+        "Throttling",
+        "ThrottlingException",
+        "TooManyRequestsException",
+    )
+)
+
+
+class TokenBucket:
+    """A token bucket which adapts its rate using AIMD.
+
+    A bucket with a rate of None is unlimited. An unlimited bucket switches to a limited rate
+    the first time it sees throttling, starting from half of its recently observed request
+    rate.
+
+    Args:
+        rate: initial rate in requests per second, None for unlimited
+        max_rate: maximum rate in requests per second, None for no maximum
+        min_rate: minimum rate in requests per second
+        additive_increase: requests per second added to the rate per second of
+                           non-throttled responses
+        multiplicative_decrease: factor the rate is multiplied by when throttled
+        decrease_cooldown: minimum seconds between rate decreases. Concurrent requests
+                           tend to be throttled together, this prevents a single burst
+                           of throttling from collapsing the rate.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        min_rate: float = 0.5,
+        additive_increase: float = 1.0,
+        multiplicative_decrease: float = 0.5,
+        decrease_cooldown: float = 1.0,
+    ):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.decrease_cooldown = decrease_cooldown
+        now = time.monotonic()
+        self._tokens = 1.0
+        self._last_refill = now
+        self._last_increase = now
+        self._last_decrease = 0.0
+        self._window_start = now
+        self._window_count = 0
+        self._observed_rate = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self.rate is not None:
+            burst = max(1.0, self.rate)
+            self._tokens = min(burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _observe_request(self, now: float) -> None:
+        window_duration = now - self._window_start
+        if window_duration >= 1.0:
+            self._observed_rate = self._window_count / window_duration
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+
+    def acquire(self) -> None:
+        """Take a token from this bucket, blocking until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.rate is None:
+                    self._observe_request(now)
+                    return
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self._observe_request(now)
+                    return
+                wait_sec = (1.0 - self._tokens) / self.rate
+            time.sleep(wait_sec)
+
+    def on_success(self) -> None:
+        """Additively increase the rate of this bucket after a non-throttled response."""
+        with self._lock:
+            now = time.monotonic()
+            if self.rate is not None:
+                self._refill(now)
+                self.rate += self.additive_increase * (now - self._last_increase)
+                if self.max_rate is not None:
+                    self.rate = min(self.rate, self.max_rate)
+            self._last_increase = now
+
+    def on_throttle(self) -> None:
+        """Multiplicatively decrease the rate of this bucket after a throttled response."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.decrease_cooldown:
+                return
+            self._refill(now)
+            if self.rate is None:
+                window_duration = now - self._window_start
+                current_rate = self._window_count / window_duration if window_duration else 0.0
+                base_rate = max(self._observed_rate, current_rate)
+            else:
+                base_rate = self.rate
+            self.rate = max(self.min_rate, base_rate * self.multiplicative_decrease)
+            self._tokens = min(self._tokens, 1.0)
+            self._last_decrease = now
+            self._last_increase = now
+
+
+class AdaptiveRateLimiter:
+    """Rate limiter holding a TokenBucket per (account id, region, service, operation).
+
+    Initial bucket rates are taken from rate_limits, a dict whose keys are either
+    'service' or 'service.Operation' (e.g. 'iam' or 'ec2.DescribeInstances') and whose values
+    are maximum requests per second. 'service.Operation' keys take precedence over
+    'service' keys. Buckets for calls without a configured limit start unlimited and only
+    become limited when throttled.
+
+    Args:
+        rate_limits: dict of 'service' or 'service.Operation' to requests per second
+    """
+
+    def __init__(self, rate_limits: Optional[Dict[str, float]] = None):
+        self.rate_limits: Dict[str, float] = dict(rate_limits) if rate_limits else {}
+        self._buckets: Dict[Tuple[str, str, str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def set_rate_limits(self, rate_limits: Dict[str, float]) -> None:
+        """Set configured rate limits. If they differ from the current rate limits existing
+        buckets are discarded.
+
+        Args:
+            rate_limits: dict of 'service' or 'service.Operation' to requests per second
+        """
+        with self._lock:
+            if rate_limits != self.rate_limits:
+                self.rate_limits = dict(rate_limits)
+                self._buckets = {}
+
+    def get_bucket(
+        self, account_id: str, region_name: str, service_name: str, operation_name: str
+    ) -> TokenBucket:
+        """Get the TokenBucket for a given account, region, service and operation, creating
+        it if necessary.
+
+        Args:
+            account_id: request account id
+            region_name: request region
+            service_name: request service
+            operation_name: request operation
+
+        Returns:
+            TokenBucket
+        """
+        key = (account_id, region_name, service_name, operation_name)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    rate_limit = self.rate_limits.get(
+                        f"{service_name}.{operation_name}", self.rate_limits.get(service_name)
+                    )
+                    bucket = TokenBucket(rate=rate_limit, max_rate=rate_limit)
+                    self._buckets[key] = bucket
+        return bucket
+
+
+def is_throttling_response(parsed_response: Dict[str, Any]) -> bool:
+    """Determine whether a parsed botocore response is a throttling error.
+
+    Args:
+        parsed_response: parsed botocore response dict
+
+    Returns:
+        True if the response is a throttling error
+    """
+    error_code = parsed_response.get("Error", {}).get("Code", "")
+    return error_code in THROTTLING_ERROR_CODES
+
+
+_RATE_LIMITER = AdaptiveRateLimiter()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    """Get the process-wide AdaptiveRateLimiter
+
+    Returns:
+        AdaptiveRateLimiter shared by all AWSAccessors in this process
+    """
+    return _RATE_LIMITER
+
+
+def split_rate_limits(rate_limits: Dict[str, float], process_count: int) -> Dict[str, float]:
+    """Divide rate limits evenly between process_count processes which each hold their own
+    AdaptiveRateLimiter, so that their combined rate does not exceed rate_limits.
+
+    Args:
+        rate_limits: dict of 'service' or 'service.Operation' to requests per second
+        process_count: number of processes sharing rate_limits
+
+    Returns:
+        dict of 'service' or 'service.Operation' to requests per second per process
+    """
+    if process_count < 1:
+        raise ValueError(f"process_count should be at least 1. Is {process_count}")
+    return {key: rate_limit / process_count for key, rate_limit in rate_limits.items()}
+
+
+def initialize_rate_limiter(rate_limits: Dict[str, float]) -> None:
+    """Set the rate limits of the process-wide AdaptiveRateLimiter. Intended to be used as a
+    ProcessPoolExecutor initializer so that worker processes are rate limited regardless of
+    the multiprocessing start method.
+
+    Args:
+        rate_limits: dict of 'service' or 'service.Operation' to requests per second
+    """
+    get_rate_limiter().set_rate_limits(rate_limits)
@@ -1,14 +1,24 @@
-from typing import Tuple, Set, List, Dict
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Deque, Tuple, Set, List, Dict, Union
 
 from altimeter.aws.auth.accessor import Accessor
 from altimeter.aws.log_events import AWSLogEvents
 from altimeter.aws.scan.account_scan_plan import AccountScanPlan
+from altimeter.aws.scan.account_scanner import scan_account_invariant_resources
 from altimeter.aws.scan.muxer import AWSScanMuxer
 from altimeter.aws.scan.scan_manifest import ScanManifest
+from altimeter.aws.settings import GRAPH_NAME, GRAPH_VERSION
+from altimeter.core.artifact_io.dedup import is_artifact_ref_path
+from altimeter.core.artifact_io.graph_set_binary import (
+    GraphSetBinaryReader,
+    is_graph_set_binary_path,
+)
 from altimeter.core.artifact_io.reader import ArtifactReader
+from altimeter.core.artifact_io.s3_client import get_shared_s3_client
 from altimeter.core.artifact_io.writer import ArtifactWriter
 from altimeter.core.config import Config
-from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.graph.graph_set_builder import SpooledGraphSet, StreamingGraphSetBuilder
 from altimeter.core.log import Logger
 from altimeter.core.multilevel_counter import MultilevelCounter
 
@@ -33,12 +43,129 @@ def get_sub_account_ids(account_ids: Tuple[str, ...], accessor: Accessor) -> Tup
     return tuple(sub_account_ids)
 
 
+def read_graph_set_artifact(
+    artifact_reader: ArtifactReader, artifact_path: str
+) -> Union[Dict[str, Any], GraphSetBinaryReader]:
+    """Read and parse a GraphSet artifact.
+
+    Args:
+        artifact_reader: ArtifactReader to read with
+        artifact_path: path to a JSON or binary GraphSet artifact or a GraphSet artifact ref
+
+    Returns:
+        GraphSet dict for JSON artifacts, GraphSetBinaryReader for binary artifacts
+    """
+    if is_artifact_ref_path(artifact_path):
+        artifact_ref = artifact_reader.read_artifact_ref(artifact_path)
+        artifact = read_graph_set_artifact(artifact_reader, artifact_ref.path)
+        if isinstance(artifact, GraphSetBinaryReader):
+            artifact_ref.apply(artifact)
+            return artifact
+        return artifact_ref.apply_to_dict(artifact)
+    if is_graph_set_binary_path(artifact_path):
+        with artifact_reader.open_artifact(artifact_path) as artifact_fp:
+            return GraphSetBinaryReader.from_file(artifact_fp)
+    return artifact_reader.read_json(artifact_path)
+
+
+def filter_account_invariant_graph_set_dict(
+    graph_set_dict: Dict[str, Any], graph_set_builder: StreamingGraphSetBuilder
+) -> Dict[str, Any]:
+    """Drop the resources of an account_invariant GraphSet dict which are not referenced by
+    any scanned account. An account references an account_invariant resource by generating
+    a resource with the same id, e.g. IAMAttachedAWSManagedPolicyResourceSpec references the
+    AWS-managed policies scanned by IAMAWSManagedPolicyResourceSpec.
+
+    Args:
+        graph_set_dict: account_invariant GraphSet dict
+        graph_set_builder: StreamingGraphSetBuilder the account artifacts were added to
+
+    Returns:
+        GraphSet dict containing only referenced resources
+    """
+    return {
+        **graph_set_dict,
+        "resources": {
+            resource_id: resource_data
+            for resource_id, resource_data in graph_set_dict["resources"].items()
+            if graph_set_builder.has_resource_id(resource_id)
+        },
+    }
+
+
+class GraphSetArtifactPrefetcher:
+    """Reads and parses GraphSet artifacts in an Executor as they are added and merges them
+    into a StreamingGraphSetBuilder in the order they were added. At most max_pending
+    artifacts are being read or held parsed awaiting merge at once, adding an artifact
+    beyond that merges the oldest first.
+
+    Args:
+        artifact_reader: ArtifactReader to read artifacts with
+        graph_set_builder: StreamingGraphSetBuilder to merge artifacts into
+        executor: Executor to read artifacts in
+        max_pending: maximum number of artifacts read ahead of merging
+    """
+
+    def __init__(
+        self,
+        artifact_reader: ArtifactReader,
+        graph_set_builder: StreamingGraphSetBuilder,
+        executor: Executor,
+        max_pending: int,
+    ):
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.artifact_reader = artifact_reader
+        self.graph_set_builder = graph_set_builder
+        self.executor = executor
+        self.max_pending = max_pending
+        self._pending: Deque[Future] = deque()
+
+    def add(self, artifact_path: str) -> None:
+        """Start reading an artifact.
+
+        Args:
+            artifact_path: path to a JSON or binary GraphSet artifact
+        """
+        while len(self._pending) >= self.max_pending:
+            self._merge_oldest()
+        self._pending.append(
+            self.executor.submit(read_graph_set_artifact, self.artifact_reader, artifact_path)
+        )
+
+    def flush(self) -> None:
+        """Wait for and merge all pending artifacts."""
+        while self._pending:
+            self._merge_oldest()
+
+    def _merge_oldest(self) -> None:
+        artifact = self._pending.popleft().result()
+        if isinstance(artifact, GraphSetBinaryReader):
+            self.graph_set_builder.add_graph_set_binary(artifact)
+        else:
+            self.graph_set_builder.add_graph_set_dict(artifact)
+
+
 def run_scan(
     muxer: AWSScanMuxer,
     config: Config,
     artifact_writer: ArtifactWriter,
     artifact_reader: ArtifactReader,
-) -> Tuple[ScanManifest, GraphSet]:
+) -> Tuple[ScanManifest, SpooledGraphSet]:
+    """Scan the accounts in config and write their artifacts, the master artifact and a
+    ScanManifest.
+
+    Args:
+        muxer: AWSScanMuxer which scans accounts
+        config: scan Config
+        artifact_writer: ArtifactWriter to write artifacts with
+        artifact_reader: ArtifactReader to read account artifacts with
+
+    Returns:
+        ScanManifest and a SpooledGraphSet of the master graph. The SpooledGraphSet reads its
+        Resources from a spool file rather than holding them in memory, the caller should
+        close it.
+    """
     if config.scan.scan_sub_accounts:
         account_ids = get_sub_account_ids(config.scan.accounts, config.access.accessor)
     else:
@@ -54,43 +181,87 @@ def run_scan(
     errors: Dict[str, List[str]] = {}
     unscanned_accounts: Set[str] = set()
     stats = MultilevelCounter()
-    graph_set = None
-
-    for account_scan_manifest in muxer.scan(account_scan_plan=account_scan_plan):
-        account_id = account_scan_manifest.account_id
-        if account_scan_manifest.errors:
-            errors[account_id] = account_scan_manifest.errors
-            unscanned_accounts.add(account_id)
-        if account_scan_manifest.artifacts:
-            for account_scan_artifact in account_scan_manifest.artifacts:
-                artifacts.append(account_scan_artifact)
-                artifact_graph_set_dict = artifact_reader.read_json(account_scan_artifact)
-                artifact_graph_set = GraphSet.from_dict(artifact_graph_set_dict)
-                if graph_set is None:
-                    graph_set = artifact_graph_set
+    get_shared_s3_client().ensure_max_pool_connections(config.concurrency.max_artifact_read_threads)
+
+    # account artifacts are read and parsed concurrently as they arrive and merged into
+    # graph_set_builder in order, only resource ids and up to max_artifact_read_threads
+    # parsed artifacts are held in memory. The master graph is returned as a SpooledGraphSet
+    # which reads its resources from graph_set_builder's spool.
+    graph_set_builder = StreamingGraphSetBuilder(name=GRAPH_NAME, version=GRAPH_VERSION)
+    try:
+        with ThreadPoolExecutor(max_workers=1) as account_invariant_executor, ThreadPoolExecutor(
+            max_workers=config.concurrency.max_artifact_read_threads
+        ) as artifact_read_executor:
+            artifact_prefetcher = GraphSetArtifactPrefetcher(
+                artifact_reader=artifact_reader,
+                graph_set_builder=graph_set_builder,
+                executor=artifact_read_executor,
+                max_pending=config.concurrency.max_artifact_read_threads,
+            )
+            # account_invariant resources are scanned once for the whole scan while accounts
+            # are scanned and are written to their own artifact.
+            account_invariant_future = account_invariant_executor.submit(
+                scan_account_invariant_resources,
+                account_ids=account_ids,
+                accessor=config.access.accessor,
+                preferred_account_scan_regions=config.scan.preferred_account_scan_regions,
+                scan_sub_accounts=config.scan.scan_sub_accounts,
+                graph_name=GRAPH_NAME,
+                graph_version=GRAPH_VERSION,
+            )
+            for account_scan_manifest in muxer.scan(account_scan_plan=account_scan_plan):
+                account_id = account_scan_manifest.account_id
+                if account_scan_manifest.errors:
+                    errors[account_id] = account_scan_manifest.errors
+                    unscanned_accounts.add(account_id)
+                if account_scan_manifest.artifacts:
+                    for account_scan_artifact in account_scan_manifest.artifacts:
+                        artifacts.append(account_scan_artifact)
+                        artifact_prefetcher.add(account_scan_artifact)
+                    else:
+                        scanned_accounts.append(account_id)
                 else:
-                    graph_set.merge(artifact_graph_set)
-            else:
-                scanned_accounts.append(account_id)
-        else:
-            unscanned_accounts.add(account_id)
-        account_stats = MultilevelCounter.from_dict(account_scan_manifest.api_call_stats)
-        stats.merge(account_stats)
-    if graph_set is None:
-        raise Exception("BUG: No graph_set generated.")
-    master_artifact_path = artifact_writer.write_json(name="master", data=graph_set.to_dict())
-    logger.info(event=AWSLogEvents.ScanAWSAccountsEnd)
-    start_time = graph_set.start_time
-    end_time = graph_set.end_time
-    scan_manifest = ScanManifest(
-        scanned_accounts=scanned_accounts,
-        master_artifact=master_artifact_path,
-        artifacts=artifacts,
-        errors=errors,
-        unscanned_accounts=list(unscanned_accounts),
-        api_call_stats=stats.to_dict(),
-        start_time=start_time,
-        end_time=end_time,
-    )
-    artifact_writer.write_json("manifest", data=scan_manifest.to_dict())
+                    unscanned_accounts.add(account_id)
+                account_stats = MultilevelCounter.from_dict(account_scan_manifest.api_call_stats)
+                stats.merge(account_stats)
+            artifact_prefetcher.flush()
+            # only account_invariant resources referenced by a scanned account are kept, the
+            # account artifacts reference them and the master graph holds their details.
+            account_invariant_graph_set_dict = filter_account_invariant_graph_set_dict(
+                graph_set_dict=account_invariant_future.result(),
+                graph_set_builder=graph_set_builder,
+            )
+            account_invariant_artifact = artifact_writer.write_json(
+                name="account_invariant",
+                data=account_invariant_graph_set_dict,
+                compression=config.artifact_compression,
+            )
+            artifacts.append(account_invariant_artifact)
+            graph_set_builder.add_graph_set_dict(account_invariant_graph_set_dict)
+            stats.merge(MultilevelCounter.from_dict(account_invariant_graph_set_dict["stats"]))
+            if graph_set_builder.start_time is None:
+                raise Exception("BUG: No graph_set generated.")
+            master_artifact_path = artifact_writer.write_json_stream(
+                name="master",
+                write=graph_set_builder.write_json,
+                compression=config.artifact_compression,
+            )
+            logger.info(event=AWSLogEvents.ScanAWSAccountsEnd)
+            graph_set = graph_set_builder.to_spooled_graph_set()
+        start_time = graph_set.start_time
+        end_time = graph_set.end_time
+        scan_manifest = ScanManifest(
+            scanned_accounts=scanned_accounts,
+            master_artifact=master_artifact_path,
+            artifacts=artifacts,
+            errors=errors,
+            unscanned_accounts=list(unscanned_accounts),
+            api_call_stats=stats.to_dict(),
+            start_time=start_time,
+            end_time=end_time,
+        )
+        artifact_writer.write_json("manifest", data=scan_manifest.to_dict())
+    except BaseException:
+        graph_set_builder.close()
+        raise
     return scan_manifest, graph_set
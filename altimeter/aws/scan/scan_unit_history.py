@@ -0,0 +1,159 @@
+"""ScanUnitHistory tracks how long ScanUnits took to run in previous scans. This is used to
+schedule the ScanUnits expected to take the longest first, reducing overall scan time."""
+from dataclasses import dataclass
+import os
+from typing import Any, Dict, Iterable, Optional, Type
+
+from altimeter.aws.log_events import AWSLogEvents
+from altimeter.core.artifact_io import is_s3_uri
+from altimeter.core.artifact_io.reader import ArtifactReader
+from altimeter.core.artifact_io.writer import ArtifactWriter
+from altimeter.core.log import Logger
+
+SCAN_UNIT_HISTORY_DIR = "scan_unit_history"
+# weight given to the most recent duration when updating an expected duration
+DURATION_SMOOTHING_FACTOR = 0.5
+
+
+def get_scan_unit_key(region_name: str, service: str, resource_spec_classes: Iterable[Type]) -> str:
+    """Build the key identifying a ScanUnit within an account's ScanUnitHistory. Resource spec
+    class names are included as a service can be split across multiple ScanUnits.
+
+    Args:
+        region_name: ScanUnit region
+        service: ScanUnit service
+        resource_spec_classes: ScanUnit resource spec classes
+
+    Returns:
+        history key
+    """
+    class_names = ",".join(sorted(cls.__name__ for cls in resource_spec_classes))
+    return f"{region_name}/{service}/{class_names}"
+
+
+@dataclass(frozen=True)
+class ScanUnitHistoryEntry:
+    """Historical stats for a single ScanUnit"""
+
+    duration_sec: float
+    resource_count: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"duration_sec": self.duration_sec, "resource_count": self.resource_count}
+
+    @classmethod
+    def from_dict(
+        cls: Type["ScanUnitHistoryEntry"], data: Dict[str, Any]
+    ) -> "ScanUnitHistoryEntry":
+        return cls(
+            duration_sec=float(data["duration_sec"]), resource_count=int(data["resource_count"])
+        )
+
+
+class ScanUnitHistory:
+    """Historical ScanUnit durations and resource counts for a single account.
+
+    Args:
+        entries: dict of ScanUnit keys (see `get_scan_unit_key`) to ScanUnitHistoryEntries
+    """
+
+    def __init__(self, entries: Optional[Dict[str, ScanUnitHistoryEntry]] = None):
+        self.entries: Dict[str, ScanUnitHistoryEntry] = entries if entries is not None else {}
+
+    def get_expected_duration(self, key: str) -> Optional[float]:
+        """Get the expected duration of a ScanUnit.
+
+        Args:
+            key: ScanUnit key
+
+        Returns:
+            expected duration in seconds or None if there is no history for this ScanUnit
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        return entry.duration_sec
+
+    def record(self, key: str, duration_sec: float, resource_count: int) -> None:
+        """Record the duration and resource count of a ScanUnit run. The expected duration
+        is an exponentially weighted average of recorded durations.
+
+        Args:
+            key: ScanUnit key
+            duration_sec: ScanUnit duration in seconds
+            resource_count: number of resources the ScanUnit found
+        """
+        previous_duration_sec = self.get_expected_duration(key)
+        if previous_duration_sec is not None:
+            duration_sec = (
+                DURATION_SMOOTHING_FACTOR * duration_sec
+                + (1 - DURATION_SMOOTHING_FACTOR) * previous_duration_sec
+            )
+        self.entries[key] = ScanUnitHistoryEntry(
+            duration_sec=duration_sec, resource_count=resource_count
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: entry.to_dict() for key, entry in self.entries.items()}
+
+    @classmethod
+    def from_dict(cls: Type["ScanUnitHistory"], data: Dict[str, Any]) -> "ScanUnitHistory":
+        return cls(
+            entries={key: ScanUnitHistoryEntry.from_dict(entry) for key, entry in data.items()}
+        )
+
+
+class ScanUnitHistoryStore:
+    """Reads and writes per-account ScanUnitHistory artifacts under
+    artifact_path/scan_unit_history/. Each account is scanned by a single AccountScanner so
+    per-account artifacts are never written concurrently.
+
+    Args:
+        artifact_path: artifact path, either a filesystem dir or s3://bucket
+    """
+
+    def __init__(self, artifact_path: str):
+        self.artifact_path = artifact_path
+
+    def _get_path(self, account_id: str) -> str:
+        if is_s3_uri(self.artifact_path):
+            return f"{self.artifact_path.rstrip('/')}/{SCAN_UNIT_HISTORY_DIR}/{account_id}.json"
+        return os.path.join(self.artifact_path, SCAN_UNIT_HISTORY_DIR, f"{account_id}.json")
+
+    def read(self, account_id: str) -> ScanUnitHistory:
+        """Read the ScanUnitHistory for an account. History is only used to order
+        ScanUnits, so if it is missing or unreadable an empty ScanUnitHistory is returned.
+
+        Args:
+            account_id: account id
+
+        Returns:
+            ScanUnitHistory object
+        """
+        path = self._get_path(account_id)
+        if not is_s3_uri(path) and not os.path.exists(path):
+            return ScanUnitHistory()
+        artifact_reader = ArtifactReader.from_artifact_path(artifact_path=self.artifact_path)
+        try:
+            return ScanUnitHistory.from_dict(artifact_reader.read_json(path))
+        except Exception as ex:
+            logger = Logger()
+            logger.warning(
+                event=AWSLogEvents.ScanUnitHistoryReadError, account_id=account_id, error=str(ex)
+            )
+            return ScanUnitHistory()
+
+    def write(self, account_id: str, scan_unit_history: ScanUnitHistory) -> str:
+        """Write the ScanUnitHistory for an account.
+
+        Args:
+            account_id: account id
+            scan_unit_history: ScanUnitHistory to write
+
+        Returns:
+            path to written artifact
+        """
+        artifact_writer = ArtifactWriter.from_artifact_path(
+            artifact_path=self.artifact_path, scan_id=SCAN_UNIT_HISTORY_DIR
+        )
+        return artifact_writer.write_json(name=account_id, data=scan_unit_history.to_dict())
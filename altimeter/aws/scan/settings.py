@@ -34,7 +34,11 @@ from altimeter.aws.resource.iam.account_password_policy import IAMAccountPasswor
 from altimeter.aws.resource.iam.group import IAMGroupResourceSpec
 from altimeter.aws.resource.iam.iam_saml_provider import IAMSAMLProviderResourceSpec
 from altimeter.aws.resource.iam.instance_profile import InstanceProfileResourceSpec
-from altimeter.aws.resource.iam.policy import IAMPolicyResourceSpec, IAMAWSManagedPolicyResourceSpec
+from altimeter.aws.resource.iam.policy import (
+    IAMAttachedAWSManagedPolicyResourceSpec,
+    IAMAWSManagedPolicyResourceSpec,
+    IAMPolicyResourceSpec,
+)
 from altimeter.aws.resource.iam.role import IAMRoleResourceSpec
 from altimeter.aws.resource.iam.user import IAMUserResourceSpec
 from altimeter.aws.resource.kms.key import KMSKeyResourceSpec
@@ -62,6 +66,7 @@ RESOURCE_SPEC_CLASSES: Tuple[Type[AWSResourceSpec], ...] = (
     EventsRuleResourceSpec,
     FlowLogResourceSpec,
     IAMAccountPasswordPolicyResourceSpec,
+    IAMAttachedAWSManagedPolicyResourceSpec,
     IAMAWSManagedPolicyResourceSpec,
     IAMGroupResourceSpec,
     IAMPolicyResourceSpec,
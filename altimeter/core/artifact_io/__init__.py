@@ -4,6 +4,11 @@ from altimeter.core.artifact_io.exceptions import InvalidS3URIException
 
 S3_URI_PREFIX = "s3://"
 
+# formats of GraphSet artifacts, see altimeter.core.artifact_io.graph_set_binary
+ARTIFACT_FORMAT_JSON = "json"
+ARTIFACT_FORMAT_BINARY = "binary"
+ARTIFACT_FORMATS = (ARTIFACT_FORMAT_JSON, ARTIFACT_FORMAT_BINARY)
+
 
 def is_s3_uri(path: str) -> bool:
     if path.startswith(S3_URI_PREFIX):
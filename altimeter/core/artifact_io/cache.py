@@ -0,0 +1,165 @@
+"""An ArtifactCache is a size limited, least recently used on-disk cache of S3 artifacts.
+Artifacts under a scan id are never modified once written so repeated reads of them, for
+example by tools run against the same scan multiple times, can be served from local disk."""
+import hashlib
+import os
+from pathlib import Path
+import re
+import shutil
+import tempfile
+import threading
+from typing import IO, List, Optional, Tuple
+
+DEFAULT_ARTIFACT_CACHE_MAX_SIZE = 10 * 1024 * 1024 * 1024
+TEMP_FILE_PREFIX = "."
+
+
+def _get_etag_filename(etag: str) -> str:
+    """ETags are quoted hex digests, optionally with a multipart count suffix"""
+    return re.sub(r"[^0-9A-Za-z-]", "", etag)
+
+
+class ArtifactCache:
+    """An on-disk cache of S3 artifacts keyed by bucket, key and ETag. The least recently
+    used artifacts are evicted when the total size of cached artifacts exceeds max_size.
+
+    Each key is cached in a directory named by a hash of its bucket and key containing a
+    single file named by its ETag. Files are written to a temporary file and then renamed
+    so a partially downloaded artifact is never read, and recency of use is tracked by file
+    modification time so it is shared by any processes using the same cache_dir.
+
+    Args:
+        cache_dir: directory to cache artifacts in
+        max_size: maximum total size in bytes of cached artifacts
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int = DEFAULT_ARTIFACT_CACHE_MAX_SIZE):
+        if max_size < 0:
+            raise ValueError("max_size must not be negative")
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _get_key_dir(self, bucket: str, key: str) -> Path:
+        key_hash = hashlib.sha256(f"{bucket}/{key}".encode("utf-8")).hexdigest()
+        return self.cache_dir.joinpath(key_hash)
+
+    def open(self, bucket: str, key: str, etag: Optional[str] = None) -> Optional[IO[bytes]]:
+        """Open a cached artifact.
+
+        Args:
+            bucket: s3 bucket
+            key: s3 key
+            etag: if set, only return the artifact if it was cached with this ETag.
+                  Otherwise the cached artifact is assumed to be current.
+
+        Returns:
+            binary file object of the cached artifact if it is cached, else None
+        """
+        key_dir = self._get_key_dir(bucket, key)
+        with self._lock:
+            if etag is None:
+                try:
+                    paths = [
+                        path
+                        for path in key_dir.iterdir()
+                        if not path.name.startswith(TEMP_FILE_PREFIX)
+                    ]
+                except FileNotFoundError:
+                    return None
+                if not paths:
+                    return None
+                path = max(paths, key=lambda path: path.stat().st_mtime)
+            else:
+                path = key_dir.joinpath(_get_etag_filename(etag))
+            try:
+                # opened while holding the lock so that it can not be evicted before opening,
+                # after which eviction does not affect reads.
+                cached_fp = path.open("rb")
+            except FileNotFoundError:
+                return None
+            os.utime(path)
+            return cached_fp
+
+    def put(self, bucket: str, key: str, etag: str, body: IO[bytes]) -> IO[bytes]:
+        """Cache an artifact, replacing any other version of it, and open it.
+
+        Args:
+            bucket: s3 bucket
+            key: s3 key
+            etag: ETag of the artifact
+            body: binary file object of the artifact content, e.g. a get_object Body
+
+        Returns:
+            binary file object of the cached artifact
+        """
+        key_dir = self._get_key_dir(bucket, key)
+        with self._lock:
+            # created while holding the lock so that eviction can not remove an empty key_dir
+            # before the temporary file is created in it
+            os.makedirs(key_dir, exist_ok=True)
+            temp_fd, temp_path = tempfile.mkstemp(dir=key_dir, prefix=TEMP_FILE_PREFIX)
+        try:
+            with os.fdopen(temp_fd, "wb") as temp_fp:
+                shutil.copyfileobj(body, temp_fp)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+        path = key_dir.joinpath(_get_etag_filename(etag))
+        with self._lock:
+            os.replace(temp_path, path)
+            cached_fp = path.open("rb")
+            for other_path in key_dir.iterdir():
+                if other_path != path and not other_path.name.startswith(TEMP_FILE_PREFIX):
+                    self._remove(other_path)
+            self._evict(keep=path)
+        return cached_fp
+
+    def get_size(self) -> int:
+        """Get the total size in bytes of cached artifacts.
+
+        Returns:
+            total size in bytes
+        """
+        with self._lock:
+            return sum(size for _, _, size in self._list_entries())
+
+    def _list_entries(self) -> List[Tuple[float, Path, int]]:
+        entries: List[Tuple[float, Path, int]] = []
+        for key_dir in self.cache_dir.iterdir():
+            if not key_dir.is_dir():
+                continue
+            for path in key_dir.iterdir():
+                if path.name.startswith(TEMP_FILE_PREFIX):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def _evict(self, keep: Path) -> None:
+        """Remove least recently used artifacts until the cache is within max_size. keep
+        is never removed, even if it alone exceeds max_size."""
+        entries = self._list_entries()
+        total_size = sum(size for _, _, size in entries)
+        for _, path, size in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self.max_size:
+                break
+            if path == keep:
+                continue
+            self._remove(path)
+            total_size -= size
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            path.parent.rmdir()
+        except OSError:
+            pass
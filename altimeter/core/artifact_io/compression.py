@@ -0,0 +1,176 @@
+"""Compression of JSON artifacts. Compressed artifacts are named with a compression suffix,
+e.g. 'master.json.gz', which is used to detect compression when they are read.
+
+gzip is always available, zstd and lz4 require the optional 'zstandard' and 'lz4'
+packages."""
+from contextlib import contextmanager
+import gzip
+import io
+from typing import Any, Iterator, Optional, TextIO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+GZIP = "gz"
+ZSTD = "zst"
+LZ4 = "lz4"
+COMPRESSIONS = (GZIP, ZSTD, LZ4)
+
+
+def validate_compression(compression: Optional[str]) -> None:
+    """Validate that a compression is known and that its module is installed.
+
+    Args:
+        compression: compression - None, GZIP, ZSTD or LZ4
+
+    Raises:
+        ValueError if compression is unknown or unavailable
+    """
+    if compression is None or compression == GZIP:
+        return
+    if compression == ZSTD:
+        if zstandard is None:
+            raise ValueError(f"Compression {compression} requires the 'zstandard' package")
+        return
+    if compression == LZ4:
+        if lz4 is None:
+            raise ValueError(f"Compression {compression} requires the 'lz4' package")
+        return
+    raise ValueError(f"Unknown compression arg {compression}")
+
+
+def get_artifact_name(name: str, extension: str, compression: Optional[str]) -> str:
+    """Get the filename of an artifact.
+
+    Args:
+        name: artifact name
+        extension: artifact file extension, e.g. json
+        compression: compression - None, GZIP, ZSTD or LZ4
+
+    Returns:
+        filename, e.g. name.json or name.json.gz
+    """
+    validate_compression(compression)
+    if compression is None:
+        return f"{name}.{extension}"
+    return f"{name}.{extension}.{compression}"
+
+
+def get_json_artifact_name(name: str, compression: Optional[str]) -> str:
+    """Get the filename of a JSON artifact.
+
+    Args:
+        name: artifact name
+        compression: compression - None, GZIP, ZSTD or LZ4
+
+    Returns:
+        filename, e.g. name.json or name.json.gz
+    """
+    return get_artifact_name(name=name, extension="json", compression=compression)
+
+
+def get_compression_from_path(path: str) -> Optional[str]:
+    """Detect the compression of an artifact from its path.
+
+    Args:
+        path: artifact path or s3 uri
+
+    Returns:
+        GZIP, ZSTD, LZ4 or None if the artifact is not compressed
+    """
+    for compression in COMPRESSIONS:
+        if path.endswith(f".{compression}"):
+            return compression
+    return None
+
+
+class _UnclosingWriter(io.RawIOBase):
+    """Raw stream which writes to another binary stream without closing it when closed."""
+
+    def __init__(self, fp: Any):
+        super().__init__()
+        self._fp = fp
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._fp.write(bytes(data))
+        return len(data)
+
+
+@contextmanager
+def open_compressed_writer(fp: Any, compression: Optional[str]) -> Iterator[Any]:
+    """Open a binary stream which compresses data written to it into fp. fp is not closed.
+
+    Args:
+        fp: binary file object to write compressed data to
+        compression: compression - None, GZIP, ZSTD or LZ4
+
+    Yields:
+        binary file object
+    """
+    validate_compression(compression)
+    if compression is None:
+        yield fp
+    elif compression == GZIP:
+        with gzip.GzipFile(fileobj=fp, mode="wb") as gz_fp:
+            yield gz_fp
+    elif compression == ZSTD:
+        with zstandard.ZstdCompressor().stream_writer(fp, closefd=False) as zstd_fp:
+            yield zstd_fp
+    else:
+        with lz4.frame.open(fp, mode="wb") as lz4_fp:
+            yield lz4_fp
+
+
+@contextmanager
+def open_json_writer(fp: Any, compression: Optional[str]) -> Iterator[TextIO]:
+    """Open a buffered text stream which writes utf-8 encoded, compressed JSON to fp. fp is
+    not closed.
+
+    Args:
+        fp: binary file object to write to
+        compression: compression - None, GZIP, ZSTD or LZ4
+
+    Yields:
+        text file object
+    """
+    with open_compressed_writer(fp, compression) as compressed_fp:
+        json_fp = io.TextIOWrapper(
+            io.BufferedWriter(_UnclosingWriter(compressed_fp)), encoding="utf-8"
+        )
+        yield json_fp
+        json_fp.close()
+
+
+@contextmanager
+def open_decompressed_reader(fp: Any, compression: Optional[str]) -> Iterator[Any]:
+    """Open a binary stream which decompresses data read from fp as it is read.
+
+    Args:
+        fp: binary file object to read compressed data from
+        compression: compression - None, GZIP, ZSTD or LZ4
+
+    Yields:
+        binary file object
+    """
+    validate_compression(compression)
+    if compression is None:
+        yield fp
+    elif compression == GZIP:
+        with gzip.GzipFile(fileobj=fp, mode="rb") as gz_fp:
+            yield gz_fp
+    elif compression == ZSTD:
+        with zstandard.ZstdDecompressor().stream_reader(fp, closefd=False) as zstd_fp:
+            yield zstd_fp
+    else:
+        with lz4.frame.open(fp, mode="rb") as lz4_fp:
+            yield lz4_fp
@@ -0,0 +1,134 @@
+"""Content-hash based deduplication of GraphSet artifacts across scans. The content of a
+deduplicated GraphSet artifact is written once to a content artifact named by a hash of the
+GraphSet's resources and errors - which excludes its timestamps and stats - under
+CONTENT_ARTIFACT_DIR. Each scan then only writes a small ref artifact containing the path of
+the content artifact along with the GraphSet's timestamps and stats. ArtifactReaders resolve
+ref artifacts transparently.
+
+Content artifacts are shared by every scan which references them so they must be retained
+for as long as any ref artifact refers to them."""
+from dataclasses import dataclass
+import hashlib
+import json
+from typing import Any, Dict, List, Type, Union
+
+from altimeter.core.artifact_io.graph_set_binary import GraphSetBinaryReader
+from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.json_encoder import json_encoder
+from altimeter.core.multilevel_counter import MultilevelCounter
+
+CONTENT_ARTIFACT_DIR = "artifact_content"
+ARTIFACT_REF_SUFFIX = ".ref"
+
+
+def _canonical_link_dicts(link_dicts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort link dicts, including those nested in MultiLinks, into a canonical order as the
+    order of a resource's links is not meaningful."""
+    canonical_link_dicts = []
+    for link_dict in link_dicts:
+        obj = link_dict["obj"]
+        if isinstance(obj, list) and all(isinstance(item, dict) for item in obj):
+            link_dict = {**link_dict, "obj": _canonical_link_dicts(obj)}
+        canonical_link_dicts.append(link_dict)
+    return sorted(
+        canonical_link_dicts,
+        key=lambda link_dict: json.dumps(link_dict, sort_keys=True, default=json_encoder),
+    )
+
+
+def get_graph_set_content_hash(graph_set: GraphSet) -> str:
+    """Generate a hash of the content of a GraphSet - its name, version, errors and
+    resources. Timestamps and stats are excluded and resources and links are hashed in a
+    canonical order, so GraphSets from different scans of an unchanged account hash equally.
+
+    Args:
+        graph_set: GraphSet to hash
+
+    Returns:
+        sha256 hex digest
+    """
+    content_hash = hashlib.sha256()
+    header = {"name": graph_set.name, "version": graph_set.version, "errors": graph_set.errors}
+    content_hash.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+    for resource in sorted(graph_set.resources, key=lambda resource: resource.resource_id):
+        resource_dict = resource.to_dict()
+        if "links" in resource_dict:
+            resource_dict["links"] = _canonical_link_dicts(resource_dict["links"])
+        resource_line = json.dumps(
+            [resource.resource_id, resource_dict], sort_keys=True, default=json_encoder
+        )
+        content_hash.update(b"\n")
+        content_hash.update(resource_line.encode("utf-8"))
+    return content_hash.hexdigest()
+
+
+def is_artifact_ref_path(path: str) -> bool:
+    """Determine whether a path is a GraphSet artifact ref.
+
+    Args:
+        path: artifact path
+
+    Returns:
+        True if the path is an artifact ref
+    """
+    return path.endswith(f"{ARTIFACT_REF_SUFFIX}.json")
+
+
+@dataclass(frozen=True)
+class ArtifactRef:
+    """A reference to a deduplicated GraphSet content artifact along with the metadata of
+    the referencing GraphSet which is excluded from the content hash.
+
+    Args:
+        path: path to the content artifact
+        start_time: GraphSet start time
+        end_time: GraphSet end time
+        stats: GraphSet stats dict
+    """
+
+    path: str
+    start_time: int
+    end_time: int
+    stats: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "stats": self.stats,
+        }
+
+    @classmethod
+    def from_dict(cls: Type["ArtifactRef"], data: Dict[str, Any]) -> "ArtifactRef":
+        return cls(
+            path=data["path"],
+            start_time=data["start_time"],
+            end_time=data["end_time"],
+            stats=data["stats"],
+        )
+
+    def apply_to_dict(self, graph_set_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Set this ref's metadata on a GraphSet dict read from the content artifact.
+
+        Args:
+            graph_set_dict: GraphSet dict
+
+        Returns:
+            the updated GraphSet dict
+        """
+        graph_set_dict["start_time"] = self.start_time
+        graph_set_dict["end_time"] = self.end_time
+        graph_set_dict["stats"] = self.stats
+        return graph_set_dict
+
+    def apply(self, graph_set: Union[GraphSet, GraphSetBinaryReader]) -> None:
+        """Set this ref's metadata on a GraphSet or GraphSetBinaryReader read from the
+        content artifact.
+
+        Args:
+            graph_set: GraphSet or GraphSetBinaryReader
+        """
+        graph_set.start_time = self.start_time
+        graph_set.end_time = self.end_time
+        graph_set.stats = MultilevelCounter.from_dict(self.stats)
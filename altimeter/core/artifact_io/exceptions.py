@@ -4,3 +4,7 @@ from altimeter.core.exceptions import AltimeterException
 
 class InvalidS3URIException(AltimeterException):
     """An S3 uri could not be parsed."""
+
+
+class InvalidGraphSetBinaryException(AltimeterException):
+    """A binary GraphSet artifact could not be decoded."""
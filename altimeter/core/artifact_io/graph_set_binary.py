@@ -0,0 +1,462 @@
+"""Compact binary GraphSet artifacts. A binary artifact holds the same data as a GraphSet JSON
+artifact (see `GraphSet.to_dict`) but stores each distinct string - predicates, type names,
+ARNs and string values - once in a string table and encodes link trees as varints
+referencing it.
+
+Layout:
+
+    MAGIC
+    resources: one record per resource - type name, link count, links
+    metadata: name, version, start_time, end_time, errors, stats
+    string table: string count, then length-prefixed utf-8 strings
+    index: resource count, then (resource id, resource record offset) pairs
+    footer: metadata offset, string table offset, index offset as little-endian uint64s,
+            followed by FOOTER_MAGIC
+
+Records only reference the string table by id so resources can be written as they are
+produced and strings are only written once, at the end. The index allows individual
+resources to be decoded without decoding the whole artifact."""
+from datetime import datetime
+import json
+import struct
+from typing import IO, Any, Dict, Iterator, Iterable, List, Tuple, Type
+
+from altimeter.core.artifact_io.compression import get_compression_from_path
+from altimeter.core.artifact_io.exceptions import InvalidGraphSetBinaryException
+from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.graph.link.base import Link
+from altimeter.core.graph.link.links import (
+    MultiLink,
+    ResourceLinkLink,
+    SimpleLink,
+    TagLink,
+    TransientResourceLinkLink,
+)
+from altimeter.core.multilevel_counter import MultilevelCounter
+from altimeter.core.resource.resource import Resource
+
+GRAPH_SET_BINARY_EXTENSION = "agb"
+MAGIC = b"ALTGSB\x00\x01"
+FOOTER_MAGIC = b"ALTGSEND"
+FOOTER = struct.Struct("<QQQ")
+
+LINK_CLASSES = (SimpleLink, MultiLink, ResourceLinkLink, TransientResourceLinkLink, TagLink)
+LINK_CODES = {link_class.field_type: code for code, link_class in enumerate(LINK_CLASSES)}
+MULTI_LINK_CODE = LINK_CODES[MultiLink.field_type]
+
+VALUE_NONE = 0
+VALUE_FALSE = 1
+VALUE_TRUE = 2
+VALUE_INT = 3
+VALUE_FLOAT = 4
+VALUE_STR = 5
+VALUE_JSON = 6
+FLOAT = struct.Struct("<d")
+
+
+def is_graph_set_binary_path(path: str) -> bool:
+    """Determine whether an artifact path or s3 uri is a binary GraphSet artifact.
+
+    Args:
+        path: artifact path or s3 uri
+
+    Returns:
+        True if the path has the binary GraphSet artifact extension
+    """
+    compression = get_compression_from_path(path)
+    if compression is not None:
+        path = path[: -len(compression) - 1]
+    return path.endswith(f".{GRAPH_SET_BINARY_EXTENSION}")
+
+
+def _encode_varint(value: int, buf: bytearray) -> None:
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def _encode_signed_varint(value: int, buf: bytearray) -> None:
+    _encode_varint(value * 2 if value >= 0 else -value * 2 - 1, buf)
+
+
+class GraphSetBinaryWriter:
+    """Writes a binary GraphSet artifact to a binary file object one resource at a time.
+    Only the string table is held in memory.
+
+    Args:
+        fp: binary file object to write to
+    """
+
+    def __init__(self, fp: IO[bytes]):
+        self._fp = fp
+        self._strings: Dict[str, int] = {}
+        self._index: List[Tuple[int, int]] = []
+        self._offset = 0
+        self._write(MAGIC)
+
+    def _write(self, data: bytes) -> None:
+        self._fp.write(data)
+        self._offset += len(data)
+
+    def _string_id(self, string: str) -> int:
+        string_id = self._strings.get(string)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings[string] = string_id
+        return string_id
+
+    def _encode_value(self, value: Any, buf: bytearray) -> None:
+        if value is None:
+            buf.append(VALUE_NONE)
+        elif value is True:
+            buf.append(VALUE_TRUE)
+        elif value is False:
+            buf.append(VALUE_FALSE)
+        elif isinstance(value, int):
+            buf.append(VALUE_INT)
+            _encode_signed_varint(value, buf)
+        elif isinstance(value, float):
+            buf.append(VALUE_FLOAT)
+            buf += FLOAT.pack(value)
+        elif isinstance(value, str):
+            buf.append(VALUE_STR)
+            _encode_varint(self._string_id(value), buf)
+        elif isinstance(value, datetime):
+            # stored as in JSON artifacts
+            buf.append(VALUE_STR)
+            _encode_varint(self._string_id(value.isoformat()), buf)
+        else:
+            buf.append(VALUE_JSON)
+            _encode_varint(self._string_id(json.dumps(value)), buf)
+
+    def _encode_links(self, links: List[Link], buf: bytearray) -> None:
+        _encode_varint(len(links), buf)
+        for link in links:
+            link_code = LINK_CODES.get(link.field_type)
+            if link_code is None:
+                raise ValueError(f"Unknown link type {link.field_type}")
+            buf.append(link_code)
+            _encode_varint(self._string_id(link.pred), buf)
+            if link_code == MULTI_LINK_CODE:
+                self._encode_links(link.obj, buf)
+            else:
+                self._encode_value(link.obj, buf)
+
+    def write_resource(self, resource: Resource) -> None:
+        """Write a Resource.
+
+        Args:
+            resource: Resource to write
+        """
+        buf = bytearray()
+        _encode_varint(self._string_id(resource.type_name), buf)
+        self._encode_links(resource.links, buf)
+        self._index.append((self._string_id(resource.resource_id), self._offset))
+        self._write(bytes(buf))
+
+    def finish(
+        self,
+        name: str,
+        version: str,
+        start_time: int,
+        end_time: int,
+        errors: List[str],
+        stats: MultilevelCounter,
+    ) -> None:
+        """Write the metadata, string table, index and footer. No more resources may be
+        written after this is called.
+
+        Args:
+            name: graph name
+            version: graph version
+            start_time: epoch scan start time
+            end_time: epoch scan end time
+            errors: errors encountered during the scan
+            stats: MultilevelCounter of api call stats
+        """
+        metadata_offset = self._offset
+        buf = bytearray()
+        _encode_varint(self._string_id(name), buf)
+        _encode_varint(self._string_id(version), buf)
+        _encode_signed_varint(start_time, buf)
+        _encode_signed_varint(end_time, buf)
+        _encode_varint(len(errors), buf)
+        for error in errors:
+            _encode_varint(self._string_id(error), buf)
+        _encode_varint(self._string_id(json.dumps(stats.to_dict())), buf)
+        self._write(bytes(buf))
+
+        strings_offset = self._offset
+        buf = bytearray()
+        _encode_varint(len(self._strings), buf)
+        for string in self._strings:
+            string_bytes = string.encode("utf-8")
+            _encode_varint(len(string_bytes), buf)
+            buf += string_bytes
+        self._write(bytes(buf))
+
+        index_offset = self._offset
+        buf = bytearray()
+        _encode_varint(len(self._index), buf)
+        for resource_id_string_id, resource_offset in self._index:
+            _encode_varint(resource_id_string_id, buf)
+            _encode_varint(resource_offset, buf)
+        self._write(bytes(buf))
+        self._write(FOOTER.pack(metadata_offset, strings_offset, index_offset) + FOOTER_MAGIC)
+
+
+def write_graph_set_binary(
+    fp: IO[bytes],
+    name: str,
+    version: str,
+    start_time: int,
+    end_time: int,
+    resources: Iterable[Resource],
+    errors: List[str],
+    stats: MultilevelCounter,
+) -> None:
+    """Write a binary GraphSet artifact to a file object one resource at a time.
+
+    Args:
+        fp: binary file object to write to
+        name: graph name
+        version: graph version
+        start_time: epoch scan start time
+        end_time: epoch scan end time
+        resources: Resources in the graph
+        errors: errors encountered during the scan
+        stats: MultilevelCounter of api call stats
+    """
+    writer = GraphSetBinaryWriter(fp)
+    for resource in resources:
+        writer.write_resource(resource)
+    writer.finish(
+        name=name,
+        version=version,
+        start_time=start_time,
+        end_time=end_time,
+        errors=errors,
+        stats=stats,
+    )
+
+
+class GraphSetBinaryReader:
+    """Reads a binary GraphSet artifact. The string table, index and metadata are decoded
+    when the reader is created, resources are decoded as they are read.
+
+    Args:
+        data: artifact content
+
+    Raises:
+        InvalidGraphSetBinaryException if data is not a binary GraphSet artifact
+    """
+
+    def __init__(self, data: bytes):
+        if len(data) < len(MAGIC) + FOOTER.size + len(FOOTER_MAGIC):
+            raise InvalidGraphSetBinaryException("Data is too short")
+        if not data.startswith(MAGIC):
+            raise InvalidGraphSetBinaryException("Data does not start with the expected magic")
+        if not data.endswith(FOOTER_MAGIC):
+            raise InvalidGraphSetBinaryException("Data does not end with the expected magic")
+        self._data = data
+        footer_offset = len(data) - FOOTER.size - len(FOOTER_MAGIC)
+        metadata_offset, strings_offset, index_offset = FOOTER.unpack_from(data, footer_offset)
+        try:
+            self._strings: List[str] = []
+            num_strings, pos = self._decode_varint(strings_offset)
+            for _ in range(num_strings):
+                string_len, pos = self._decode_varint(pos)
+                self._strings.append(data[pos : pos + string_len].decode("utf-8"))
+                pos += string_len
+            self._index: List[Tuple[str, int]] = []
+            num_resources, pos = self._decode_varint(index_offset)
+            for _ in range(num_resources):
+                resource_id_string_id, pos = self._decode_varint(pos)
+                resource_offset, pos = self._decode_varint(pos)
+                self._index.append((self._strings[resource_id_string_id], resource_offset))
+            pos = metadata_offset
+            name_string_id, pos = self._decode_varint(pos)
+            self.name = self._strings[name_string_id]
+            version_string_id, pos = self._decode_varint(pos)
+            self.version = self._strings[version_string_id]
+            self.start_time, pos = self._decode_signed_varint(pos)
+            self.end_time, pos = self._decode_signed_varint(pos)
+            self.errors: List[str] = []
+            num_errors, pos = self._decode_varint(pos)
+            for _ in range(num_errors):
+                error_string_id, pos = self._decode_varint(pos)
+                self.errors.append(self._strings[error_string_id])
+            stats_string_id, pos = self._decode_varint(pos)
+            self.stats = MultilevelCounter.from_dict(json.loads(self._strings[stats_string_id]))
+        except (IndexError, ValueError) as ex:
+            raise InvalidGraphSetBinaryException(f"Unable to decode artifact: {ex}") from ex
+        self._resource_ids_offsets = dict(self._index)
+
+    @classmethod
+    def from_file(cls: Type["GraphSetBinaryReader"], fp: IO[bytes]) -> "GraphSetBinaryReader":
+        """Create a GraphSetBinaryReader from a binary file object.
+
+        Args:
+            fp: binary file object to read from
+
+        Returns:
+            GraphSetBinaryReader object
+        """
+        return cls(fp.read())
+
+    def _decode_varint(self, pos: int) -> Tuple[int, int]:
+        data = self._data
+        byte = data[pos]
+        if byte < 0x80:
+            return byte, pos + 1
+        value = byte & 0x7F
+        shift = 7
+        while True:
+            pos += 1
+            byte = data[pos]
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value, pos + 1
+            shift += 7
+
+    def _decode_signed_varint(self, pos: int) -> Tuple[int, int]:
+        value, pos = self._decode_varint(pos)
+        return (value >> 1) ^ -(value & 1), pos
+
+    def _decode_value(self, pos: int) -> Tuple[Any, int]:
+        value_type = self._data[pos]
+        pos += 1
+        if value_type == VALUE_STR:
+            string_id, pos = self._decode_varint(pos)
+            return self._strings[string_id], pos
+        if value_type == VALUE_NONE:
+            return None, pos
+        if value_type == VALUE_TRUE:
+            return True, pos
+        if value_type == VALUE_FALSE:
+            return False, pos
+        if value_type == VALUE_INT:
+            return self._decode_signed_varint(pos)
+        if value_type == VALUE_FLOAT:
+            return FLOAT.unpack_from(self._data, pos)[0], pos + FLOAT.size
+        if value_type == VALUE_JSON:
+            string_id, pos = self._decode_varint(pos)
+            return json.loads(self._strings[string_id]), pos
+        raise InvalidGraphSetBinaryException(f"Unknown value type {value_type} at {pos - 1}")
+
+    def _decode_links(self, pos: int, as_dicts: bool) -> Tuple[List[Any], int]:
+        """Decode a list of links as Link objects or, if as_dicts is True, dicts as generated
+        by `Link.to_dict`. Single byte varints, which most string ids and counts are, are
+        decoded inline."""
+        data = self._data
+        strings = self._strings
+        decode_varint = self._decode_varint
+        num_links = data[pos]
+        if num_links < 0x80:
+            pos += 1
+        else:
+            num_links, pos = decode_varint(pos)
+        links: List[Any] = []
+        for _ in range(num_links):
+            link_code = data[pos]
+            pred_string_id = data[pos + 1]
+            if pred_string_id < 0x80:
+                pos += 2
+            else:
+                pred_string_id, pos = decode_varint(pos + 1)
+            obj: Any
+            if link_code == MULTI_LINK_CODE:
+                obj, pos = self._decode_links(pos, as_dicts)
+            elif data[pos] == VALUE_STR:
+                string_id = data[pos + 1]
+                if string_id < 0x80:
+                    pos += 2
+                else:
+                    string_id, pos = decode_varint(pos + 1)
+                obj = strings[string_id]
+            else:
+                obj, pos = self._decode_value(pos)
+            try:
+                link_class = LINK_CLASSES[link_code]
+            except IndexError as ex:
+                raise InvalidGraphSetBinaryException(f"Unknown link type {link_code}") from ex
+            if as_dicts:
+                links.append(
+                    {"pred": strings[pred_string_id], "obj": obj, "type": link_class.field_type}
+                )
+            else:
+                links.append(link_class(pred=strings[pred_string_id], obj=obj))
+        return links, pos
+
+    def _decode_resource(self, resource_id: str, offset: int, as_dict: bool) -> Any:
+        try:
+            type_name_string_id, pos = self._decode_varint(offset)
+            links, _ = self._decode_links(pos, as_dict)
+            type_name = self._strings[type_name_string_id]
+        except IndexError as ex:
+            raise InvalidGraphSetBinaryException(
+                f"Unable to decode resource {resource_id}: {ex}"
+            ) from ex
+        if as_dict:
+            resource_dict: Dict[str, Any] = {"type": type_name}
+            if links:
+                resource_dict["links"] = links
+            return resource_dict
+        return Resource(resource_id=resource_id, type_name=type_name, links=links)
+
+    @property
+    def resource_ids(self) -> List[str]:
+        """Resource ids in the artifact, in artifact order."""
+        return [resource_id for resource_id, _ in self._index]
+
+    def read_resource(self, resource_id: str) -> Resource:
+        """Decode a single Resource using the index.
+
+        Args:
+            resource_id: resource id
+
+        Returns:
+            Resource object
+
+        Raises:
+            KeyError if resource_id is not in the artifact
+        """
+        return self._decode_resource(
+            resource_id, self._resource_ids_offsets[resource_id], as_dict=False
+        )
+
+    def iter_resources(self) -> Iterator[Resource]:
+        """Iterate over the Resources in the artifact.
+
+        Yields:
+            Resource objects
+        """
+        for resource_id, offset in self._index:
+            yield self._decode_resource(resource_id, offset, as_dict=False)
+
+    def iter_resource_dicts(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over the Resources in the artifact as dicts, as generated by
+        `Resource.to_dict`.
+
+        Yields:
+            (resource_id, resource dict) tuples
+        """
+        for resource_id, offset in self._index:
+            yield resource_id, self._decode_resource(resource_id, offset, as_dict=True)
+
+    def to_graph_set(self) -> GraphSet:
+        """Read the artifact into a GraphSet.
+
+        Returns:
+            GraphSet object
+        """
+        return GraphSet(
+            name=self.name,
+            version=self.version,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            resources=list(self.iter_resources()),
+            errors=self.errors,
+            stats=self.stats,
+        )
@@ -0,0 +1,219 @@
+"""Functions for writing GraphSets as RDF graph artifacts which are loaded into Neptune by
+`altimeter.core.neptune.client.AltimeterNeptuneClient.load_graph`.
+
+A graph artifact is either a single file or, for N-Triples and N-Quads, a set of size bounded
+shards under a common prefix which the Neptune loader can load in parallel. Neptune scopes
+blank nodes to the file they are loaded from so blank nodes in sharded graphs are replaced by
+skolem IRIs which are the same in every shard."""
+from contextlib import ExitStack
+import io
+from types import TracebackType
+from typing import IO, Any, Callable, ContextManager, Optional, Type, cast
+
+from altimeter.core.artifact_io.compression import GZIP, get_artifact_name
+from altimeter.core.graph.graph_set import BaseGraphSet
+from altimeter.core.graph.rdf_stream import (
+    RDF_FORMAT_EXTENSIONS,
+    RDF_FORMAT_NQUADS,
+    RDF_FORMATS,
+    RDF_STREAM_FORMATS,
+)
+from altimeter.core.neptune.graph_uri import SKOLEM_BASE_URI, get_graph_uri
+
+RDF_SHARD_NAME_PREFIX = "part-"
+
+
+def get_rdf_artifact_name(name: str, rdf_format: str, compression: Optional[str]) -> str:
+    """Get the filename of a graph RDF artifact.
+
+    Args:
+        name: artifact name
+        rdf_format: RDF_FORMAT_RDFXML, RDF_FORMAT_NTRIPLES or RDF_FORMAT_NQUADS
+        compression: None or GZIP, the only compression supported by the Neptune loader
+
+    Returns:
+        filename, e.g. name.rdf.gz or name.nt.gz
+
+    Raises:
+        ValueError if rdf_format or compression are not supported
+    """
+    if rdf_format not in RDF_FORMATS:
+        raise ValueError(f"Unknown rdf_format {rdf_format}, expected one of {RDF_FORMATS}")
+    if compression not in (None, GZIP):
+        raise ValueError(f"Unknown compression arg {compression}")
+    return get_artifact_name(
+        name=name, extension=RDF_FORMAT_EXTENSIONS[rdf_format], compression=compression
+    )
+
+
+def get_rdf_shard_name(index: int, rdf_format: str, compression: Optional[str]) -> str:
+    """Get the filename of a shard of a sharded graph RDF artifact.
+
+    Args:
+        index: shard index
+        rdf_format: RDF_FORMAT_NTRIPLES or RDF_FORMAT_NQUADS
+        compression: None or GZIP
+
+    Returns:
+        filename, e.g. part-00000.nt.gz
+    """
+    return get_rdf_artifact_name(f"{RDF_SHARD_NAME_PREFIX}{index:05d}", rdf_format, compression)
+
+
+def write_graph_set_rdf(
+    graph_set: BaseGraphSet, fp: IO[bytes], rdf_format: str, skolemize: bool = False
+) -> None:
+    """Write a GraphSet as RDF. N-Quads are written to the graph the GraphSet is loaded as by
+    `altimeter.core.neptune.client.AltimeterNeptuneClient.load_graph`.
+
+    Args:
+        graph_set: GraphSet to write
+        fp: binary file object to write to
+        rdf_format: RDF_FORMAT_RDFXML, RDF_FORMAT_NTRIPLES or RDF_FORMAT_NQUADS
+        skolemize: if True, write BNodes as skolem IRIs. Not supported for RDF_FORMAT_RDFXML.
+    """
+    graph_iri: Optional[str] = None
+    if rdf_format == RDF_FORMAT_NQUADS:
+        graph_iri = get_graph_uri(
+            name=graph_set.name, version=graph_set.version, end_time=graph_set.end_time
+        )
+    graph_set.write_rdf(
+        fp,
+        rdf_format=rdf_format,
+        graph_iri=graph_iri,
+        skolem_base=SKOLEM_BASE_URI if skolemize else None,
+    )
+
+
+class RDFShardStream(io.RawIOBase):
+    """A writable binary stream of N-Triples or N-Quads lines which splits the lines written to
+    it into shards of at most max_shard_size bytes. Lines are never split across shards, a
+    single line longer than max_shard_size is written to a shard of its own.
+
+    Shards are opened by open_shard, which is called with the index of each shard and returns
+    a context manager yielding a binary file object. A shard's context is exited when the
+    shard is full or the stream is closed. If the stream is used as a context manager and an
+    exception is raised the exception is passed to the open shard's context, shards which
+    were already complete are not removed.
+
+    Args:
+        open_shard: function returning a context manager yielding a binary file object for
+                    a shard index
+        max_shard_size: maximum uncompressed size in bytes of a shard
+    """
+
+    def __init__(self, open_shard: Callable[[int], ContextManager[IO[bytes]]], max_shard_size: int):
+        super().__init__()
+        if max_shard_size < 1:
+            raise ValueError("max_shard_size must be at least 1")
+        self.open_shard = open_shard
+        self.max_shard_size = max_shard_size
+        self.shard_count = 0
+        self._shard_stack: Optional[ExitStack] = None
+        self._shard_fp: Optional[IO[bytes]] = None
+        self._shard_size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        if self.closed:
+            raise ValueError("write to closed RDFShardStream")
+        data = bytes(data)
+        offset = 0
+        while offset < len(data):
+            shard_fp = self._shard_fp
+            if shard_fp is None:
+                shard_fp = self._open_next_shard()
+            capacity = self.max_shard_size - self._shard_size
+            if len(data) - offset <= capacity:
+                end = len(data)
+            else:
+                end = data.rfind(b"\n", offset, offset + capacity) + 1
+            if end <= offset:
+                # the next line does not fit in this shard
+                if self._shard_size:
+                    self._close_shard()
+                    continue
+                end = data.find(b"\n", offset) + 1 or len(data)
+            shard_fp.write(data[offset:end])
+            self._shard_size += end - offset
+            offset = end
+            if self._shard_size >= self.max_shard_size:
+                self._close_shard()
+        return len(data)
+
+    def _open_next_shard(self) -> IO[bytes]:
+        shard_stack = ExitStack()
+        shard_fp = shard_stack.enter_context(self.open_shard(self.shard_count))
+        self._shard_stack = shard_stack
+        self._shard_fp = shard_fp
+        self._shard_size = 0
+        self.shard_count += 1
+        return shard_fp
+
+    def _close_shard(
+        self,
+        exc_type: Optional[Type[BaseException]] = None,
+        exc_value: Optional[BaseException] = None,
+        traceback: Optional[TracebackType] = None,
+    ) -> None:
+        shard_stack, self._shard_stack, self._shard_fp = self._shard_stack, None, None
+        if shard_stack is not None:
+            shard_stack.__exit__(exc_type, exc_value, traceback)
+
+    def close(self) -> None:
+        """Close the open shard, if any."""
+        if self.closed:
+            return
+        try:
+            self._close_shard()
+        finally:
+            super().close()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        try:
+            self._close_shard(exc_type, exc_value, traceback)
+        finally:
+            super().close()
+
+
+def write_graph_set_rdf_shards(
+    graph_set: BaseGraphSet,
+    rdf_format: str,
+    max_shard_size: int,
+    open_shard: Callable[[int], ContextManager[IO[bytes]]],
+) -> int:
+    """Write a GraphSet as RDF shards, see `RDFShardStream`. BNodes are written as skolem IRIs
+    so that nodes are the same across shards.
+
+    Args:
+        graph_set: GraphSet to write
+        rdf_format: RDF_FORMAT_NTRIPLES or RDF_FORMAT_NQUADS
+        max_shard_size: maximum uncompressed size in bytes of a shard
+        open_shard: function returning a context manager yielding a binary file object for
+                    a shard index
+
+    Returns:
+        number of shards written
+
+    Raises:
+        ValueError if rdf_format is not a line based format which can be sharded
+    """
+    if rdf_format not in RDF_STREAM_FORMATS:
+        raise ValueError(
+            f"rdf_format {rdf_format} can not be sharded, expected one of {RDF_STREAM_FORMATS}"
+        )
+    with RDFShardStream(open_shard=open_shard, max_shard_size=max_shard_size) as shard_stream:
+        write_graph_set_rdf(
+            graph_set, cast(IO[bytes], shard_stream), rdf_format=rdf_format, skolemize=True
+        )
+    return shard_stream.shard_count
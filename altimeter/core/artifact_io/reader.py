@@ -1,13 +1,25 @@
-"""Classes for ArtifactReaders. An ArtifactReader reads a scan artifact dict
+"""Classes for ArtifactReaders. An ArtifactReader reads a scan artifact
 from something - e.g. a file, s3 key, etc."""
 import abc
+from contextlib import contextmanager
 import io
 import json
-from typing import Any, Dict, Type
-
-import boto3
+import mmap
+from typing import IO, Any, ContextManager, Dict, Iterator, Optional, Type, cast
 
 from altimeter.core.artifact_io import is_s3_uri, parse_s3_uri
+from altimeter.core.artifact_io.cache import ArtifactCache
+from altimeter.core.artifact_io.compression import (
+    get_compression_from_path,
+    open_decompressed_reader,
+)
+from altimeter.core.artifact_io.dedup import ArtifactRef, is_artifact_ref_path
+from altimeter.core.artifact_io.graph_set_binary import (
+    GraphSetBinaryReader,
+    is_graph_set_binary_path,
+)
+from altimeter.core.artifact_io.s3_client import get_shared_s3_client
+from altimeter.core.graph.graph_set import GraphSet, GraphSetJSONReader
 from altimeter.core.log import Logger
 from altimeter.core.log_events import LogEvent
 
@@ -16,7 +28,8 @@ class ArtifactReader(abc.ABC):
     """ArtifactReaders read JSON artifacts from locations - e.g. s3, filesystem, etc."""
 
     def read_json(self, path: str) -> Dict[str, Any]:
-        """Read a json artifact
+        """Read a json artifact. If the artifact is a GraphSet artifact ref (see
+        altimeter.core.artifact_io.dedup) the referenced GraphSet artifact is read.
 
         Args:
             path: path to artifact to read
@@ -24,68 +37,184 @@ class ArtifactReader(abc.ABC):
         Returns:
             artifact content
         """
+        if is_artifact_ref_path(path):
+            artifact_ref = self.read_artifact_ref(path)
+            return artifact_ref.apply_to_dict(self.read_json(artifact_ref.path))
+        with self.open_artifact(path) as json_fp:
+            return json.load(json_fp)
+
+    def read_artifact_ref(self, path: str) -> ArtifactRef:
+        """Read a GraphSet artifact ref, see altimeter.core.artifact_io.dedup
+
+        Args:
+            path: path to artifact ref to read
+
+        Returns:
+            ArtifactRef object
+        """
+        with self.open_artifact(path) as json_fp:
+            return ArtifactRef.from_dict(json.load(json_fp))
+
+    def read_graph_set(self, path: str) -> GraphSet:
+        """Read a GraphSet artifact, either JSON or binary (see
+        altimeter.core.artifact_io.graph_set_binary) depending on the artifact's extension.
+        GraphSet artifact refs are resolved to the GraphSet artifact they refer to.
+
+        Args:
+            path: path to artifact to read
+
+        Returns:
+            GraphSet object
+        """
+        if is_artifact_ref_path(path):
+            artifact_ref = self.read_artifact_ref(path)
+            graph_set = self.read_graph_set(artifact_ref.path)
+            artifact_ref.apply(graph_set)
+            return graph_set
+        with self.open_artifact(path) as artifact_fp:
+            if is_graph_set_binary_path(path):
+                return GraphSetBinaryReader.from_file(artifact_fp).to_graph_set()
+            return GraphSetJSONReader(artifact_fp).to_graph_set()
+
+    @abc.abstractmethod
+    def open_artifact(self, path: str) -> ContextManager[IO[bytes]]:
+        """Open an artifact for streaming reads, e.g. with
+        `altimeter.core.graph.graph_set.GraphSetJSONReader`. Compressed artifacts are detected
+        by their path suffix and decompressed as they are read.
+
+        Args:
+            path: path to artifact to read
+
+        Returns:
+            context manager yielding a binary file object of the artifact content
+        """
 
     @classmethod
-    def from_artifact_path(cls: Type["ArtifactReader"], artifact_path: str) -> "ArtifactReader":
+    def from_artifact_path(
+        cls: Type["ArtifactReader"], artifact_path: str, cache: Optional[ArtifactCache] = None
+    ) -> "ArtifactReader":
         """Create an ArtifactReader based on an artifact path. This either returns a
-        FileArtifactReader or an S3ArtifactReader depending on the value of artifact_path"""
+        FileArtifactReader or an S3ArtifactReader depending on the value of artifact_path.
+        If cache is set S3ArtifactReaders cache artifacts in it."""
         if is_s3_uri(artifact_path):
             _, key_prefix = parse_s3_uri(artifact_path)
             if key_prefix is not None:
                 raise ValueError(
                     f"S3 artifact path should be s3://<bucket>, no key - got {artifact_path}"
                 )
-            return S3ArtifactReader()
+            return S3ArtifactReader(cache=cache)
         return FileArtifactReader()
 
 
 class FileArtifactReader(ArtifactReader):
     """ArtifactReader to read from the filesystem"""
 
-    def read_json(self, path: str) -> Dict[str, Any]:
-        """Read a json artifact
+    @contextmanager
+    def open_artifact(self, path: str) -> Iterator[IO[bytes]]:
+        """Open an artifact for streaming reads. Compressed artifacts are detected by
+        their filename suffix and decompressed as they are read.
 
         Args:
             path: filesystem path to artifact
 
-        Returns:
-            artifact content
+        Yields:
+            binary file object of the artifact content
         """
         logger = Logger()
         with logger.bind(artifact_path=path):
             logger.info(event=LogEvent.ReadFromFSStart)
-            with open(path, "r") as artifact_fp:
-                data = json.load(artifact_fp)
+            with open(path, "rb") as artifact_fp:
+                with open_decompressed_reader(
+                    artifact_fp, get_compression_from_path(path)
+                ) as decompressed_fp:
+                    yield decompressed_fp
             logger.info(event=LogEvent.ReadFromFSEnd)
-            return data
 
 
 class S3ArtifactReader(ArtifactReader):
-    """ArtifactReader to read from S3"""
-
-    def read_json(self, path: str) -> Dict[str, Any]:
-        """Read a json artifact
+    """ArtifactReader to read from S3
+
+    Args:
+        cache: if set, artifacts are downloaded to this ArtifactCache and read from it.
+               Artifacts which are already cached are read without accessing S3.
+        revalidate: if True, the ETag of cached artifacts is checked against S3 before
+                    reading them. This is only required for artifacts which are modified,
+                    e.g. ScanUnitHistory, as artifacts under a scan id never change.
+    """
+
+    def __init__(self, cache: Optional[ArtifactCache] = None, revalidate: bool = False):
+        self.cache = cache
+        self.revalidate = revalidate
+
+    @contextmanager
+    def open_artifact(self, path: str) -> Iterator[IO[bytes]]:
+        """Open an artifact for streaming reads. The object body is read as it is
+        downloaded rather than buffered in memory, or if there is a cache it is downloaded to
+        the cache and memory mapped from there. Compressed artifacts are detected by their
+        key suffix and decompressed as they are read.
 
         Args:
             path: s3 uri to artifact. s3://bucket/key/path
 
-        Returns:
-            artifact content
+        Yields:
+            binary file object of the artifact content
         """
         bucket, key = parse_s3_uri(path)
         if key is None:
             raise ValueError(f"Unable to read from s3 uri missing key: {path}")
-        session = boto3.Session()
-        s3_client = session.client("s3")
+        if self.cache is not None:
+            with self._open_cached_artifact(self.cache, bucket, key) as artifact_fp:
+                yield artifact_fp
+            return
+        s3_client = get_shared_s3_client().get_client()
+        logger = Logger()
+        with logger.bind(bucket=bucket, key=key):
+            logger.info(event=LogEvent.ReadFromS3Start)
+            resp = s3_client.get_object(Bucket=bucket, Key=key)
+            body = resp["Body"]
+            try:
+                with open_decompressed_reader(
+                    body, get_compression_from_path(key)
+                ) as decompressed_fp:
+                    yield decompressed_fp
+            finally:
+                body.close()
+            logger.info(event=LogEvent.ReadFromS3End)
+
+    @contextmanager
+    def _open_cached_artifact(
+        self, cache: ArtifactCache, bucket: str, key: str
+    ) -> Iterator[IO[bytes]]:
         logger = Logger()
         with logger.bind(bucket=bucket, key=key):
-            with io.BytesIO() as artifact_bytes_buf:
+            s3_client = get_shared_s3_client().get_client()
+            etag: Optional[str] = None
+            if self.revalidate:
+                etag = s3_client.head_object(Bucket=bucket, Key=key)["ETag"]
+            cached_fp = cache.open(bucket=bucket, key=key, etag=etag)
+            if cached_fp is None:
                 logger.info(event=LogEvent.ReadFromS3Start)
-                s3_client.download_fileobj(bucket, key, artifact_bytes_buf)
-                artifact_bytes_buf.flush()
-                artifact_bytes_buf.seek(0)
-                artifact_bytes = artifact_bytes_buf.read()
+                resp = s3_client.get_object(Bucket=bucket, Key=key)
+                body = resp["Body"]
+                try:
+                    cached_fp = cache.put(bucket=bucket, key=key, etag=resp["ETag"], body=body)
+                finally:
+                    body.close()
                 logger.info(event=LogEvent.ReadFromS3End)
-                artifact_str = artifact_bytes.decode("utf-8")
-                artifact_dict = json.loads(artifact_str)
-                return artifact_dict
+            else:
+                logger.info(event=LogEvent.ReadFromArtifactCache)
+            with cached_fp:
+                if not cached_fp.seek(0, 2):
+                    # empty files can not be memory mapped
+                    artifact_fp: IO[bytes] = io.BytesIO()
+                else:
+                    artifact_fp = cast(
+                        IO[bytes], mmap.mmap(cached_fp.fileno(), 0, access=mmap.ACCESS_READ)
+                    )
+                try:
+                    with open_decompressed_reader(
+                        artifact_fp, get_compression_from_path(key)
+                    ) as decompressed_fp:
+                        yield decompressed_fp
+                finally:
+                    artifact_fp.close()
@@ -0,0 +1,91 @@
+"""A SharedS3Client provides a single pooled S3 client per process for ArtifactReaders and
+ArtifactWriters. Creating a boto3 Session and client per artifact resolves credentials and
+opens new HTTPS connections for every artifact - sharing one thread safe client makes the
+per-artifact overhead negligible."""
+import os
+import threading
+from typing import Optional
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.client import BaseClient
+from botocore.config import Config
+
+DEFAULT_MAX_POOL_CONNECTIONS = 32
+DEFAULT_TRANSFER_MAX_CONCURRENCY = 8
+
+
+class SharedS3Client:
+    """A lazily created S3 client shared by all threads of a process. boto3 clients are
+    thread safe, Sessions are not, so the client is created once under a lock. A new
+    client is created in forked child processes as connection pools must not be shared
+    across processes.
+
+    Args:
+        max_pool_connections: max_pool_connections of the client
+        transfer_max_concurrency: number of threads used by managed transfers, e.g.
+                                  upload_file, see `get_transfer_config`
+    """
+
+    def __init__(
+        self,
+        max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+        transfer_max_concurrency: int = DEFAULT_TRANSFER_MAX_CONCURRENCY,
+    ):
+        self.max_pool_connections = max_pool_connections
+        self.transfer_max_concurrency = transfer_max_concurrency
+        self._client: Optional[BaseClient] = None
+        self._client_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get_client(self) -> BaseClient:
+        """Get the shared S3 client, creating it if needed.
+
+        Returns:
+            boto3 S3 client
+        """
+        with self._lock:
+            if self._client is None or self._client_pid != os.getpid():
+                session = boto3.Session()
+                self._client = session.client(
+                    "s3", config=Config(max_pool_connections=self.max_pool_connections)
+                )
+                self._client_pid = os.getpid()
+            return self._client
+
+    def ensure_max_pool_connections(self, max_pool_connections: int) -> None:
+        """Ensure the client's connection pool allows at least max_pool_connections
+        connections, e.g. for the number of threads which will read or write artifacts
+        concurrently. If the existing client's pool is smaller a new client is created on the
+        next `get_client` call, callers holding the previous client may continue to use it.
+
+        Args:
+            max_pool_connections: minimum max_pool_connections
+        """
+        with self._lock:
+            if max_pool_connections > self.max_pool_connections:
+                self.max_pool_connections = max_pool_connections
+                self._client = None
+
+    def get_transfer_config(self) -> TransferConfig:
+        """Get a TransferConfig for managed transfers with the shared client. Its
+        concurrency is limited so that a transfer does not exhaust the connection pool.
+
+        Returns:
+            boto3 TransferConfig
+        """
+        return TransferConfig(
+            max_concurrency=min(self.transfer_max_concurrency, self.max_pool_connections)
+        )
+
+
+_SHARED_S3_CLIENT = SharedS3Client()
+
+
+def get_shared_s3_client() -> SharedS3Client:
+    """Get the process-wide SharedS3Client
+
+    Returns:
+        SharedS3Client shared by all ArtifactReaders and ArtifactWriters in this process
+    """
+    return _SHARED_S3_CLIENT
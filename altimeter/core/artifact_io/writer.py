@@ -1,52 +1,567 @@
 """Classes for ArtifactWriters. An ArtifactWriter writes a scan artifact dict
 to something - e.g. a file, s3 key, etc."""
 import abc
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 import io
-import gzip
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional, Type
-
-import boto3
-
-from altimeter.core.artifact_io import is_s3_uri, parse_s3_uri
-from altimeter.core.graph.graph_set import GraphSet
+import queue
+import threading
+from typing import (
+    IO,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Type,
+    cast,
+)
+
+from botocore.client import BaseClient
+from botocore.exceptions import ClientError
+
+from altimeter.core.artifact_io import (
+    ARTIFACT_FORMAT_BINARY,
+    ARTIFACT_FORMAT_JSON,
+    is_s3_uri,
+    parse_s3_uri,
+)
+from altimeter.core.artifact_io.compression import (
+    GZIP,
+    get_artifact_name,
+    get_json_artifact_name,
+    open_compressed_writer,
+    open_json_writer,
+)
+from altimeter.core.artifact_io.dedup import (
+    ARTIFACT_REF_SUFFIX,
+    ArtifactRef,
+    get_graph_set_content_hash,
+)
+from altimeter.core.artifact_io.graph_set_binary import (
+    GRAPH_SET_BINARY_EXTENSION,
+    write_graph_set_binary,
+)
+from altimeter.core.artifact_io.rdf import (
+    get_rdf_artifact_name,
+    get_rdf_shard_name,
+    write_graph_set_rdf,
+    write_graph_set_rdf_shards,
+)
+from altimeter.core.artifact_io.s3_client import get_shared_s3_client
+from altimeter.core.graph.graph_set import BaseGraphSet, GraphSet
+from altimeter.core.graph.rdf_stream import RDF_FORMAT_RDFXML
 from altimeter.core.json_encoder import json_encoder
 from altimeter.core.log import Logger
 from altimeter.core.log_events import LogEvent
 
-GZIP = "gz"
+# S3 requires all parts of a multipart upload except the last to be at least 5 MiB
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_MULTIPART_PART_SIZE = 8 * 1024 * 1024
+DEFAULT_MAX_CONCURRENT_PARTS = 4
+DEFAULT_BACKGROUND_WRITE_CHUNK_SIZE = 256 * 1024
+DEFAULT_BACKGROUND_WRITE_MAX_QUEUED = 16
+
+
+class S3MultipartUploadStream(io.RawIOBase):
+    """A writable binary stream which uploads to an S3 object. A part is uploaded each time
+    part_size bytes have been written so memory use is bounded by part_size rather than
+    the object size. Objects smaller than part_size are uploaded with a single put_object.
+    The object is only created when the stream is closed; `abort` discards it.
+
+    If max_concurrent_parts is greater than 1 parts are uploaded by background threads so
+    that the caller can go on writing while earlier parts upload. Writes block while
+    max_concurrent_parts parts are uploading, memory use is then bounded by
+    (max_concurrent_parts + 1) * part_size.
+
+    Args:
+        s3_client: boto3 s3 client
+        bucket: s3 bucket
+        key: s3 key
+        part_size: multipart upload part size in bytes
+        extra_args: extra args for put_object/create_multipart_upload, e.g. Metadata
+        max_concurrent_parts: maximum number of parts uploading at once
+    """
+
+    def __init__(
+        self,
+        s3_client: BaseClient,
+        bucket: str,
+        key: str,
+        part_size: int = DEFAULT_MULTIPART_PART_SIZE,
+        extra_args: Optional[Dict[str, Any]] = None,
+        max_concurrent_parts: int = 1,
+    ):
+        super().__init__()
+        if part_size < MIN_MULTIPART_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_MULTIPART_PART_SIZE}")
+        if max_concurrent_parts < 1:
+            raise ValueError("max_concurrent_parts must be at least 1")
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.extra_args = extra_args if extra_args is not None else {}
+        self.max_concurrent_parts = max_concurrent_parts
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Dict[str, Any]] = []
+        self._parts_lock = threading.Lock()
+        self._part_count = 0
+        self._part_slots = threading.BoundedSemaphore(max_concurrent_parts)
+        self._part_futures: List["Future[None]"] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        if self.closed:
+            raise ValueError("write to closed S3MultipartUploadStream")
+        self._buffer += data
+        while len(self._buffer) >= self.part_size:
+            self._submit_part(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(data)
+
+    def _submit_part(self, part: bytes) -> None:
+        if self._upload_id is None:
+            resp = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, **self.extra_args
+            )
+            self._upload_id = resp["UploadId"]
+        self._part_count += 1
+        if self.max_concurrent_parts == 1:
+            self._upload_part(self._part_count, part)
+            return
+        # fail fast rather than going on writing after a part upload failed
+        part_futures = []
+        for future in self._part_futures:
+            if future.done():
+                future.result()
+            else:
+                part_futures.append(future)
+        self._part_futures = part_futures
+        self._part_slots.acquire()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent_parts, thread_name_prefix="s3-part-upload"
+            )
+        future = self._executor.submit(self._upload_part, self._part_count, part)
+        future.add_done_callback(lambda _: self._part_slots.release())
+        self._part_futures.append(future)
+
+    def _upload_part(self, part_number: int, part: bytes) -> None:
+        resp = self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=part,
+        )
+        with self._parts_lock:
+            self._parts.append({"ETag": resp["ETag"], "PartNumber": part_number})
+
+    def _wait_for_parts(self) -> None:
+        """Wait for all submitted part uploads, raising the first error if any failed."""
+        try:
+            for future in self._part_futures:
+                future.result()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def close(self) -> None:
+        """Upload any buffered data and complete the upload."""
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self.s3_client.put_object(
+                    Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer), **self.extra_args
+                )
+            else:
+                if self._buffer:
+                    self._submit_part(bytes(self._buffer))
+                self._wait_for_parts()
+                self.s3_client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={
+                        "Parts": sorted(self._parts, key=lambda part: part["PartNumber"])
+                    },
+                )
+        except Exception:
+            self.abort()
+            raise
+        self._buffer = bytearray()
+        super().close()
+
+    def abort(self) -> None:
+        """Discard written data and abort the multipart upload if one was started."""
+        if self.closed:
+            return
+        self._buffer = bytearray()
+        try:
+            # parts still uploading when the upload is aborted could otherwise be stored
+            try:
+                self._wait_for_parts()
+            except Exception:
+                pass
+            if self._upload_id is not None:
+                self.s3_client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+                )
+        finally:
+            super().close()
+
+
+class BackgroundWriteStream(io.RawIOBase):
+    """A writable binary stream which writes the data written to it to fp from a background
+    thread. This pipelines producing data with consuming it, e.g. serializing a graph in the
+    caller's thread while a background thread compresses it into an S3MultipartUploadStream
+    (zlib releases the GIL while compressing). Small writes are coalesced into chunks of
+    chunk_size bytes and writes block while max_queued chunks are waiting to be written, so
+    memory use is bounded by about (max_queued + 1) * chunk_size. fp is not closed.
+
+    An error writing to fp is raised by the next call to `write` or `close`.
+
+    Args:
+        fp: binary file object to write to
+        chunk_size: size in bytes of chunks written to fp
+        max_queued: maximum number of chunks waiting to be written to fp
+    """
+
+    def __init__(
+        self,
+        fp: IO[bytes],
+        chunk_size: int = DEFAULT_BACKGROUND_WRITE_CHUNK_SIZE,
+        max_queued: int = DEFAULT_BACKGROUND_WRITE_MAX_QUEUED,
+    ):
+        super().__init__()
+        if max_queued < 1:
+            raise ValueError("max_queued must be at least 1")
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_queued)
+        self._error: Optional[BaseException] = None
+        self._discard = False
+        self._thread = threading.Thread(
+            target=self._write_chunks, name="background-writer", daemon=True
+        )
+        self._thread.start()
+
+    def writable(self) -> bool:
+        return True
+
+    def _write_chunks(self) -> None:
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            # after an error or abort chunks are still consumed so that writers never block
+            if self._error is None and not self._discard:
+                try:
+                    self.fp.write(chunk)
+                except BaseException as ex:  # pylint: disable=broad-except
+                    self._error = ex
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def write(self, data: Any) -> int:
+        if self.closed:
+            raise ValueError("write to closed BackgroundWriteStream")
+        self._raise_error()
+        self._buffer += data
+        if len(self._buffer) >= self.chunk_size:
+            self._queue.put(bytes(self._buffer))
+            self._buffer = bytearray()
+        return len(data)
+
+    def close(self) -> None:
+        """Write any buffered data to fp and wait for the background thread to finish."""
+        if self.closed:
+            return
+        try:
+            if self._buffer:
+                self._queue.put(bytes(self._buffer))
+                self._buffer = bytearray()
+            self._queue.put(None)
+            self._thread.join()
+            self._raise_error()
+        finally:
+            super().close()
+
+    def abort(self) -> None:
+        """Discard data which has not been written to fp and stop the background thread."""
+        if self.closed:
+            return
+        self._discard = True
+        self._buffer = bytearray()
+        self._queue.put(None)
+        self._thread.join()
+        super().close()
+
+
+@contextmanager
+def open_background_writer(fp: IO[bytes]) -> Iterator[IO[bytes]]:
+    """Open a BackgroundWriteStream writing to fp. If an exception is raised in the context
+    data not yet written to fp is discarded.
+
+    Args:
+        fp: binary file object to write to
+
+    Yields:
+        binary file object
+    """
+    stream = BackgroundWriteStream(fp)
+    try:
+        yield cast(IO[bytes], stream)
+    except BaseException:
+        stream.abort()
+        raise
+    stream.close()
+
+
+class ArtifactWriteQueue:
+    """A bounded queue of artifact writes run by background threads, allowing artifacts to
+    be uploaded while other work continues. `submit` blocks while max_queued writes are
+    queued or running so that memory held by data awaiting write is bounded. Closing the
+    queue, e.g. by exiting its context, waits for all submitted writes to finish.
+
+    Args:
+        max_workers: number of writer threads
+        max_queued: maximum number of writes queued or running, defaults to 2 * max_workers
+    """
+
+    def __init__(self, max_workers: int, max_queued: Optional[int] = None):
+        if max_queued is None:
+            max_queued = 2 * max_workers
+        if max_queued < max_workers:
+            raise ValueError("max_queued must be at least max_workers")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="artifact-writer"
+        )
+        self._slots = threading.BoundedSemaphore(max_queued)
+
+    def __enter__(self) -> "ArtifactWriteQueue":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def submit(self, write: Callable[..., str], *args: Any, **kwargs: Any) -> "Future[str]":
+        """Queue a write, blocking while the queue is full.
+
+        Args:
+            write: function which writes an artifact and returns its path, e.g.
+                   `ArtifactWriter.write_json`
+            args: positional args for write
+            kwargs: keyword args for write
+
+        Returns:
+            Future of the written artifact's path
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(write, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def close(self) -> None:
+        """Wait for all queued writes to finish."""
+        self._executor.shutdown(wait=True)
 
 
 class ArtifactWriter(abc.ABC):
     """ArtifactWriters write JSON artifacts to locations - e.g. s3, filesystem, etc."""
 
-    @abc.abstractmethod
-    def write_json(self, name: str, data: Dict[str, Any]) -> str:
+    def write_json(self, name: str, data: Dict[str, Any], compression: Optional[str] = None) -> str:
         """Write a json artifact
 
         Args:
             name: name
             data: data
+            compression: if set, compress the artifact with GZIP, ZSTD or LZ4 (see
+                         altimeter.core.artifact_io.compression)
 
         Returns:
             path to written artifact
         """
+        return self.write_json_stream(
+            name=name,
+            write=lambda json_fp: json.dump(data, json_fp, default=json_encoder),
+            compression=compression,
+        )
 
     @abc.abstractmethod
-    def write_graph_set(
+    def write_json_stream(
+        self, name: str, write: Callable[[TextIO], None], compression: Optional[str] = None
+    ) -> str:
+        """Write a json artifact incrementally. write is called with a text file object and
+        the JSON it writes is streamed to the artifact rather than buffered in memory.
+
+        Args:
+            name: name
+            write: function which writes JSON to a text file object, e.g.
+                   `GraphSet.write_json`
+            compression: if set, compress the artifact with GZIP, ZSTD or LZ4. The
+                         compression is recorded as a suffix of the artifact name.
+
+        Returns:
+            path to written artifact
+        """
+
+    def write_graph_set_binary(
         self, name: str, graph_set: GraphSet, compression: Optional[str] = None
     ) -> str:
-        """Write a graph artifact
+        """Write a binary GraphSet artifact, see altimeter.core.artifact_io.graph_set_binary
 
         Args:
             name: name
             graph_set: GraphSet object to write
+            compression: if set, compress the artifact with GZIP, ZSTD or LZ4
 
         Returns:
             path to written artifact
         """
+        return self.write_graph_set_binary_stream(
+            name=name,
+            write=lambda fp: write_graph_set_binary(
+                fp=fp,
+                name=graph_set.name,
+                version=graph_set.version,
+                start_time=graph_set.start_time,
+                end_time=graph_set.end_time,
+                resources=graph_set.resources,
+                errors=graph_set.errors,
+                stats=graph_set.stats,
+            ),
+            compression=compression,
+        )
+
+    @abc.abstractmethod
+    def write_graph_set_binary_stream(
+        self, name: str, write: Callable[[IO[bytes]], None], compression: Optional[str] = None
+    ) -> str:
+        """Write a binary GraphSet artifact incrementally. write is called with a binary file
+        object, generally via `write_graph_set_binary`, and the data it writes is streamed to
+        the artifact rather than buffered in memory.
+
+        Args:
+            name: name
+            write: function which writes a binary GraphSet artifact to a binary file object
+            compression: if set, compress the artifact with GZIP, ZSTD or LZ4. The
+                         compression is recorded as a suffix of the artifact name.
+
+        Returns:
+            path to written artifact
+        """
+
+    @abc.abstractmethod
+    def write_graph_set(
+        self,
+        name: str,
+        graph_set: BaseGraphSet,
+        compression: Optional[str] = None,
+        rdf_format: str = RDF_FORMAT_RDFXML,
+        max_shard_size: Optional[int] = None,
+    ) -> str:
+        """Write a graph artifact
+
+        Args:
+            name: name
+            graph_set: GraphSet object to write
+            compression: None or GZIP
+            rdf_format: RDF_FORMAT_RDFXML, RDF_FORMAT_NTRIPLES or RDF_FORMAT_NQUADS
+            max_shard_size: if set, write the graph as shards of at most max_shard_size
+                            uncompressed bytes under a name prefix rather than as a single
+                            artifact, see altimeter.core.artifact_io.rdf. Only supported for
+                            RDF_FORMAT_NTRIPLES and RDF_FORMAT_NQUADS.
+
+        Returns:
+            path to written artifact, or to the prefix of the shards if max_shard_size is set
+        """
+
+    @abc.abstractmethod
+    def find_artifact(self, artifact_name: str) -> Optional[str]:
+        """Find a previously written artifact.
+
+        Args:
+            artifact_name: artifact name including extension, e.g. as generated by
+                           `get_artifact_name`
+
+        Returns:
+            path to the artifact if it exists, else None
+        """
+
+    def write_deduplicated_graph_set(
+        self,
+        name: str,
+        graph_set: GraphSet,
+        content_artifact_writer: "ArtifactWriter",
+        artifact_format: str = ARTIFACT_FORMAT_JSON,
+        compression: Optional[str] = None,
+    ) -> str:
+        """Write a GraphSet artifact deduplicated by content, see
+        altimeter.core.artifact_io.dedup. The GraphSet is only written by
+        content_artifact_writer if no artifact with the same content hash, format and
+        compression exists yet, an ArtifactRef to the content artifact is written as
+        name.ref.json by this writer.
+
+        Args:
+            name: name
+            graph_set: GraphSet object to write
+            content_artifact_writer: ArtifactWriter for content artifacts, generally writing
+                                     to CONTENT_ARTIFACT_DIR
+            artifact_format: ARTIFACT_FORMAT_JSON or ARTIFACT_FORMAT_BINARY
+            compression: if set, compress the content artifact with GZIP, ZSTD or LZ4
+
+        Returns:
+            path to written ref artifact
+        """
+        content_hash = get_graph_set_content_hash(graph_set)
+        if artifact_format == ARTIFACT_FORMAT_BINARY:
+            extension = GRAPH_SET_BINARY_EXTENSION
+        else:
+            extension = ARTIFACT_FORMAT_JSON
+        logger = Logger()
+        with logger.bind(content_hash=content_hash):
+            content_path = content_artifact_writer.find_artifact(
+                get_artifact_name(content_hash, extension, compression)
+            )
+            if content_path is None:
+                if artifact_format == ARTIFACT_FORMAT_BINARY:
+                    content_path = content_artifact_writer.write_graph_set_binary(
+                        name=content_hash, graph_set=graph_set, compression=compression
+                    )
+                else:
+                    content_path = content_artifact_writer.write_json_stream(
+                        name=content_hash, write=graph_set.write_json, compression=compression
+                    )
+            else:
+                logger.info(event=LogEvent.ArtifactContentExists, content_path=content_path)
+        artifact_ref = ArtifactRef(
+            path=content_path,
+            start_time=graph_set.start_time,
+            end_time=graph_set.end_time,
+            stats=graph_set.stats.to_dict(),
+        )
+        return self.write_json(name=f"{name}{ARTIFACT_REF_SUFFIX}", data=artifact_ref.to_dict())
 
     @classmethod
     def from_artifact_path(
@@ -74,60 +589,129 @@ class FileArtifactWriter(ArtifactWriter):
     def __init__(self, scan_id: str, output_dir: Path):
         self.output_dir = output_dir.joinpath(scan_id)
 
-    def write_json(self, name: str, data: Dict[str, Any]) -> str:
-        """Write artifact data to self.output_dir/name.json
+    def write_json_stream(
+        self, name: str, write: Callable[[TextIO], None], compression: Optional[str] = None
+    ) -> str:
+        """Write JSON written by write to self.output_dir/name.json[.compression]
 
         Args:
             name: filename
-            data: data
+            write: function which writes JSON to a text file object
+            compression: if set, compress the artifact with GZIP, ZSTD or LZ4
 
         Returns:
             Full filesystem path of artifact file
         """
         logger = Logger()
         os.makedirs(self.output_dir, exist_ok=True)
-        artifact_path = os.path.join(self.output_dir, f"{name}.json")
+        artifact_path = os.path.join(self.output_dir, get_json_artifact_name(name, compression))
         with logger.bind(artifact_path=artifact_path):
             logger.info(event=LogEvent.WriteToFSStart)
-            with open(artifact_path, "w") as artifact_fp:
-                json.dump(data, artifact_fp, default=json_encoder)
+            with open(artifact_path, "wb") as artifact_fp:
+                with open_json_writer(artifact_fp, compression) as json_fp:
+                    write(json_fp)
+            logger.info(event=LogEvent.WriteToFSEnd)
+        return artifact_path
+
+    def write_graph_set_binary_stream(
+        self, name: str, write: Callable[[IO[bytes]], None], compression: Optional[str] = None
+    ) -> str:
+        """Write a binary GraphSet artifact written by write to
+        self.output_dir/name.agb[.compression]
+
+        Args:
+            name: filename
+            write: function which writes a binary GraphSet artifact to a binary file object
+            compression: if set, compress the artifact with GZIP, ZSTD or LZ4
+
+        Returns:
+            Full filesystem path of artifact file
+        """
+        logger = Logger()
+        os.makedirs(self.output_dir, exist_ok=True)
+        artifact_path = os.path.join(
+            self.output_dir, get_artifact_name(name, GRAPH_SET_BINARY_EXTENSION, compression)
+        )
+        with logger.bind(artifact_path=artifact_path):
+            logger.info(event=LogEvent.WriteToFSStart)
+            with open(artifact_path, "wb") as artifact_fp:
+                with open_compressed_writer(artifact_fp, compression) as compressed_fp:
+                    write(compressed_fp)
             logger.info(event=LogEvent.WriteToFSEnd)
         return artifact_path
 
     def write_graph_set(
-        self, name: str, graph_set: GraphSet, compression: Optional[str] = None
+        self,
+        name: str,
+        graph_set: BaseGraphSet,
+        compression: Optional[str] = None,
+        rdf_format: str = RDF_FORMAT_RDFXML,
+        max_shard_size: Optional[int] = None,
     ) -> str:
         """Write a graph artifact
 
         Args:
             name: name
             graph_set: GraphSet object to write
+            compression: None or GZIP
+            rdf_format: RDF_FORMAT_RDFXML, RDF_FORMAT_NTRIPLES or RDF_FORMAT_NQUADS
+            max_shard_size: if set, write the graph as shards of at most max_shard_size
+                            uncompressed bytes in directory output_dir/name
 
         Returns:
-            path to written artifact
+            path to written artifact, or to the directory of the shards if max_shard_size
+            is set
         """
         logger = Logger()
         os.makedirs(self.output_dir, exist_ok=True)
-        if compression is None:
-            artifact_path = os.path.join(self.output_dir, f"{name}.rdf")
-        elif compression == GZIP:
-            artifact_path = os.path.join(self.output_dir, f"{name}.rdf.gz")
-        else:
-            raise ValueError(f"Unknown compression arg {compression}")
-        graph = graph_set.to_rdf()
-        with logger.bind(artifact_path=artifact_path):
+        if max_shard_size is not None:
+            shard_dir = os.path.join(self.output_dir, name)
+            os.makedirs(shard_dir, exist_ok=True)
+
+            @contextmanager
+            def open_shard(index: int) -> Iterator[IO[bytes]]:
+                shard_path = os.path.join(
+                    shard_dir, get_rdf_shard_name(index, rdf_format, compression)
+                )
+                with open(shard_path, "wb") as fp:
+                    with open_compressed_writer(fp, compression) as rdf_fp:
+                        yield rdf_fp
+
+            with logger.bind(artifact_path=shard_dir, rdf_format=rdf_format):
+                logger.info(event=LogEvent.WriteToFSStart)
+                shard_count = write_graph_set_rdf_shards(
+                    graph_set,
+                    rdf_format=rdf_format,
+                    max_shard_size=max_shard_size,
+                    open_shard=open_shard,
+                )
+                logger.info(event=LogEvent.WriteToFSEnd, shard_count=shard_count)
+            return shard_dir
+        artifact_path = os.path.join(
+            self.output_dir, get_rdf_artifact_name(name, rdf_format, compression)
+        )
+        with logger.bind(artifact_path=artifact_path, rdf_format=rdf_format):
             logger.info(event=LogEvent.WriteToFSStart)
             with open(artifact_path, "wb") as fp:
-                if compression is None:
-                    graph.serialize(fp)
-                elif compression == GZIP:
-                    with gzip.GzipFile(fileobj=fp, mode="wb") as gz:
-                        graph.serialize(gz)
-                else:
-                    raise ValueError(f"Unknown compression arg {compression}")
+                with open_compressed_writer(fp, compression) as rdf_fp:
+                    write_graph_set_rdf(graph_set, rdf_fp, rdf_format)
             logger.info(event=LogEvent.WriteToFSEnd)
         return artifact_path
 
+    def find_artifact(self, artifact_name: str) -> Optional[str]:
+        """Find an artifact in self.output_dir
+
+        Args:
+            artifact_name: filename including extension
+
+        Returns:
+            Full filesystem path of artifact file if it exists, else None
+        """
+        artifact_path = os.path.join(self.output_dir, artifact_name)
+        if os.path.exists(artifact_path):
+            return artifact_path
+        return None
+
 
 class S3ArtifactWriter(ArtifactWriter):
     """ArtifactWriter which writes to S3.
@@ -135,82 +719,225 @@ class S3ArtifactWriter(ArtifactWriter):
     Args:
         bucket: s3 bucket
         key_prefix: s3 key prefix
+        part_size: multipart upload part size in bytes
+        max_concurrent_parts: maximum number of parts of an artifact uploading at once
     """
 
-    def __init__(self, bucket: str, key_prefix: str):
+    def __init__(
+        self,
+        bucket: str,
+        key_prefix: str,
+        part_size: int = DEFAULT_MULTIPART_PART_SIZE,
+        max_concurrent_parts: int = DEFAULT_MAX_CONCURRENT_PARTS,
+    ):
         self.bucket = bucket
         self.key_prefix = key_prefix
+        self.part_size = part_size
+        self.max_concurrent_parts = max_concurrent_parts
 
-    def write_json(self, name: str, data: Dict[str, Any]) -> str:
-        """Write artifact data to s3://self.bucket/self.key_prefix/name.json
+    def write_json_stream(
+        self, name: str, write: Callable[[TextIO], None], compression: Optional[str] = None
+    ) -> str:
+        """Write JSON written by write to s3://self.bucket/self.key_prefix/name.json[.compression].
+        Parts are uploaded as they fill, if write raises the upload is aborted. Compression is
+        also recorded in the object's 'compression' metadata.
 
         Args:
             name: s3 key name
-            data: data
+            write: function which writes JSON to a text file object
+            compression: if set, compress the artifact with GZIP, ZSTD or LZ4
 
         Returns:
             S3 uri (s3://bucket/key/path) to artifact
         """
+        output_key = "/".join((self.key_prefix, get_json_artifact_name(name, compression)))
+        logger = Logger()
+        with logger.bind(bucket=self.bucket, key=output_key):
+            logger.info(event=LogEvent.WriteToS3Start)
+            s3_client = get_shared_s3_client().get_client()
+            extra_args: Dict[str, Any] = {"ContentType": "application/json"}
+            if compression is not None:
+                extra_args["Metadata"] = {"compression": compression}
+            upload_stream = S3MultipartUploadStream(
+                s3_client=s3_client,
+                bucket=self.bucket,
+                key=output_key,
+                part_size=self.part_size,
+                extra_args=extra_args,
+                max_concurrent_parts=self.max_concurrent_parts,
+            )
+            try:
+                with open_json_writer(upload_stream, compression) as json_fp:
+                    write(json_fp)
+            except Exception:
+                upload_stream.abort()
+                raise
+            upload_stream.close()
+            logger.info(event=LogEvent.WriteToS3End)
+        return f"s3://{self.bucket}/{output_key}"
+
+    def write_graph_set_binary_stream(
+        self, name: str, write: Callable[[IO[bytes]], None], compression: Optional[str] = None
+    ) -> str:
+        """Write a binary GraphSet artifact written by write to
+        s3://self.bucket/self.key_prefix/name.agb[.compression]. Parts are uploaded as they
+        fill, if write raises the upload is aborted.
+
+        Args:
+            name: s3 key name
+            write: function which writes a binary GraphSet artifact to a binary file object
+            compression: if set, compress the artifact with GZIP, ZSTD or LZ4
 
-        output_key = "/".join((self.key_prefix, f"{name}.json"))
+        Returns:
+            S3 uri (s3://bucket/key/path) to artifact
+        """
+        output_key = "/".join(
+            (self.key_prefix, get_artifact_name(name, GRAPH_SET_BINARY_EXTENSION, compression))
+        )
         logger = Logger()
         with logger.bind(bucket=self.bucket, key=output_key):
             logger.info(event=LogEvent.WriteToS3Start)
-            s3_client = boto3.Session().client("s3")
-            results_str = json.dumps(data, default=json_encoder)
-            results_bytes = results_str.encode("utf-8")
-            with io.BytesIO(results_bytes) as results_bytes_stream:
-                s3_client.upload_fileobj(results_bytes_stream, self.bucket, output_key)
+            s3_client = get_shared_s3_client().get_client()
+            extra_args: Dict[str, Any] = {"ContentType": "application/octet-stream"}
+            if compression is not None:
+                extra_args["Metadata"] = {"compression": compression}
+            upload_stream = S3MultipartUploadStream(
+                s3_client=s3_client,
+                bucket=self.bucket,
+                key=output_key,
+                part_size=self.part_size,
+                extra_args=extra_args,
+                max_concurrent_parts=self.max_concurrent_parts,
+            )
+            try:
+                with open_compressed_writer(upload_stream, compression) as compressed_fp:
+                    write(compressed_fp)
+            except Exception:
+                upload_stream.abort()
+                raise
+            upload_stream.close()
             logger.info(event=LogEvent.WriteToS3End)
         return f"s3://{self.bucket}/{output_key}"
 
     def write_graph_set(
-        self, name: str, graph_set: GraphSet, compression: Optional[str] = None
+        self,
+        name: str,
+        graph_set: BaseGraphSet,
+        compression: Optional[str] = None,
+        rdf_format: str = RDF_FORMAT_RDFXML,
+        max_shard_size: Optional[int] = None,
     ) -> str:
-        """Write a graph artifact
+        """Write a graph artifact. The artifact is tagged with the graph's name, version,
+        start_time, end_time and rdf format which are used by
+        `altimeter.core.neptune.client.AltimeterNeptuneClient.load_graph`.
 
         Args:
             name: name
             graph_set: GraphSet to write
+            compression: None or GZIP
+            rdf_format: RDF_FORMAT_RDFXML, RDF_FORMAT_NTRIPLES or RDF_FORMAT_NQUADS
+            max_shard_size: if set, write the graph as shards of at most max_shard_size
+                            uncompressed bytes under s3://self.bucket/self.key_prefix/name/.
+                            Each shard is tagged.
 
         Returns:
-            path to written artifact
+            S3 uri of the written artifact, or of the prefix of the shards (ending in /) if
+            max_shard_size is set
         """
         logger = Logger()
-        if compression is None:
-            key = f"{name}.rdf"
-        elif compression == GZIP:
-            key = f"{name}.rdf.gz"
-        else:
-            raise ValueError(f"Unknown compression arg {compression}")
+        tag_set = [
+            {"Key": "name", "Value": graph_set.name},
+            {"Key": "version", "Value": graph_set.version},
+            {"Key": "start_time", "Value": str(graph_set.start_time)},
+            {"Key": "end_time", "Value": str(graph_set.end_time)},
+            {"Key": "format", "Value": rdf_format},
+        ]
+        if max_shard_size is not None:
+            shard_key_prefix = "/".join((self.key_prefix, name, ""))
+
+            def open_shard(index: int) -> ContextManager[IO[bytes]]:
+                return self._open_graph_upload(
+                    key=shard_key_prefix + get_rdf_shard_name(index, rdf_format, compression),
+                    compression=compression,
+                    tag_set=tag_set,
+                )
+
+            with logger.bind(
+                bucket=self.bucket, key_prefix=shard_key_prefix, rdf_format=rdf_format
+            ):
+                logger.info(event=LogEvent.WriteToS3Start)
+                shard_count = write_graph_set_rdf_shards(
+                    graph_set,
+                    rdf_format=rdf_format,
+                    max_shard_size=max_shard_size,
+                    open_shard=open_shard,
+                )
+                logger.info(event=LogEvent.WriteToS3End, shard_count=shard_count)
+            return f"s3://{self.bucket}/{shard_key_prefix}"
+        key = get_rdf_artifact_name(name, rdf_format, compression)
         output_key = "/".join((self.key_prefix, key))
-        graph = graph_set.to_rdf()
-        with logger.bind(bucket=self.bucket, key_prefix=self.key_prefix, key=key):
+        with logger.bind(
+            bucket=self.bucket, key_prefix=self.key_prefix, key=key, rdf_format=rdf_format
+        ):
             logger.info(event=LogEvent.WriteToS3Start)
-            with io.BytesIO() as rdf_bytes_buf:
-                if compression is None:
-                    graph.serialize(rdf_bytes_buf)
-                elif compression == GZIP:
-                    with gzip.GzipFile(fileobj=rdf_bytes_buf, mode="wb") as gz:
-                        graph.serialize(gz)
-                else:
-                    raise ValueError(f"Unknown compression arg {compression}")
-                rdf_bytes_buf.flush()
-                rdf_bytes_buf.seek(0)
-                session = boto3.Session()
-                s3_client = session.client("s3")
-                s3_client.upload_fileobj(rdf_bytes_buf, self.bucket, output_key)
-            s3_client.put_object_tagging(
-                Bucket=self.bucket,
-                Key=output_key,
-                Tagging={
-                    "TagSet": [
-                        {"Key": "name", "Value": graph_set.name},
-                        {"Key": "version", "Value": graph_set.version},
-                        {"Key": "start_time", "Value": str(graph_set.start_time)},
-                        {"Key": "end_time", "Value": str(graph_set.end_time)},
-                    ]
-                },
-            )
+            with self._open_graph_upload(
+                key=output_key, compression=compression, tag_set=tag_set
+            ) as rdf_fp:
+                write_graph_set_rdf(graph_set, rdf_fp, rdf_format)
             logger.info(event=LogEvent.WriteToS3End)
         return f"s3://{self.bucket}/{output_key}"
+
+    @contextmanager
+    def _open_graph_upload(
+        self, key: str, compression: Optional[str], tag_set: List[Dict[str, str]]
+    ) -> Iterator[IO[bytes]]:
+        """Open a pipelined upload of a graph artifact: data written to the yielded stream is
+        compressed by a BackgroundWriteStream thread into an S3MultipartUploadStream which
+        uploads parts concurrently, so serialization, compression and upload overlap. The
+        upload is aborted if an exception is raised in the context, else the object is tagged
+        with tag_set once it is complete.
+
+        Args:
+            key: s3 key
+            compression: None or GZIP
+            tag_set: S3 TagSet of the object
+
+        Yields:
+            binary file object
+        """
+        s3_client = get_shared_s3_client().get_client()
+        upload_stream = S3MultipartUploadStream(
+            s3_client=s3_client,
+            bucket=self.bucket,
+            key=key,
+            part_size=self.part_size,
+            max_concurrent_parts=self.max_concurrent_parts,
+        )
+        try:
+            with open_compressed_writer(upload_stream, compression) as compressed_fp:
+                with open_background_writer(compressed_fp) as rdf_fp:
+                    yield rdf_fp
+        except BaseException:
+            upload_stream.abort()
+            raise
+        upload_stream.close()
+        s3_client.put_object_tagging(Bucket=self.bucket, Key=key, Tagging={"TagSet": tag_set})
+
+    def find_artifact(self, artifact_name: str) -> Optional[str]:
+        """Find an artifact at s3://self.bucket/self.key_prefix/artifact_name
+
+        Args:
+            artifact_name: s3 key name including extension
+
+        Returns:
+            S3 uri (s3://bucket/key/path) to artifact if it exists, else None
+        """
+        output_key = "/".join((self.key_prefix, artifact_name))
+        s3_client = get_shared_s3_client().get_client()
+        try:
+            s3_client.head_object(Bucket=self.bucket, Key=output_key)
+        except ClientError as c_e:
+            if c_e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise
+        return f"s3://{self.bucket}/{output_key}"
@@ -7,7 +7,16 @@ import boto3
 import toml
 
 from altimeter.aws.auth.accessor import Accessor
-from altimeter.core.artifact_io import is_s3_uri, parse_s3_uri
+from altimeter.core.artifact_io import (
+    ARTIFACT_FORMAT_JSON,
+    ARTIFACT_FORMATS,
+    is_s3_uri,
+    parse_s3_uri,
+)
+from altimeter.core.artifact_io.compression import validate_compression
+from altimeter.core.graph.rdf_stream import RDF_FORMAT_RDFXML, RDF_FORMATS, RDF_STREAM_FORMATS
+
+DEFAULT_MAX_ARTIFACT_READ_THREADS = 4
 
 
 class InvalidConfigException(Exception):
@@ -81,6 +90,17 @@ def get_required_int_param(key: str, config_dict: Dict[str, Any]) -> int:
     return value
 
 
+def get_optional_int_param(key: str, config_dict: Dict[str, Any]) -> Optional[int]:
+    """Get an int parameter by key from a config dict. Return None if it does not exist,
+    raise InvalidConfigException if its value is not an int."""
+    value = _get_optional_param(key, config_dict)
+    if value is None:
+        return None
+    if not isinstance(value, int):
+        raise InvalidConfigException(f"Parameter '{key}' should be a int. Is {type(value)}")
+    return value
+
+
 def get_required_str_param(key: str, config_dict: Dict[str, Any]) -> str:
     """Get a str parameter by key from a config dict. Raise InvalidConfigException if it does
     not exist or its value is not a str."""
@@ -168,11 +188,37 @@ class ScanConfig:
 
 @dataclass(frozen=True)
 class ConcurrencyConfig:
-    """Concurrency configuration class"""
+    """Concurrency configuration class
+
+    max_account_scan_processes and max_svc_scan_processes are optional. If
+    max_account_scan_processes is set, account scans are run in that many processes rather
+    than max_account_scan_threads threads. If max_svc_scan_processes is set, the ScanUnits of
+    each account scan are run in that many processes rather than max_svc_scan_threads
+    threads.
+
+    rate_limits optionally maps 'service' or 'service.Operation' (e.g. 'iam' or
+    'ec2.DescribeInstances') to a maximum number of AWS API requests per second per
+    account and region. Limits adapt downwards when throttled. Rate limiters are per
+    process: if max_svc_scan_processes is set each limit is divided evenly between the
+    ScanUnit processes of an account scan. Account scan processes
+    (max_account_scan_processes) and Lambda account scans each scan a distinct set of
+    accounts so each applies the full limits to its own accounts.
+
+    max_artifact_read_threads is the number of account artifacts read and parsed
+    concurrently while they are merged into the master artifact.
+
+    max_artifact_writer_threads is optional. If set, each account scan writes account
+    artifacts in the background using that many threads as soon as each account's scan
+    completes, overlapping uploads with the scanning of other accounts."""
 
     max_account_scan_threads: int
     max_accounts_per_thread: int
     max_svc_scan_threads: int
+    max_account_scan_processes: Optional[int] = None
+    max_svc_scan_processes: Optional[int] = None
+    rate_limits: Optional[Dict[str, float]] = None
+    max_artifact_read_threads: int = DEFAULT_MAX_ARTIFACT_READ_THREADS
+    max_artifact_writer_threads: Optional[int] = None
 
     @classmethod
     def from_dict(
@@ -182,10 +228,46 @@ class ConcurrencyConfig:
         max_account_scan_threads = get_required_int_param("max_account_scan_threads", config_dict)
         max_accounts_per_thread = get_required_int_param("max_accounts_per_thread", config_dict)
         max_svc_scan_threads = get_required_int_param("max_svc_scan_threads", config_dict)
+        max_account_scan_processes = get_optional_int_param(
+            "max_account_scan_processes", config_dict
+        )
+        max_svc_scan_processes = get_optional_int_param("max_svc_scan_processes", config_dict)
+        rate_limits = get_optional_section("rate_limits", config_dict)
+        max_artifact_read_threads = get_optional_int_param("max_artifact_read_threads", config_dict)
+        if max_artifact_read_threads is None:
+            max_artifact_read_threads = DEFAULT_MAX_ARTIFACT_READ_THREADS
+        elif max_artifact_read_threads < 1:
+            raise InvalidConfigException(
+                f"max_artifact_read_threads should be at least 1. Is {max_artifact_read_threads}"
+            )
+        max_artifact_writer_threads = get_optional_int_param(
+            "max_artifact_writer_threads", config_dict
+        )
+        if max_artifact_writer_threads is not None and max_artifact_writer_threads < 1:
+            raise InvalidConfigException(
+                "max_artifact_writer_threads should be at least 1. "
+                f"Is {max_artifact_writer_threads}"
+            )
+        if rate_limits is not None:
+            for rate_limit_key, rate_limit in rate_limits.items():
+                if (
+                    isinstance(rate_limit, bool)
+                    or not isinstance(rate_limit, (int, float))
+                    or rate_limit <= 0
+                ):
+                    raise InvalidConfigException(
+                        f"Rate limit '{rate_limit_key}' should be a positive number. "
+                        f"Is {rate_limit}"
+                    )
         return ConcurrencyConfig(
             max_account_scan_threads=max_account_scan_threads,
             max_accounts_per_thread=max_accounts_per_thread,
             max_svc_scan_threads=max_svc_scan_threads,
+            max_account_scan_processes=max_account_scan_processes,
+            max_svc_scan_processes=max_svc_scan_processes,
+            rate_limits=rate_limits,
+            max_artifact_read_threads=max_artifact_read_threads,
+            max_artifact_writer_threads=max_artifact_writer_threads,
         )
 
 
@@ -202,6 +284,9 @@ class NeptuneConfig:
     use_lpg: Optional[bool] = False
     iam_credentials_provider_type: Optional[str] = ""
     auth_mode: Optional[str] = ""
+    load_parallelism: Optional[str] = None
+    lpg_batch_size: Optional[int] = None
+    lpg_connections: Optional[int] = None
 
     @classmethod
     def from_dict(cls: Type["NeptuneConfig"], config_dict: Dict[str, Any]) -> "NeptuneConfig":
@@ -214,6 +299,17 @@ class NeptuneConfig:
         iam_role_arn = get_optional_str_param("iam_role_arn", config_dict)
         auth_mode = get_optional_str_param("auth_mode", config_dict)
         graph_load_sns_topic_arn = get_optional_str_param("graph_load_sns_topic_arn", config_dict)
+        load_parallelism = get_optional_str_param("load_parallelism", config_dict)
+        lpg_batch_size = get_optional_int_param("lpg_batch_size", config_dict)
+        if lpg_batch_size is not None and lpg_batch_size < 1:
+            raise InvalidConfigException(
+                f"lpg_batch_size should be at least 1. Is {lpg_batch_size}"
+            )
+        lpg_connections = get_optional_int_param("lpg_connections", config_dict)
+        if lpg_connections is not None and lpg_connections < 1:
+            raise InvalidConfigException(
+                f"lpg_connections should be at least 1. Is {lpg_connections}"
+            )
         return NeptuneConfig(
             host=host,
             port=port,
@@ -223,6 +319,9 @@ class NeptuneConfig:
             iam_role_arn=iam_role_arn,
             graph_load_sns_topic_arn=graph_load_sns_topic_arn,
             auth_mode=auth_mode,
+            load_parallelism=load_parallelism,
+            lpg_batch_size=lpg_batch_size,
+            lpg_connections=lpg_connections,
         )
 
 
@@ -237,6 +336,11 @@ class Config:
     concurrency: ConcurrencyConfig
     scan: ScanConfig
     neptune: Optional[NeptuneConfig] = None
+    artifact_compression: Optional[str] = None
+    artifact_format: str = ARTIFACT_FORMAT_JSON
+    artifact_dedup: bool = False
+    rdf_format: str = RDF_FORMAT_RDFXML
+    rdf_max_shard_size: Optional[int] = None
 
     def __post_init__(self) -> None:
         if (
@@ -251,6 +355,28 @@ class Config:
                 raise InvalidConfigException(
                     f"S3 artifact_path should be s3://<bucket>, no key - got {self.artifact_path}"
                 )
+        try:
+            validate_compression(self.artifact_compression)
+        except ValueError as v_e:
+            raise InvalidConfigException(f"Invalid artifact_compression: {str(v_e)}")
+        if self.artifact_format not in ARTIFACT_FORMATS:
+            raise InvalidConfigException(
+                f"Invalid artifact_format {self.artifact_format}, must be one of "
+                f"{', '.join(ARTIFACT_FORMATS)}"
+            )
+        if self.rdf_format not in RDF_FORMATS:
+            raise InvalidConfigException(
+                f"Invalid rdf_format {self.rdf_format}, must be one of {', '.join(RDF_FORMATS)}"
+            )
+        if self.rdf_max_shard_size is not None:
+            if self.rdf_max_shard_size < 1:
+                raise InvalidConfigException(
+                    f"rdf_max_shard_size should be at least 1. Is {self.rdf_max_shard_size}"
+                )
+            if self.rdf_format not in RDF_STREAM_FORMATS:
+                raise InvalidConfigException(
+                    f"rdf_max_shard_size requires an rdf_format of {', '.join(RDF_STREAM_FORMATS)}"
+                )
 
     @classmethod
     def from_dict(cls: Type["Config"], config_dict: Dict[str, Any]) -> "Config":
@@ -258,6 +384,11 @@ class Config:
         artifact_path = get_required_str_param("artifact_path", config_dict)
         pruner_max_age_min = get_required_int_param("pruner_max_age_min", config_dict)
         graph_name = get_required_str_param("graph_name", config_dict)
+        artifact_compression = get_optional_str_param("artifact_compression", config_dict)
+        artifact_format = get_optional_str_param("artifact_format", config_dict)
+        artifact_dedup = get_optional_bool_param("artifact_dedup", config_dict)
+        rdf_format = get_optional_str_param("rdf_format", config_dict)
+        rdf_max_shard_size = get_optional_int_param("rdf_max_shard_size", config_dict)
 
         scan_dict = get_required_section("scan", config_dict)
         try:
@@ -292,6 +423,13 @@ class Config:
             concurrency=concurrency,
             scan=scan,
             neptune=neptune,
+            artifact_compression=artifact_compression,
+            artifact_format=artifact_format
+            if artifact_format is not None
+            else ARTIFACT_FORMAT_JSON,
+            artifact_dedup=bool(artifact_dedup),
+            rdf_format=rdf_format if rdf_format is not None else RDF_FORMAT_RDFXML,
+            rdf_max_shard_size=rdf_max_shard_size,
         )
 
     @classmethod
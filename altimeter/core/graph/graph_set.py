@@ -1,9 +1,22 @@
 """A GraphSet represents the contents of a Graph."""
+import abc
 import uuid
 from collections import defaultdict
 import json
 from pathlib import Path
-from typing import Any, DefaultDict, Dict, List, Type
+from typing import (
+    IO,
+    Any,
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Type,
+)
 
 from rdflib import BNode, Graph, Literal, Namespace, RDF
 
@@ -13,22 +26,30 @@ from altimeter.core.graph.exceptions import (
 )
 from altimeter.core.graph.link.links import ResourceLinkLink
 from altimeter.core.graph.node_cache import NodeCache
+from altimeter.core.graph.rdf_stream import (
+    RDF_FORMAT_NTRIPLES,
+    RDF_FORMAT_RDFXML,
+    RDFStreamWriter,
+    TripleSink,
+)
+from altimeter.core.json_encoder import json_encoder
+from altimeter.core.json_stream import DEFAULT_CHUNK_SIZE, JSONStreamParser
 from altimeter.core.multilevel_counter import MultilevelCounter
 from altimeter.core.resource.resource import Resource
 from altimeter.core.resource.resource_spec import ResourceSpec
 
 
-class GraphSet:
-    """A GraphSet represents the contents of a Graph.  It contains a list of Resource objects, a
-    graph name and version and a few metadata fields describing the scan. Generally GraphSets
-    are created by running `GraphSpec.scan`.
+class BaseGraphSet(abc.ABC):
+    """The metadata and Resources of a Graph. Serializations which read the Resources once,
+    in order, are implemented here so that they work both for in-memory GraphSets and for
+    GraphSets whose Resources are streamed from disk, see
+    `altimeter.core.graph.graph_set_builder.SpooledGraphSet`.
 
     Args:
         name: graph name
         version: graph version
         start_time: epoch scan start time
         end_time: epoch scan end time
-        resources: Resource objects
         errors: Errors encountered during scan
         stats: Scan statistics, generally API call stats.
     """
@@ -39,7 +60,6 @@ class GraphSet:
         version: str,
         start_time: int,
         end_time: int,
-        resources: List[Resource],
         errors: List[str],
         stats: MultilevelCounter,
     ):
@@ -47,10 +67,16 @@ class GraphSet:
         self.version = version
         self.start_time = start_time
         self.end_time = end_time
-        self.resources = resources
         self.errors = errors
         self.stats = stats
-        self._resolve_duplicates()
+
+    @abc.abstractmethod
+    def iter_resources(self) -> Iterator[Resource]:
+        """Iterate over the Resources of this GraphSet.
+
+        Yields:
+            Resource objects
+        """
 
     def to_rdf(self) -> Graph:
         """Generate an rdflib.Graph from this GraphSet.
@@ -58,9 +84,51 @@ class GraphSet:
         Returns:
             rdf.Graph object representing this GraphSet.
         """
+        graph = Graph()
+        self._graph_rdf(graph)
+        return graph
+
+    def write_rdf(
+        self,
+        fp: IO[bytes],
+        rdf_format: str = RDF_FORMAT_NTRIPLES,
+        graph_iri: Optional[str] = None,
+        skolem_base: Optional[str] = None,
+    ) -> int:
+        """Write this GraphSet as RDF/XML, N-Triples or N-Quads. N-Triples and N-Quads are
+        written by an `altimeter.core.graph.rdf_stream.RDFStreamWriter` - the triples written
+        are the same as those of `to_rdf` but are streamed to fp as they are generated rather
+        than built into an rdflib.Graph. RDF/XML is serialized from `to_rdf`.
+
+        Args:
+            fp: binary file object to write to
+            rdf_format: RDF_FORMAT_RDFXML, RDF_FORMAT_NTRIPLES or RDF_FORMAT_NQUADS
+            graph_iri: named graph IRI, required for RDF_FORMAT_NQUADS
+            skolem_base: if set, BNodes are written as skolem IRIs starting with skolem_base.
+                         Not supported for RDF_FORMAT_RDFXML.
+
+        Returns:
+            number of triples written
+        """
+        if rdf_format == RDF_FORMAT_RDFXML:
+            if graph_iri is not None or skolem_base is not None:
+                raise ValueError(
+                    f"graph_iri and skolem_base are not supported by {RDF_FORMAT_RDFXML}"
+                )
+            graph = self.to_rdf()
+            graph.serialize(fp)
+            return len(graph)
+        writer = RDFStreamWriter(
+            fp=fp, rdf_format=rdf_format, graph_iri=graph_iri, skolem_base=skolem_base
+        )
+        self._graph_rdf(writer)
+        writer.flush()
+        return writer.triple_count
+
+    def _graph_rdf(self, graph: TripleSink) -> None:
+        """Add the triples of this GraphSet to a TripleSink"""
         namespace = Namespace(f"{self.name}:")
         node_cache = NodeCache()
-        graph = Graph()
         metadata_node = BNode()
         graph.add((metadata_node, RDF.type, getattr(namespace, "metadata")))
         graph.add((metadata_node, getattr(namespace, "name"), Literal(self.name)))
@@ -69,9 +137,8 @@ class GraphSet:
         graph.add((metadata_node, getattr(namespace, "end_time"), Literal(self.end_time)))
         for error in self.errors:
             graph.add((metadata_node, getattr(namespace, "error"), Literal(error)))
-        for resource in self.resources:
+        for resource in self.iter_resources():
             resource.to_rdf(namespace=namespace, graph=graph, node_cache=node_cache)
-        return graph
 
     def to_neptune_lpg(self, scan_id: str) -> Dict:
         vertices = []
@@ -97,7 +164,7 @@ class GraphSet:
                 }
             )
             vertices.append(vertex)
-        for resource in self.resources:
+        for resource in self.iter_resources():
             resource.to_lpg(vertices, edges)
 
         for v in vertices:
@@ -114,6 +181,72 @@ class GraphSet:
             )
         return {"vertices": vertices, "edges": edges}
 
+    def write_json(self, json_fp: TextIO) -> None:
+        """Write this GraphSet as JSON to a file object, one resource at a time. The output is
+        equivalent to `json.dump(graph_set.to_dict(), json_fp)` without building the dict.
+
+        Args:
+            json_fp: file object to write to
+        """
+        write_graph_set_json(
+            json_fp=json_fp,
+            name=self.name,
+            version=self.version,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            resources=self.iter_resources(),
+            errors=self.errors,
+            stats=self.stats,
+        )
+
+
+class GraphSet(BaseGraphSet):
+    """A GraphSet represents the contents of a Graph.  It contains a list of Resource objects, a
+    graph name and version and a few metadata fields describing the scan. Generally GraphSets
+    are created by running `GraphSpec.scan`.
+
+    Args:
+        name: graph name
+        version: graph version
+        start_time: epoch scan start time
+        end_time: epoch scan end time
+        resources: Resource objects
+        errors: Errors encountered during scan
+        stats: Scan statistics, generally API call stats.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        version: str,
+        start_time: int,
+        end_time: int,
+        resources: List[Resource],
+        errors: List[str],
+        stats: MultilevelCounter,
+    ):
+        super().__init__(
+            name=name,
+            version=version,
+            start_time=start_time,
+            end_time=end_time,
+            errors=errors,
+            stats=stats,
+        )
+        self.resources: List[Resource] = []
+        # index of resource_id -> position in self.resources, used to resolve duplicates
+        # incrementally as resources are added.
+        self._resource_ids_indexes: Dict[str, int] = {}
+        self._add_resources(resources)
+
+    def iter_resources(self) -> Iterator[Resource]:
+        """Iterate over the Resources of this GraphSet.
+
+        Returns:
+            iterator of Resource objects
+        """
+        return iter(self.resources)
+
     def to_dict(self) -> Dict[str, Any]:
         """Generate a dictionary representation of this GraphSet.
 
@@ -153,28 +286,55 @@ class GraphSet:
                 ("References to resources were found which were not scanned: " f"{orphan_refs}.")
             )
 
-    def _resolve_duplicates(self) -> None:
-        """Resolve any duplicate resource ids.  In general duplicate resource ids can
-        have their Resource objects merged if they are of the same type and all fields
-        are identical or additive only across the resources or if one of the Resources
-        allows a special merge via its ResourceSpec class' `allow_clobber` attribute."""
-        resource_ids_resources: DefaultDict[str, List[Resource]] = defaultdict(list)
-        for resource in self.resources:
-            resource_ids_resources[resource.resource_id].append(resource)
-        merged_resources: List[Resource] = []
-        for resource_id, resources in resource_ids_resources.items():
-            if len(resources) > 1:
-                merged_resource = ResourceSpec.merge_resources(
-                    resource_id=resource_id, resources=resources
+    def _add_resources(self, resources: List[Resource]) -> None:
+        """Add resources to this GraphSet, resolving any duplicate resource ids.  In general
+        duplicate resource ids can have their Resource objects merged if they are of the same
+        type and all fields are identical or additive only across the resources or if one of
+        the Resources allows a special merge via its ResourceSpec class' `allow_clobber`
+        attribute.
+
+        Only the incoming resource ids are checked against the existing resource index. As
+        before, merged resources are removed from their original positions and appended after
+        the other resources in the order their resource ids were first seen.
+
+        Args:
+            resources: Resource objects to add
+        """
+        resource_ids_resources: Dict[str, List[Resource]] = {}
+        for resource in resources:
+            resource_id = resource.resource_id
+            duplicate_resources = resource_ids_resources.get(resource_id)
+            if duplicate_resources is None:
+                existing_index = self._resource_ids_indexes.get(resource_id)
+                if existing_index is None:
+                    self._resource_ids_indexes[resource_id] = len(self.resources)
+                    self.resources.append(resource)
+                    resource_ids_resources[resource_id] = [resource]
+                else:
+                    resource_ids_resources[resource_id] = [
+                        self.resources[existing_index],
+                        resource,
+                    ]
+            else:
+                duplicate_resources.append(resource)
+        merged_resources: Dict[str, Resource] = {}
+        for resource_id, duplicate_resources in sorted(
+            resource_ids_resources.items(), key=lambda item: self._resource_ids_indexes[item[0]],
+        ):
+            if len(duplicate_resources) > 1:
+                merged_resources[resource_id] = ResourceSpec.merge_resources(
+                    resource_id=resource_id, resources=duplicate_resources
                 )
-                merged_resources.append(merged_resource)
-        for merged_resource in merged_resources:
+        if merged_resources:
             self.resources = [
                 resource
                 for resource in self.resources
-                if resource.resource_id != merged_resource.resource_id
+                if resource.resource_id not in merged_resources
             ]
-            self.resources.append(merged_resource)
+            self.resources += merged_resources.values()
+            self._resource_ids_indexes = {
+                resource.resource_id: index for index, resource in enumerate(self.resources)
+            }
 
     @classmethod
     def from_dict(cls: Type["GraphSet"], data: Dict[str, Any]) -> "GraphSet":
@@ -209,8 +369,7 @@ class GraphSet:
     @classmethod
     def from_json_file(cls: Type["GraphSet"], path: Path) -> "GraphSet":
         with path.open("r") as json_fp:
-            json_data = json.load(json_fp)
-            return cls.from_dict(json_data)
+            return GraphSetJSONReader(json_fp).to_graph_set()
 
     def merge(self, other: "GraphSet") -> None:
         """Merge another GraphSet into this GraphSet.
@@ -228,7 +387,134 @@ class GraphSet:
             )
         self.start_time = min(self.start_time, other.start_time)
         self.end_time = max(self.end_time, other.end_time)
-        self.resources += other.resources
-        self._resolve_duplicates()
+        self._add_resources(other.resources)
         self.errors += other.errors
         self.stats.merge(other.stats)
+
+
+def write_graph_set_json(
+    json_fp: TextIO,
+    name: str,
+    version: str,
+    start_time: int,
+    end_time: int,
+    resources: Iterable[Resource],
+    errors: List[str],
+    stats: MultilevelCounter,
+) -> None:
+    """Write GraphSet JSON, as generated by `GraphSet.to_dict`, to a file object one resource
+    at a time.
+
+    Args:
+        json_fp: file object to write to
+        name: graph name
+        version: graph version
+        start_time: epoch scan start time
+        end_time: epoch scan end time
+        resources: Resources in the graph
+        errors: errors encountered during the scan
+        stats: MultilevelCounter of api call stats
+    """
+    json_fp.write("{")
+    for key, value in (
+        ("name", name),
+        ("version", version),
+        ("start_time", start_time),
+        ("end_time", end_time),
+    ):
+        json_fp.write(f"{json.dumps(key)}: {json.dumps(value)}, ")
+    json_fp.write('"resources": {')
+    for i, resource in enumerate(resources):
+        if i:
+            json_fp.write(", ")
+        json_fp.write(json.dumps(resource.resource_id))
+        json_fp.write(": ")
+        json.dump(resource.to_dict(), json_fp, default=json_encoder)
+    json_fp.write("}, ")
+    json_fp.write(f'"errors": {json.dumps(errors)}, ')
+    json_fp.write(f'"stats": {json.dumps(stats.to_dict())}')
+    json_fp.write("}")
+
+
+class GraphSetJSONReader:
+    """Reads GraphSet JSON, as generated by `GraphSet.to_dict`, from a file object one resource
+    at a time without loading the whole document. The file object may be text or utf-8
+    encoded binary.
+
+    The metadata fields (name, version, start_time, end_time, errors, stats) are set as they
+    are encountered in the document, generally name and version are available once the first
+    resource has been read and all fields are available once iteration has finished.
+
+    Args:
+        json_fp: file object to read from
+        chunk_size: number of characters or bytes to read at a time
+    """
+
+    def __init__(self, json_fp: IO[Any], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._parser = JSONStreamParser(json_fp, chunk_size=chunk_size)
+        self.name: Optional[str] = None
+        self.version: Optional[str] = None
+        self.start_time: Optional[int] = None
+        self.end_time: Optional[int] = None
+        self.errors: Optional[List[str]] = None
+        self.stats: Optional[MultilevelCounter] = None
+
+    def iter_resource_dicts(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Iterate over the resources in the document as they are read.
+
+        Yields:
+            (resource_id, resource dict) tuples
+
+        Raises:
+            json.JSONDecodeError if the document is not valid JSON
+            KeyError if a GraphSet field is missing from the document
+        """
+        for key in self._parser.iter_object():
+            if key == "resources":
+                for resource_id in self._parser.iter_object():
+                    yield resource_id, self._parser.read_value()
+            elif key == "stats":
+                self.stats = MultilevelCounter.from_dict(self._parser.read_value())
+            elif key in ("name", "version", "start_time", "end_time", "errors"):
+                setattr(self, key, self._parser.read_value())
+            else:
+                self._parser.read_value()
+        self._parser.read_end()
+        for key in ("name", "version", "start_time", "end_time", "errors", "stats"):
+            if getattr(self, key) is None:
+                raise KeyError(key)
+
+    def iter_resources(self) -> Iterator[Resource]:
+        """Iterate over the Resources in the document as they are read.
+
+        Yields:
+            Resource objects
+        """
+        for resource_id, resource_data in self.iter_resource_dicts():
+            yield Resource.from_dict(resource_id, resource_data)
+
+    def to_graph_set(self) -> GraphSet:
+        """Read the document into a GraphSet.
+
+        Returns:
+            GraphSet object
+        """
+        resources = list(self.iter_resources())
+        if (
+            self.name is None
+            or self.version is None
+            or self.start_time is None
+            or self.end_time is None
+            or self.errors is None
+            or self.stats is None
+        ):
+            raise Exception("BUG: GraphSet fields not set after reading document.")
+        return GraphSet(
+            name=self.name,
+            version=self.version,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            resources=resources,
+            errors=self.errors,
+            stats=self.stats,
+        )
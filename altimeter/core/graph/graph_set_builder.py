@@ -0,0 +1,318 @@
+"""A StreamingGraphSetBuilder assembles a single GraphSet from many GraphSet artifacts
+without holding all of their Resources in memory. The assembled GraphSet can be written as JSON
+or read as a SpooledGraphSet, which streams its Resources from the builder's spool."""
+import json
+import tempfile
+from typing import IO, Any, Dict, Iterator, List, Optional, TextIO
+
+from altimeter.core.artifact_io.graph_set_binary import GraphSetBinaryReader
+from altimeter.core.graph.exceptions import UnmergableGraphSetsException
+from altimeter.core.graph.graph_set import (
+    BaseGraphSet,
+    GraphSet,
+    GraphSetJSONReader,
+    write_graph_set_json,
+)
+from altimeter.core.json_encoder import json_encoder
+from altimeter.core.multilevel_counter import MultilevelCounter
+from altimeter.core.resource.resource import Resource
+from altimeter.core.resource.resource_spec import ResourceSpec
+
+
+class StreamingGraphSetBuilder:
+    """A StreamingGraphSetBuilder assembles a single GraphSet from many GraphSet artifacts
+    (as generated by `GraphSet.to_dict`) without holding all of their Resources in memory.
+
+    Resources are appended to an on-disk spool file as artifacts are added. Only an index
+    of resource ids to spool offsets and positions is kept in memory, which is enough to find
+    duplicate resource ids across artifacts. Duplicates are merged via
+    `ResourceSpec.merge_resources` when the assembled GraphSet is read, producing the same
+    result, in the same order, as merging each artifact's GraphSet with `GraphSet.merge`.
+
+    Args:
+        name: graph name
+        version: graph version
+    """
+
+    def __init__(self, name: str, version: str):
+        self.name = name
+        self.version = version
+        self.start_time: Optional[int] = None
+        self.end_time: Optional[int] = None
+        self.errors: List[str] = []
+        self.stats = MultilevelCounter()
+        self._spool: IO[bytes] = tempfile.TemporaryFile(mode="w+b")
+        self._resource_ids_offsets: Dict[str, int] = {}
+        self._duplicate_resource_ids_offsets: Dict[str, List[int]] = {}
+        # position of each resource id in the assembled GraphSet. As in GraphSet.merge,
+        # resources which are merged with a duplicate are moved after the other resources.
+        self._resource_ids_positions: Dict[str, int] = {}
+        self._next_position = 0
+        self._added_duplicate_resource_ids: List[str] = []
+
+    def __enter__(self) -> "StreamingGraphSetBuilder":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close and remove the spool file."""
+        self._spool.close()
+
+    @property
+    def num_resources(self) -> int:
+        """Number of unique resource ids added to this builder."""
+        return len(self._resource_ids_offsets)
+
+    def has_resource_id(self, resource_id: str) -> bool:
+        """Determine whether a resource with a given id has been added to this builder.
+
+        Args:
+            resource_id: resource id
+
+        Returns:
+            True if a resource with resource_id has been added
+        """
+        return resource_id in self._resource_ids_offsets
+
+    def add_graph_set_dict(self, data: Dict[str, Any]) -> None:
+        """Add a GraphSet dict, as generated by `GraphSet.to_dict`, to this builder.
+
+        Args:
+            data: GraphSet dict
+
+        Raises:
+            UnmergableGraphSetsException if the name or version of data does not match
+            this builder's name or version.
+        """
+        self._validate_name_version(name=data["name"], version=data["version"])
+        self._spool.seek(0, 2)
+        for resource_id, resource_data in data["resources"].items():
+            self._spool_resource_dict(resource_id, resource_data)
+        self._add_metadata(
+            start_time=data["start_time"],
+            end_time=data["end_time"],
+            errors=data["errors"],
+            stats=MultilevelCounter.from_dict(data["stats"]),
+        )
+
+    def add_graph_set_json(self, json_fp: IO[Any]) -> None:
+        """Add GraphSet JSON, as generated by `GraphSet.to_dict`, to this builder reading it
+        from a file object one resource at a time.
+
+        Args:
+            json_fp: text or utf-8 encoded binary file object to read from
+
+        Raises:
+            UnmergableGraphSetsException if the name or version of the GraphSet does not
+            match this builder's name or version.
+        """
+        reader = GraphSetJSONReader(json_fp)
+        validated = False
+        self._spool.seek(0, 2)
+        for resource_id, resource_data in reader.iter_resource_dicts():
+            if not validated and reader.name is not None and reader.version is not None:
+                self._validate_name_version(name=reader.name, version=reader.version)
+                validated = True
+            self._spool_resource_dict(resource_id, resource_data)
+        if (
+            reader.name is None
+            or reader.version is None
+            or reader.start_time is None
+            or reader.end_time is None
+            or reader.errors is None
+            or reader.stats is None
+        ):
+            raise Exception("BUG: GraphSet fields not set after reading document.")
+        if not validated:
+            self._validate_name_version(name=reader.name, version=reader.version)
+        self._add_metadata(
+            start_time=reader.start_time,
+            end_time=reader.end_time,
+            errors=reader.errors,
+            stats=reader.stats,
+        )
+
+    def add_graph_set_binary(self, reader: GraphSetBinaryReader) -> None:
+        """Add a binary GraphSet artifact to this builder.
+
+        Args:
+            reader: GraphSetBinaryReader of the artifact
+
+        Raises:
+            UnmergableGraphSetsException if the name or version of the GraphSet does not
+            match this builder's name or version.
+        """
+        self._validate_name_version(name=reader.name, version=reader.version)
+        self._spool.seek(0, 2)
+        for resource_id, resource_data in reader.iter_resource_dicts():
+            self._spool_resource_dict(resource_id, resource_data)
+        self._add_metadata(
+            start_time=reader.start_time,
+            end_time=reader.end_time,
+            errors=reader.errors,
+            stats=reader.stats,
+        )
+
+    def _validate_name_version(self, name: str, version: str) -> None:
+        if name != self.name:
+            raise UnmergableGraphSetsException(
+                f"Unable to merge graph with name {name} into {self.name}"
+            )
+        if version != self.version:
+            raise UnmergableGraphSetsException(
+                f"Unable to merge graph with version {version} into {self.version}"
+            )
+
+    def _spool_resource_dict(self, resource_id: str, resource_data: Dict[str, Any]) -> None:
+        offset = self._spool.tell()
+        spool_line = json.dumps([resource_id, resource_data], default=json_encoder) + "\n"
+        self._spool.write(spool_line.encode("utf-8"))
+        first_offset = self._resource_ids_offsets.get(resource_id)
+        if first_offset is None:
+            self._resource_ids_offsets[resource_id] = offset
+            self._resource_ids_positions[resource_id] = self._next_position
+            self._next_position += 1
+        else:
+            self._duplicate_resource_ids_offsets.setdefault(resource_id, [first_offset]).append(
+                offset
+            )
+            self._added_duplicate_resource_ids.append(resource_id)
+
+    def _add_metadata(
+        self, start_time: int, end_time: int, errors: List[str], stats: MultilevelCounter
+    ) -> None:
+        for resource_id in sorted(
+            set(self._added_duplicate_resource_ids), key=self._resource_ids_positions.__getitem__,
+        ):
+            self._resource_ids_positions[resource_id] = self._next_position
+            self._next_position += 1
+        self._added_duplicate_resource_ids = []
+        if self.start_time is None or start_time < self.start_time:
+            self.start_time = start_time
+        if self.end_time is None or end_time > self.end_time:
+            self.end_time = end_time
+        self.errors += errors
+        self.stats.merge(stats)
+
+    def _read_spooled_resource(self, offset: int) -> Resource:
+        self._spool.seek(offset)
+        resource_id, resource_data = json.loads(self._spool.readline())
+        return Resource.from_dict(resource_id, resource_data)
+
+    def resources(self) -> Iterator[Resource]:
+        """Iterate over the Resources added to this builder in the order `GraphSet.merge`
+        would leave them, merging any duplicate resource ids.
+
+        Yields:
+            Resource objects
+
+        Raises:
+            UnmergableDuplicateResourceIdsFoundException if duplicate resources could not be
+            merged.
+        """
+        self._spool.flush()
+        for resource_id in sorted(
+            self._resource_ids_positions, key=self._resource_ids_positions.__getitem__
+        ):
+            duplicate_offsets = self._duplicate_resource_ids_offsets.get(resource_id)
+            if duplicate_offsets is None:
+                yield self._read_spooled_resource(self._resource_ids_offsets[resource_id])
+            else:
+                duplicate_resources = [
+                    self._read_spooled_resource(duplicate_offset)
+                    for duplicate_offset in duplicate_offsets
+                ]
+                yield ResourceSpec.merge_resources(
+                    resource_id=resource_id, resources=duplicate_resources
+                )
+
+    def write_json(self, json_fp: TextIO) -> None:
+        """Write the assembled GraphSet as JSON to a file object, one resource at a time.
+        The output is equivalent to `json.dump(graph_set.to_dict(), json_fp)`.
+
+        Args:
+            json_fp: file object to write to
+        """
+        if self.start_time is None or self.end_time is None:
+            raise ValueError("No GraphSets have been added to this builder.")
+        write_graph_set_json(
+            json_fp=json_fp,
+            name=self.name,
+            version=self.version,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            resources=self.resources(),
+            errors=self.errors,
+            stats=self.stats,
+        )
+
+    def to_spooled_graph_set(self) -> "SpooledGraphSet":
+        """Get a SpooledGraphSet reading the contents of this builder. Closing the
+        SpooledGraphSet closes this builder.
+
+        Returns:
+            SpooledGraphSet object
+        """
+        return SpooledGraphSet(self)
+
+    def to_graph_set(self) -> GraphSet:
+        """Build a GraphSet from the contents of this builder. This holds all Resources in
+        memory, `to_spooled_graph_set` should be used where the Resources are only read once.
+
+        Returns:
+            GraphSet object
+        """
+        if self.start_time is None or self.end_time is None:
+            raise ValueError("No GraphSets have been added to this builder.")
+        return GraphSet(
+            name=self.name,
+            version=self.version,
+            start_time=self.start_time,
+            end_time=self.end_time,
+            resources=list(self.resources()),
+            errors=self.errors,
+            stats=self.stats,
+        )
+
+
+class SpooledGraphSet(BaseGraphSet):
+    """A GraphSet whose Resources are read from a StreamingGraphSetBuilder's spool each time
+    they are iterated rather than held in memory. It supports the serializations of
+    BaseGraphSet, e.g. `write_rdf`, and must be closed to remove the spool.
+
+    Args:
+        builder: StreamingGraphSetBuilder to read from
+    """
+
+    def __init__(self, builder: StreamingGraphSetBuilder):
+        if builder.start_time is None or builder.end_time is None:
+            raise ValueError("No GraphSets have been added to this builder.")
+        super().__init__(
+            name=builder.name,
+            version=builder.version,
+            start_time=builder.start_time,
+            end_time=builder.end_time,
+            errors=builder.errors,
+            stats=builder.stats,
+        )
+        self._builder = builder
+
+    def __enter__(self) -> "SpooledGraphSet":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the builder and remove its spool file."""
+        self._builder.close()
+
+    def iter_resources(self) -> Iterator[Resource]:
+        """Iterate over the Resources of this GraphSet, reading them from the spool.
+
+        Returns:
+            iterator of Resource objects
+        """
+        return self._builder.resources()
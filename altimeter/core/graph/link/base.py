@@ -2,9 +2,10 @@ import abc
 import inspect
 from typing import Any, Dict, List
 
-from rdflib import BNode, Namespace, Graph
+from rdflib import BNode, Namespace
 
 from altimeter.core.graph.node_cache import NodeCache
+from altimeter.core.graph.rdf_stream import TripleSink
 
 
 class Link(abc.ABC):
@@ -54,7 +55,7 @@ class Link(abc.ABC):
 
     @abc.abstractmethod
     def to_rdf(
-        self, subj: BNode, namespace: Namespace, graph: Graph, node_cache: NodeCache
+        self, subj: BNode, namespace: Namespace, graph: TripleSink, node_cache: NodeCache
     ) -> None:
         """Graph this link on a BNode in a Graph using a given Namespace to create the full
         predicate.
@@ -62,7 +63,7 @@ class Link(abc.ABC):
         Args:
              subj: subject portion of triple - graph this link's pred, obj against it.
              namespace: RDF namespace to use for this triple's predicate
-             graph: RDF graph
+             graph: RDF graph or other TripleSink to add triples to
              node_cache: NodeCache to use to find cached nodes.
         """
 
@@ -2,11 +2,12 @@
 import uuid
 from typing import Any, Dict, Type, List
 
-from rdflib import BNode, Graph, Literal, Namespace, RDF, XSD
+from rdflib import BNode, Literal, Namespace, RDF, XSD
 
 from altimeter.core.graph.exceptions import LinkParseException
 from altimeter.core.graph.link.base import Link
 from altimeter.core.graph.node_cache import NodeCache
+from altimeter.core.graph.rdf_stream import TripleSink
 
 
 class SimpleLink(Link):
@@ -16,7 +17,7 @@ class SimpleLink(Link):
     field_type = "simple"
 
     def to_rdf(
-        self, subj: BNode, namespace: Namespace, graph: Graph, node_cache: NodeCache
+        self, subj: BNode, namespace: Namespace, graph: TripleSink, node_cache: NodeCache
     ) -> None:
         """Graph this link on a BNode in a Graph using a given Namespace to create the full
         predicate.
@@ -24,7 +25,7 @@ class SimpleLink(Link):
         Args:
              subj: subject portion of triple - graph this link's pred, obj against it.
              namespace: RDF namespace to use for this triple's predicate
-             graph: RDF graph
+             graph: RDF graph or other TripleSink to add triples to
              node_cache: NodeCache to use to find cached nodes.
         """
         datatype = None
@@ -74,7 +75,7 @@ class MultiLink(Link):
         }
 
     def to_rdf(
-        self, subj: BNode, namespace: Namespace, graph: Graph, node_cache: NodeCache
+        self, subj: BNode, namespace: Namespace, graph: TripleSink, node_cache: NodeCache
     ) -> None:
         """Graph this link on a BNode in a Graph using a given Namespace to create the full
         predicate.
@@ -82,7 +83,7 @@ class MultiLink(Link):
         Args:
              subj: subject portion of triple - graph this link's pred, obj against it.
              namespace: RDF namespace to use for this triple's predicate
-             graph: RDF graph
+             graph: RDF graph or other TripleSink to add triples to
              node_cache: NodeCache to use to find cached nodes.
         """
         map_node = BNode()
@@ -127,7 +128,7 @@ class ResourceLinkLink(Link):
     field_type = "resource_link"
 
     def to_rdf(
-        self, subj: BNode, namespace: Namespace, graph: Graph, node_cache: NodeCache
+        self, subj: BNode, namespace: Namespace, graph: TripleSink, node_cache: NodeCache
     ) -> None:
         """Graph this link on a BNode in a Graph using a given Namespace to create the full
         predicate.
@@ -135,7 +136,7 @@ class ResourceLinkLink(Link):
         Args:
              subj: subject portion of triple - graph this link's pred, obj against it.
              namespace: RDF namespace to use for this triple's predicate
-             graph: RDF graph
+             graph: RDF graph or other TripleSink to add triples to
              node_cache: NodeCache to use to find cached nodes.
         """
         link_node = node_cache.setdefault(self.obj, BNode())
@@ -167,7 +168,7 @@ class TransientResourceLinkLink(Link):
     field_type = "transient_resource_link"
 
     def to_rdf(
-        self, subj: BNode, namespace: Namespace, graph: Graph, node_cache: NodeCache
+        self, subj: BNode, namespace: Namespace, graph: TripleSink, node_cache: NodeCache
     ) -> None:
         """Graph this link on a BNode in a Graph using a given Namespace to create the full
         predicate.
@@ -175,7 +176,7 @@ class TransientResourceLinkLink(Link):
         Args:
              subj: subject portion of triple - graph this link's pred, obj against it.
              namespace: RDF namespace to use for this triple's predicate
-             graph: RDF graph
+             graph: RDF graph or other TripleSink to add triples to
              node_cache: NodeCache to use to find cached nodes.
         """
         link_node = node_cache.setdefault(self.obj, BNode())
@@ -207,7 +208,7 @@ class TagLink(Link):
     field_type = "tag"
 
     def to_rdf(
-        self, subj: BNode, namespace: Namespace, graph: Graph, node_cache: NodeCache
+        self, subj: BNode, namespace: Namespace, graph: TripleSink, node_cache: NodeCache
     ) -> None:
         """Graph this link on a BNode in a Graph using a given Namespace to create the full
         predicate.
@@ -215,7 +216,7 @@ class TagLink(Link):
         Args:
              subj: subject portion of triple - graph this link's pred, obj against it.
              namespace: RDF namespace to use for this triple's predicate
-             graph: RDF graph
+             graph: RDF graph or other TripleSink to add triples to
              node_cache: NodeCache to use to find cached nodes.
         """
         tag_id = f"{self.pred}:{self.obj}"
@@ -0,0 +1,137 @@
+"""An RDFStreamWriter writes the triples of a graph as N-Triples or N-Quads as they are
+generated, without building an rdflib Graph. Resource and Link `to_rdf` methods graph
+themselves by calling `add` on a TripleSink, which is either an rdflib Graph or an
+RDFStreamWriter, so both produce the same triples. Memory use is bounded by the NodeCache of
+resource and tag nodes rather than by the number of triples."""
+from typing import IO, Any, List, Optional, Protocol, Tuple
+
+from rdflib import BNode, Literal, URIRef
+
+# format names are those of the Neptune bulk loader
+RDF_FORMAT_RDFXML = "rdfxml"
+RDF_FORMAT_NTRIPLES = "ntriples"
+RDF_FORMAT_NQUADS = "nquads"
+RDF_FORMATS = (RDF_FORMAT_RDFXML, RDF_FORMAT_NTRIPLES, RDF_FORMAT_NQUADS)
+RDF_STREAM_FORMATS = (RDF_FORMAT_NTRIPLES, RDF_FORMAT_NQUADS)
+RDF_FORMAT_EXTENSIONS = {
+    RDF_FORMAT_RDFXML: "rdf",
+    RDF_FORMAT_NTRIPLES: "nt",
+    RDF_FORMAT_NQUADS: "nq",
+}
+DEFAULT_RDF_STREAM_BUFFER_SIZE = 64 * 1024
+
+
+class TripleSink(Protocol):
+    """Anything triples can be graphed on, e.g. an rdflib Graph or an RDFStreamWriter"""
+
+    def add(self, triple: Tuple[Any, Any, Any]) -> Any:
+        """Add a (subject, predicate, object) triple"""
+
+
+def _escape_literal(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+
+
+def term_to_ntriples(term: Any, skolem_base: Optional[str] = None) -> str:
+    """Get the N-Triples representation of an rdflib term
+
+    Args:
+        term: rdflib URIRef, BNode or Literal
+        skolem_base: if set, BNodes are replaced by skolem IRIs - skolem_base followed by the
+                     BNode id. Unlike BNodes these refer to the same node in every file they
+                     are written to.
+
+    Returns:
+        N-Triples representation of term
+
+    Raises:
+        ValueError if term is not a URIRef, BNode or Literal
+    """
+    if isinstance(term, Literal):
+        quoted = f'"{_escape_literal(str(term))}"'
+        if term.language:
+            return f"{quoted}@{term.language}"
+        if term.datatype:
+            return f"{quoted}^^<{term.datatype}>"
+        return quoted
+    if isinstance(term, BNode):
+        if skolem_base is not None:
+            return f"<{skolem_base}{term}>"
+        return f"_:{term}"
+    if isinstance(term, URIRef):
+        return f"<{term}>"
+    raise ValueError(f"Unable to serialize {term!r} as N-Triples")
+
+
+class RDFStreamWriter:
+    """Writes triples to a binary file object as utf-8 N-Triples or N-Quads lines. Lines are
+    buffered and written in chunks of about buffer_size characters, `flush` must be called
+    after the last triple is added.
+
+    Args:
+        fp: binary file object to write to
+        rdf_format: RDF_FORMAT_NTRIPLES or RDF_FORMAT_NQUADS
+        graph_iri: IRI of the named graph of N-Quads lines. Required for N-Quads,
+                   not allowed for N-Triples.
+        buffer_size: approximate number of characters to buffer between writes to fp. Each
+                     write to fp contains only whole lines.
+        skolem_base: if set, BNodes are written as skolem IRIs, see `term_to_ntriples`
+    """
+
+    def __init__(
+        self,
+        fp: IO[bytes],
+        rdf_format: str = RDF_FORMAT_NTRIPLES,
+        graph_iri: Optional[str] = None,
+        buffer_size: int = DEFAULT_RDF_STREAM_BUFFER_SIZE,
+        skolem_base: Optional[str] = None,
+    ):
+        if rdf_format == RDF_FORMAT_NTRIPLES:
+            if graph_iri is not None:
+                raise ValueError(f"graph_iri is not supported by {RDF_FORMAT_NTRIPLES}")
+            self._line_suffix = " .\n"
+        elif rdf_format == RDF_FORMAT_NQUADS:
+            if graph_iri is None:
+                raise ValueError(f"graph_iri is required by {RDF_FORMAT_NQUADS}")
+            self._line_suffix = f" <{graph_iri}> .\n"
+        else:
+            raise ValueError(
+                f"Unknown rdf_format {rdf_format}, expected one of {RDF_STREAM_FORMATS}"
+            )
+        self.fp = fp
+        self.rdf_format = rdf_format
+        self.graph_iri = graph_iri
+        self.buffer_size = buffer_size
+        self.skolem_base = skolem_base
+        self.triple_count = 0
+        self._lines: List[str] = []
+        self._buffered_size = 0
+
+    def add(self, triple: Tuple[Any, Any, Any]) -> "RDFStreamWriter":
+        """Write a (subject, predicate, object) triple
+
+        Args:
+            triple: tuple of rdflib terms
+
+        Returns:
+            this RDFStreamWriter, as rdflib's Graph.add returns the Graph
+        """
+        subj, pred, obj = triple
+        skolem_base = self.skolem_base
+        line = (
+            f"{term_to_ntriples(subj, skolem_base)} {term_to_ntriples(pred, skolem_base)} "
+            f"{term_to_ntriples(obj, skolem_base)}{self._line_suffix}"
+        )
+        self._lines.append(line)
+        self._buffered_size += len(line)
+        self.triple_count += 1
+        if self._buffered_size >= self.buffer_size:
+            self.flush()
+        return self
+
+    def flush(self) -> None:
+        """Write any buffered lines to fp"""
+        if self._lines:
+            self.fp.write("".join(self._lines).encode("utf-8"))
+            self._lines = []
+            self._buffered_size = 0
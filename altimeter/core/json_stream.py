@@ -0,0 +1,143 @@
+"""Incremental parsing of large JSON documents. A JSONStreamParser reads a document from a
+file object in chunks, allowing large objects to be iterated key by key while only the
+value currently being parsed is held in memory."""
+import codecs
+import json
+from typing import IO, Any, Iterator
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+JSON_WHITESPACE = " \t\n\r"
+JSON_NUMBER_CHARS = "0123456789+-.eE"
+
+
+class JSONStreamParser:
+    """Parses a JSON document incrementally from a text or binary (utf-8) file object.
+
+    Values are parsed with `read_value` and objects are iterated with `iter_object`, which
+    yields each key - the caller must then consume that key's value with `read_value` or
+    `iter_object` before continuing iteration. For example, to read the items of a
+    top-level object:
+
+        parser = JSONStreamParser(json_fp)
+        for key in parser.iter_object():
+            value = parser.read_value()
+
+    Args:
+        json_fp: file object to read from
+        chunk_size: number of characters or bytes to read at a time
+    """
+
+    def __init__(self, json_fp: IO[Any], chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._json_fp = json_fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._bytes_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read more of the document into the buffer, discarding parsed data. The amount
+        read grows with the unparsed buffer size so that re-parsing a large value after
+        each read stays linear overall.
+
+        Returns:
+            False if the end of the document has been reached
+        """
+        if self._eof:
+            return False
+        unparsed = self._buffer[self._pos :]
+        while True:
+            chunk = self._json_fp.read(max(self._chunk_size, len(unparsed)))
+            if not isinstance(chunk, bytes):
+                break
+            # a chunk may end within a multi-byte character, in which case nothing is decoded
+            decoded_chunk = self._bytes_decoder.decode(chunk, final=not chunk)
+            if decoded_chunk or not chunk:
+                chunk = decoded_chunk
+                break
+        if not chunk:
+            self._eof = True
+        self._buffer = unparsed + chunk
+        self._pos = 0
+        return not self._eof
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, or an empty string at the end of
+        the document."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in JSON_WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """Parse the next JSON value.
+
+        Returns:
+            parsed value
+
+        Raises:
+            json.JSONDecodeError if the document is not valid JSON
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # a number may have been truncated at the end of the buffer, e.g. 1.5 read as 1
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and (end == len(self._buffer) or self._buffer[end] in JSON_NUMBER_CHARS)
+                and self._fill()
+            ):
+                continue
+            self._pos = end
+            return value
+
+    def iter_object(self) -> Iterator[str]:
+        """Iterate over the keys of the next JSON value, which must be an object. After each
+        key is yielded its value must be consumed before iteration continues.
+
+        Yields:
+            object keys
+
+        Raises:
+            json.JSONDecodeError if the document is not valid JSON
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self._peek() != '"':
+                raise json.JSONDecodeError("Expecting property name", self._buffer, self._pos)
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            next_char = self._peek()
+            self._pos += 1
+            if next_char == "}":
+                return
+            if next_char != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", self._buffer, self._pos - 1)
+
+    def read_end(self) -> None:
+        """Verify that only whitespace remains in the document.
+
+        Raises:
+            json.JSONDecodeError if there is extra data
+        """
+        if self._peek():
+            raise json.JSONDecodeError("Extra data", self._buffer, self._pos)
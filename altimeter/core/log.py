@@ -146,6 +146,17 @@ class BaseLogger:
         """
         self._get_current_logger().error(event=event.name, **kwargs)
 
+    def get_bindings(self) -> Dict[str, Any]:
+        """Get the k/vs currently bound to the logger in this thread, excluding the thread id.
+        This can be used to carry bindings over to worker threads.
+
+        Returns:
+            dict of bound k/vs
+        """
+        bindings = dict(self._get_current_logger()._context)
+        bindings.pop("tid", None)
+        return bindings
+
     @contextmanager
     def bind(self, **bindings: Any) -> structlog.BoundLogger:
         """Context manager to bind a set of k/vs to the logger.  The k/vs will be removed
@@ -7,6 +7,8 @@ from altimeter.core.log import BaseLogEvent, EventName
 class LogEvent(BaseLogEvent):
     """Contains EventNames for logging."""
 
+    ArtifactContentExists: EventName
+
     AuthToAccountStart: EventName
     AuthToAccountEnd: EventName
     AuthToAccountFailure: EventName
@@ -27,6 +29,7 @@ class LogEvent(BaseLogEvent):
     NeptuneGremlinWriteStart: EventName
     NeptuneGremlinWriteEnd: EventName
     NeptunePeriodicWrite: EventName
+    NeptuneGremlinWriteStats: EventName
 
     PruneNeptuneGraphStart: EventName
     PruneNeptuneGraphEnd: EventName
@@ -45,6 +48,8 @@ class LogEvent(BaseLogEvent):
     ReadFromS3Start: EventName
     ReadFromS3End: EventName
 
+    ReadFromArtifactCache: EventName
+
     ScanResourceTypeStart: EventName
     ScanResourceTypeEnd: EventName
 
@@ -9,6 +9,7 @@ from typing import Dict, List, Optional, Set, Tuple
 
 from aws_requests_auth.aws_auth import AWSRequestsAuth
 import boto3
+from botocore.client import BaseClient
 
 from gremlin_python.process.graph_traversal import __
 from gremlin_python.process.anonymous_traversal import traversal
@@ -18,6 +19,7 @@ from tornado import httpclient
 from urllib import parse
 
 from altimeter.core.exceptions import AltimeterException
+from altimeter.core.graph.rdf_stream import RDF_FORMAT_RDFXML, RDF_FORMATS
 from altimeter.core.log import Logger
 from altimeter.core.log_events import LogEvent
 from altimeter.core.neptune.exceptions import (
@@ -28,12 +30,22 @@ from altimeter.core.neptune.exceptions import (
     NeptuneQueryException,
     NeptuneUpdateGraphException,
 )
+from altimeter.core.neptune.graph_uri import GRAPH_BASE_URI, get_graph_uri
+from altimeter.core.neptune.gremlin_writer import (
+    DEFAULT_LPG_BATCH_SIZE,
+    DEFAULT_LPG_CONNECTIONS,
+    GremlinWriteStats,
+    ParallelGremlinWriter,
+)
 from altimeter.core.neptune.results import QueryResult, QueryResultSet
 from altimeter.core.neptune.sparql import finalize_query
 
-GRAPH_BASE_URI = "https://alti"
 META_GRAPH_NAME = f"{GRAPH_BASE_URI}/__meta__"
 SESSION_LIFETIME_MINUTES = 5
+LOAD_PARALLELISMS = ("LOW", "MEDIUM", "HIGH", "OVERSUBSCRIBE")
+DEFAULT_LOAD_PARALLELISM = "MEDIUM"
+# tags which must be the same on every shard of a sharded graph
+GRAPH_SHARD_TAG_KEYS = ("name", "version", "start_time", "end_time", "format")
 
 
 def get_required_tag_value(tag_set: List[Dict[str, str]], key: str) -> str:
@@ -56,6 +68,66 @@ def get_required_tag_value(tag_set: List[Dict[str, str]], key: str) -> str:
     raise ValueError(f"Required tag key {key} not found in {tag_set}")
 
 
+def get_optional_tag_value(tag_set: List[Dict[str, str]], key: str) -> Optional[str]:
+    """Get a tag value from a TagSet if present.
+
+    Args:
+        tag_set: list of dicts, each of which contains keys 'Key' and 'Value'.
+        key: tag key string
+
+    Returns:
+        tag value string if key is present in tag_set, else None
+    """
+    try:
+        return get_required_tag_value(tag_set, key)
+    except ValueError:
+        return None
+
+
+def get_graph_shards_tag_set(
+    s3_client: BaseClient, bucket: str, prefix: str
+) -> List[Dict[str, str]]:
+    """Get the TagSet of a sharded graph written by ArtifactWriter.write_graph_set. Every
+    shard is tagged with the graph's details, these are checked to be the same for all
+    shards under prefix so that shards of different graphs are never loaded as one graph.
+
+    Args:
+        s3_client: boto3 s3 client
+        bucket: s3 bucket of graph shards
+        prefix: s3 key prefix of graph shards
+
+    Returns:
+        TagSet of the shards
+
+    Raises:
+        NeptuneLoadGraphException if there are no shards under prefix or their tags differ
+    """
+    shard_keys: List[str] = []
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for resp in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        shard_keys += [obj["Key"] for obj in resp.get("Contents", [])]
+    if not shard_keys:
+        raise NeptuneLoadGraphException(f"No graph shards found under s3://{bucket}/{prefix}")
+    tag_set: Optional[List[Dict[str, str]]] = None
+    graph_tags: Optional[Dict[str, Optional[str]]] = None
+    for shard_key in shard_keys:
+        shard_tag_set = s3_client.get_object_tagging(Bucket=bucket, Key=shard_key)["TagSet"]
+        shard_graph_tags = {
+            tag_key: get_optional_tag_value(shard_tag_set, tag_key)
+            for tag_key in GRAPH_SHARD_TAG_KEYS
+        }
+        if graph_tags is None:
+            tag_set, graph_tags = shard_tag_set, shard_graph_tags
+        elif shard_graph_tags != graph_tags:
+            raise NeptuneLoadGraphException(
+                f"Graph shard s3://{bucket}/{shard_key} tags {shard_graph_tags} differ from "
+                f"{graph_tags} of other shards under s3://{bucket}/{prefix}"
+            )
+    if tag_set is None:
+        raise Exception("BUG: tag_set should be set for at least one shard")
+    return tag_set
+
+
 @dataclass(frozen=True)
 class NeptuneEndpoint:
     """Represents an AWS Neptune endpoint.
@@ -204,12 +276,27 @@ class AltimeterNeptuneClient:
         query_result_set = self.run_raw_query(finalized_query)
         return QueryResult(graph_uris_load_times, query_result_set)
 
-    def load_graph(self, bucket: str, key: str, load_iam_role_arn: str) -> GraphMetadata:
-        """Load a graph into Neptune.
+    def load_graph(
+        self,
+        bucket: str,
+        key: str,
+        load_iam_role_arn: str,
+        rdf_format: Optional[str] = None,
+        parallelism: str = DEFAULT_LOAD_PARALLELISM,
+    ) -> GraphMetadata:
+        """Load a graph into Neptune. The graph is registered in the metadata graph only once
+        the whole graph has loaded successfully.
         Args:
              bucket: s3 bucket of graph rdf
-             key: s3 key of graph rdf
+             key: s3 key of graph rdf. If key ends with / it is the prefix of a sharded graph
+                  written by ArtifactWriter.write_graph_set and all shards under it are loaded
+                  by a single load.
              load_iam_role_arn: arn of iam role used to load the graph
+             rdf_format: RDF_FORMAT_RDFXML, RDF_FORMAT_NTRIPLES or RDF_FORMAT_NQUADS. If not
+                         set the format is read from the graph rdf's 'format' tag, which is
+                         set by ArtifactWriter.write_graph_set, defaulting to RDF/XML if the
+                         tag is absent.
+             parallelism: Neptune loader parallelism, one of LOAD_PARALLELISMS
 
         Returns:
             GraphMetadata object describing loaded graph
@@ -217,16 +304,27 @@ class AltimeterNeptuneClient:
         Raises:
             NeptuneLoadGraphException if errors occur during graph load
         """
+        if parallelism not in LOAD_PARALLELISMS:
+            raise ValueError(
+                f"Unknown parallelism {parallelism}, expected one of {LOAD_PARALLELISMS}"
+            )
         session = boto3.Session(region_name=self._neptune_endpoint.region)
         s3_client = session.client("s3")
-        rdf_object_tagging = s3_client.get_object_tagging(Bucket=bucket, Key=key)
-        tag_set = rdf_object_tagging["TagSet"]
+        if key.endswith("/"):
+            tag_set = get_graph_shards_tag_set(s3_client=s3_client, bucket=bucket, prefix=key)
+        else:
+            rdf_object_tagging = s3_client.get_object_tagging(Bucket=bucket, Key=key)
+            tag_set = rdf_object_tagging["TagSet"]
         graph_name = get_required_tag_value(tag_set, "name")
         graph_version = get_required_tag_value(tag_set, "version")
         graph_start_time = int(get_required_tag_value(tag_set, "start_time"))
         graph_end_time = int(get_required_tag_value(tag_set, "end_time"))
+        if rdf_format is None:
+            rdf_format = get_optional_tag_value(tag_set, "format") or RDF_FORMAT_RDFXML
+        if rdf_format not in RDF_FORMATS:
+            raise ValueError(f"Unknown rdf_format {rdf_format}, expected one of {RDF_FORMATS}")
         graph_metadata = GraphMetadata(
-            uri=f"{GRAPH_BASE_URI}/{graph_name}/{graph_version}/{graph_end_time}",
+            uri=get_graph_uri(name=graph_name, version=graph_version, end_time=graph_end_time),
             name=graph_name,
             version=graph_version,
             start_time=graph_start_time,
@@ -236,6 +334,7 @@ class AltimeterNeptuneClient:
         with logger.bind(
             rdf_bucket=bucket,
             rdf_key=key,
+            rdf_format=rdf_format,
             graph_uri=graph_metadata.uri,
             neptune_endpoint=self._neptune_endpoint.get_endpoint_str(),
         ):
@@ -251,11 +350,11 @@ class AltimeterNeptuneClient:
             )
             post_body = {
                 "source": f"s3://{bucket}/{key}",
-                "format": "rdfxml",
+                "format": rdf_format,
                 "iamRoleArn": load_iam_role_arn,
                 "region": self._neptune_endpoint.region,
                 "failOnError": "TRUE",
-                "parallelism": "MEDIUM",
+                "parallelism": parallelism,
                 "parserConfiguration": {
                     "baseUri": GRAPH_BASE_URI,
                     "namedGraphUri": graph_metadata.uri,
@@ -684,100 +783,69 @@ class AltimeterNeptuneClient:
 
         return graph_traversal_source, gremlin_connection
 
-    def __write_vertices(self, g: traversal, vertices: List[Dict], scan_id: str) -> None:
+    def __add_vertex(self, t: traversal, vertex: Dict, scan_id: str) -> traversal:
         """
-        Writes the vertices to the labeled property graph
-        :param g: The graph traversal source
-        :param vertices: A list of dictionaries for each vertex
-        :return: None
+        Chains the steps writing a vertex to the labeled property graph onto a traversal
+        :param t: The traversal or graph traversal source
+        :param vertex: A dictionary for the vertex
+        :param scan_id: The unique string representing the scan
+        :return: The traversal
+        """
+        vertex_id = f'{vertex["~id"]}_{scan_id}'
+        t = (
+            t.V(vertex_id)
+            .fold()
+            .coalesce(
+                __.unfold(),
+                __.addV(self.parse_arn(vertex["~label"])["resource"]).property(T.id, vertex_id),
+            )
+        )
+        for k in vertex.keys():
+            # Need to handle numbers that are bigger than a Long in Java, for now we stringify it
+            if isinstance(vertex[k], int) and (
+                vertex[k] > 9223372036854775807 or vertex[k] < -9223372036854775807
+            ):
+                vertex[k] = str(vertex[k])
+            if k not in ["~id", "~label"]:
+                t = t.property(k, vertex[k])
+        return t
+
+    def __add_edge(self, t: traversal, edge: Dict, scan_id: str) -> traversal:
+        """
+        Chains the steps writing an edge to the labeled property graph onto a traversal
+        :param t: The traversal or graph traversal source
+        :param edge: A dictionary for the edge
+        :param scan_id: The unique string representing the scan
+        :return: The traversal
         """
-        cnt = 0
-        t = g
-        for r in vertices:
-            vertex_id = f'{r["~id"]}_{scan_id}'
-            t = (
-                t.V(vertex_id)
+        to_id = f'{edge["~to"]}_{scan_id}'
+        from_id = f'{edge["~from"]}_{scan_id}'
+        return (
+            t.addE(edge["~label"])
+            .property(T.id, str(edge["~id"]))
+            .from_(
+                __.V(from_id)
                 .fold()
                 .coalesce(
                     __.unfold(),
-                    __.addV(self.parse_arn(r["~label"])["resource"]).property(T.id, vertex_id),
+                    __.addV(self.parse_arn(edge["~from"])["resource"])
+                    .property(T.id, from_id)
+                    .property("scan_id", scan_id)
+                    .property("arn", edge["~from"]),
                 )
             )
-            for k in r.keys():
-                # Need to handle numbers that are bigger than a Long in Java, for now we stringify it
-                if isinstance(r[k], int) and (
-                    r[k] > 9223372036854775807 or r[k] < -9223372036854775807
-                ):
-                    r[k] = str(r[k])
-                if k not in ["~id", "~label"]:
-                    t = t.property(k, r[k])
-            cnt += 1
-            if cnt % 100 == 0 or cnt == len(vertices):
-                try:
-                    self.logger.info(
-                        event=LogEvent.NeptunePeriodicWrite,
-                        msg=f"Writing vertices {cnt} of {len(vertices)}",
-                    )
-                    t.next()
-                    t = g
-                except Exception as err:
-                    print(str(err))
-                    raise NeptuneLoadGraphException(
-                        f"Error loading vertex {r} " f"with {str(t.bytecode)}"
-                    )
-
-    def __write_edges(self, g: traversal, edges: List[Dict], scan_id: str) -> None:
-        """
-        Writes the edges to the labeled property graph
-        :param g: The graph traversal source
-        :param edges: A list of dictionaries for each edge
-        :return: None
-        """
-        cnt = 0
-        t = g
-        for r in edges:
-            to_id = f'{r["~to"]}_{scan_id}'
-            from_id = f'{r["~from"]}_{scan_id}'
-            t = (
-                t.addE(r["~label"])
-                .property(T.id, str(r["~id"]))
-                .from_(
-                    __.V(from_id)
-                    .fold()
-                    .coalesce(
-                        __.unfold(),
-                        __.addV(self.parse_arn(r["~from"])["resource"])
-                        .property(T.id, from_id)
-                        .property("scan_id", scan_id)
-                        .property("arn", r["~from"]),
-                    )
-                )
-                .to(
-                    __.V(to_id)
-                    .fold()
-                    .coalesce(
-                        __.unfold(),
-                        __.addV(self.parse_arn(r["~to"])["resource"])
-                        .property(T.id, to_id)
-                        .property("scan_id", scan_id)
-                        .property("arn", r["~to"]),
-                    )
+            .to(
+                __.V(to_id)
+                .fold()
+                .coalesce(
+                    __.unfold(),
+                    __.addV(self.parse_arn(edge["~to"])["resource"])
+                    .property(T.id, to_id)
+                    .property("scan_id", scan_id)
+                    .property("arn", edge["~to"]),
                 )
             )
-            cnt += 1
-            if cnt % 100 == 0 or cnt == len(edges):
-                try:
-                    self.logger.info(
-                        event=LogEvent.NeptunePeriodicWrite,
-                        msg=f"Writing edges {cnt} of {len(edges)}",
-                    )
-                    t.next()
-                    t = g
-                except Exception as err:
-                    self.logger.error(event=LogEvent.NeptuneLoadError, msg=str(err))
-                    raise NeptuneLoadGraphException(
-                        f"Error loading edge {r} " f"with {str(t.bytecode)}"
-                    )
+        )
 
     @staticmethod
     def parse_arn(arn: str) -> Dict:
@@ -811,18 +879,47 @@ class AltimeterNeptuneClient:
 
         return result
 
-    def write_to_neptune_lpg(self, graph: Dict, scan_id: str) -> None:
+    def write_to_neptune_lpg(
+        self,
+        graph: Dict,
+        scan_id: str,
+        batch_size: int = DEFAULT_LPG_BATCH_SIZE,
+        connections: int = DEFAULT_LPG_CONNECTIONS,
+    ) -> Dict[str, GremlinWriteStats]:
         """
-        Writes the graph to a labeled property graph
+        Writes the graph to a labeled property graph. Vertices and then edges are written in
+        batches over concurrent connections, see ParallelGremlinWriter. Edges are only written
+        once all vertices have been written.
         :param scan_id: The unique string representing the scan
         :param graph: The graph to write
-        :return: None
+        :param batch_size: The number of vertices or edges written per traversal
+        :param connections: The number of concurrent Gremlin connections
+        :return: GremlinWriteStats of the vertex and edge writes keyed by 'vertices' and 'edges'
         """
+        if connections < 1:
+            raise ValueError("connections must be at least 1")
         if "vertices" in graph and "edges" in graph and len(graph["vertices"]) > 0:
-            g, conn = self.connect_to_gremlin()
-            self.__write_vertices(g, graph["vertices"], scan_id)
-            self.__write_edges(g, graph["edges"], scan_id)
-            conn.close()
+            gremlin_connections: List[DriverRemoteConnection] = []
+            try:
+                traversal_sources = []
+                for _ in range(connections):
+                    g, conn = self.connect_to_gremlin()
+                    gremlin_connections.append(conn)
+                    traversal_sources.append(g)
+                writer = ParallelGremlinWriter(traversal_sources, batch_size=batch_size)
+                return {
+                    "vertices": writer.write(
+                        graph["vertices"],
+                        lambda t, vertex: self.__add_vertex(t, vertex, scan_id),
+                        "vertices",
+                    ),
+                    "edges": writer.write(
+                        graph["edges"], lambda t, edge: self.__add_edge(t, edge, scan_id), "edges",
+                    ),
+                }
+            finally:
+                for conn in gremlin_connections:
+                    conn.close()
         else:
             raise NeptuneNoGraphsFoundException
 
@@ -0,0 +1,22 @@
+"""Graph URIs of graphs loaded into Neptune. These are used both when writing N-Quads, which
+carry their graph URI in each line, and when loading graphs, so they are kept separate from
+the client to avoid its dependencies."""
+
+GRAPH_BASE_URI = "https://alti"
+# prefix of skolem IRIs which replace blank nodes in graphs written as multiple files, see
+# https://www.w3.org/TR/rdf11-concepts/#section-skolemization
+SKOLEM_BASE_URI = f"{GRAPH_BASE_URI}/.well-known/genid/"
+
+
+def get_graph_uri(name: str, version: str, end_time: int) -> str:
+    """Get the URI of a graph in Neptune
+
+    Args:
+        name: graph name
+        version: graph version
+        end_time: epoch timestamp of graph end time
+
+    Returns:
+        graph uri
+    """
+    return f"{GRAPH_BASE_URI}/{name}/{version}/{end_time}"
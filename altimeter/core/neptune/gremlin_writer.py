@@ -0,0 +1,190 @@
+"""A ParallelGremlinWriter writes vertices or edges to Neptune as batches of chained Gremlin
+traversals submitted concurrently over several connections. Neptune runs each traversal in
+its own transaction, concurrent transactions which touch the same elements can fail with a
+ConcurrentModificationException - such batches are retried with exponential backoff."""
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+from gremlin_python.process.anonymous_traversal import traversal
+
+from altimeter.core.log import Logger
+from altimeter.core.log_events import LogEvent
+from altimeter.core.neptune.exceptions import NeptuneLoadGraphException
+
+DEFAULT_LPG_BATCH_SIZE = 100
+DEFAULT_LPG_CONNECTIONS = 4
+DEFAULT_LPG_MAX_RETRIES = 5
+DEFAULT_LPG_RETRY_DELAY_SECONDS = 0.1
+RETRYABLE_GREMLIN_ERRORS = ("ConcurrentModificationException",)
+
+
+def is_retryable_gremlin_error(error: Exception) -> bool:
+    """Determine whether a Gremlin traversal which raised error can be retried.
+
+    Args:
+        error: exception raised by the traversal
+
+    Returns:
+        True if error is a transient Neptune error
+    """
+    return any(retryable_error in str(error) for retryable_error in RETRYABLE_GREMLIN_ERRORS)
+
+
+@dataclass(frozen=True)
+class GremlinWriteStats:
+    """Throughput of a ParallelGremlinWriter write"""
+
+    element_count: int
+    batch_count: int
+    retry_count: int
+    elapsed_seconds: float
+
+    @property
+    def elements_per_second(self) -> float:
+        """Elements written per second"""
+        if self.elapsed_seconds <= 0:
+            return float(self.element_count)
+        return self.element_count / self.elapsed_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Generate a dict representation of this GremlinWriteStats"""
+        return {
+            "element_count": self.element_count,
+            "batch_count": self.batch_count,
+            "retry_count": self.retry_count,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "elements_per_second": round(self.elements_per_second, 1),
+        }
+
+
+class ParallelGremlinWriter:
+    """Writes elements in batches of batch_size, each batch is a single chained traversal. Each
+    graph traversal source is used by one batch at a time, so batches are submitted over as
+    many concurrent connections as there are sources. A batch which fails with a retryable
+    error is resubmitted up to max_retries times after a randomized exponential backoff
+    delay, other errors fail the write.
+
+    Args:
+        traversal_sources: graph traversal sources, one per connection
+        batch_size: number of elements per traversal
+        max_retries: maximum number of times a batch is retried
+        retry_delay: base delay in seconds before retrying a batch
+    """
+
+    def __init__(
+        self,
+        traversal_sources: Sequence[traversal],
+        batch_size: int = DEFAULT_LPG_BATCH_SIZE,
+        max_retries: int = DEFAULT_LPG_MAX_RETRIES,
+        retry_delay: float = DEFAULT_LPG_RETRY_DELAY_SECONDS,
+    ):
+        if not traversal_sources:
+            raise ValueError("at least one traversal source is required")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.traversal_sources = traversal_sources
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+    def write(
+        self,
+        elements: List[Dict],
+        add_element: Callable[[traversal, Dict], traversal],
+        element_type: str,
+    ) -> GremlinWriteStats:
+        """Write elements, returning once all batches are written.
+
+        Args:
+            elements: vertex or edge dicts to write
+            add_element: function which chains the traversal steps writing an element onto a
+                         traversal and returns the new traversal
+            element_type: name of the elements for logging, e.g. 'vertices'
+
+        Returns:
+            GremlinWriteStats of the write
+
+        Raises:
+            NeptuneLoadGraphException if a batch could not be written
+        """
+        logger = Logger()
+        batches = [
+            elements[start : start + self.batch_size]
+            for start in range(0, len(elements), self.batch_size)
+        ]
+        available_sources: "queue.Queue[traversal]" = queue.Queue()
+        for traversal_source in self.traversal_sources:
+            available_sources.put(traversal_source)
+        progress_lock = threading.Lock()
+        progress = {"element_count": 0, "retry_count": 0}
+        start_time = time.time()
+
+        def write_batch(batch: List[Dict]) -> None:
+            traversal_source = available_sources.get()
+            try:
+                retry_count = self._write_batch(traversal_source, batch, add_element)
+            finally:
+                available_sources.put(traversal_source)
+            with progress_lock:
+                progress["element_count"] += len(batch)
+                progress["retry_count"] += retry_count
+                element_count = progress["element_count"]
+            with logger.bind(element_type=element_type):
+                logger.info(
+                    event=LogEvent.NeptunePeriodicWrite,
+                    msg=f"Wrote {element_type} {element_count} of {len(elements)}",
+                )
+
+        with ThreadPoolExecutor(
+            max_workers=len(self.traversal_sources), thread_name_prefix="gremlin-writer"
+        ) as executor:
+            futures = [executor.submit(write_batch, batch) for batch in batches]
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in not_done:
+                future.cancel()
+            for future in done:
+                future.result()
+        stats = GremlinWriteStats(
+            element_count=len(elements),
+            batch_count=len(batches),
+            retry_count=progress["retry_count"],
+            elapsed_seconds=time.time() - start_time,
+        )
+        logger.info(
+            event=LogEvent.NeptuneGremlinWriteStats, element_type=element_type, **stats.to_dict()
+        )
+        return stats
+
+    def _write_batch(
+        self,
+        traversal_source: traversal,
+        batch: List[Dict],
+        add_element: Callable[[traversal, Dict], traversal],
+    ) -> int:
+        """Write a batch, retrying on retryable errors.
+
+        Returns:
+            number of retries
+        """
+        attempt = 0
+        while True:
+            batch_traversal = traversal_source
+            for element in batch:
+                batch_traversal = add_element(batch_traversal, element)
+            try:
+                batch_traversal.next()
+                return attempt
+            except Exception as err:
+                if attempt >= self.max_retries or not is_retryable_gremlin_error(err):
+                    Logger().error(event=LogEvent.NeptuneLoadError, msg=str(err))
+                    raise NeptuneLoadGraphException(
+                        f"Error writing batch of {len(batch)} elements starting with "
+                        f"{batch[0]}: {str(err)}"
+                    ) from err
+                attempt += 1
+                time.sleep(random.uniform(0, self.retry_delay * 2 ** attempt))
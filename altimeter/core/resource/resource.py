@@ -1,10 +1,11 @@
 from typing import Optional, List, Dict, Any, Type
 
-from rdflib import Namespace, Graph, BNode, RDF, Literal
+from rdflib import Namespace, BNode, RDF, Literal
 
 from altimeter.core.graph.link.base import Link
 from altimeter.core.graph.link.links import link_from_dict
 from altimeter.core.graph.node_cache import NodeCache
+from altimeter.core.graph.rdf_stream import TripleSink
 
 
 class Resource:
@@ -53,13 +54,13 @@ class Resource:
             links.append(link_from_dict(link))
         return cls(resource_id=resource_id, type_name=type_name, links=links)
 
-    def to_rdf(self, namespace: Namespace, graph: Graph, node_cache: NodeCache) -> None:
+    def to_rdf(self, namespace: Namespace, graph: TripleSink, node_cache: NodeCache) -> None:
         """Graph this Resource as a BNode on a Graph.
 
         Args:
             namespace: RDF namespace to use for predicates and objects when graphing
                        this resource's links
-            graph: RDF graph
+            graph: RDF graph or other TripleSink to add triples to
             node_cache: NodeCache to use for any cached BNode lookups
         """
         node = node_cache.setdefault(self.resource_id, BNode())
@@ -1,11 +1,14 @@
 """Scan a set of accounts as defined by an AccountScanPlan"""
 import json
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+from altimeter.core.artifact_io import ARTIFACT_FORMAT_JSON
+from altimeter.core.artifact_io.dedup import CONTENT_ARTIFACT_DIR
 from altimeter.core.artifact_io.writer import ArtifactWriter
 from altimeter.aws.scan.account_scanner import AccountScanner
 from altimeter.aws.scan.account_scan_plan import AccountScanPlan
+from altimeter.aws.scan.scan_unit_history import ScanUnitHistoryStore
 from altimeter.core.json_encoder import json_encoder
 from altimeter.core.parameters import get_required_lambda_event_var
 
@@ -26,16 +29,32 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> None:
         event, "preferred_account_scan_regions"
     )
     scan_sub_accounts = get_required_lambda_event_var(event, "scan_sub_accounts")
+    rate_limits = event.get("rate_limits")
+    artifact_compression = event.get("artifact_compression")
+    artifact_format = event.get("artifact_format", ARTIFACT_FORMAT_JSON)
+    max_artifact_writer_threads = event.get("max_artifact_writer_threads")
+    artifact_dedup = event.get("artifact_dedup", False)
 
     artifact_writer = ArtifactWriter.from_artifact_path(
         artifact_path=artifact_path, scan_id=scan_id
     )
+    content_artifact_writer: Optional[ArtifactWriter] = None
+    if artifact_dedup:
+        content_artifact_writer = ArtifactWriter.from_artifact_path(
+            artifact_path=artifact_path, scan_id=CONTENT_ARTIFACT_DIR
+        )
     account_scanner = AccountScanner(
         account_scan_plan=account_scan_plan,
         artifact_writer=artifact_writer,
         max_svc_scan_threads=max_svc_scan_threads,
         preferred_account_scan_regions=preferred_account_scan_regions,
         scan_sub_accounts=scan_sub_accounts,
+        rate_limits=rate_limits,
+        scan_unit_history_store=ScanUnitHistoryStore(artifact_path=artifact_path),
+        artifact_compression=artifact_compression,
+        artifact_format=artifact_format,
+        max_artifact_writer_threads=max_artifact_writer_threads,
+        content_artifact_writer=content_artifact_writer,
     )
     scan_results_dict = account_scanner.scan()
     scan_results_str = json.dumps(scan_results_dict, default=json_encoder)
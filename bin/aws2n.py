@@ -15,7 +15,7 @@ import boto3
 from altimeter.aws.log_events import AWSLogEvents
 from altimeter.aws.scan.muxer import AWSScanMuxer
 from altimeter.aws.scan.muxer.lambda_muxer import LambdaAWSScanMuxer
-from altimeter.aws.scan.muxer.local_muxer import LocalAWSScanMuxer
+from altimeter.aws.scan.muxer.local_muxer import LocalAWSScanMuxer, ProcessPoolAWSScanMuxer
 from altimeter.aws.scan.scan import run_scan
 from altimeter.core.artifact_io import parse_s3_uri
 from altimeter.core.artifact_io.reader import ArtifactReader
@@ -23,7 +23,12 @@ from altimeter.core.artifact_io.writer import ArtifactWriter, GZIP
 from altimeter.core.config import Config
 from altimeter.core.log import Logger
 from altimeter.core.log_events import LogEvent
-from altimeter.core.neptune.client import AltimeterNeptuneClient, GraphMetadata, NeptuneEndpoint
+from altimeter.core.neptune.client import (
+    AltimeterNeptuneClient,
+    DEFAULT_LOAD_PARALLELISM,
+    GraphMetadata,
+    NeptuneEndpoint,
+)
 from altimeter.core.parameters import get_required_str_env_var, get_required_int_env_var
 
 
@@ -57,7 +62,14 @@ def aws2n(scan_id: str, config: Config, muxer: AWSScanMuxer, load_neptune: bool)
         artifact_reader=artifact_reader,
     )
     json_path = scan_manifest.master_artifact
-    rdf_path = artifact_writer.write_graph_set(name="master", graph_set=graph_set, compression=GZIP)
+    with graph_set:
+        rdf_path = artifact_writer.write_graph_set(
+            name="master",
+            graph_set=graph_set,
+            compression=GZIP,
+            rdf_format=config.rdf_format,
+            max_shard_size=config.rdf_max_shard_size,
+        )
     graph_metadata = None
     if load_neptune:
         if config.neptune is None:
@@ -70,7 +82,10 @@ def aws2n(scan_id: str, config: Config, muxer: AWSScanMuxer, load_neptune: bool)
         if rdf_key is None:
             raise Exception(f"Invalid rdf s3 path {rdf_path}")
         graph_metadata = neptune_client.load_graph(
-            bucket=rdf_bucket, key=rdf_key, load_iam_role_arn=str(config.neptune.iam_role_arn)
+            bucket=rdf_bucket,
+            key=rdf_key,
+            load_iam_role_arn=str(config.neptune.iam_role_arn),
+            parallelism=config.neptune.load_parallelism or DEFAULT_LOAD_PARALLELISM,
         )
         logger.info(event=LogEvent.GraphLoadedSNSNotificationStart)
         sns_client = boto3.client("sns")
@@ -140,7 +155,11 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     config = Config.from_path(config)
     scan_id = generate_scan_id()
-    muxer = LocalAWSScanMuxer(scan_id=scan_id, config=config)
+    muxer: AWSScanMuxer
+    if config.concurrency.max_account_scan_processes:
+        muxer = ProcessPoolAWSScanMuxer(scan_id=scan_id, config=config)
+    else:
+        muxer = LocalAWSScanMuxer(scan_id=scan_id, config=config)
     result = aws2n(scan_id=scan_id, config=config, muxer=muxer, load_neptune=False)
     print(result.rdf_path)
     return 0
@@ -18,6 +18,7 @@ from altimeter.core.config import Config
 from altimeter.core.log import Logger
 from altimeter.core.log_events import LogEvent
 from altimeter.core.neptune.client import AltimeterNeptuneClient, NeptuneEndpoint
+from altimeter.core.neptune.gremlin_writer import DEFAULT_LPG_BATCH_SIZE, DEFAULT_LPG_CONNECTIONS
 
 logger = Logger(pretty_output=True)
 
@@ -47,7 +48,8 @@ def aws2neptune_lpg(scan_id: str, config: Config, muxer: AWSScanMuxer) -> None:
     )
     print("AWS Account Scan Complete. Beginning write to Amazon Neptune.")
     logger.info(LogEvent.NeptuneGremlinWriteStart)
-    graph = graph_set.to_neptune_lpg(scan_id)
+    with graph_set:
+        graph = graph_set.to_neptune_lpg(scan_id)
     if config.neptune is None:
         raise Exception("Can not load to Neptune because config.neptune is empty.")
     endpoint = NeptuneEndpoint(
@@ -58,8 +60,16 @@ def aws2neptune_lpg(scan_id: str, config: Config, muxer: AWSScanMuxer) -> None:
         auth_mode=str(config.neptune.auth_mode),
     )
     neptune_client = AltimeterNeptuneClient(max_age_min=1440, neptune_endpoint=endpoint)
-    neptune_client.write_to_neptune_lpg(graph, scan_id)
-    logger.info(LogEvent.NeptuneGremlinWriteEnd)
+    write_stats = neptune_client.write_to_neptune_lpg(
+        graph,
+        scan_id,
+        batch_size=config.neptune.lpg_batch_size or DEFAULT_LPG_BATCH_SIZE,
+        connections=config.neptune.lpg_connections or DEFAULT_LPG_CONNECTIONS,
+    )
+    logger.info(
+        LogEvent.NeptuneGremlinWriteEnd,
+        **{element_type: stats.to_dict() for element_type, stats in write_stats.items()},
+    )
     print("Write to Amazon Neptune Complete")
 
 
@@ -87,7 +97,8 @@ def aws2neptune_rdf(scan_id: str, config: Config, muxer: AWSScanMuxer) -> None:
     )
     print("AWS Account Scan Complete. Beginning write to Amazon Neptune.")
     logger.info(LogEvent.NeptuneRDFWriteStart)
-    graph = graph_set.to_rdf()
+    with graph_set:
+        graph = graph_set.to_rdf()
     if config.neptune is None:
         raise Exception("Can not load to Neptune because config.neptune is empty.")
     endpoint = NeptuneEndpoint(
@@ -162,6 +173,11 @@ def main(argv: Optional[List[str]] = None) -> int:
             "ssl": config["ssl"],
             "region": config["aws_region"],
             "use_lpg": bool(args_ns.model.lower() == "lpg"),
+            **{
+                key: int(config[key])
+                for key in ("lpg_batch_size", "lpg_connections")
+                if config.get(key) is not None
+            },
         },
     }
 
@@ -8,13 +8,32 @@ from datetime import datetime
 from operator import attrgetter
 from pathlib import Path
 import sys
-from typing import DefaultDict, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Type, Union
+from typing import (
+    DefaultDict,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 from types import MappingProxyType
 import uuid
 
 import tableauhyperapi
 
-from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.artifact_io import is_s3_uri
+from altimeter.core.artifact_io.cache import DEFAULT_ARTIFACT_CACHE_MAX_SIZE, ArtifactCache
+from altimeter.core.artifact_io.reader import (
+    ArtifactReader,
+    FileArtifactReader,
+    S3ArtifactReader,
+)
+from altimeter.core.graph.graph_set import GraphSetJSONReader
 from altimeter.core.graph.link.base import Link
 from altimeter.core.graph.link.links import (
     SimpleLink,
@@ -23,6 +42,7 @@ from altimeter.core.graph.link.links import (
     MultiLink,
     TransientResourceLinkLink,
 )
+from altimeter.core.resource.resource import Resource
 
 Primitive = Union[int, bool, str, datetime, None]
 TAG_TABLE_NAME = "tag"
@@ -106,6 +126,19 @@ class TimestampColumn(Column):
         )
 
 
+class GraphSetJSONArtifactResources:
+    """Resources of a GraphSet JSON artifact. Each iteration streams the Resources from the
+    artifact rather than holding them all in memory."""
+
+    def __init__(self, artifact_reader: ArtifactReader, path: str):
+        self.artifact_reader = artifact_reader
+        self.path = path
+
+    def __iter__(self) -> Iterator[Resource]:
+        with self.artifact_reader.open_artifact(self.path) as json_fp:
+            yield from GraphSetJSONReader(json_fp).iter_resources()
+
+
 def normalize_name(name: str) -> str:
     normalized_name = name
     if normalized_name.startswith("aws:"):
@@ -114,20 +147,22 @@ def normalize_name(name: str) -> str:
     return normalized_name
 
 
-def build_table_defns(graph_sets: Iterable[GraphSet]) -> Mapping[str, Tuple[Column, ...]]:
+def build_table_defns(
+    graph_sets_resources: Iterable[Iterable[Resource]],
+) -> Mapping[str, Tuple[Column, ...]]:
     # discover simple link obj types - generally str, bool or int
     table_names_simple_obj_types: DefaultDict[
         str, DefaultDict[str, Set[Type[Primitive]]]
     ] = defaultdict(lambda: defaultdict(set))
-    for graph_set in graph_sets:
-        for resource in graph_set.resources:
+    for resources in graph_sets_resources:
+        for resource in resources:
             table_name = normalize_name(resource.type_name)
             for link in resource.links:
                 if isinstance(link, SimpleLink):
                     table_names_simple_obj_types[table_name][link.pred].add(type(link.obj))
     table_names_columns: DefaultDict[str, Set[Column]] = defaultdict(set)
-    for graph_set in graph_sets:
-        for resource in graph_set.resources:
+    for resources in graph_sets_resources:
+        for resource in resources:
             table_name = normalize_name(resource.type_name)
             # all top level types have an id column
             table_names_columns[table_name].add(PKColumn(f"_{table_name}_id"))
@@ -188,13 +223,14 @@ def build_table_defns_helper(
 
 
 def build_data(
-    graph_sets: Iterable[GraphSet], table_defns: Mapping[str, Tuple[Column, ...]],
+    graph_sets_resources: Iterable[Iterable[Resource]],
+    table_defns: Mapping[str, Tuple[Column, ...]],
 ) -> Mapping[str, List[Tuple[Primitive, ...]]]:
     pk_counters: DefaultDict[str, int] = defaultdict(int)
     arns_pks: Dict[str, int] = {}
     table_names_datas: DefaultDict[str, List[Tuple[Primitive, ...]]] = defaultdict(list)
-    for graph_set in graph_sets:
-        for resource in graph_set.resources:
+    for resources in graph_sets_resources:
+        for resource in resources:
             resource_data: List[Primitive] = []
             table_name = normalize_name(resource.type_name)
             arn = resource.resource_id
@@ -350,25 +386,47 @@ def main(argv: Optional[List[str]] = None) -> int:
     if argv is None:
         argv = sys.argv[1:]
     parser = argparse.ArgumentParser()
-    parser.add_argument("input_json_filepaths", type=Path, nargs="+")
+    parser.add_argument("input_json_paths", type=str, nargs="+", help="filesystem paths or s3 uris")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="if set, s3 inputs are cached in this dir and read from it on later runs",
+    )
+    parser.add_argument(
+        "--cache-max-size-mb",
+        type=int,
+        default=DEFAULT_ARTIFACT_CACHE_MAX_SIZE // (1024 * 1024),
+        help="maximum size of --cache-dir in MiB",
+    )
     args_ns = parser.parse_args(argv)
 
-    input_json_filepaths = args_ns.input_json_filepaths
-    if len(input_json_filepaths) > 1:
+    input_json_paths = args_ns.input_json_paths
+    if len(input_json_paths) > 1:
         raise NotImplementedError("Only one input supported at this time")
+    cache: Optional[ArtifactCache] = None
+    if args_ns.cache_dir is not None:
+        cache = ArtifactCache(
+            cache_dir=args_ns.cache_dir, max_size=args_ns.cache_max_size_mb * 1024 * 1024
+        )
 
-    # create a dict of scan ids to GraphSets. This contains all of the data in the provided input.
-    scan_ids_graph_sets: Dict[int, GraphSet] = {
-        scan_id: GraphSet.from_json_file(filepath)
-        for scan_id, filepath in enumerate(input_json_filepaths)
+    # create a dict of scan ids to GraphSet resources. Resources are streamed from the
+    # provided input on each pass rather than held in memory.
+    scan_ids_graph_sets_resources: Dict[int, GraphSetJSONArtifactResources] = {
+        scan_id: GraphSetJSONArtifactResources(
+            artifact_reader=S3ArtifactReader(cache=cache)
+            if is_s3_uri(path)
+            else FileArtifactReader(),
+            path=path,
+        )
+        for scan_id, path in enumerate(input_json_paths)
     }
 
     # discover tables which need to be created by iterating over resources and finding the maximum
     # set of predicates used for each type
-    table_defns = build_table_defns(scan_ids_graph_sets.values())
+    table_defns = build_table_defns(scan_ids_graph_sets_resources.values())
 
     # build data
-    table_names_datas = build_data(scan_ids_graph_sets.values(), table_defns)
+    table_names_datas = build_data(scan_ids_graph_sets_resources.values(), table_defns)
 
     table_names_tables: Dict[str, tableauhyperapi.TableDefinition] = {}
     with tableauhyperapi.HyperProcess(
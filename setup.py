@@ -35,7 +35,11 @@ setup(
         "hyper": [
             "tableauhyperapi>=0.0.11355,<1",
             "pydantic>=1.6.1,<2",
-        ]
+        ],
+        "compression": [
+            "lz4>=3.1.0,<4",
+            "zstandard>=0.15.0,<1",
+        ],
     },
     data_files=[
         (
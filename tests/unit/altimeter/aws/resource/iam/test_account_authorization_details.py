@@ -0,0 +1,328 @@
+from datetime import datetime
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+import boto3
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+from moto import mock_iam
+
+from altimeter.aws.resource.iam.account_authorization_details import (
+    AccountAuthorizationDetails,
+    get_account_authorization_details,
+)
+from altimeter.aws.resource.iam.group import IAMGroupResourceSpec
+from altimeter.aws.resource.iam.policy import (
+    IAMAttachedAWSManagedPolicyResourceSpec,
+    IAMPolicyResourceSpec,
+)
+from altimeter.aws.resource.iam.role import IAMRoleResourceSpec
+from altimeter.aws.resource.resource_spec import ListFromAWSResult
+from altimeter.aws.scan.aws_accessor import AWSAccessor
+
+ASSUME_ROLE_POLICY_DOCUMENT = {
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Effect": "Allow",
+            "Principal": {"AWS": "arn:aws:iam::123456789012:root"},
+            "Action": "sts:AssumeRole",
+        }
+    ],
+}
+
+
+def build_policy_document(action: str) -> str:
+    return json.dumps(
+        {
+            "Version": "2012-10-17",
+            "Statement": [{"Effect": "Allow", "Action": action, "Resource": "*"}],
+        }
+    )
+
+
+class TestIAMAccountAuthorizationDetailsResourceSpecs(TestCase):
+    def setUp(self):
+        self.mock_iam = mock_iam()
+        self.mock_iam.start()
+        self.session = boto3.Session(region_name="us-east-1")
+        client = self.session.client("iam")
+        policy_arn = client.create_policy(
+            PolicyName="test-policy", PolicyDocument=build_policy_document("s3:GetObject")
+        )["Policy"]["Arn"]
+        client.create_policy_version(
+            PolicyArn=policy_arn,
+            PolicyDocument=build_policy_document("s3:ListBucket"),
+            SetAsDefault=True,
+        )
+        client.create_role(
+            RoleName="test-role",
+            AssumeRolePolicyDocument=json.dumps(ASSUME_ROLE_POLICY_DOCUMENT),
+            MaxSessionDuration=7200,
+        )
+        client.attach_role_policy(RoleName="test-role", PolicyArn=policy_arn)
+        client.create_role(
+            RoleName="test-role-no-policies",
+            AssumeRolePolicyDocument=json.dumps(ASSUME_ROLE_POLICY_DOCUMENT),
+        )
+        client.create_group(GroupName="test-group")
+        client.create_group(GroupName="test-empty-group")
+        client.create_user(UserName="test-user")
+        client.add_user_to_group(GroupName="test-group", UserName="test-user")
+
+    def tearDown(self):
+        self.mock_iam.stop()
+
+    def build_scan_accessor(self) -> AWSAccessor:
+        return AWSAccessor(session=self.session, account_id="123456789012", region_name="us-east-1")
+
+    def list_per_entity(self, resource_spec_class):
+        with patch(
+            "altimeter.aws.resource.iam.account_authorization_details."
+            "get_account_authorization_details",
+            return_value=None,
+        ):
+            return resource_spec_class._list_from_aws(self.build_scan_accessor()).resources
+
+    def test_role_list_matches_per_entity_list(self):
+        resources = IAMRoleResourceSpec._list_from_aws(self.build_scan_accessor()).resources
+        self.assertEqual(len(resources), 2)
+        self.assertDictEqual(resources, self.list_per_entity(IAMRoleResourceSpec))
+
+    def test_policy_scan_matches_per_entity_scan(self):
+        resources = IAMPolicyResourceSpec.scan(scan_accessor=self.build_scan_accessor())
+        self.assertEqual(len(resources), 1)
+        per_entity_resources = IAMPolicyResourceSpec._list_from_aws_result_to_resources(
+            ListFromAWSResult(resources=self.list_per_entity(IAMPolicyResourceSpec)),
+            context={"account_id": "123456789012", "region": "us-east-1"},
+        )
+        self.assertDictEqual(
+            {resource.resource_id: resource.to_dict() for resource in resources},
+            {resource.resource_id: resource.to_dict() for resource in per_entity_resources},
+        )
+
+    def test_group_list_matches_per_entity_list(self):
+        resources = IAMGroupResourceSpec._list_from_aws(self.build_scan_accessor()).resources
+        per_entity_resources = self.list_per_entity(IAMGroupResourceSpec)
+        self.assertDictEqual(
+            {arn: [user["Arn"] for user in group["Users"]] for arn, group in resources.items()},
+            {
+                arn: [user["Arn"] for user in group["Users"]]
+                for arn, group in per_entity_resources.items()
+            },
+        )
+        self.assertEqual(
+            resources["arn:aws:iam::123456789012:group/test-group"]["Users"][0]["Arn"],
+            "arn:aws:iam::123456789012:user/test-user",
+        )
+
+    def test_response_is_shared_between_specs(self):
+        scan_accessor = self.build_scan_accessor()
+        IAMRoleResourceSpec._list_from_aws(scan_accessor)
+        IAMPolicyResourceSpec._list_from_aws(scan_accessor)
+        IAMGroupResourceSpec._list_from_aws(scan_accessor)
+        iam_stats = scan_accessor.api_call_stats.to_dict()["123456789012"]["us-east-1"]["iam"]
+        self.assertEqual(iam_stats["GetAccountAuthorizationDetails"]["count"], 1)
+        self.assertNotIn("ListAttachedRolePolicies", iam_stats)
+        self.assertNotIn("GetPolicyVersion", iam_stats)
+        self.assertNotIn("GetGroup", iam_stats)
+
+    def test_access_denied(self):
+        scan_accessor = self.build_scan_accessor()
+        access_denied = ClientError(
+            error_response={"Error": {"Code": "AccessDenied"}},
+            operation_name="GetAccountAuthorizationDetails",
+        )
+        with patch.object(
+            scan_accessor.client("iam"), "get_paginator", side_effect=access_denied
+        ) as mock_get_paginator:
+            self.assertIsNone(get_account_authorization_details(scan_accessor))
+            self.assertIsNone(get_account_authorization_details(scan_accessor))
+        self.assertEqual(mock_get_paginator.call_count, 1)
+
+
+class TestListFromAccountAuthorizationDetails(TestCase):
+    """Compare the resources built by list_from_account_authorization_details with those built
+    by list_from_aws given equivalent, stubbed, per-entity and bulk responses"""
+
+    account_id = "123456789012"
+    region = "us-east-1"
+    create_date = datetime(2020, 1, 1)
+    role = {
+        "Path": "/",
+        "RoleName": "test-role",
+        "RoleId": "AROAEXAMPLEROLEID0001",
+        "Arn": "arn:aws:iam::123456789012:role/test-role",
+        "CreateDate": create_date,
+        "AssumeRolePolicyDocument": json.dumps(ASSUME_ROLE_POLICY_DOCUMENT),
+        "MaxSessionDuration": 7200,
+    }
+    policy_attachment = {
+        "PolicyName": "test-policy",
+        "PolicyArn": "arn:aws:iam::123456789012:policy/test-policy",
+    }
+    group = {
+        "Path": "/",
+        "GroupName": "test-group",
+        "GroupId": "AGPAEXAMPLEGROUPID001",
+        "Arn": "arn:aws:iam::123456789012:group/test-group",
+        "CreateDate": create_date,
+    }
+    user = {
+        "Path": "/",
+        "UserName": "test-user",
+        "UserId": "AIDAEXAMPLEUSERID0001",
+        "Arn": "arn:aws:iam::123456789012:user/test-user",
+        "CreateDate": create_date,
+    }
+    policy = {
+        "PolicyName": "test-policy",
+        "PolicyId": "ANPAEXAMPLEPOLICYID01",
+        "Arn": "arn:aws:iam::123456789012:policy/test-policy",
+        "Path": "/",
+        "DefaultVersionId": "v2",
+        "AttachmentCount": 1,
+        "PermissionsBoundaryUsageCount": 0,
+        "IsAttachable": True,
+        "CreateDate": create_date,
+        "UpdateDate": create_date,
+    }
+
+    def setUp(self):
+        self.client = boto3.Session(region_name=self.region).client("iam")
+        self.stubber = Stubber(self.client)
+        self.stubber.activate()
+        self.account_authorization_details = AccountAuthorizationDetails(
+            users=[{**self.user, "GroupList": [self.group["GroupName"]]}],
+            groups=[self.group],
+            roles=[
+                {
+                    **{
+                        key: value
+                        for key, value in self.role.items()
+                        if key != "MaxSessionDuration"
+                    },
+                    "AssumeRolePolicyDocument": ASSUME_ROLE_POLICY_DOCUMENT,
+                    "AttachedManagedPolicies": [self.policy_attachment],
+                }
+            ],
+            policies=[
+                {
+                    **self.policy,
+                    "PolicyVersionList": [
+                        {
+                            "Document": json.loads(build_policy_document("s3:GetObject")),
+                            "VersionId": "v1",
+                            "IsDefaultVersion": False,
+                        },
+                        {
+                            "Document": json.loads(build_policy_document("s3:ListBucket")),
+                            "VersionId": "v2",
+                            "IsDefaultVersion": True,
+                        },
+                    ],
+                }
+            ],
+        )
+
+    def tearDown(self):
+        self.stubber.deactivate()
+
+    def assert_resources_match(self, resource_spec_class):
+        details_result = resource_spec_class.list_from_account_authorization_details(
+            client=self.client,
+            account_authorization_details=self.account_authorization_details,
+            account_id=self.account_id,
+            region=self.region,
+        )
+        per_entity_result = resource_spec_class.list_from_aws(
+            client=self.client, account_id=self.account_id, region=self.region
+        )
+        self.stubber.assert_no_pending_responses()
+        context = {"account_id": self.account_id, "region": self.region}
+        details_resources = resource_spec_class._list_from_aws_result_to_resources(
+            details_result, context=context
+        )
+        per_entity_resources = resource_spec_class._list_from_aws_result_to_resources(
+            per_entity_result, context=context
+        )
+        self.assertGreater(len(details_resources), 0)
+        self.assertListEqual(
+            [resource.to_dict() for resource in details_resources],
+            [resource.to_dict() for resource in per_entity_resources],
+        )
+
+    def test_role(self):
+        self.stubber.add_response("list_roles", {"Roles": [dict(self.role)]})
+        self.stubber.add_response("list_roles", {"Roles": [dict(self.role)]})
+        self.stubber.add_response(
+            "list_attached_role_policies",
+            {"AttachedPolicies": [self.policy_attachment]},
+            {"RoleName": "test-role"},
+        )
+        self.assert_resources_match(IAMRoleResourceSpec)
+
+    def test_group(self):
+        self.stubber.add_response("list_groups", {"Groups": [dict(self.group)]})
+        self.stubber.add_response(
+            "get_group",
+            {"Group": self.group, "Users": [self.user]},
+            {"GroupName": "test-group"},
+        )
+        self.assert_resources_match(IAMGroupResourceSpec)
+
+    def test_policy(self):
+        self.stubber.add_response(
+            "list_policies", {"Policies": [dict(self.policy)]}, {"Scope": "Local"}
+        )
+        self.stubber.add_response(
+            "get_policy_version",
+            {
+                "PolicyVersion": {
+                    "Document": build_policy_document("s3:ListBucket"),
+                    "VersionId": "v2",
+                    "IsDefaultVersion": True,
+                }
+            },
+            {"PolicyArn": self.policy["Arn"], "VersionId": "v2"},
+        )
+        self.assert_resources_match(IAMPolicyResourceSpec)
+
+    def test_attached_aws_managed_policy(self):
+        read_only_access = {
+            "PolicyName": "ReadOnlyAccess",
+            "PolicyArn": "arn:aws:iam::aws:policy/ReadOnlyAccess",
+        }
+        security_audit = {
+            "PolicyName": "SecurityAudit",
+            "PolicyArn": "arn:aws:iam::aws:policy/SecurityAudit",
+        }
+        self.account_authorization_details = AccountAuthorizationDetails(
+            users=[{**self.user, "AttachedManagedPolicies": [read_only_access]}],
+            groups=[{**self.group, "AttachedManagedPolicies": [security_audit]}],
+            roles=[
+                {
+                    **self.account_authorization_details.roles[0],
+                    "AttachedManagedPolicies": [self.policy_attachment, read_only_access],
+                }
+            ],
+            policies=self.account_authorization_details.policies,
+        )
+        self.stubber.add_response(
+            "list_policies",
+            {
+                "Policies": [
+                    {
+                        "PolicyName": attached_policy["PolicyName"],
+                        "PolicyId": f"ANPA{attached_policy['PolicyName'].upper()}",
+                        "Arn": attached_policy["PolicyArn"],
+                        "DefaultVersionId": "v1",
+                        "AttachmentCount": 1,
+                    }
+                    for attached_policy in (read_only_access, security_audit)
+                ]
+            },
+            {"Scope": "AWS", "OnlyAttached": True},
+        )
+        self.assert_resources_match(IAMAttachedAWSManagedPolicyResourceSpec)
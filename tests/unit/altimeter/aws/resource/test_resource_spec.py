@@ -1,4 +1,6 @@
 import inspect
+import threading
+import time
 from typing import Any, Type
 from unittest import TestCase
 
@@ -48,7 +50,9 @@ class TestSkipResourceScanFlag(TestCase):
             service_name = "fakesvc"
 
             @classmethod
-            def skip_resource_scan(cls: Type["TestResource"], client, account_id: str, region: str) -> bool:
+            def skip_resource_scan(
+                cls: Type["TestResource"], client, account_id: str, region: str
+            ) -> bool:
                 return True
 
         accessor = TestSkipResourceScanFlag.TestAWSAccessor(None, None, None)
@@ -62,3 +66,55 @@ class TestSkipResourceScanFlag(TestCase):
         accessor = TestSkipResourceScanFlag.TestAWSAccessor(None, None, None)
         with self.assertRaises(AttributeError):
             TestResource.scan(scan_accessor=accessor)
+
+
+class TestEnrich(TestCase):
+    class TestResource(AWSResourceSpec):
+        type_name = "t"
+        service_name = "fakesvc"
+        enrichment_max_workers = 4
+
+        @classmethod
+        def list_from_aws(
+            cls: Type["TestResource"], client, account_id: str, region: str
+        ) -> ListFromAWSResult:
+            raise NotImplementedError()
+
+    def test_results_in_order(self):
+        def enrich_func(item):
+            time.sleep(0.01 * (10 - item))
+            return item * 2
+
+        self.assertListEqual(
+            TestEnrich.TestResource.enrich(enrich_func, range(10)), [i * 2 for i in range(10)]
+        )
+
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        active = []
+        max_active = []
+
+        def enrich_func(item):
+            with lock:
+                active.append(item)
+                max_active.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.remove(item)
+            return item
+
+        TestEnrich.TestResource.enrich(enrich_func, range(20))
+        self.assertLessEqual(max(max_active), 4)
+        self.assertGreater(max(max_active), 1)
+
+    def test_exception_raised(self):
+        def enrich_func(item):
+            if item == 3:
+                raise ValueError("bad item")
+            return item
+
+        with self.assertRaises(ValueError):
+            TestEnrich.TestResource.enrich(enrich_func, range(10))
+
+    def test_empty(self):
+        self.assertListEqual(TestEnrich.TestResource.enrich(lambda item: item, []), [])
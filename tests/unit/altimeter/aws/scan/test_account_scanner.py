@@ -0,0 +1,381 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from altimeter.aws.auth.exceptions import AccountAuthException
+from altimeter.aws.resource.ec2.instance import EC2InstanceResourceSpec
+from altimeter.aws.resource.ec2.vpc import VPCResourceSpec
+from altimeter.aws.resource.iam.role import IAMRoleResourceSpec
+from altimeter.aws.scan.account_scan_plan import AccountScanPlan
+from altimeter.aws.scan.rate_limiter import initialize_rate_limiter
+from altimeter.aws.resource.iam.policy import IAMAWSManagedPolicyResourceSpec
+from altimeter.aws.scan.account_scanner import (
+    AccountScanner,
+    ScanUnit,
+    ScanUnitDispatcher,
+    scan_account_invariant_resources,
+    scan_scan_unit,
+    scan_scan_unit_to_dict,
+    schedule_scan,
+    sort_scan_units,
+)
+from altimeter.aws.scan.scan_unit_history import ScanUnitHistory
+from altimeter.core.artifact_io import ARTIFACT_FORMAT_BINARY
+from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.multilevel_counter import MultilevelCounter
+from altimeter.core.resource.resource import Resource
+
+
+def build_scan_unit(account_id, region_name, service, resource_spec_class):
+    return ScanUnit(
+        graph_name="alti",
+        graph_version="1",
+        account_id=account_id,
+        region_name=region_name,
+        service=service,
+        access_key="access_key",
+        secret_key="secret_key",
+        token="token",
+        resource_spec_classes=(resource_spec_class,),
+    )
+
+
+class TestSortScanUnits(TestCase):
+    def setUp(self):
+        self.iam_scan_unit = build_scan_unit("123", "us-east-1", "iam", IAMRoleResourceSpec)
+        self.vpc_scan_unit = build_scan_unit("123", "us-east-1", "ec2", VPCResourceSpec)
+        self.instance_scan_unit = build_scan_unit(
+            "123", "us-west-2", "ec2", EC2InstanceResourceSpec
+        )
+        self.other_account_scan_unit = build_scan_unit("456", "us-east-1", "ec2", VPCResourceSpec)
+
+    def test_no_history(self):
+        scan_units = [self.iam_scan_unit, self.vpc_scan_unit, self.instance_scan_unit]
+        sorted_scan_units = sort_scan_units(
+            scan_units=scan_units, account_ids_scan_unit_histories={}
+        )
+        self.assertCountEqual(sorted_scan_units, scan_units)
+
+    def test_longest_first(self):
+        history = ScanUnitHistory()
+        history.record(self.iam_scan_unit.history_key, duration_sec=120.0, resource_count=100)
+        history.record(self.vpc_scan_unit.history_key, duration_sec=1.0, resource_count=1)
+        history.record(self.instance_scan_unit.history_key, duration_sec=30.0, resource_count=10)
+        sorted_scan_units = sort_scan_units(
+            scan_units=[self.vpc_scan_unit, self.instance_scan_unit, self.iam_scan_unit],
+            account_ids_scan_unit_histories={"123": history},
+        )
+        self.assertListEqual(
+            sorted_scan_units, [self.iam_scan_unit, self.instance_scan_unit, self.vpc_scan_unit]
+        )
+
+    def test_unknown_first(self):
+        history = ScanUnitHistory()
+        history.record(self.iam_scan_unit.history_key, duration_sec=120.0, resource_count=100)
+        sorted_scan_units = sort_scan_units(
+            scan_units=[self.iam_scan_unit, self.other_account_scan_unit],
+            account_ids_scan_unit_histories={"123": history},
+        )
+        self.assertListEqual(sorted_scan_units, [self.other_account_scan_unit, self.iam_scan_unit])
+
+
+class TestScanUnitDispatcher(TestCase):
+    def test_longest_first_across_accounts(self):
+        account_1_long = build_scan_unit("123", "us-east-1", "iam", IAMRoleResourceSpec)
+        account_1_short = build_scan_unit("123", "us-east-1", "ec2", VPCResourceSpec)
+        account_2_long = build_scan_unit("456", "us-west-2", "ec2", EC2InstanceResourceSpec)
+        account_2_short = build_scan_unit("456", "us-east-1", "ec2", VPCResourceSpec)
+        account_1_history = ScanUnitHistory()
+        account_1_history.record(account_1_long.history_key, duration_sec=100.0, resource_count=1)
+        account_1_history.record(account_1_short.history_key, duration_sec=10.0, resource_count=1)
+        account_2_history = ScanUnitHistory()
+        account_2_history.record(account_2_long.history_key, duration_sec=50.0, resource_count=1)
+        account_2_history.record(account_2_short.history_key, duration_sec=1.0, resource_count=1)
+        account_ids_scan_unit_histories = {"123": account_1_history}
+        executor = MagicMock(spec=ThreadPoolExecutor)
+        executor.submit.side_effect = lambda func, scan_unit: MagicMock()
+        dispatcher = ScanUnitDispatcher(
+            executor=executor,
+            max_in_flight=1,
+            account_ids_scan_unit_histories=account_ids_scan_unit_histories,
+        )
+        dispatched = []
+        dispatcher.add([account_1_short, account_1_long])
+        in_flight = dispatcher.dispatch()
+        self.assertEqual(len(in_flight), 1)
+        self.assertDictEqual(dispatcher.dispatch(), {})
+        # the second account's prescan completes while the first account's ScanUnits are
+        # being scanned
+        account_ids_scan_unit_histories["456"] = account_2_history
+        dispatcher.add([account_2_short, account_2_long])
+        while in_flight:
+            (future,) = in_flight
+            dispatched.append(dispatcher.complete(future))
+            in_flight = dispatcher.dispatch()
+        self.assertListEqual(
+            dispatched, [account_1_long, account_2_long, account_1_short, account_2_short]
+        )
+        self.assertListEqual(
+            [call_args[0][1] for call_args in executor.submit.call_args_list], dispatched
+        )
+
+    def test_max_in_flight(self):
+        scan_units = [
+            build_scan_unit(account_id, "us-east-1", "ec2", VPCResourceSpec)
+            for account_id in ("123", "456", "789")
+        ]
+        executor = MagicMock(spec=ThreadPoolExecutor)
+        executor.submit.side_effect = lambda func, scan_unit: MagicMock()
+        dispatcher = ScanUnitDispatcher(
+            executor=executor, max_in_flight=2, account_ids_scan_unit_histories={}
+        )
+        dispatcher.add(scan_units)
+        in_flight = dispatcher.dispatch()
+        self.assertEqual(len(in_flight), 2)
+        dispatcher.complete(next(iter(in_flight)))
+        self.assertEqual(len(dispatcher.dispatch()), 1)
+        self.assertDictEqual(dispatcher.dispatch(), {})
+        self.assertEqual(executor.submit.call_count, 3)
+
+    def test_invalid_max_in_flight(self):
+        with self.assertRaises(ValueError):
+            ScanUnitDispatcher(
+                executor=MagicMock(), max_in_flight=0, account_ids_scan_unit_histories={}
+            )
+
+
+def fake_get_session(account_id, region_name=None):
+    if account_id == "111":
+        raise AccountAuthException("unable to access 111")
+    session = MagicMock()
+    session.client.return_value.get_caller_identity.return_value = {"Account": account_id}
+    return session
+
+
+def fake_scan_scan_unit(scan_unit, resources=()):
+    graph_set = GraphSet(
+        name=scan_unit.graph_name,
+        version=scan_unit.graph_version,
+        start_time=1,
+        end_time=2,
+        resources=list(resources),
+        errors=[],
+        stats=MultilevelCounter(),
+    )
+    return scan_unit.account_id, graph_set, 1.0
+
+
+class TestAccountScanner(TestCase):
+    @patch("altimeter.aws.scan.account_scanner.scan_scan_unit", fake_scan_scan_unit)
+    def test_scan_with_prescan_error(self):
+        accessor = MagicMock()
+        accessor.get_session.side_effect = fake_get_session
+        artifact_writer = MagicMock()
+        artifact_writer.write_json_stream.side_effect = (
+            lambda name, write, compression: f"/tmp/{name}.json"
+        )
+        account_scanner = AccountScanner(
+            account_scan_plan=AccountScanPlan(
+                account_ids=("111", "222", "333"), regions=("us-east-1",), accessor=accessor
+            ),
+            artifact_writer=artifact_writer,
+            max_svc_scan_threads=4,
+            preferred_account_scan_regions=("us-east-1",),
+            scan_sub_accounts=False,
+        )
+        scan_result_dicts = account_scanner.scan()
+        account_ids_errors = {
+            scan_result_dict["account_id"]: scan_result_dict["errors"]
+            for scan_result_dict in scan_result_dicts
+        }
+        self.assertCountEqual(account_ids_errors.keys(), ["111", "222", "333"])
+        self.assertEqual(len(account_ids_errors["111"]), 1)
+        self.assertIn("unable to access 111", account_ids_errors["111"][0])
+        self.assertListEqual(account_ids_errors["222"], [])
+        self.assertListEqual(account_ids_errors["333"], [])
+
+    @patch("altimeter.aws.scan.account_scanner.scan_scan_unit", fake_scan_scan_unit)
+    def test_scan_with_binary_artifact_format(self):
+        accessor = MagicMock()
+        accessor.get_session.side_effect = fake_get_session
+        artifact_writer = MagicMock()
+        artifact_writer.write_graph_set_binary.side_effect = (
+            lambda name, graph_set, compression: f"/tmp/{name}.agb"
+        )
+        account_scanner = AccountScanner(
+            account_scan_plan=AccountScanPlan(
+                account_ids=("111", "222"), regions=("us-east-1",), accessor=accessor
+            ),
+            artifact_writer=artifact_writer,
+            max_svc_scan_threads=4,
+            preferred_account_scan_regions=("us-east-1",),
+            scan_sub_accounts=False,
+            artifact_format=ARTIFACT_FORMAT_BINARY,
+        )
+        scan_result_dicts = account_scanner.scan()
+        self.assertCountEqual(
+            [scan_result_dict["output_artifact"] for scan_result_dict in scan_result_dicts],
+            ["/tmp/111.agb", "/tmp/222.agb"],
+        )
+        artifact_writer.write_json_stream.assert_not_called()
+
+    @patch("altimeter.aws.scan.account_scanner.scan_scan_unit", fake_scan_scan_unit)
+    def test_scan_with_artifact_writer_threads(self):
+        accessor = MagicMock()
+        accessor.get_session.side_effect = fake_get_session
+        writer_thread_names = []
+
+        def write_json_stream(name, write, compression):
+            writer_thread_names.append(threading.current_thread().name)
+            return f"/tmp/{name}.json"
+
+        artifact_writer = MagicMock()
+        artifact_writer.write_json_stream.side_effect = write_json_stream
+        account_scanner = AccountScanner(
+            account_scan_plan=AccountScanPlan(
+                account_ids=("111", "222", "333"), regions=("us-east-1",), accessor=accessor
+            ),
+            artifact_writer=artifact_writer,
+            max_svc_scan_threads=4,
+            preferred_account_scan_regions=("us-east-1",),
+            scan_sub_accounts=False,
+            max_artifact_writer_threads=2,
+        )
+        scan_result_dicts = account_scanner.scan()
+        self.assertCountEqual(
+            [scan_result_dict["output_artifact"] for scan_result_dict in scan_result_dicts],
+            ["/tmp/111.json", "/tmp/222.json", "/tmp/333.json"],
+        )
+        self.assertEqual(len(writer_thread_names), 3)
+        for writer_thread_name in writer_thread_names:
+            self.assertTrue(writer_thread_name.startswith("artifact-writer"))
+        account_ids_errors = {
+            scan_result_dict["account_id"]: scan_result_dict["errors"]
+            for scan_result_dict in scan_result_dicts
+        }
+        self.assertEqual(len(account_ids_errors["111"]), 1)
+        self.assertListEqual(account_ids_errors["222"], [])
+
+    @patch("altimeter.aws.scan.account_scanner.scan_scan_unit", fake_scan_scan_unit)
+    @patch("altimeter.aws.scan.account_scanner.get_rate_limiter")
+    def test_scan_with_svc_scan_processes_splits_rate_limits(self, mock_get_rate_limiter):
+        accessor = MagicMock()
+        accessor.get_session.side_effect = fake_get_session
+        artifact_writer = MagicMock()
+        artifact_writer.write_json_stream.side_effect = (
+            lambda name, write, compression: f"/tmp/{name}.json"
+        )
+        executor_kwargs = {}
+
+        class RecordingProcessPoolExecutor(ThreadPoolExecutor):
+            def __init__(self, **kwargs):
+                executor_kwargs.update(kwargs)
+                super().__init__(max_workers=kwargs["max_workers"])
+
+        account_scanner = AccountScanner(
+            account_scan_plan=AccountScanPlan(
+                account_ids=("222",), regions=("us-east-1",), accessor=accessor
+            ),
+            artifact_writer=artifact_writer,
+            max_svc_scan_threads=4,
+            preferred_account_scan_regions=("us-east-1",),
+            scan_sub_accounts=False,
+            max_svc_scan_processes=4,
+            rate_limits={"ec2": 10.0, "iam": 2.0},
+        )
+        with patch(
+            "altimeter.aws.scan.account_scanner.ProcessPoolExecutor", RecordingProcessPoolExecutor
+        ):
+            scan_result_dicts = account_scanner.scan()
+        self.assertListEqual(scan_result_dicts[0]["errors"], [])
+        mock_get_rate_limiter.return_value.set_rate_limits.assert_called_once_with(
+            {"ec2": 10.0, "iam": 2.0}
+        )
+        self.assertEqual(executor_kwargs["max_workers"], 4)
+        self.assertIs(executor_kwargs["initializer"], initialize_rate_limiter)
+        self.assertTupleEqual(executor_kwargs["initargs"], ({"ec2": 2.5, "iam": 0.5},))
+
+
+def fake_account_invariant_scan_scan_unit(scan_unit):
+    resource = Resource.from_dict(
+        "arn:aws:iam::aws:policy/ReadOnlyAccess",
+        {
+            "type": "aws:iam:policy",
+            "links": [{"pred": "name", "obj": "ReadOnlyAccess", "type": "simple"}],
+        },
+    )
+    return fake_scan_scan_unit(scan_unit, resources=[resource])
+
+
+class TestScanAccountInvariantResources(TestCase):
+    @patch(
+        "altimeter.aws.scan.account_scanner.scan_scan_unit", fake_account_invariant_scan_scan_unit
+    )
+    def test_scan_account_invariant_resources(self):
+        accessor = MagicMock()
+        accessor.get_session.side_effect = fake_get_session
+        graph_set_dict = scan_account_invariant_resources(
+            account_ids=("111", "222", "333"),
+            accessor=accessor,
+            preferred_account_scan_regions=("us-west-2",),
+            scan_sub_accounts=False,
+        )
+        self.assertListEqual(graph_set_dict["errors"], [])
+        self.assertListEqual(
+            list(graph_set_dict["resources"].keys()), ["arn:aws:iam::aws:policy/ReadOnlyAccess"]
+        )
+        # 111 is inaccessible, 222 is used and 333 is never accessed
+        self.assertListEqual(
+            [call[1]["account_id"] for call in accessor.get_session.call_args_list], ["111", "222"],
+        )
+
+    def test_scan_account_invariant_resources_all_errors(self):
+        accessor = MagicMock()
+        accessor.get_session.side_effect = AccountAuthException("no access")
+        graph_set_dict = scan_account_invariant_resources(
+            account_ids=("111", "222", "333", "444"),
+            accessor=accessor,
+            preferred_account_scan_regions=("us-west-2",),
+            scan_sub_accounts=False,
+        )
+        self.assertEqual(len(graph_set_dict["errors"]), 3)
+        self.assertDictEqual(graph_set_dict["resources"], {})
+
+
+class TestAccountScannerResourceSpecClasses(TestCase):
+    def test_account_invariant_excluded(self):
+        account_scanner = AccountScanner(
+            account_scan_plan=AccountScanPlan(account_ids=(), regions=(), accessor=MagicMock()),
+            artifact_writer=MagicMock(),
+            max_svc_scan_threads=1,
+            preferred_account_scan_regions=("us-east-1",),
+            scan_sub_accounts=False,
+        )
+        self.assertNotIn(IAMAWSManagedPolicyResourceSpec, account_scanner.resource_spec_classes)
+
+
+class TestScheduleScan(TestCase):
+    def test_thread_pool_executor(self):
+        executor = MagicMock(spec=ThreadPoolExecutor)
+        scan_unit = build_scan_unit("123", "us-east-1", "ec2", VPCResourceSpec)
+        schedule_scan(executor=executor, scan_unit=scan_unit)
+        executor.submit.assert_called_once_with(scan_scan_unit, scan_unit)
+
+    def test_process_pool_executor(self):
+        executor = MagicMock(spec=ProcessPoolExecutor)
+        scan_unit = build_scan_unit("123", "us-east-1", "ec2", VPCResourceSpec)
+        schedule_scan(executor=executor, scan_unit=scan_unit)
+        executor.submit.assert_called_once_with(scan_scan_unit_to_dict, scan_unit)
+
+    @patch(
+        "altimeter.aws.scan.account_scanner.scan_scan_unit", fake_account_invariant_scan_scan_unit
+    )
+    def test_scan_scan_unit_to_dict(self):
+        scan_unit = build_scan_unit("123", "us-east-1", "iam", IAMAWSManagedPolicyResourceSpec)
+        account_id, graph_set_dict, elapsed_sec = scan_scan_unit_to_dict(scan_unit)
+        self.assertEqual(account_id, "123")
+        self.assertEqual(elapsed_sec, 1.0)
+        self.assertDictEqual(
+            graph_set_dict, fake_account_invariant_scan_scan_unit(scan_unit)[1].to_dict()
+        )
@@ -0,0 +1,77 @@
+from unittest import TestCase
+
+import boto3
+from botocore.awsrequest import AWSResponse
+
+from altimeter.aws.scan.aws_accessor import AWSAccessor
+from altimeter.aws.scan.rate_limiter import AdaptiveRateLimiter
+
+THROTTLING_BODY = b"""<ErrorResponse xmlns="https://sts.amazonaws.com/doc/2011-06-15/">
+  <Error><Type>Sender</Type><Code>Throttling</Code><Message>Rate exceeded</Message></Error>
+  <RequestId>1</RequestId>
+</ErrorResponse>"""
+
+SUCCESS_BODY = b"""<GetCallerIdentityResponse xmlns="https://sts.amazonaws.com/doc/2011-06-15/">
+  <GetCallerIdentityResult>
+    <Arn>arn:aws:iam::123456789012:user/test</Arn>
+    <UserId>TEST</UserId>
+    <Account>123456789012</Account>
+  </GetCallerIdentityResult>
+  <ResponseMetadata><RequestId>2</RequestId></ResponseMetadata>
+</GetCallerIdentityResponse>"""
+
+
+class FakeSender:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def __call__(self, request, **kwargs):
+        status_code, body = self.responses.pop(0)
+
+        class Raw:
+            def stream(self, **kwargs):
+                yield body
+
+        return AWSResponse(request.url, status_code, {}, Raw())
+
+
+class TestAWSAccessor(TestCase):
+    def test_throttled_response_decreases_rate(self):
+        session = boto3.Session(
+            aws_access_key_id="test", aws_secret_access_key="test", region_name="us-east-1"
+        )
+        rate_limiter = AdaptiveRateLimiter({"sts": 8.0})
+        accessor = AWSAccessor(
+            session=session,
+            account_id="123456789012",
+            region_name="us-east-1",
+            rate_limiter=rate_limiter,
+        )
+        client = accessor.client("sts")
+        sender = FakeSender([(400, THROTTLING_BODY), (200, SUCCESS_BODY)])
+        client.meta.events.register("before-send.sts.GetCallerIdentity", sender)
+        resp = client.get_caller_identity()
+        self.assertEqual(resp["Account"], "123456789012")
+        self.assertListEqual(sender.responses, [])
+        bucket = rate_limiter.get_bucket("123456789012", "us-east-1", "sts", "GetCallerIdentity")
+        self.assertLess(bucket.rate, 8.0)
+        self.assertEqual(accessor.api_call_stats.to_dict()["count"], 2)
+
+    def test_close_unregisters_handlers(self):
+        session = boto3.Session(
+            aws_access_key_id="test", aws_secret_access_key="test", region_name="us-east-1"
+        )
+        rate_limiter = AdaptiveRateLimiter({"sts": 8.0})
+        accessor = AWSAccessor(
+            session=session,
+            account_id="123456789012",
+            region_name="us-east-1",
+            rate_limiter=rate_limiter,
+        )
+        client = accessor.client("sts")
+        accessor.close()
+        sender = FakeSender([(400, THROTTLING_BODY), (200, SUCCESS_BODY)])
+        client.meta.events.register("before-send.sts.GetCallerIdentity", sender)
+        client.get_caller_identity()
+        bucket = rate_limiter.get_bucket("123456789012", "us-east-1", "sts", "GetCallerIdentity")
+        self.assertEqual(bucket.rate, 8.0)
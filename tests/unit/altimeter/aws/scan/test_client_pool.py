@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+import boto3
+from moto import mock_ec2
+
+from altimeter.aws.scan.aws_accessor import AWSAccessor
+from altimeter.aws.scan.client_pool import AWSClientPool
+
+
+class TestAWSClientPool(TestCase):
+    def test_get_session_cached(self):
+        client_pool = AWSClientPool()
+        session = client_pool.get_session("access", "secret", "token", "us-east-1")
+        self.assertIs(client_pool.get_session("access", "secret", "token", "us-east-1"), session)
+        self.assertIsNot(client_pool.get_session("access", "secret", "token", "us-west-2"), session)
+
+    def test_get_session_shared_loader(self):
+        client_pool = AWSClientPool()
+        session_1 = client_pool.get_session("access", "secret", "token", "us-east-1")
+        session_2 = client_pool.get_session("access2", "secret2", "token2", "us-east-1")
+        loader = session_1._session.get_component("data_loader")
+        self.assertIs(session_2._session.get_component("data_loader"), loader)
+        self.assertEqual(len(loader.search_paths), len(set(loader.search_paths)))
+
+    def test_get_session_evicts(self):
+        client_pool = AWSClientPool(max_sessions=1)
+        session = client_pool.get_session("access", "secret", "token", "us-east-1")
+        client = client_pool.acquire_client(session, "us-east-1", "ec2")
+        client_pool.get_session("access", "secret", "token", "us-west-2")
+        client_pool.release_client(session, "us-east-1", "ec2", client)
+        self.assertIsNot(client_pool.acquire_client(session, "us-east-1", "ec2"), client)
+        self.assertIsNot(client_pool.get_session("access", "secret", "token", "us-east-1"), session)
+
+    def test_acquire_release_client(self):
+        client_pool = AWSClientPool(max_pool_connections=32)
+        session = client_pool.get_session("access", "secret", "token", "us-east-1")
+        client_1 = client_pool.acquire_client(session, "us-east-1", "ec2")
+        client_2 = client_pool.acquire_client(session, "us-east-1", "ec2")
+        self.assertIsNot(client_1, client_2)
+        self.assertEqual(client_1.meta.config.max_pool_connections, 32)
+        client_pool.release_client(session, "us-east-1", "ec2", client_1)
+        self.assertIs(client_pool.acquire_client(session, "us-east-1", "ec2"), client_1)
+
+    @mock_ec2
+    def test_pooled_accessor_stats(self):
+        client_pool = AWSClientPool()
+        session = client_pool.get_session("access", "secret", "token", "us-east-1")
+        accessor_1 = AWSAccessor(
+            session=session, account_id="123", region_name="us-east-1", client_pool=client_pool
+        )
+        client_1 = accessor_1.client("ec2")
+        client_1.describe_vpcs()
+        accessor_1.close()
+        accessor_2 = AWSAccessor(
+            session=session, account_id="123", region_name="us-east-1", client_pool=client_pool
+        )
+        client_2 = accessor_2.client("ec2")
+        self.assertIs(client_2, client_1)
+        client_2.describe_vpcs()
+        client_2.describe_vpcs()
+        accessor_2.close()
+        self.assertEqual(
+            accessor_1.api_call_stats.to_dict()["123"]["us-east-1"]["ec2"]["DescribeVpcs"]["count"],
+            1,
+        )
+        self.assertEqual(
+            accessor_2.api_call_stats.to_dict()["123"]["us-east-1"]["ec2"]["DescribeVpcs"]["count"],
+            2,
+        )
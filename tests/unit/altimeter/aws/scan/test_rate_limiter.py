@@ -0,0 +1,159 @@
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from typing import Dict
+from unittest import TestCase
+from unittest.mock import patch
+
+from altimeter.aws.scan.rate_limiter import (
+    AdaptiveRateLimiter,
+    TokenBucket,
+    get_rate_limiter,
+    initialize_rate_limiter,
+    is_throttling_response,
+    split_rate_limits,
+)
+
+
+def get_process_rate_limits() -> Dict[str, float]:
+    return get_rate_limiter().rate_limits
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, secs):
+        self.now += secs
+
+
+class TestTokenBucket(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.patchers = [
+            patch("altimeter.aws.scan.rate_limiter.time.monotonic", self.clock.monotonic),
+            patch("altimeter.aws.scan.rate_limiter.time.sleep", self.clock.sleep),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def test_unlimited_does_not_block(self):
+        bucket = TokenBucket()
+        for _ in range(100):
+            bucket.acquire()
+        self.assertEqual(self.clock.now, 1000.0)
+
+    def test_limited_blocks(self):
+        bucket = TokenBucket(rate=2.0, max_rate=2.0)
+        for _ in range(5):
+            bucket.acquire()
+        self.assertAlmostEqual(self.clock.now, 1002.0)
+
+    def test_throttle_decreases_rate(self):
+        bucket = TokenBucket(rate=8.0, max_rate=8.0)
+        bucket.on_throttle()
+        self.assertEqual(bucket.rate, 4.0)
+
+    def test_throttle_cooldown(self):
+        bucket = TokenBucket(rate=8.0, max_rate=8.0, decrease_cooldown=1.0)
+        bucket.on_throttle()
+        bucket.on_throttle()
+        self.assertEqual(bucket.rate, 4.0)
+        self.clock.sleep(1.0)
+        bucket.on_throttle()
+        self.assertEqual(bucket.rate, 2.0)
+
+    def test_throttle_min_rate(self):
+        bucket = TokenBucket(rate=0.6, min_rate=0.5)
+        bucket.on_throttle()
+        self.assertEqual(bucket.rate, 0.5)
+
+    def test_success_increases_rate_up_to_max(self):
+        bucket = TokenBucket(rate=8.0, max_rate=8.0, additive_increase=1.0)
+        bucket.on_throttle()
+        self.clock.sleep(2.0)
+        bucket.on_success()
+        self.assertEqual(bucket.rate, 6.0)
+        self.clock.sleep(10.0)
+        bucket.on_success()
+        self.assertEqual(bucket.rate, 8.0)
+
+    def test_unlimited_throttle_uses_observed_rate(self):
+        bucket = TokenBucket()
+        for _ in range(20):
+            bucket.acquire()
+            self.clock.sleep(0.1)
+        bucket.on_throttle()
+        self.assertAlmostEqual(bucket.rate, 5.0)
+        self.clock.sleep(10.0)
+        bucket.on_success()
+        self.assertIsNone(bucket.max_rate)
+        self.assertAlmostEqual(bucket.rate, 15.0)
+
+
+class TestAdaptiveRateLimiter(TestCase):
+    def test_get_bucket_rate_limits(self):
+        rate_limiter = AdaptiveRateLimiter(rate_limits={"ec2": 10.0, "ec2.DescribeInstances": 2.0})
+        self.assertEqual(
+            rate_limiter.get_bucket("123", "us-east-1", "ec2", "DescribeInstances").rate, 2.0
+        )
+        self.assertEqual(
+            rate_limiter.get_bucket("123", "us-east-1", "ec2", "DescribeVpcs").rate, 10.0
+        )
+        self.assertIsNone(rate_limiter.get_bucket("123", "us-east-1", "iam", "ListRoles").rate)
+
+    def test_get_bucket_same_bucket(self):
+        rate_limiter = AdaptiveRateLimiter()
+        bucket = rate_limiter.get_bucket("123", "us-east-1", "ec2", "DescribeVpcs")
+        self.assertIs(rate_limiter.get_bucket("123", "us-east-1", "ec2", "DescribeVpcs"), bucket)
+        self.assertIsNot(rate_limiter.get_bucket("456", "us-east-1", "ec2", "DescribeVpcs"), bucket)
+
+    def test_set_rate_limits(self):
+        rate_limiter = AdaptiveRateLimiter(rate_limits={"ec2": 10.0})
+        bucket = rate_limiter.get_bucket("123", "us-east-1", "ec2", "DescribeVpcs")
+        rate_limiter.set_rate_limits({"ec2": 10.0})
+        self.assertIs(rate_limiter.get_bucket("123", "us-east-1", "ec2", "DescribeVpcs"), bucket)
+        rate_limiter.set_rate_limits({"ec2": 5.0})
+        self.assertEqual(
+            rate_limiter.get_bucket("123", "us-east-1", "ec2", "DescribeVpcs").rate, 5.0
+        )
+
+
+class TestIsThrottlingResponse(TestCase):
+    def test_throttling(self):
+        self.assertTrue(is_throttling_response({"Error": {"Code": "Throttling"}}))
+
+    def test_other_error(self):
+        self.assertFalse(is_throttling_response({"Error": {"Code": "AccessDenied"}}))
+
+    def test_success(self):
+        self.assertFalse(is_throttling_response({"Vpcs": []}))
+
+
+class TestSplitRateLimits(TestCase):
+    def test_split_rate_limits(self):
+        self.assertDictEqual(
+            split_rate_limits({"ec2": 10.0, "iam.ListRoles": 3}, 4),
+            {"ec2": 2.5, "iam.ListRoles": 0.75},
+        )
+
+    def test_split_rate_limits_invalid_process_count(self):
+        with self.assertRaises(ValueError):
+            split_rate_limits({"ec2": 10.0}, 0)
+
+
+class TestInitializeRateLimiter(TestCase):
+    def test_spawned_worker_rate_limits(self):
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initialize_rate_limiter,
+            initargs=(split_rate_limits({"ec2": 10.0}, 2),),
+        ) as executor:
+            self.assertDictEqual(executor.submit(get_process_rate_limits).result(), {"ec2": 5.0})
@@ -0,0 +1,263 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+from pathlib import Path
+import tempfile
+import threading
+from unittest import TestCase
+
+from altimeter.aws.resource.iam.account_authorization_details import (
+    AccountAuthorizationDetails,
+)
+from altimeter.aws.resource.iam.policy import (
+    IAMAttachedAWSManagedPolicyResourceSpec,
+    IAMAWSManagedPolicyResourceSpec,
+)
+from altimeter.aws.resource.resource_spec import ListFromAWSResult
+from altimeter.aws.scan.scan import (
+    GraphSetArtifactPrefetcher,
+    filter_account_invariant_graph_set_dict,
+    read_graph_set_artifact,
+)
+from altimeter.core.artifact_io import ARTIFACT_FORMAT_BINARY, ARTIFACT_FORMAT_JSON
+from altimeter.core.artifact_io.dedup import CONTENT_ARTIFACT_DIR
+from altimeter.core.artifact_io.graph_set_binary import write_graph_set_binary
+from altimeter.core.artifact_io.reader import FileArtifactReader
+from altimeter.core.artifact_io.writer import FileArtifactWriter
+from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.graph.graph_set_builder import StreamingGraphSetBuilder
+from altimeter.core.graph.link.links import SimpleLink
+from altimeter.core.multilevel_counter import MultilevelCounter
+from altimeter.core.resource.resource import Resource
+
+
+def build_graph_set(account_id):
+    return GraphSet(
+        name="alti",
+        version="2",
+        start_time=int(account_id),
+        end_time=int(account_id) + 10,
+        resources=[
+            Resource(
+                resource_id="arn:aws:iam::aws:policy/ReadOnlyAccess",
+                type_name="aws:iam:policy",
+                links=[SimpleLink(pred=f"seen-by-{account_id}", obj=True)],
+            ),
+            Resource(resource_id=f"arn:aws:::{account_id}:account", type_name="aws:account"),
+        ],
+        errors=[f"error {account_id}"],
+        stats=MultilevelCounter(),
+    )
+
+
+class BlockingFileArtifactReader(FileArtifactReader):
+    """FileArtifactReader which blocks reads of the first artifact until released"""
+
+    def __init__(self, first_path):
+        self.first_path = first_path
+        self.release = threading.Event()
+
+    def read_json(self, path):
+        if path == self.first_path:
+            self.release.wait(timeout=10)
+        return super().read_json(path)
+
+
+class TestGraphSetArtifactPrefetcher(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.account_ids = ("111", "222", "333", "444")
+        self.graph_sets = [build_graph_set(account_id) for account_id in self.account_ids]
+        self.paths = []
+        for account_id, graph_set in zip(self.account_ids, self.graph_sets):
+            if account_id == "333":
+                path = os.path.join(self.temp_dir.name, f"{account_id}.agb")
+                with open(path, "wb") as fp:
+                    write_graph_set_binary(
+                        fp=fp,
+                        name=graph_set.name,
+                        version=graph_set.version,
+                        start_time=graph_set.start_time,
+                        end_time=graph_set.end_time,
+                        resources=graph_set.resources,
+                        errors=graph_set.errors,
+                        stats=graph_set.stats,
+                    )
+            else:
+                path = os.path.join(self.temp_dir.name, f"{account_id}.json")
+                with open(path, "w") as fp:
+                    graph_set.write_json(fp)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_merges_in_order(self):
+        artifact_reader = BlockingFileArtifactReader(first_path=self.paths[0])
+        with StreamingGraphSetBuilder(
+            name="alti", version="2"
+        ) as builder, ThreadPoolExecutor(max_workers=4) as executor:
+            prefetcher = GraphSetArtifactPrefetcher(
+                artifact_reader=artifact_reader,
+                graph_set_builder=builder,
+                executor=executor,
+                max_pending=4,
+            )
+            for path in self.paths:
+                prefetcher.add(path)
+            # later artifacts are read while the first is blocked but not merged before it
+            self.assertEqual(builder.num_resources, 0)
+            artifact_reader.release.set()
+            prefetcher.flush()
+            graph_set = builder.to_graph_set()
+        expected_graph_set = self.graph_sets[0]
+        for other_graph_set in self.graph_sets[1:]:
+            expected_graph_set.merge(other_graph_set)
+        self.assertDictEqual(graph_set.to_dict(), expected_graph_set.to_dict())
+
+    def test_max_pending(self):
+        artifact_reader = FileArtifactReader()
+        with StreamingGraphSetBuilder(
+            name="alti", version="2"
+        ) as builder, ThreadPoolExecutor(max_workers=2) as executor:
+            prefetcher = GraphSetArtifactPrefetcher(
+                artifact_reader=artifact_reader,
+                graph_set_builder=builder,
+                executor=executor,
+                max_pending=2,
+            )
+            for path in self.paths:
+                prefetcher.add(path)
+            # adding beyond max_pending merged the first two artifacts
+            self.assertEqual(builder.num_resources, 3)
+            prefetcher.flush()
+            self.assertEqual(builder.num_resources, 5)
+
+
+class TestReadGraphSetArtifact(TestCase):
+    def test_artifact_refs(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            content_artifact_writer = FileArtifactWriter(
+                scan_id=CONTENT_ARTIFACT_DIR, output_dir=Path(temp_dir)
+            )
+            artifact_writer = FileArtifactWriter(scan_id="test-scan-id", output_dir=Path(temp_dir))
+            graph_set = build_graph_set("111")
+            for artifact_format in (ARTIFACT_FORMAT_JSON, ARTIFACT_FORMAT_BINARY):
+                path = artifact_writer.write_deduplicated_graph_set(
+                    name=f"111-{artifact_format}",
+                    graph_set=graph_set,
+                    content_artifact_writer=content_artifact_writer,
+                    artifact_format=artifact_format,
+                )
+                artifact = read_graph_set_artifact(FileArtifactReader(), path)
+                if artifact_format == ARTIFACT_FORMAT_BINARY:
+                    artifact = artifact.to_graph_set().to_dict()
+                self.assertDictEqual(artifact, graph_set.to_dict())
+
+
+AWS_MANAGED_POLICIES = {
+    f"arn:aws:iam::aws:policy/{policy_name}": {
+        "PolicyName": policy_name,
+        "PolicyId": f"ANPA{policy_name.upper()}",
+        "Arn": f"arn:aws:iam::aws:policy/{policy_name}",
+        "DefaultVersionId": "v1",
+    }
+    for policy_name in ("ReadOnlyAccess", "AdministratorAccess", "SecurityAudit")
+}
+
+
+def build_policy_graph_set_dict(resource_spec_class, policies, account_id):
+    resources = resource_spec_class._list_from_aws_result_to_resources(
+        ListFromAWSResult(resources=policies),
+        context={"account_id": account_id, "region": "us-east-1"},
+    )
+    return GraphSet(
+        name="alti",
+        version="2",
+        start_time=1,
+        end_time=2,
+        resources=resources,
+        errors=[],
+        stats=MultilevelCounter(),
+    ).to_dict()
+
+
+def build_account_authorization_details(policy_names):
+    return AccountAuthorizationDetails(
+        users=[],
+        groups=[],
+        roles=[
+            {
+                "RoleName": f"role-{policy_name}",
+                "Arn": f"arn:aws:iam::111:role/role-{policy_name}",
+                "AttachedManagedPolicies": [
+                    {
+                        "PolicyName": policy_name,
+                        "PolicyArn": f"arn:aws:iam::aws:policy/{policy_name}",
+                    },
+                    {"PolicyName": "local", "PolicyArn": "arn:aws:iam::111:policy/local"},
+                ],
+            }
+            for policy_name in policy_names
+        ],
+        policies=[],
+    )
+
+
+class TestFilterAccountInvariantGraphSetDict(TestCase):
+    def test_master_policies_match_per_account_scan(self):
+        accounts_policy_names = {
+            "111": ["ReadOnlyAccess"],
+            "222": ["ReadOnlyAccess", "AdministratorAccess"],
+        }
+        # previously each account scanned the AWS-managed policies attached in it
+        with StreamingGraphSetBuilder(name="alti", version="2") as builder:
+            for account_id, policy_names in accounts_policy_names.items():
+                builder.add_graph_set_dict(
+                    build_policy_graph_set_dict(
+                        IAMAWSManagedPolicyResourceSpec,
+                        {
+                            f"arn:aws:iam::aws:policy/{policy_name}": AWS_MANAGED_POLICIES[
+                                f"arn:aws:iam::aws:policy/{policy_name}"
+                            ]
+                            for policy_name in policy_names
+                        },
+                        account_id,
+                    )
+                )
+            per_account_graph_set = builder.to_graph_set()
+        with StreamingGraphSetBuilder(name="alti", version="2") as builder:
+            for account_id, policy_names in accounts_policy_names.items():
+                spec_class = IAMAttachedAWSManagedPolicyResourceSpec
+                attached_policies = spec_class.list_from_account_authorization_details(
+                    client=None,
+                    account_authorization_details=build_account_authorization_details(
+                        policy_names
+                    ),
+                    account_id=account_id,
+                    region="us-east-1",
+                ).resources
+                builder.add_graph_set_dict(
+                    build_policy_graph_set_dict(spec_class, attached_policies, account_id)
+                )
+            account_invariant_graph_set_dict = filter_account_invariant_graph_set_dict(
+                graph_set_dict=build_policy_graph_set_dict(
+                    IAMAWSManagedPolicyResourceSpec, AWS_MANAGED_POLICIES, "111"
+                ),
+                graph_set_builder=builder,
+            )
+            builder.add_graph_set_dict(account_invariant_graph_set_dict)
+            graph_set = builder.to_graph_set()
+        self.assertCountEqual(
+            account_invariant_graph_set_dict["resources"].keys(),
+            [
+                "arn:aws:iam::aws:policy/ReadOnlyAccess",
+                "arn:aws:iam::aws:policy/AdministratorAccess",
+            ],
+        )
+        self.assertDictEqual(
+            {resource.resource_id: resource.to_dict() for resource in graph_set.resources},
+            {
+                resource.resource_id: resource.to_dict()
+                for resource in per_account_graph_set.resources
+            },
+        )
@@ -0,0 +1,63 @@
+import tempfile
+from unittest import TestCase
+
+from altimeter.aws.resource.ec2.instance import EC2InstanceResourceSpec
+from altimeter.aws.resource.ec2.vpc import VPCResourceSpec
+from altimeter.aws.scan.scan_unit_history import (
+    ScanUnitHistory,
+    ScanUnitHistoryEntry,
+    ScanUnitHistoryStore,
+    get_scan_unit_key,
+)
+
+
+class TestGetScanUnitKey(TestCase):
+    def test_key_is_order_independent(self):
+        self.assertEqual(
+            get_scan_unit_key("us-east-1", "ec2", (VPCResourceSpec, EC2InstanceResourceSpec)),
+            get_scan_unit_key("us-east-1", "ec2", (EC2InstanceResourceSpec, VPCResourceSpec)),
+        )
+        self.assertEqual(
+            get_scan_unit_key("us-east-1", "ec2", (VPCResourceSpec,)),
+            "us-east-1/ec2/VPCResourceSpec",
+        )
+
+
+class TestScanUnitHistory(TestCase):
+    def test_get_expected_duration_no_history(self):
+        self.assertIsNone(ScanUnitHistory().get_expected_duration("us-east-1/ec2/VPCResourceSpec"))
+
+    def test_record(self):
+        history = ScanUnitHistory()
+        history.record("us-east-1/iam/IAMRoleResourceSpec", duration_sec=10.0, resource_count=5)
+        self.assertEqual(history.get_expected_duration("us-east-1/iam/IAMRoleResourceSpec"), 10.0)
+        history.record("us-east-1/iam/IAMRoleResourceSpec", duration_sec=20.0, resource_count=6)
+        self.assertEqual(history.get_expected_duration("us-east-1/iam/IAMRoleResourceSpec"), 15.0)
+        self.assertEqual(
+            history.entries["us-east-1/iam/IAMRoleResourceSpec"],
+            ScanUnitHistoryEntry(duration_sec=15.0, resource_count=6),
+        )
+
+    def test_to_dict_from_dict(self):
+        history = ScanUnitHistory()
+        history.record("us-east-1/iam/IAMRoleResourceSpec", duration_sec=10.0, resource_count=5)
+        self.assertEqual(
+            ScanUnitHistory.from_dict(history.to_dict()).entries,
+            history.entries,
+        )
+
+
+class TestScanUnitHistoryStore(TestCase):
+    def test_read_missing(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = ScanUnitHistoryStore(artifact_path=temp_dir)
+            self.assertDictEqual(store.read(account_id="123456789012").entries, {})
+
+    def test_write_read(self):
+        history = ScanUnitHistory()
+        history.record("us-east-1/iam/IAMRoleResourceSpec", duration_sec=10.0, resource_count=5)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = ScanUnitHistoryStore(artifact_path=temp_dir)
+            store.write(account_id="123456789012", scan_unit_history=history)
+            self.assertDictEqual(store.read(account_id="123456789012").entries, history.entries)
+            self.assertDictEqual(store.read(account_id="210987654321").entries, {})
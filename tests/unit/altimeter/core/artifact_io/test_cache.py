@@ -0,0 +1,80 @@
+import io
+import os
+from pathlib import Path
+import tempfile
+import time
+import unittest
+
+from altimeter.core.artifact_io.cache import ArtifactCache
+
+
+class TestArtifactCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_put_open(self):
+        cache = ArtifactCache(cache_dir=self.cache_dir)
+        self.assertIsNone(cache.open(bucket="bucket", key="key"))
+        with cache.put(bucket="bucket", key="key", etag='"abc"', body=io.BytesIO(b"data")) as fp:
+            self.assertEqual(fp.read(), b"data")
+        with cache.open(bucket="bucket", key="key") as fp:
+            self.assertEqual(fp.read(), b"data")
+        with cache.open(bucket="bucket", key="key", etag='"abc"') as fp:
+            self.assertEqual(fp.read(), b"data")
+        self.assertIsNone(cache.open(bucket="bucket", key="key", etag='"def"'))
+        self.assertIsNone(cache.open(bucket="other_bucket", key="key"))
+
+    def test_put_replaces_other_etags(self):
+        cache = ArtifactCache(cache_dir=self.cache_dir)
+        cache.put(bucket="bucket", key="key", etag='"abc"', body=io.BytesIO(b"old")).close()
+        cache.put(bucket="bucket", key="key", etag='"def-2"', body=io.BytesIO(b"new")).close()
+        self.assertIsNone(cache.open(bucket="bucket", key="key", etag='"abc"'))
+        with cache.open(bucket="bucket", key="key") as fp:
+            self.assertEqual(fp.read(), b"new")
+        self.assertEqual(cache.get_size(), 3)
+
+    def test_evicts_least_recently_used(self):
+        cache = ArtifactCache(cache_dir=self.cache_dir, max_size=20)
+        past = time.time() - 60
+        for i, key in enumerate(("a", "b")):
+            cache.put(bucket="bucket", key=key, etag="1", body=io.BytesIO(b"x" * 8)).close()
+            # make a the least recently written
+            os.utime(cache._get_key_dir("bucket", key).joinpath("1"), (past + i, past + i))
+        # reading a makes b the least recently used
+        cache.open(bucket="bucket", key="a").close()
+        cache.put(bucket="bucket", key="c", etag="1", body=io.BytesIO(b"x" * 8)).close()
+        self.assertIsNone(cache.open(bucket="bucket", key="b"))
+        for key in ("a", "c"):
+            with cache.open(bucket="bucket", key=key) as fp:
+                self.assertEqual(fp.read(), b"x" * 8)
+        self.assertEqual(cache.get_size(), 16)
+
+    def test_keeps_artifact_larger_than_max_size(self):
+        cache = ArtifactCache(cache_dir=self.cache_dir, max_size=4)
+        with cache.put(bucket="bucket", key="key", etag="1", body=io.BytesIO(b"x" * 8)) as fp:
+            self.assertEqual(fp.read(), b"x" * 8)
+        cache.put(bucket="bucket", key="key2", etag="1", body=io.BytesIO(b"y")).close()
+        self.assertIsNone(cache.open(bucket="bucket", key="key"))
+        self.assertEqual(cache.get_size(), 1)
+
+    def test_failed_put(self):
+        class FailingBody(io.RawIOBase):
+            def readable(self):
+                return True
+
+            def readinto(self, buffer):
+                raise IOError("connection reset")
+
+        cache = ArtifactCache(cache_dir=self.cache_dir)
+        with self.assertRaises(IOError):
+            cache.put(bucket="bucket", key="key", etag="1", body=FailingBody())
+        self.assertIsNone(cache.open(bucket="bucket", key="key"))
+        self.assertEqual(cache.get_size(), 0)
+
+    def test_negative_max_size(self):
+        with self.assertRaises(ValueError):
+            ArtifactCache(cache_dir=self.cache_dir, max_size=-1)
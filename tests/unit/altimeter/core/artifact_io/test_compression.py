@@ -0,0 +1,51 @@
+import io
+import unittest
+
+from altimeter.core.artifact_io.compression import (
+    GZIP,
+    LZ4,
+    ZSTD,
+    get_compression_from_path,
+    get_json_artifact_name,
+    open_decompressed_reader,
+    open_json_writer,
+    validate_compression,
+)
+
+
+def get_available_compressions():
+    compressions = [None]
+    for compression in (GZIP, ZSTD, LZ4):
+        try:
+            validate_compression(compression)
+        except ValueError:
+            continue
+        compressions.append(compression)
+    return compressions
+
+
+class TestCompression(unittest.TestCase):
+    def test_get_json_artifact_name(self):
+        self.assertEqual(get_json_artifact_name("master", None), "master.json")
+        self.assertEqual(get_json_artifact_name("master", GZIP), "master.json.gz")
+
+    def test_get_json_artifact_name_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            get_json_artifact_name("master", "bz2")
+
+    def test_get_compression_from_path(self):
+        self.assertIsNone(get_compression_from_path("/tmp/scan/master.json"))
+        self.assertEqual(get_compression_from_path("/tmp/scan/master.json.gz"), GZIP)
+        self.assertEqual(get_compression_from_path("s3://bucket/scan/master.json.zst"), ZSTD)
+        self.assertEqual(get_compression_from_path("s3://bucket/scan/master.json.lz4"), LZ4)
+
+    def test_round_trip(self):
+        for compression in get_available_compressions():
+            with self.subTest(compression=compression):
+                fp = io.BytesIO()
+                with open_json_writer(fp, compression) as json_fp:
+                    json_fp.write('{"foo": "böo"}')
+                self.assertFalse(fp.closed)
+                fp.seek(0)
+                with open_decompressed_reader(fp, compression) as decompressed_fp:
+                    self.assertEqual(decompressed_fp.read().decode("utf-8"), '{"foo": "böo"}')
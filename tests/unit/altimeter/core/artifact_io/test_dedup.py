@@ -0,0 +1,172 @@
+import os
+from pathlib import Path
+import tempfile
+import unittest
+
+import boto3
+import moto
+
+from altimeter.core.artifact_io import ARTIFACT_FORMAT_BINARY
+from altimeter.core.artifact_io.dedup import (
+    CONTENT_ARTIFACT_DIR,
+    get_graph_set_content_hash,
+    is_artifact_ref_path,
+)
+from altimeter.core.artifact_io.reader import FileArtifactReader, S3ArtifactReader
+from altimeter.core.artifact_io.writer import FileArtifactWriter, GZIP, S3ArtifactWriter
+from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.graph.link.links import MultiLink, SimpleLink
+from altimeter.core.multilevel_counter import MultilevelCounter
+from altimeter.core.resource.resource import Resource
+
+
+def build_graph_set(start_time=1234, end_time=4567, api_calls=1, reverse=False):
+    resources = [
+        Resource(
+            resource_id="123",
+            type_name="test:a",
+            links=[
+                SimpleLink(pred="has-foo", obj="goo"),
+                MultiLink(
+                    pred="has-multi",
+                    obj=[SimpleLink(pred="a", obj="1"), SimpleLink(pred="b", obj="2")],
+                ),
+            ],
+        ),
+        Resource(resource_id="456", type_name="test:b", links=[SimpleLink(pred="c", obj=3)]),
+    ]
+    if reverse:
+        resources.reverse()
+        resources[1].links.reverse()
+        resources[1].links[0].obj.reverse()
+    stats = MultilevelCounter()
+    for _ in range(api_calls):
+        stats.increment("test")
+    return GraphSet(
+        name="test-name",
+        version="1",
+        start_time=start_time,
+        end_time=end_time,
+        resources=resources,
+        errors=[],
+        stats=stats,
+    )
+
+
+class TestGetGraphSetContentHash(unittest.TestCase):
+    def test_excludes_timestamps_and_stats(self):
+        self.assertEqual(
+            get_graph_set_content_hash(build_graph_set()),
+            get_graph_set_content_hash(build_graph_set(start_time=1, end_time=2, api_calls=5)),
+        )
+
+    def test_resource_and_link_order(self):
+        self.assertEqual(
+            get_graph_set_content_hash(build_graph_set()),
+            get_graph_set_content_hash(build_graph_set(reverse=True)),
+        )
+
+    def test_content_change(self):
+        graph_set = build_graph_set()
+        changed_graph_set = build_graph_set()
+        changed_graph_set.resources[0].links[0] = SimpleLink(pred="has-foo", obj="boo")
+        self.assertNotEqual(
+            get_graph_set_content_hash(graph_set), get_graph_set_content_hash(changed_graph_set)
+        )
+        errors_graph_set = build_graph_set()
+        errors_graph_set.errors.append("error")
+        self.assertNotEqual(
+            get_graph_set_content_hash(graph_set), get_graph_set_content_hash(errors_graph_set)
+        )
+
+
+class TestDeduplicatedGraphSetArtifacts(unittest.TestCase):
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            content_artifact_writer = FileArtifactWriter(
+                scan_id=CONTENT_ARTIFACT_DIR, output_dir=Path(temp_dir)
+            )
+            first_path = FileArtifactWriter(
+                scan_id="scan-1", output_dir=Path(temp_dir)
+            ).write_deduplicated_graph_set(
+                name="123456789012",
+                graph_set=build_graph_set(),
+                content_artifact_writer=content_artifact_writer,
+            )
+            second_graph_set = build_graph_set(start_time=5000, end_time=6000, api_calls=2)
+            second_path = FileArtifactWriter(
+                scan_id="scan-2", output_dir=Path(temp_dir)
+            ).write_deduplicated_graph_set(
+                name="123456789012",
+                graph_set=second_graph_set,
+                content_artifact_writer=content_artifact_writer,
+            )
+            self.assertEqual(
+                second_path, os.path.join(temp_dir, "scan-2", "123456789012.ref.json")
+            )
+            self.assertTrue(is_artifact_ref_path(first_path))
+            self.assertEqual(len(os.listdir(os.path.join(temp_dir, CONTENT_ARTIFACT_DIR))), 1)
+            artifact_reader = FileArtifactReader()
+            self.assertEqual(
+                artifact_reader.read_artifact_ref(first_path).path,
+                artifact_reader.read_artifact_ref(second_path).path,
+            )
+            graph_set = artifact_reader.read_graph_set(second_path)
+            self.assertDictEqual(graph_set.to_dict(), second_graph_set.to_dict())
+            self.assertDictEqual(
+                artifact_reader.read_json(second_path), second_graph_set.to_dict()
+            )
+
+    @moto.mock_s3
+    def test_s3_binary(self):
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        content_artifact_writer = S3ArtifactWriter(
+            bucket="test_bucket", key_prefix=CONTENT_ARTIFACT_DIR
+        )
+        paths = []
+        for scan_id, start_time in (("scan-1", 1000), ("scan-2", 2000)):
+            paths.append(
+                S3ArtifactWriter(
+                    bucket="test_bucket", key_prefix=scan_id
+                ).write_deduplicated_graph_set(
+                    name="123456789012",
+                    graph_set=build_graph_set(start_time=start_time),
+                    content_artifact_writer=content_artifact_writer,
+                    artifact_format=ARTIFACT_FORMAT_BINARY,
+                    compression=GZIP,
+                )
+            )
+        self.assertListEqual(
+            paths,
+            [
+                "s3://test_bucket/scan-1/123456789012.ref.json",
+                "s3://test_bucket/scan-2/123456789012.ref.json",
+            ],
+        )
+        content_hash = get_graph_set_content_hash(build_graph_set())
+        resp = s3_client.list_objects_v2(Bucket="test_bucket", Prefix=CONTENT_ARTIFACT_DIR)
+        self.assertListEqual(
+            [obj["Key"] for obj in resp["Contents"]],
+            [f"{CONTENT_ARTIFACT_DIR}/{content_hash}.agb.gz"],
+        )
+        graph_set = S3ArtifactReader().read_graph_set(paths[1])
+        self.assertDictEqual(graph_set.to_dict(), build_graph_set(start_time=2000).to_dict())
+
+
+class TestFindArtifact(unittest.TestCase):
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            artifact_writer = FileArtifactWriter(scan_id="test-scan-id", output_dir=Path(temp_dir))
+            self.assertIsNone(artifact_writer.find_artifact("test_name.json"))
+            path = artifact_writer.write_json("test_name", {"foo": "boo"})
+            self.assertEqual(artifact_writer.find_artifact("test_name.json"), path)
+
+    @moto.mock_s3
+    def test_s3(self):
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        artifact_writer = S3ArtifactWriter(bucket="test_bucket", key_prefix="test-scan-id")
+        self.assertIsNone(artifact_writer.find_artifact("test_name.json"))
+        path = artifact_writer.write_json("test_name", {"foo": "boo"})
+        self.assertEqual(artifact_writer.find_artifact("test_name.json"), path)
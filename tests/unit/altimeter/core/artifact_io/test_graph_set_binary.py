@@ -0,0 +1,149 @@
+from datetime import datetime
+import io
+import json
+from unittest import TestCase
+
+from altimeter.core.artifact_io.exceptions import InvalidGraphSetBinaryException
+from altimeter.core.artifact_io.graph_set_binary import (
+    GraphSetBinaryReader,
+    is_graph_set_binary_path,
+    write_graph_set_binary,
+)
+from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.graph.link.links import (
+    MultiLink,
+    ResourceLinkLink,
+    SimpleLink,
+    TagLink,
+    TransientResourceLinkLink,
+)
+from altimeter.core.json_encoder import json_encoder
+from altimeter.core.multilevel_counter import MultilevelCounter
+from altimeter.core.resource.resource import Resource
+
+
+def write_graph_set(graph_set):
+    fp = io.BytesIO()
+    write_graph_set_binary(
+        fp=fp,
+        name=graph_set.name,
+        version=graph_set.version,
+        start_time=graph_set.start_time,
+        end_time=graph_set.end_time,
+        resources=graph_set.resources,
+        errors=graph_set.errors,
+        stats=graph_set.stats,
+    )
+    return fp.getvalue()
+
+
+class TestGraphSetBinary(TestCase):
+    def setUp(self):
+        stats = MultilevelCounter()
+        stats.increment("123456789012", "us-east-1", "ec2")
+        self.graph_set = GraphSet(
+            name="test-name",
+            version="2",
+            start_time=1234,
+            end_time=4567,
+            resources=[
+                Resource(
+                    resource_id="arn:aws:ec2:us-east-1:123456789012:instance/i-123",
+                    type_name="aws:ec2:instance",
+                    links=[
+                        SimpleLink(pred="name", obj="ünïcode 😀"),
+                        SimpleLink(pred="count", obj=2 ** 70),
+                        SimpleLink(pred="negative", obj=-5),
+                        SimpleLink(pred="ratio", obj=0.1),
+                        SimpleLink(pred="enabled", obj=True),
+                        SimpleLink(pred="disabled", obj=False),
+                        SimpleLink(pred="launch_time", obj=datetime(2020, 1, 2, 3, 4, 5)),
+                        ResourceLinkLink(
+                            pred="vpc", obj="arn:aws:ec2:us-east-1:123456789012:vpc/vpc-123"
+                        ),
+                        TransientResourceLinkLink(pred="image", obj=None),
+                        TagLink(pred="Name", obj="test"),
+                        MultiLink(
+                            pred="volume_attachment",
+                            obj=[
+                                SimpleLink(pred="device", obj="/dev/xvda"),
+                                MultiLink(
+                                    pred="nested", obj=[SimpleLink(pred="name", obj="test")]
+                                ),
+                            ],
+                        ),
+                    ],
+                ),
+                Resource(
+                    resource_id="arn:aws:ec2:us-east-1:123456789012:vpc/vpc-123",
+                    type_name="aws:ec2:vpc",
+                ),
+            ],
+            errors=["test err 1"],
+            stats=stats,
+        )
+
+    def test_round_trip_matches_to_dict(self):
+        expected_dict = json.loads(json.dumps(self.graph_set.to_dict(), default=json_encoder))
+        reader = GraphSetBinaryReader(write_graph_set(self.graph_set))
+        self.assertDictEqual(reader.to_graph_set().to_dict(), expected_dict)
+        self.assertDictEqual(
+            dict(reader.iter_resource_dicts()), expected_dict["resources"],
+        )
+
+    def test_read_resource(self):
+        reader = GraphSetBinaryReader.from_file(io.BytesIO(write_graph_set(self.graph_set)))
+        self.assertListEqual(
+            reader.resource_ids,
+            [
+                "arn:aws:ec2:us-east-1:123456789012:instance/i-123",
+                "arn:aws:ec2:us-east-1:123456789012:vpc/vpc-123",
+            ],
+        )
+        resource = reader.read_resource("arn:aws:ec2:us-east-1:123456789012:vpc/vpc-123")
+        self.assertEqual(resource.type_name, "aws:ec2:vpc")
+        with self.assertRaises(KeyError):
+            reader.read_resource("arn:aws:ec2:us-east-1:123456789012:vpc/vpc-456")
+
+    def test_smaller_than_json(self):
+        resources = [
+            Resource(
+                resource_id=f"arn:aws:ec2:us-east-1:123456789012:instance/i-{i}",
+                type_name="aws:ec2:instance",
+                links=[
+                    SimpleLink(pred="state", obj="running"),
+                    ResourceLinkLink(
+                        pred="vpc", obj="arn:aws:ec2:us-east-1:123456789012:vpc/vpc-123"
+                    ),
+                ],
+            )
+            for i in range(100)
+        ]
+        graph_set = GraphSet(
+            name="test-name",
+            version="2",
+            start_time=1234,
+            end_time=4567,
+            resources=resources,
+            errors=[],
+            stats=MultilevelCounter(),
+        )
+        json_len = len(json.dumps(graph_set.to_dict()))
+        self.assertLess(len(write_graph_set(graph_set)), json_len / 2)
+
+    def test_invalid_data(self):
+        data = write_graph_set(self.graph_set)
+        for invalid_data in (
+            b"",
+            data[1:],
+            data[:-1],
+            b"ALTGSB\x00\x01" + b"\xff" * 40 + data[-32:],
+        ):
+            with self.assertRaises(InvalidGraphSetBinaryException):
+                GraphSetBinaryReader(invalid_data)
+
+    def test_is_graph_set_binary_path(self):
+        self.assertTrue(is_graph_set_binary_path("/tmp/123.agb"))
+        self.assertTrue(is_graph_set_binary_path("s3://bucket/scan/123.agb.gz"))
+        self.assertFalse(is_graph_set_binary_path("/tmp/123.json"))
+        self.assertFalse(is_graph_set_binary_path("/tmp/123.json.gz"))
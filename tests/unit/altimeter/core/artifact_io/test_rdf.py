@@ -0,0 +1,153 @@
+from contextlib import contextmanager
+import io
+import unittest
+
+from rdflib import BNode, Graph, URIRef
+from rdflib.compare import isomorphic
+
+from altimeter.core.artifact_io.rdf import (
+    RDFShardStream,
+    get_rdf_artifact_name,
+    get_rdf_shard_name,
+    write_graph_set_rdf_shards,
+)
+from altimeter.core.artifact_io.writer import GZIP
+from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.graph.link.links import MultiLink, ResourceLinkLink, SimpleLink, TagLink
+from altimeter.core.graph.rdf_stream import (
+    RDF_FORMAT_NQUADS,
+    RDF_FORMAT_NTRIPLES,
+    RDF_FORMAT_RDFXML,
+)
+from altimeter.core.multilevel_counter import MultilevelCounter
+from altimeter.core.neptune.graph_uri import SKOLEM_BASE_URI
+from altimeter.core.resource.resource import Resource
+
+
+def build_graph_set(num_resources=20):
+    resources = [
+        Resource(
+            resource_id=f"arn:aws:::123:a/{i}",
+            type_name="test:a",
+            links=[
+                SimpleLink(pred="name", obj=f"name-{i}"),
+                MultiLink(
+                    pred="attachment",
+                    obj=[
+                        SimpleLink(pred="time", obj="2020-01-01"),
+                        ResourceLinkLink(
+                            pred="a", obj=f"arn:aws:::123:a/{(i + 1) % num_resources}"
+                        ),
+                    ],
+                ),
+                TagLink(pred="env", obj="prod"),
+            ],
+        )
+        for i in range(num_resources)
+    ]
+    return GraphSet(
+        name="test-name",
+        version="1",
+        start_time=1234,
+        end_time=4567,
+        resources=resources,
+        errors=[],
+        stats=MultilevelCounter(),
+    )
+
+
+def de_skolemize(graph):
+    def de_skolemize_term(term):
+        if isinstance(term, URIRef) and term.startswith(SKOLEM_BASE_URI):
+            return BNode(term[len(SKOLEM_BASE_URI):])
+        return term
+
+    de_skolemized_graph = Graph()
+    for triple in graph:
+        de_skolemized_graph.add(tuple(de_skolemize_term(term) for term in triple))
+    return de_skolemized_graph
+
+
+class ShardCollector:
+    def __init__(self):
+        self.shards = []
+        self.exceptions = []
+
+    @contextmanager
+    def open_shard(self, index):
+        assert index == len(self.shards)
+        fp = io.BytesIO()
+        try:
+            yield fp
+        except Exception as ex:
+            self.exceptions.append(ex)
+            raise
+        self.shards.append(fp.getvalue())
+
+
+class TestGetRDFArtifactName(unittest.TestCase):
+    def test_names(self):
+        self.assertEqual(get_rdf_artifact_name("master", RDF_FORMAT_RDFXML, None), "master.rdf")
+        self.assertEqual(
+            get_rdf_artifact_name("master", RDF_FORMAT_NQUADS, GZIP), "master.nq.gz"
+        )
+        self.assertEqual(
+            get_rdf_shard_name(12, RDF_FORMAT_NTRIPLES, GZIP), "part-00012.nt.gz"
+        )
+
+
+class TestRDFShardStream(unittest.TestCase):
+    def test_splits_at_line_boundaries(self):
+        collector = ShardCollector()
+        with RDFShardStream(open_shard=collector.open_shard, max_shard_size=10) as shard_stream:
+            shard_stream.write(b"aaa\nbbb\nccc\n")
+            shard_stream.write(b"dd\n")
+            shard_stream.write(b"eeeeeeeeeeeeeee\nf\n")
+        self.assertListEqual(
+            collector.shards, [b"aaa\nbbb\n", b"ccc\ndd\n", b"eeeeeeeeeeeeeee\n", b"f\n"]
+        )
+        self.assertEqual(shard_stream.shard_count, 4)
+
+    def test_full_shard_closed(self):
+        collector = ShardCollector()
+        with RDFShardStream(open_shard=collector.open_shard, max_shard_size=4) as shard_stream:
+            shard_stream.write(b"aaa\n")
+            self.assertListEqual(collector.shards, [b"aaa\n"])
+        self.assertEqual(shard_stream.shard_count, 1)
+
+    def test_exception_passed_to_shard(self):
+        collector = ShardCollector()
+        with self.assertRaises(ValueError):
+            with RDFShardStream(open_shard=collector.open_shard, max_shard_size=4) as shard_stream:
+                shard_stream.write(b"aaa\nbb\n")
+                raise ValueError("test")
+        self.assertListEqual(collector.shards, [b"aaa\n"])
+        self.assertEqual(len(collector.exceptions), 1)
+
+
+class TestWriteGraphSetRDFShards(unittest.TestCase):
+    def test_shards_equivalent_to_graph(self):
+        graph_set = build_graph_set()
+        collector = ShardCollector()
+        shard_count = write_graph_set_rdf_shards(
+            graph_set,
+            rdf_format=RDF_FORMAT_NTRIPLES,
+            max_shard_size=1024,
+            open_shard=collector.open_shard,
+        )
+        self.assertGreater(shard_count, 1)
+        self.assertEqual(shard_count, len(collector.shards))
+        graph = Graph()
+        for shard in collector.shards:
+            self.assertLessEqual(len(shard), 1024)
+            graph.parse(data=shard.decode("utf-8"), format="nt")
+        self.assertTrue(isomorphic(de_skolemize(graph), graph_set.to_rdf()))
+
+    def test_rdfxml_not_supported(self):
+        with self.assertRaises(ValueError):
+            write_graph_set_rdf_shards(
+                build_graph_set(),
+                rdf_format=RDF_FORMAT_RDFXML,
+                max_shard_size=1024,
+                open_shard=ShardCollector().open_shard,
+            )
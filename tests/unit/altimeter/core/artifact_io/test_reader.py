@@ -1,10 +1,13 @@
+import gzip
 import json
+from pathlib import Path
 import tempfile
 import unittest
 
 import boto3
 import moto
 
+from altimeter.core.artifact_io.cache import ArtifactCache
 from altimeter.core.artifact_io.exceptions import InvalidS3URIException
 from altimeter.core.artifact_io.reader import ArtifactReader, FileArtifactReader, S3ArtifactReader
 from altimeter.core.artifact_io import parse_s3_uri
@@ -29,6 +32,24 @@ class TestFileArtifactReader(unittest.TestCase):
             read_data = artifact_reader.read_json(temp.name)
         self.assertDictEqual(data, read_data)
 
+    def test_with_gzip_file(self):
+        data = {"foo": "boo"}
+        artifact_reader = FileArtifactReader()
+        with tempfile.NamedTemporaryFile(suffix=".json.gz") as temp:
+            temp.write(gzip.compress(json.dumps(data).encode("utf-8")))
+            temp.flush()
+            read_data = artifact_reader.read_json(temp.name)
+        self.assertDictEqual(data, read_data)
+
+    def test_open_artifact_with_gzip_file(self):
+        data = {"foo": "boo"}
+        artifact_reader = FileArtifactReader()
+        with tempfile.NamedTemporaryFile(suffix=".json.gz") as temp:
+            temp.write(gzip.compress(json.dumps(data).encode("utf-8")))
+            temp.flush()
+            with artifact_reader.open_artifact(temp.name) as json_fp:
+                self.assertEqual(json_fp.read(), json.dumps(data).encode("utf-8"))
+
     def test_with_invalid_file(self):
         data = "foo"
         artifact_reader = FileArtifactReader()
@@ -50,6 +71,77 @@ class TestS3ArtifactReader(unittest.TestCase):
         read_data = artifact_reader.read_json("s3://test_bucket/key")
         self.assertDictEqual(data, read_data)
 
+    @moto.mock_s3
+    def test_with_gzip_object(self):
+        data = {"foo": "boo"}
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        s3_client.put_object(
+            Bucket="test_bucket",
+            Key="key.json.gz",
+            Body=gzip.compress(json.dumps(data).encode("utf-8")),
+        )
+        artifact_reader = S3ArtifactReader()
+        read_data = artifact_reader.read_json("s3://test_bucket/key.json.gz")
+        self.assertDictEqual(data, read_data)
+
+    @moto.mock_s3
+    def test_open_artifact(self):
+        data = {"foo": "boo"}
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        s3_client.put_object(Bucket="test_bucket", Key="key", Body=json.dumps(data).encode("utf-8"))
+        artifact_reader = S3ArtifactReader()
+        with artifact_reader.open_artifact("s3://test_bucket/key") as json_fp:
+            self.assertEqual(json_fp.read(), json.dumps(data).encode("utf-8"))
+
+
+class TestS3ArtifactReaderCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ArtifactCache(cache_dir=Path(self.temp_dir.name))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @moto.mock_s3
+    def test_repeat_reads_use_cache(self):
+        data = {"foo": "boo"}
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        s3_client.put_object(
+            Bucket="test_bucket",
+            Key="key.json.gz",
+            Body=gzip.compress(json.dumps(data).encode("utf-8")),
+        )
+        artifact_reader = S3ArtifactReader(cache=self.cache)
+        self.assertDictEqual(artifact_reader.read_json("s3://test_bucket/key.json.gz"), data)
+        s3_client.delete_object(Bucket="test_bucket", Key="key.json.gz")
+        self.assertDictEqual(artifact_reader.read_json("s3://test_bucket/key.json.gz"), data)
+
+    @moto.mock_s3
+    def test_revalidate(self):
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        s3_client.put_object(Bucket="test_bucket", Key="key", Body=b'{"foo": "boo"}')
+        artifact_reader = S3ArtifactReader(cache=self.cache, revalidate=True)
+        self.assertDictEqual(artifact_reader.read_json("s3://test_bucket/key"), {"foo": "boo"})
+        s3_client.put_object(Bucket="test_bucket", Key="key", Body=b'{"foo": "goo"}')
+        self.assertDictEqual(artifact_reader.read_json("s3://test_bucket/key"), {"foo": "goo"})
+        self.assertDictEqual(
+            S3ArtifactReader(cache=self.cache).read_json("s3://test_bucket/key"), {"foo": "goo"}
+        )
+
+    @moto.mock_s3
+    def test_empty_object(self):
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        s3_client.put_object(Bucket="test_bucket", Key="key", Body=b"")
+        artifact_reader = S3ArtifactReader(cache=self.cache)
+        for _ in range(2):
+            with artifact_reader.open_artifact("s3://test_bucket/key") as artifact_fp:
+                self.assertEqual(artifact_fp.read(), b"")
+
 
 class TestParseS3URI(unittest.TestCase):
     def test_invalid_uri(self):
@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+from unittest.mock import patch
+
+from altimeter.core.artifact_io.s3_client import SharedS3Client, get_shared_s3_client
+
+
+class TestSharedS3Client(unittest.TestCase):
+    def test_get_client_shared_across_threads(self):
+        shared_s3_client = SharedS3Client()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            clients = list(executor.map(lambda _: shared_s3_client.get_client(), range(8)))
+        self.assertEqual(len({id(client) for client in clients}), 1)
+        self.assertEqual(clients[0].meta.config.max_pool_connections, 32)
+
+    def test_new_client_after_fork(self):
+        shared_s3_client = SharedS3Client()
+        client = shared_s3_client.get_client()
+        with patch("altimeter.core.artifact_io.s3_client.os.getpid", return_value=-1):
+            forked_client = shared_s3_client.get_client()
+        self.assertIsNot(client, forked_client)
+
+    def test_ensure_max_pool_connections(self):
+        shared_s3_client = SharedS3Client(max_pool_connections=8)
+        client = shared_s3_client.get_client()
+        shared_s3_client.ensure_max_pool_connections(4)
+        self.assertIs(shared_s3_client.get_client(), client)
+        shared_s3_client.ensure_max_pool_connections(16)
+        larger_client = shared_s3_client.get_client()
+        self.assertIsNot(larger_client, client)
+        self.assertEqual(larger_client.meta.config.max_pool_connections, 16)
+
+    def test_get_transfer_config(self):
+        shared_s3_client = SharedS3Client(max_pool_connections=4, transfer_max_concurrency=8)
+        self.assertEqual(shared_s3_client.get_transfer_config().max_concurrency, 4)
+
+    def test_get_shared_s3_client(self):
+        self.assertIs(get_shared_s3_client(), get_shared_s3_client())
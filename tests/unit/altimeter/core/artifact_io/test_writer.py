@@ -1,13 +1,51 @@
+import gzip
+import io
 import json
 import os
 from pathlib import Path
 import tempfile
+import threading
 import unittest
+from unittest import mock
 
 import boto3
 import moto
+from rdflib import ConjunctiveGraph, Graph, URIRef
+from rdflib.compare import isomorphic
+
+from altimeter.core.artifact_io.reader import FileArtifactReader, S3ArtifactReader
+from altimeter.core.artifact_io.writer import (
+    ArtifactWriter,
+    ArtifactWriteQueue,
+    BackgroundWriteStream,
+    FileArtifactWriter,
+    GZIP,
+    MIN_MULTIPART_PART_SIZE,
+    S3ArtifactWriter,
+    S3MultipartUploadStream,
+)
+from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.graph.link.links import SimpleLink
+from altimeter.core.graph.rdf_stream import RDF_FORMAT_NQUADS, RDF_FORMAT_NTRIPLES
+from altimeter.core.multilevel_counter import MultilevelCounter
+from altimeter.core.resource.resource import Resource
+
+
+def build_graph_set():
+    return GraphSet(
+        name="test-name",
+        version="1",
+        start_time=1234,
+        end_time=4567,
+        resources=[
+            Resource(
+                resource_id="123", type_name="test:a", links=[SimpleLink(pred="has-foo", obj="goo")]
+            )
+        ],
+        errors=["test err 1"],
+        stats=MultilevelCounter(),
+    )
 
-from altimeter.core.artifact_io.writer import ArtifactWriter, FileArtifactWriter, S3ArtifactWriter
 
 class TestArtifactWriter(unittest.TestCase):
     def test_from_artifact_path_s3(self):
@@ -34,6 +72,239 @@ class TestFileArtifactReader(unittest.TestCase):
         self.assertDictEqual(written_data, data)
 
 
+class TestFileArtifactWriterCompression(unittest.TestCase):
+    def test_write_json_gzip(self):
+        data = {"foo": "boo"}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            artifact_writer = FileArtifactWriter(scan_id="test-scan-id", output_dir=Path(temp_dir))
+            path = artifact_writer.write_json("test_name", data, compression=GZIP)
+            self.assertEqual(path, os.path.join(temp_dir, "test-scan-id", "test_name.json.gz"))
+            with gzip.open(path, "rt") as fp:
+                written_data = json.load(fp)
+        self.assertDictEqual(written_data, data)
+
+    def test_write_graph_set(self):
+        graph_set = build_graph_set()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            artifact_writer = FileArtifactWriter(scan_id="test-scan-id", output_dir=Path(temp_dir))
+            path = artifact_writer.write_graph_set("test_name", graph_set)
+            self.assertEqual(path, os.path.join(temp_dir, "test-scan-id", "test_name.rdf"))
+            graph = Graph()
+            graph.parse(path, format="xml")
+            self.assertTrue(isomorphic(graph, graph_set.to_rdf()))
+
+    def test_write_graph_set_ntriples_gzip(self):
+        graph_set = build_graph_set()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            artifact_writer = FileArtifactWriter(scan_id="test-scan-id", output_dir=Path(temp_dir))
+            path = artifact_writer.write_graph_set(
+                "test_name", graph_set, compression=GZIP, rdf_format=RDF_FORMAT_NTRIPLES
+            )
+            self.assertEqual(path, os.path.join(temp_dir, "test-scan-id", "test_name.nt.gz"))
+            with gzip.open(path, "rt") as fp:
+                graph = Graph()
+                graph.parse(data=fp.read(), format="nt")
+            self.assertTrue(isomorphic(graph, graph_set.to_rdf()))
+
+    def test_write_graph_set_sharded(self):
+        graph_set = build_graph_set()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            artifact_writer = FileArtifactWriter(scan_id="test-scan-id", output_dir=Path(temp_dir))
+            path = artifact_writer.write_graph_set(
+                "test_name",
+                graph_set,
+                compression=GZIP,
+                rdf_format=RDF_FORMAT_NTRIPLES,
+                max_shard_size=200,
+            )
+            self.assertEqual(path, os.path.join(temp_dir, "test-scan-id", "test_name"))
+            shard_names = sorted(os.listdir(path))
+            self.assertGreater(len(shard_names), 1)
+            self.assertEqual(shard_names[0], "part-00000.nt.gz")
+            graph = Graph()
+            for shard_name in shard_names:
+                with gzip.open(os.path.join(path, shard_name), "rt") as fp:
+                    graph.parse(data=fp.read(), format="nt")
+            self.assertEqual(len(graph), len(graph_set.to_rdf()))
+
+    def test_write_graph_set_invalid_args(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            artifact_writer = FileArtifactWriter(scan_id="test-scan-id", output_dir=Path(temp_dir))
+            with self.assertRaises(ValueError):
+                artifact_writer.write_graph_set("test_name", build_graph_set(), rdf_format="n3")
+            with self.assertRaises(ValueError):
+                artifact_writer.write_graph_set("test_name", build_graph_set(), compression="zst")
+
+    def test_write_graph_set_binary_gzip(self):
+        graph_set = build_graph_set()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            artifact_writer = FileArtifactWriter(scan_id="test-scan-id", output_dir=Path(temp_dir))
+            path = artifact_writer.write_graph_set_binary("test_name", graph_set, compression=GZIP)
+            self.assertEqual(path, os.path.join(temp_dir, "test-scan-id", "test_name.agb.gz"))
+            read_graph_set = FileArtifactReader().read_graph_set(path)
+        self.assertDictEqual(read_graph_set.to_dict(), graph_set.to_dict())
+
+
+class TestS3MultipartUploadStream(unittest.TestCase):
+    @moto.mock_s3
+    def test_small_object(self):
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        with S3MultipartUploadStream(
+            s3_client=s3_client, bucket="test_bucket", key="key"
+        ) as stream:
+            stream.write(b"foo")
+            stream.write(b"boo")
+        resp = s3_client.get_object(Bucket="test_bucket", Key="key")
+        self.assertEqual(resp["Body"].read(), b"fooboo")
+
+    @moto.mock_s3
+    def test_multipart_object(self):
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        data = os.urandom(MIN_MULTIPART_PART_SIZE * 2 + 1024)
+        with S3MultipartUploadStream(
+            s3_client=s3_client, bucket="test_bucket", key="key", part_size=MIN_MULTIPART_PART_SIZE
+        ) as stream:
+            for i in range(0, len(data), 1024 * 1024):
+                stream.write(data[i : i + 1024 * 1024])
+            self.assertEqual(len(stream._parts), 2)
+        resp = s3_client.get_object(Bucket="test_bucket", Key="key")
+        self.assertEqual(resp["Body"].read(), data)
+
+    @moto.mock_s3
+    def test_abort(self):
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        stream = S3MultipartUploadStream(
+            s3_client=s3_client, bucket="test_bucket", key="key", part_size=MIN_MULTIPART_PART_SIZE
+        )
+        stream.write(b"x" * MIN_MULTIPART_PART_SIZE)
+        stream.abort()
+        self.assertTrue(stream.closed)
+        self.assertNotIn("Contents", s3_client.list_objects_v2(Bucket="test_bucket"))
+        self.assertNotIn("Uploads", s3_client.list_multipart_uploads(Bucket="test_bucket"))
+
+    def test_part_size_too_small(self):
+        with self.assertRaises(ValueError):
+            S3MultipartUploadStream(s3_client=None, bucket="test_bucket", key="key", part_size=1)
+
+    @moto.mock_s3
+    def test_concurrent_parts(self):
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        data = os.urandom(MIN_MULTIPART_PART_SIZE * 3 + 1024)
+        with S3MultipartUploadStream(
+            s3_client=s3_client,
+            bucket="test_bucket",
+            key="key",
+            part_size=MIN_MULTIPART_PART_SIZE,
+            max_concurrent_parts=2,
+        ) as stream:
+            for i in range(0, len(data), 1024 * 1024):
+                stream.write(data[i : i + 1024 * 1024])
+        self.assertEqual(len(stream._parts), 4)
+        resp = s3_client.get_object(Bucket="test_bucket", Key="key")
+        self.assertEqual(resp["Body"].read(), data)
+
+    def test_concurrent_part_failure(self):
+        s3_client = mock.Mock()
+        s3_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+        s3_client.upload_part.side_effect = ValueError("test")
+        stream = S3MultipartUploadStream(
+            s3_client=s3_client,
+            bucket="test_bucket",
+            key="key",
+            part_size=MIN_MULTIPART_PART_SIZE,
+            max_concurrent_parts=2,
+        )
+        stream.write(b"x" * MIN_MULTIPART_PART_SIZE)
+        with self.assertRaises(ValueError):
+            stream.close()
+        self.assertTrue(stream.closed)
+        s3_client.complete_multipart_upload.assert_not_called()
+        s3_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="test_bucket", Key="key", UploadId="upload-id"
+        )
+
+    def test_max_concurrent_parts_too_small(self):
+        with self.assertRaises(ValueError):
+            S3MultipartUploadStream(
+                s3_client=None, bucket="test_bucket", key="key", max_concurrent_parts=0
+            )
+
+
+class FailingWriter:
+    def write(self, data):
+        raise ValueError("test")
+
+
+class TestBackgroundWriteStream(unittest.TestCase):
+    def test_write(self):
+        fp = io.BytesIO()
+        with BackgroundWriteStream(fp, chunk_size=4, max_queued=1) as stream:
+            for i in range(100):
+                stream.write(str(i).encode("utf-8"))
+        self.assertEqual(fp.getvalue(), "".join(str(i) for i in range(100)).encode("utf-8"))
+
+    def test_write_error(self):
+        stream = BackgroundWriteStream(FailingWriter(), chunk_size=1, max_queued=1)
+        with self.assertRaises(ValueError):
+            for _ in range(100):
+                stream.write(b"a")
+            stream.close()
+        stream.abort()
+        self.assertTrue(stream.closed)
+
+    def test_abort(self):
+        fp = io.BytesIO()
+        stream = BackgroundWriteStream(fp, chunk_size=1024)
+        stream.write(b"a")
+        stream.abort()
+        self.assertTrue(stream.closed)
+        self.assertEqual(fp.getvalue(), b"")
+
+
+class TestArtifactWriteQueue(unittest.TestCase):
+    def test_submit(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            artifact_writer = FileArtifactWriter(scan_id="test-scan-id", output_dir=Path(temp_dir))
+            with ArtifactWriteQueue(max_workers=2) as write_queue:
+                futures = [
+                    write_queue.submit(artifact_writer.write_json, name=str(i), data={"i": i})
+                    for i in range(5)
+                ]
+            for i, future in enumerate(futures):
+                self.assertTrue(future.done())
+                with open(future.result(), "r") as fp:
+                    self.assertDictEqual(json.load(fp), {"i": i})
+
+    def test_submit_blocks_when_full(self):
+        release = threading.Event()
+        started = threading.Semaphore(0)
+
+        def write() -> str:
+            started.release()
+            release.wait()
+            return "written"
+
+        write_queue = ArtifactWriteQueue(max_workers=1, max_queued=2)
+        futures = [write_queue.submit(write), write_queue.submit(write)]
+        started.acquire()
+        submitter = threading.Thread(target=lambda: futures.append(write_queue.submit(write)))
+        submitter.start()
+        submitter.join(timeout=0.1)
+        self.assertTrue(submitter.is_alive())
+        release.set()
+        submitter.join()
+        write_queue.close()
+        self.assertListEqual([future.result() for future in futures], ["written"] * 3)
+
+    def test_max_queued_less_than_max_workers(self):
+        with self.assertRaises(ValueError):
+            ArtifactWriteQueue(max_workers=2, max_queued=1)
+
+
 class TestS3ArtifactWriter(unittest.TestCase):
     @moto.mock_s3
     def test_with_valid_object(self):
@@ -46,3 +317,127 @@ class TestS3ArtifactWriter(unittest.TestCase):
         resp = s3_client.get_object(Bucket="test_bucket", Key="test-scan-id/test_name.json")
         written_data = json.load(resp["Body"])
         self.assertDictEqual(data, written_data)
+
+    @moto.mock_s3
+    def test_write_json_stream(self):
+        scan_id = "test-scan-id"
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        artifact_writer = S3ArtifactWriter(bucket="test_bucket", key_prefix=scan_id)
+        path = artifact_writer.write_json_stream(
+            "test_name", lambda json_fp: json_fp.write('{"foo": "boo"}')
+        )
+        self.assertEqual(path, "s3://test_bucket/test-scan-id/test_name.json")
+        resp = s3_client.get_object(Bucket="test_bucket", Key="test-scan-id/test_name.json")
+        self.assertDictEqual(json.load(resp["Body"]), {"foo": "boo"})
+
+    @moto.mock_s3
+    def test_write_json_stream_error(self):
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        artifact_writer = S3ArtifactWriter(bucket="test_bucket", key_prefix="test-scan-id")
+
+        def write(json_fp):
+            json_fp.write('{"foo": ')
+            raise ValueError("serialization error")
+
+        with self.assertRaises(ValueError):
+            artifact_writer.write_json_stream("test_name", write)
+        self.assertNotIn("Contents", s3_client.list_objects_v2(Bucket="test_bucket"))
+
+    @moto.mock_s3
+    def test_write_json_gzip(self):
+        data = {"foo": "boo"}
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        artifact_writer = S3ArtifactWriter(bucket="test_bucket", key_prefix="test-scan-id")
+        path = artifact_writer.write_json("test_name", data, compression=GZIP)
+        self.assertEqual(path, "s3://test_bucket/test-scan-id/test_name.json.gz")
+        resp = s3_client.get_object(Bucket="test_bucket", Key="test-scan-id/test_name.json.gz")
+        self.assertDictEqual(resp["Metadata"], {"compression": GZIP})
+        self.assertDictEqual(json.loads(gzip.decompress(resp["Body"].read())), data)
+
+    @moto.mock_s3
+    def test_write_graph_set_binary(self):
+        graph_set = build_graph_set()
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        artifact_writer = S3ArtifactWriter(bucket="test_bucket", key_prefix="test-scan-id")
+        path = artifact_writer.write_graph_set_binary("test_name", graph_set)
+        self.assertEqual(path, "s3://test_bucket/test-scan-id/test_name.agb")
+        read_graph_set = S3ArtifactReader().read_graph_set(path)
+        self.assertDictEqual(read_graph_set.to_dict(), graph_set.to_dict())
+
+    @moto.mock_s3
+    def test_write_graph_set_nquads(self):
+        graph_set = build_graph_set()
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        artifact_writer = S3ArtifactWriter(bucket="test_bucket", key_prefix="test-scan-id")
+        path = artifact_writer.write_graph_set(
+            "test_name", graph_set, compression=GZIP, rdf_format=RDF_FORMAT_NQUADS
+        )
+        self.assertEqual(path, "s3://test_bucket/test-scan-id/test_name.nq.gz")
+        key = "test-scan-id/test_name.nq.gz"
+        tag_set = s3_client.get_object_tagging(Bucket="test_bucket", Key=key)["TagSet"]
+        self.assertDictEqual(
+            {tag["Key"]: tag["Value"] for tag in tag_set},
+            {
+                "name": "test-name",
+                "version": "1",
+                "start_time": "1234",
+                "end_time": "4567",
+                "format": RDF_FORMAT_NQUADS,
+            },
+        )
+        resp = s3_client.get_object(Bucket="test_bucket", Key=key)
+        conjunctive_graph = ConjunctiveGraph()
+        conjunctive_graph.parse(
+            data=gzip.decompress(resp["Body"].read()).decode("utf-8"), format="nquads"
+        )
+        graph = conjunctive_graph.get_context(URIRef("https://alti/test-name/1/4567"))
+        self.assertTrue(isomorphic(graph, graph_set.to_rdf()))
+
+    @moto.mock_s3
+    def test_write_graph_set_sharded(self):
+        graph_set = build_graph_set()
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        artifact_writer = S3ArtifactWriter(bucket="test_bucket", key_prefix="test-scan-id")
+        path = artifact_writer.write_graph_set(
+            "test_name",
+            graph_set,
+            compression=GZIP,
+            rdf_format=RDF_FORMAT_NQUADS,
+            max_shard_size=200,
+        )
+        self.assertEqual(path, "s3://test_bucket/test-scan-id/test_name/")
+        resp = s3_client.list_objects_v2(Bucket="test_bucket", Prefix="test-scan-id/test_name/")
+        keys = [obj["Key"] for obj in resp["Contents"]]
+        self.assertGreater(len(keys), 1)
+        self.assertEqual(keys[0], "test-scan-id/test_name/part-00000.nq.gz")
+        conjunctive_graph = ConjunctiveGraph()
+        for key in keys:
+            tag_set = s3_client.get_object_tagging(Bucket="test_bucket", Key=key)["TagSet"]
+            self.assertIn({"Key": "format", "Value": RDF_FORMAT_NQUADS}, tag_set)
+            resp = s3_client.get_object(Bucket="test_bucket", Key=key)
+            conjunctive_graph.parse(
+                data=gzip.decompress(resp["Body"].read()).decode("utf-8"), format="nquads"
+            )
+        graph = conjunctive_graph.get_context(URIRef("https://alti/test-name/1/4567"))
+        self.assertEqual(len(graph), len(graph_set.to_rdf()))
+
+    @moto.mock_s3
+    def test_write_graph_set_error(self):
+        s3_client = boto3.Session().client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        artifact_writer = S3ArtifactWriter(bucket="test_bucket", key_prefix="test-scan-id")
+        with mock.patch(
+            "altimeter.core.artifact_io.writer.write_graph_set_rdf",
+            side_effect=ValueError("test"),
+        ):
+            with self.assertRaises(ValueError):
+                artifact_writer.write_graph_set(
+                    "test_name", build_graph_set(), rdf_format=RDF_FORMAT_NTRIPLES
+                )
+        self.assertNotIn("Contents", s3_client.list_objects_v2(Bucket="test_bucket"))
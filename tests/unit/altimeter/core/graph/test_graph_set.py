@@ -1,3 +1,5 @@
+import io
+import json
 from typing import Any, List, Type
 from unittest import TestCase
 
@@ -6,7 +8,7 @@ from altimeter.core.graph.exceptions import (
     UnmergableDuplicateResourceIdsFoundException,
     UnmergableGraphSetsException,
 )
-from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.graph.graph_set import GraphSet, GraphSetJSONReader
 from altimeter.core.graph.link.links import ResourceLinkLink, SimpleLink
 from altimeter.core.multilevel_counter import MultilevelCounter
 from altimeter.core.resource.resource import Resource
@@ -149,6 +151,34 @@ class TestGraphSetWithValidDataNoMerging(TestCase):
         }
         self.assertDictEqual(expected_dict, self.graph_set.to_dict())
 
+    def test_write_json(self):
+        json_fp = io.StringIO()
+        self.graph_set.write_json(json_fp)
+        self.assertDictEqual(json.loads(json_fp.getvalue()), self.graph_set.to_dict())
+
+    def test_json_reader(self):
+        json_str = json.dumps(self.graph_set.to_dict())
+        reader = GraphSetJSONReader(io.StringIO(json_str), chunk_size=8)
+        resource_ids = []
+        for resource in reader.iter_resources():
+            resource_ids.append(resource.resource_id)
+            self.assertEqual(reader.name, "test-name")
+        self.assertListEqual(resource_ids, ["123", "456", "abc", "def"])
+        self.assertEqual(reader.end_time, 4567)
+        self.assertListEqual(reader.errors, ["test err 1", "test err 2"])
+
+    def test_json_reader_to_graph_set(self):
+        json_bytes = json.dumps(self.graph_set.to_dict()).encode("utf-8")
+        graph_set = GraphSetJSONReader(io.BytesIO(json_bytes), chunk_size=8).to_graph_set()
+        self.assertDictEqual(graph_set.to_dict(), self.graph_set.to_dict())
+
+    def test_json_reader_missing_field(self):
+        graph_set_dict = self.graph_set.to_dict()
+        del graph_set_dict["stats"]
+        reader = GraphSetJSONReader(io.StringIO(json.dumps(graph_set_dict)))
+        with self.assertRaises(KeyError):
+            reader.to_graph_set()
+
     def test_from_dict(self):
         input_dict = {
             "name": "test-name",
@@ -370,3 +400,90 @@ class TestGraphSetMerge(TestCase):
         ]
         resource_dicts = [resource.to_dict() for resource in graph_set_1.resources]
         self.assertCountEqual(expected_resource_dicts, resource_dicts)
+
+    def test_valid_merge_with_duplicates(self):
+        resource_a1 = Resource(
+            resource_id="123", type_name="test:a", links=[SimpleLink(pred="has-foo", obj="goo")]
+        )
+        resource_a2 = Resource(resource_id="456", type_name="test:a")
+        resource_a3 = Resource(
+            resource_id="123", type_name="test:a", links=[SimpleLink(pred="has-goo", obj="foo")]
+        )
+        resource_b1 = Resource(
+            resource_id="abc", type_name="test:b", links=[ResourceLinkLink(pred="has-a", obj="123")]
+        )
+        graph_set_1 = GraphSet(
+            name="graph-1",
+            version="1",
+            start_time=10,
+            end_time=20,
+            resources=[resource_a1, resource_a2],
+            errors=[],
+            stats=MultilevelCounter(),
+        )
+        graph_set_2 = GraphSet(
+            name="graph-1",
+            version="1",
+            start_time=15,
+            end_time=25,
+            resources=[resource_a3, resource_b1],
+            errors=[],
+            stats=MultilevelCounter(),
+        )
+        graph_set_1.merge(graph_set_2)
+
+        expected_resources_dict = {
+            "123": {
+                "type": "test:a",
+                "links": [
+                    {"pred": "has-foo", "obj": "goo", "type": "simple"},
+                    {"pred": "has-goo", "obj": "foo", "type": "simple"},
+                ],
+            },
+            "456": {"type": "test:a"},
+            "abc": {
+                "type": "test:b",
+                "links": [{"pred": "has-a", "obj": "123", "type": "resource_link"}],
+            },
+        }
+        self.assertEqual(len(graph_set_1.resources), 3)
+        self.assertDictEqual(expected_resources_dict, graph_set_1.to_dict()["resources"])
+        # merged resources are moved after the other resources
+        self.assertListEqual(
+            [resource.resource_id for resource in graph_set_1.resources], ["456", "abc", "123"]
+        )
+
+    def test_merged_duplicates_order(self):
+        resources = [
+            Resource(resource_id=resource_id, type_name="test:a")
+            for resource_id in ("1", "2", "3", "2", "4", "1", "5")
+        ]
+        graph_set = GraphSet(
+            name="graph-1",
+            version="1",
+            start_time=10,
+            end_time=20,
+            resources=resources,
+            errors=[],
+            stats=MultilevelCounter(),
+        )
+        self.assertListEqual(
+            list(graph_set.to_dict()["resources"].keys()), ["3", "4", "5", "1", "2"]
+        )
+        graph_set.merge(
+            GraphSet(
+                name="graph-1",
+                version="1",
+                start_time=10,
+                end_time=20,
+                resources=[
+                    Resource(resource_id=resource_id, type_name="test:a")
+                    for resource_id in ("6", "4", "6", "3")
+                ],
+                errors=[],
+                stats=MultilevelCounter(),
+            )
+        )
+        self.assertListEqual(
+            list(graph_set.to_dict()["resources"].keys()), ["5", "1", "2", "6", "3", "4"]
+        )
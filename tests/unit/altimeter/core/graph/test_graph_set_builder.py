@@ -0,0 +1,227 @@
+import io
+import json
+from typing import Any, List, Type
+from unittest import TestCase
+
+from altimeter.core.artifact_io.graph_set_binary import (
+    GraphSetBinaryReader,
+    write_graph_set_binary,
+)
+from altimeter.core.graph.exceptions import (
+    UnmergableDuplicateResourceIdsFoundException,
+    UnmergableGraphSetsException,
+)
+from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.graph.graph_set_builder import SpooledGraphSet, StreamingGraphSetBuilder
+from altimeter.core.graph.rdf_stream import RDF_FORMAT_NTRIPLES
+from altimeter.core.graph.link.links import ResourceLinkLink, SimpleLink
+from altimeter.core.multilevel_counter import MultilevelCounter
+from altimeter.core.resource.resource import Resource
+from altimeter.core.resource.resource_spec import ResourceSpec
+
+
+class TestResourceSpecA(ResourceSpec):
+    type_name = "a"
+
+    @classmethod
+    def get_full_type_name(self):
+        return "test:a"
+
+    @classmethod
+    def scan(cls: Type["TestResourceSpecA"], scan_accessor: Any) -> List[Resource]:
+        raise NotImplementedError()
+
+
+class TestResourceSpecB(ResourceSpec):
+    type_name = "b"
+
+    @classmethod
+    def get_full_type_name(self):
+        return "test:b"
+
+    @classmethod
+    def scan(cls: Type["TestResourceSpecB"], scan_accessor: Any) -> List[Resource]:
+        raise NotImplementedError()
+
+
+class TestStreamingGraphSetBuilder(TestCase):
+    def setUp(self):
+        stats_1 = MultilevelCounter()
+        stats_1.increment("123", "us-east-1", "ec2")
+        self.graph_set_1 = GraphSet(
+            name="test-name",
+            version="1",
+            start_time=10,
+            end_time=20,
+            resources=[
+                Resource(
+                    resource_id="123",
+                    type_name="test:a",
+                    links=[SimpleLink(pred="has-foo", obj="goo")],
+                ),
+                Resource(resource_id="456", type_name="test:a"),
+            ],
+            errors=["errora1"],
+            stats=stats_1,
+        )
+        stats_2 = MultilevelCounter()
+        stats_2.increment("456", "us-east-1", "s3")
+        self.graph_set_2 = GraphSet(
+            name="test-name",
+            version="1",
+            start_time=15,
+            end_time=25,
+            resources=[
+                Resource(
+                    resource_id="abc",
+                    type_name="test:b",
+                    links=[ResourceLinkLink(pred="has-a", obj="123")],
+                ),
+                Resource(
+                    resource_id="123",
+                    type_name="test:a",
+                    links=[SimpleLink(pred="has-goo", obj="foo")],
+                ),
+            ],
+            errors=["errorb1"],
+            stats=stats_2,
+        )
+
+    def test_write_json_matches_merge(self):
+        with StreamingGraphSetBuilder(name="test-name", version="1") as builder:
+            builder.add_graph_set_dict(self.graph_set_1.to_dict())
+            builder.add_graph_set_dict(self.graph_set_2.to_dict())
+            json_fp = io.StringIO()
+            builder.write_json(json_fp)
+            self.assertEqual(builder.num_resources, 3)
+        self.graph_set_1.merge(self.graph_set_2)
+        self.assertDictEqual(json.loads(json_fp.getvalue()), self.graph_set_1.to_dict())
+
+    def test_to_graph_set_matches_merge(self):
+        with StreamingGraphSetBuilder(name="test-name", version="1") as builder:
+            builder.add_graph_set_dict(self.graph_set_1.to_dict())
+            builder.add_graph_set_dict(self.graph_set_2.to_dict())
+            graph_set = builder.to_graph_set()
+        self.graph_set_1.merge(self.graph_set_2)
+        self.assertDictEqual(graph_set.to_dict(), self.graph_set_1.to_dict())
+
+    def test_resource_order_matches_merge(self):
+        graph_sets = [
+            GraphSet(
+                name="test-name",
+                version="1",
+                start_time=10,
+                end_time=20,
+                resources=[
+                    Resource(resource_id=resource_id, type_name="test:a")
+                    for resource_id in resource_ids
+                ],
+                errors=[],
+                stats=MultilevelCounter(),
+            )
+            for resource_ids in (("1", "2", "3"), ("4", "2", "1"), ("5", "3", "4", "2"))
+        ]
+        with StreamingGraphSetBuilder(name="test-name", version="1") as builder:
+            for graph_set in graph_sets:
+                builder.add_graph_set_dict(graph_set.to_dict())
+            resource_ids = [resource.resource_id for resource in builder.resources()]
+        for graph_set in graph_sets[1:]:
+            graph_sets[0].merge(graph_set)
+        self.assertListEqual(
+            resource_ids, [resource.resource_id for resource in graph_sets[0].resources]
+        )
+        self.assertListEqual(resource_ids, ["1", "5", "3", "4", "2"])
+
+    def test_spooled_graph_set(self):
+        builder = StreamingGraphSetBuilder(name="test-name", version="1")
+        builder.add_graph_set_dict(self.graph_set_1.to_dict())
+        builder.add_graph_set_dict(self.graph_set_2.to_dict())
+        with builder.to_spooled_graph_set() as spooled_graph_set:
+            self.assertIsInstance(spooled_graph_set, SpooledGraphSet)
+            self.graph_set_1.merge(self.graph_set_2)
+            self.assertEqual(spooled_graph_set.start_time, 10)
+            self.assertEqual(spooled_graph_set.end_time, 25)
+            self.assertListEqual(spooled_graph_set.errors, ["errora1", "errorb1"])
+            json_fp = io.StringIO()
+            spooled_graph_set.write_json(json_fp)
+            self.assertDictEqual(json.loads(json_fp.getvalue()), self.graph_set_1.to_dict())
+            # resources are read from the spool on each iteration
+            rdf_fp = io.BytesIO()
+            spooled_graph_set.write_rdf(rdf_fp, rdf_format=RDF_FORMAT_NTRIPLES)
+            expected_rdf_fp = io.BytesIO()
+            self.graph_set_1.write_rdf(expected_rdf_fp, rdf_format=RDF_FORMAT_NTRIPLES)
+            self.assertEqual(
+                len(rdf_fp.getvalue().splitlines()), len(expected_rdf_fp.getvalue().splitlines())
+            )
+        self.assertTrue(builder._spool.closed)
+
+    def test_spooled_graph_set_empty_builder(self):
+        with StreamingGraphSetBuilder(name="test-name", version="1") as builder:
+            with self.assertRaises(ValueError):
+                builder.to_spooled_graph_set()
+
+    def test_add_graph_set_json_matches_add_graph_set_dict(self):
+        with StreamingGraphSetBuilder(name="test-name", version="1") as builder:
+            builder.add_graph_set_json(io.StringIO(json.dumps(self.graph_set_1.to_dict())))
+            builder.add_graph_set_json(
+                io.BytesIO(json.dumps(self.graph_set_2.to_dict()).encode("utf-8"))
+            )
+            graph_set = builder.to_graph_set()
+        self.graph_set_1.merge(self.graph_set_2)
+        self.assertDictEqual(graph_set.to_dict(), self.graph_set_1.to_dict())
+
+    def test_add_graph_set_json_invalid_diff_names(self):
+        with StreamingGraphSetBuilder(name="other-name", version="1") as builder:
+            with self.assertRaises(UnmergableGraphSetsException):
+                builder.add_graph_set_json(io.StringIO(json.dumps(self.graph_set_1.to_dict())))
+            self.assertEqual(builder.num_resources, 0)
+
+    def test_add_graph_set_binary_matches_add_graph_set_dict(self):
+        with StreamingGraphSetBuilder(name="test-name", version="1") as builder:
+            for graph_set in (self.graph_set_1, self.graph_set_2):
+                fp = io.BytesIO()
+                write_graph_set_binary(
+                    fp=fp,
+                    name=graph_set.name,
+                    version=graph_set.version,
+                    start_time=graph_set.start_time,
+                    end_time=graph_set.end_time,
+                    resources=graph_set.resources,
+                    errors=graph_set.errors,
+                    stats=graph_set.stats,
+                )
+                builder.add_graph_set_binary(GraphSetBinaryReader(fp.getvalue()))
+            graph_set = builder.to_graph_set()
+        self.graph_set_1.merge(self.graph_set_2)
+        self.assertDictEqual(graph_set.to_dict(), self.graph_set_1.to_dict())
+
+    def test_unmergable_duplicates(self):
+        graph_set_3 = GraphSet(
+            name="test-name",
+            version="1",
+            start_time=15,
+            end_time=25,
+            resources=[Resource(resource_id="123", type_name="test:b")],
+            errors=[],
+            stats=MultilevelCounter(),
+        )
+        with StreamingGraphSetBuilder(name="test-name", version="1") as builder:
+            builder.add_graph_set_dict(self.graph_set_1.to_dict())
+            builder.add_graph_set_dict(graph_set_3.to_dict())
+            with self.assertRaises(UnmergableDuplicateResourceIdsFoundException):
+                builder.write_json(io.StringIO())
+
+    def test_invalid_diff_names(self):
+        with StreamingGraphSetBuilder(name="other-name", version="1") as builder:
+            with self.assertRaises(UnmergableGraphSetsException):
+                builder.add_graph_set_dict(self.graph_set_1.to_dict())
+
+    def test_invalid_diff_versions(self):
+        with StreamingGraphSetBuilder(name="test-name", version="2") as builder:
+            with self.assertRaises(UnmergableGraphSetsException):
+                builder.add_graph_set_dict(self.graph_set_1.to_dict())
+
+    def test_empty(self):
+        with StreamingGraphSetBuilder(name="test-name", version="1") as builder:
+            with self.assertRaises(ValueError):
+                builder.write_json(io.StringIO())
@@ -0,0 +1,118 @@
+import io
+from unittest import TestCase
+
+from rdflib import BNode, ConjunctiveGraph, Graph, Literal, URIRef, XSD
+from rdflib.compare import isomorphic
+
+from altimeter.core.graph.graph_set import GraphSet
+from altimeter.core.graph.link.links import (
+    MultiLink,
+    ResourceLinkLink,
+    SimpleLink,
+    TagLink,
+    TransientResourceLinkLink,
+)
+from altimeter.core.graph.rdf_stream import (
+    RDF_FORMAT_NQUADS,
+    RDF_FORMAT_NTRIPLES,
+    RDFStreamWriter,
+    term_to_ntriples,
+)
+from altimeter.core.multilevel_counter import MultilevelCounter
+from altimeter.core.resource.resource import Resource
+
+
+def build_graph_set():
+    resources = [
+        Resource(
+            resource_id="arn:aws:::123:a/1",
+            type_name="test:a",
+            links=[
+                SimpleLink(pred="name", obj='quoted "name"\nwith\\escapes é'),
+                SimpleLink(pred="size", obj=5),
+                SimpleLink(pred="big-size", obj=2147483648),
+                SimpleLink(pred="enabled", obj=True),
+                MultiLink(
+                    pred="attachment",
+                    obj=[
+                        SimpleLink(pred="time", obj="2020-01-01"),
+                        ResourceLinkLink(pred="b", obj="arn:aws:::123:b/1"),
+                    ],
+                ),
+                TagLink(pred="env", obj="prod"),
+                TransientResourceLinkLink(pred="role", obj="arn:aws:::123:role/x"),
+            ],
+        ),
+        Resource(
+            resource_id="arn:aws:::123:b/1",
+            type_name="test:b",
+            links=[TagLink(pred="env", obj="prod")],
+        ),
+    ]
+    return GraphSet(
+        name="test-name",
+        version="2",
+        start_time=1234,
+        end_time=4567,
+        resources=resources,
+        errors=["test error"],
+        stats=MultilevelCounter(),
+    )
+
+
+class TestTermToNTriples(TestCase):
+    def test_terms(self):
+        self.assertEqual(term_to_ntriples(URIRef("alti:test:a")), "<alti:test:a>")
+        self.assertEqual(term_to_ntriples(BNode("N123")), "_:N123")
+        self.assertEqual(term_to_ntriples(Literal('a"b\nc')), '"a\\"b\\nc"')
+        self.assertEqual(
+            term_to_ntriples(Literal(1)), f'"1"^^<{XSD.integer}>',
+        )
+        self.assertEqual(term_to_ntriples(Literal("a", lang="en")), '"a"@en')
+        with self.assertRaises(ValueError):
+            term_to_ntriples("a")
+
+
+class TestGraphSetWriteRDF(TestCase):
+    def test_ntriples_equivalent_to_graph(self):
+        graph_set = build_graph_set()
+        fp = io.BytesIO()
+        triple_count = graph_set.write_rdf(fp, rdf_format=RDF_FORMAT_NTRIPLES)
+        graph = Graph()
+        graph.parse(data=fp.getvalue().decode("utf-8"), format="nt")
+        expected_graph = graph_set.to_rdf()
+        self.assertEqual(triple_count, len(expected_graph))
+        self.assertEqual(len(fp.getvalue().splitlines()), triple_count)
+        self.assertTrue(isomorphic(graph, expected_graph))
+
+    def test_nquads(self):
+        graph_set = build_graph_set()
+        fp = io.BytesIO()
+        graph_set.write_rdf(fp, rdf_format=RDF_FORMAT_NQUADS, graph_iri="http://test/graph")
+        conjunctive_graph = ConjunctiveGraph()
+        conjunctive_graph.parse(data=fp.getvalue().decode("utf-8"), format="nquads")
+        graph = conjunctive_graph.get_context(URIRef("http://test/graph"))
+        self.assertTrue(isomorphic(graph, graph_set.to_rdf()))
+
+
+class TestRDFStreamWriter(TestCase):
+    def test_buffering(self):
+        fp = io.BytesIO()
+        writer = RDFStreamWriter(fp, buffer_size=100)
+        triple = (BNode("N1"), URIRef("alti:name"), Literal("a"))
+        writer.add(triple)
+        self.assertEqual(fp.getvalue(), b"")
+        for _ in range(9):
+            writer.add(triple)
+        self.assertNotEqual(fp.getvalue(), b"")
+        writer.flush()
+        self.assertEqual(fp.getvalue(), b'_:N1 <alti:name> "a" .\n' * 10)
+        self.assertEqual(writer.triple_count, 10)
+
+    def test_invalid_args(self):
+        with self.assertRaises(ValueError):
+            RDFStreamWriter(io.BytesIO(), rdf_format="turtle")
+        with self.assertRaises(ValueError):
+            RDFStreamWriter(io.BytesIO(), rdf_format=RDF_FORMAT_NQUADS)
+        with self.assertRaises(ValueError):
+            RDFStreamWriter(io.BytesIO(), rdf_format=RDF_FORMAT_NTRIPLES, graph_iri="http://a")
@@ -0,0 +1,106 @@
+import threading
+from unittest import TestCase
+
+from altimeter.core.neptune.exceptions import NeptuneLoadGraphException
+from altimeter.core.neptune.gremlin_writer import (
+    ParallelGremlinWriter,
+    is_retryable_gremlin_error,
+)
+
+
+class FakeTraversal:
+    def __init__(self, source, elements):
+        self.source = source
+        self.elements = elements
+
+    def add(self, element):
+        return FakeTraversal(self.source, self.elements + [element])
+
+    def next(self):
+        return self.source.submit(self.elements)
+
+
+class FakeTraversalSource:
+    def __init__(self, errors=None, barrier=None):
+        self.errors = list(errors or [])
+        self.barrier = barrier
+        self.batches = []
+
+    def add(self, element):
+        return FakeTraversal(self, [element])
+
+    def submit(self, elements):
+        if self.barrier is not None:
+            self.barrier.wait()
+        if self.errors:
+            raise self.errors.pop(0)
+        self.batches.append(elements)
+
+
+def add_element(t, element):
+    return t.add(element)
+
+
+class TestIsRetryableGremlinError(TestCase):
+    def test_errors(self):
+        self.assertTrue(
+            is_retryable_gremlin_error(
+                Exception('{"code":"ConcurrentModificationException","detailedMessage":""}')
+            )
+        )
+        self.assertFalse(is_retryable_gremlin_error(Exception("ConstraintViolationException")))
+
+
+class TestParallelGremlinWriter(TestCase):
+    def test_write(self):
+        sources = [FakeTraversalSource(), FakeTraversalSource()]
+        writer = ParallelGremlinWriter(sources, batch_size=3)
+        elements = [{"~id": str(i)} for i in range(10)]
+        stats = writer.write(elements, add_element, "vertices")
+        self.assertEqual(stats.element_count, 10)
+        self.assertEqual(stats.batch_count, 4)
+        self.assertEqual(stats.retry_count, 0)
+        batches = sorted(
+            (batch for source in sources for batch in source.batches),
+            key=lambda batch: int(batch[0]["~id"]),
+        )
+        self.assertListEqual(batches, [elements[0:3], elements[3:6], elements[6:9], elements[9:]])
+
+    def test_write_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        sources = [FakeTraversalSource(barrier=barrier), FakeTraversalSource(barrier=barrier)]
+        writer = ParallelGremlinWriter(sources, batch_size=1)
+        stats = writer.write([{"~id": "1"}, {"~id": "2"}], add_element, "edges")
+        self.assertEqual(stats.batch_count, 2)
+        self.assertListEqual([len(source.batches) for source in sources], [1, 1])
+
+    def test_retry(self):
+        source = FakeTraversalSource(
+            errors=[
+                Exception("ConcurrentModificationException"),
+                Exception("ConcurrentModificationException"),
+            ]
+        )
+        writer = ParallelGremlinWriter([source], batch_size=2, retry_delay=0)
+        stats = writer.write([{"~id": "1"}, {"~id": "2"}], add_element, "vertices")
+        self.assertEqual(stats.retry_count, 2)
+        self.assertListEqual(source.batches, [[{"~id": "1"}, {"~id": "2"}]])
+
+    def test_retries_exhausted(self):
+        source = FakeTraversalSource(errors=[Exception("ConcurrentModificationException")] * 3)
+        writer = ParallelGremlinWriter([source], max_retries=2, retry_delay=0)
+        with self.assertRaises(NeptuneLoadGraphException):
+            writer.write([{"~id": "1"}], add_element, "vertices")
+
+    def test_non_retryable_error(self):
+        source = FakeTraversalSource(errors=[Exception("ConstraintViolationException")])
+        writer = ParallelGremlinWriter([source], retry_delay=0)
+        with self.assertRaises(NeptuneLoadGraphException):
+            writer.write([{"~id": "1"}, {"~id": "2"}], add_element, "vertices")
+        self.assertListEqual(source.batches, [])
+
+    def test_invalid_args(self):
+        with self.assertRaises(ValueError):
+            ParallelGremlinWriter([])
+        with self.assertRaises(ValueError):
+            ParallelGremlinWriter([FakeTraversalSource()], batch_size=0)
@@ -1,7 +1,19 @@
-from unittest import TestCase
-
-from altimeter.core.neptune.client import get_required_tag_value, NeptuneEndpoint, AltimeterNeptuneClient
-from altimeter.core.neptune.exceptions import NeptuneNoGraphsFoundException, NeptuneLoadGraphException
+from unittest import TestCase, mock
+
+import boto3
+import moto
+
+from altimeter.core.graph.rdf_stream import RDF_FORMAT_NQUADS, RDF_FORMAT_NTRIPLES
+from altimeter.core.neptune.client import (
+    get_optional_tag_value,
+    get_required_tag_value,
+    NeptuneEndpoint,
+    AltimeterNeptuneClient,
+)
+from altimeter.core.neptune.exceptions import (
+    NeptuneNoGraphsFoundException,
+    NeptuneLoadGraphException,
+)
 
 class TestGetRequiredTagValue(TestCase):
     def test_with_present_key(self):
@@ -18,6 +30,124 @@ class TestGetRequiredTagValue(TestCase):
             get_required_tag_value(tag_set, "boo")
 
 
+class TestGetOptionalTagValue(TestCase):
+    def test_with_present_key(self):
+        tag_set = [{"Key": "name", "Value": "boo"}]
+        self.assertEqual(get_optional_tag_value(tag_set, "name"), "boo")
+
+    def test_with_absent_key(self):
+        tag_set = [{"Key": "name", "Value": "boo"}]
+        self.assertIsNone(get_optional_tag_value(tag_set, "boo"))
+
+
+class TestLoadGraph(TestCase):
+    def load_graph(self, tag_set, rdf_format=None, key="master.nq.gz", shard_tag_sets=None):
+        s3_client = boto3.Session(region_name="us-east-1").client("s3")
+        s3_client.create_bucket(Bucket="test_bucket")
+        if shard_tag_sets is None:
+            shard_tag_sets = {key: tag_set}
+        for shard_key, shard_tag_set in shard_tag_sets.items():
+            s3_client.put_object(Bucket="test_bucket", Key=shard_key, Body=b"")
+            s3_client.put_object_tagging(
+                Bucket="test_bucket", Key=shard_key, Tagging={"TagSet": shard_tag_set}
+            )
+        endpoint = NeptuneEndpoint(host="host", port=5555, region="us-east-1")
+        client = AltimeterNeptuneClient(0, endpoint)
+        post_resp = mock.Mock(status_code=200)
+        post_resp.json.return_value = {"payload": {"loadId": "test-load-id"}}
+        get_resp = mock.Mock(status_code=200)
+        get_resp.json.return_value = {"payload": {"overallStatus": {"status": "LOAD_COMPLETED"}}}
+        with mock.patch("altimeter.core.neptune.client.requests") as mock_requests, mock.patch(
+            "altimeter.core.neptune.client.time"
+        ), mock.patch.object(client, "_register_graph") as mock_register_graph:
+            mock_requests.post.return_value = post_resp
+            mock_requests.get.return_value = get_resp
+            graph_metadata = client.load_graph(
+                bucket="test_bucket",
+                key=key,
+                load_iam_role_arn="arn:aws:iam::123456789012:role/test",
+                rdf_format=rdf_format,
+                parallelism="HIGH",
+            )
+        mock_register_graph.assert_called_once_with(graph_metadata=graph_metadata)
+        return graph_metadata, mock_requests.post.call_args[1]["json"]
+
+    @moto.mock_s3
+    def test_format_from_tags(self):
+        tag_set = [
+            {"Key": "name", "Value": "alti"},
+            {"Key": "version", "Value": "2"},
+            {"Key": "start_time", "Value": "1234"},
+            {"Key": "end_time", "Value": "4567"},
+            {"Key": "format", "Value": RDF_FORMAT_NQUADS},
+        ]
+        graph_metadata, post_body = self.load_graph(tag_set)
+        self.assertEqual(graph_metadata.uri, "https://alti/alti/2/4567")
+        self.assertEqual(post_body["source"], "s3://test_bucket/master.nq.gz")
+        self.assertEqual(post_body["format"], RDF_FORMAT_NQUADS)
+        self.assertEqual(post_body["parserConfiguration"]["namedGraphUri"], graph_metadata.uri)
+        _, post_body = self.load_graph(tag_set, rdf_format=RDF_FORMAT_NTRIPLES)
+        self.assertEqual(post_body["format"], RDF_FORMAT_NTRIPLES)
+
+    @moto.mock_s3
+    def test_format_default(self):
+        tag_set = [
+            {"Key": "name", "Value": "alti"},
+            {"Key": "version", "Value": "2"},
+            {"Key": "start_time", "Value": "1234"},
+            {"Key": "end_time", "Value": "4567"},
+        ]
+        _, post_body = self.load_graph(tag_set)
+        self.assertEqual(post_body["format"], "rdfxml")
+
+
+    @moto.mock_s3
+    def test_sharded(self):
+        tag_set = [
+            {"Key": "name", "Value": "alti"},
+            {"Key": "version", "Value": "2"},
+            {"Key": "start_time", "Value": "1234"},
+            {"Key": "end_time", "Value": "4567"},
+            {"Key": "format", "Value": RDF_FORMAT_NQUADS},
+        ]
+        graph_metadata, post_body = self.load_graph(
+            tag_set,
+            key="scan/master/",
+            shard_tag_sets={
+                "scan/master/part-00000.nq.gz": tag_set,
+                "scan/master/part-00001.nq.gz": tag_set,
+            },
+        )
+        self.assertEqual(graph_metadata.uri, "https://alti/alti/2/4567")
+        self.assertEqual(post_body["source"], "s3://test_bucket/scan/master/")
+        self.assertEqual(post_body["format"], RDF_FORMAT_NQUADS)
+        self.assertEqual(post_body["parallelism"], "HIGH")
+
+    @moto.mock_s3
+    def test_sharded_mismatched_tags(self):
+        tag_set = [
+            {"Key": "name", "Value": "alti"},
+            {"Key": "version", "Value": "2"},
+            {"Key": "start_time", "Value": "1234"},
+            {"Key": "end_time", "Value": "4567"},
+        ]
+        other_tag_set = tag_set[:3] + [{"Key": "end_time", "Value": "9999"}]
+        with self.assertRaises(NeptuneLoadGraphException):
+            self.load_graph(
+                tag_set,
+                key="scan/master/",
+                shard_tag_sets={
+                    "scan/master/part-00000.nt.gz": tag_set,
+                    "scan/master/part-00001.nt.gz": other_tag_set,
+                },
+            )
+
+    @moto.mock_s3
+    def test_sharded_no_shards(self):
+        with self.assertRaises(NeptuneLoadGraphException):
+            self.load_graph([], key="scan/master/", shard_tag_sets={})
+
+
 class TestNeptuneEndpoint(TestCase):
     def test_get_endpoint_str(self):
         endpoint = NeptuneEndpoint(host="host", port=5555, region="us-east-1")
@@ -169,6 +299,36 @@ class TestAltimeterNeptuneClient(TestCase):
                 {"~id": "123", "~label": "test"}],
                 "edges" : []}, "")
 
+    def test_write_to_neptune_lpg_batched(self):
+        endpoint = NeptuneEndpoint(host="host", port=5555, region="us-east-1", ssl=False)
+        client = AltimeterNeptuneClient(0, endpoint)
+        conns = [mock.MagicMock(), mock.MagicMock()]
+        graph = {
+            "vertices": [
+                {"~id": f"arn:aws:ec2:us-east-1:123:vpc/vpc-{i}", "~label": "vpc"}
+                for i in range(5)
+            ],
+            "edges": [
+                {
+                    "~id": "edge-1",
+                    "~label": "vpc",
+                    "~from": "arn:aws:ec2:us-east-1:123:vpc/vpc-0",
+                    "~to": "arn:aws:ec2:us-east-1:123:vpc/vpc-1",
+                }
+            ],
+        }
+        with mock.patch.object(
+            client,
+            "connect_to_gremlin",
+            side_effect=[(mock.MagicMock(), conn) for conn in conns],
+        ):
+            write_stats = client.write_to_neptune_lpg(graph, "scan", batch_size=2, connections=2)
+        self.assertEqual(write_stats["vertices"].element_count, 5)
+        self.assertEqual(write_stats["vertices"].batch_count, 3)
+        self.assertEqual(write_stats["edges"].batch_count, 1)
+        for conn in conns:
+            conn.close.assert_called_once_with()
+
     def test_write_to_neptune_lpg_no_graph(self):
         endpoint = NeptuneEndpoint(host="host", port=5555, region="us-east-1", ssl=False)
         client = AltimeterNeptuneClient(0, endpoint)
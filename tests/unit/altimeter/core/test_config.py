@@ -1,8 +1,10 @@
 from unittest import TestCase
 
 from altimeter.core.config import (
+    ConcurrencyConfig,
     Config,
     InvalidConfigException,
+    NeptuneConfig,
     get_optional_section,
     get_required_list_param,
     get_required_bool_param,
@@ -141,6 +143,27 @@ class TestScanConfig(TestCase):
         self.assertEqual(scan_config.single_account_mode, False)
         config = Config.from_file("conf/single_account.toml")
 
+class TestNeptuneConfig(TestCase):
+    def test_from_dict_lpg_options(self):
+        neptune_config_dict = {
+            "host": "host",
+            "port": 8182,
+            "region": "us-east-1",
+            "lpg_batch_size": 500,
+            "lpg_connections": 8,
+        }
+        neptune_config = NeptuneConfig.from_dict(neptune_config_dict)
+        self.assertEqual(neptune_config.lpg_batch_size, 500)
+        self.assertEqual(neptune_config.lpg_connections, 8)
+
+    def test_from_dict_invalid_lpg_options(self):
+        for key in ("lpg_batch_size", "lpg_connections"):
+            with self.assertRaises(InvalidConfigException):
+                NeptuneConfig.from_dict(
+                    {"host": "host", "port": 8182, "region": "us-east-1", key: 0}
+                )
+
+
 class TestConfig(TestCase):
     def test_from_dict(self):
         config_dict = {
@@ -178,3 +201,228 @@ class TestConfig(TestCase):
         self.assertIsNone(config.neptune)
         self.assertEqual(config.pruner_max_age_min, 4320)
 
+
+    def test_from_dict_with_processes(self):
+        config_dict = {
+            'artifact_path': '/tmp/altimeter_single_account',
+            'pruner_max_age_min': 4320,
+            'graph_name': 'alti',
+            'access': {},
+            'concurrency': {
+                'max_account_scan_threads': 1,
+                'max_accounts_per_thread': 1,
+                'max_svc_scan_threads': 64,
+                'max_account_scan_processes': 4,
+                'max_svc_scan_processes': 8,
+            },
+            'scan': {
+                'accounts': ('1234',),
+                'regions': (),
+                'scan_sub_accounts': False,
+                'preferred_account_scan_regions': ('us-west-1',),
+            },
+        }
+        config = Config.from_dict(config_dict)
+        self.assertEqual(config.concurrency.max_account_scan_processes, 4)
+        self.assertEqual(config.concurrency.max_svc_scan_processes, 8)
+
+    def test_from_dict_with_invalid_processes(self):
+        config_dict = {
+            'max_account_scan_threads': 1,
+            'max_accounts_per_thread': 1,
+            'max_svc_scan_threads': 64,
+            'max_account_scan_processes': "4",
+        }
+        with self.assertRaises(InvalidConfigException):
+            ConcurrencyConfig.from_dict(config_dict)
+
+    def test_from_dict_with_rate_limits(self):
+        config_dict = {
+            'max_account_scan_threads': 1,
+            'max_accounts_per_thread': 1,
+            'max_svc_scan_threads': 64,
+            'rate_limits': {'iam': 10, 'ec2.DescribeInstances': 2.5},
+        }
+        concurrency_config = ConcurrencyConfig.from_dict(config_dict)
+        self.assertDictEqual(
+            concurrency_config.rate_limits, {'iam': 10, 'ec2.DescribeInstances': 2.5}
+        )
+
+    def test_from_dict_with_invalid_rate_limits(self):
+        config_dict = {
+            'max_account_scan_threads': 1,
+            'max_accounts_per_thread': 1,
+            'max_svc_scan_threads': 64,
+            'rate_limits': {'iam': 0},
+        }
+        with self.assertRaises(InvalidConfigException):
+            ConcurrencyConfig.from_dict(config_dict)
+
+    def test_from_dict_with_bool_rate_limits(self):
+        config_dict = {
+            'max_account_scan_threads': 1,
+            'max_accounts_per_thread': 1,
+            'max_svc_scan_threads': 64,
+            'rate_limits': {'iam': True},
+        }
+        with self.assertRaises(InvalidConfigException):
+            ConcurrencyConfig.from_dict(config_dict)
+
+    def test_from_dict_with_max_artifact_read_threads(self):
+        config_dict = {
+            'max_account_scan_threads': 1,
+            'max_accounts_per_thread': 1,
+            'max_svc_scan_threads': 64,
+        }
+        self.assertEqual(ConcurrencyConfig.from_dict(config_dict).max_artifact_read_threads, 4)
+        config_dict['max_artifact_read_threads'] = 8
+        self.assertEqual(ConcurrencyConfig.from_dict(config_dict).max_artifact_read_threads, 8)
+        config_dict['max_artifact_read_threads'] = 0
+        with self.assertRaises(InvalidConfigException):
+            ConcurrencyConfig.from_dict(config_dict)
+
+    def test_from_dict_with_max_artifact_writer_threads(self):
+        config_dict = {
+            'max_account_scan_threads': 1,
+            'max_accounts_per_thread': 1,
+            'max_svc_scan_threads': 64,
+        }
+        self.assertIsNone(ConcurrencyConfig.from_dict(config_dict).max_artifact_writer_threads)
+        config_dict['max_artifact_writer_threads'] = 4
+        self.assertEqual(ConcurrencyConfig.from_dict(config_dict).max_artifact_writer_threads, 4)
+        config_dict['max_artifact_writer_threads'] = 0
+        with self.assertRaises(InvalidConfigException):
+            ConcurrencyConfig.from_dict(config_dict)
+
+    def test_from_dict_with_artifact_compression(self):
+        config_dict = {
+            'artifact_path': '/tmp/altimeter_single_account',
+            'pruner_max_age_min': 4320,
+            'graph_name': 'alti',
+            'artifact_compression': 'gz',
+            'access': {},
+            'concurrency': {
+                'max_account_scan_threads': 1,
+                'max_accounts_per_thread': 1,
+                'max_svc_scan_threads': 64,
+            },
+            'scan': {
+                'accounts': ('1234',),
+                'regions': (),
+                'scan_sub_accounts': False,
+                'preferred_account_scan_regions': ('us-west-1',),
+            },
+        }
+        config = Config.from_dict(config_dict)
+        self.assertEqual(config.artifact_compression, 'gz')
+        config_dict['artifact_compression'] = 'bz2'
+        with self.assertRaises(InvalidConfigException):
+            Config.from_dict(config_dict)
+
+    def test_from_dict_with_artifact_format(self):
+        config_dict = {
+            'artifact_path': '/tmp/altimeter_single_account',
+            'pruner_max_age_min': 4320,
+            'graph_name': 'alti',
+            'artifact_format': 'binary',
+            'access': {},
+            'concurrency': {
+                'max_account_scan_threads': 1,
+                'max_accounts_per_thread': 1,
+                'max_svc_scan_threads': 64,
+            },
+            'scan': {
+                'accounts': ('1234',),
+                'regions': (),
+                'scan_sub_accounts': False,
+                'preferred_account_scan_regions': ('us-west-1',),
+            },
+        }
+        config = Config.from_dict(config_dict)
+        self.assertEqual(config.artifact_format, 'binary')
+        del config_dict['artifact_format']
+        self.assertEqual(Config.from_dict(config_dict).artifact_format, 'json')
+        config_dict['artifact_format'] = 'xml'
+        with self.assertRaises(InvalidConfigException):
+            Config.from_dict(config_dict)
+
+    def test_from_dict_with_artifact_dedup(self):
+        config_dict = {
+            'artifact_path': '/tmp/altimeter_single_account',
+            'pruner_max_age_min': 4320,
+            'graph_name': 'alti',
+            'artifact_dedup': True,
+            'access': {},
+            'concurrency': {
+                'max_account_scan_threads': 1,
+                'max_accounts_per_thread': 1,
+                'max_svc_scan_threads': 64,
+            },
+            'scan': {
+                'accounts': ('1234',),
+                'regions': (),
+                'scan_sub_accounts': False,
+                'preferred_account_scan_regions': ('us-west-1',),
+            },
+        }
+        self.assertTrue(Config.from_dict(config_dict).artifact_dedup)
+        del config_dict['artifact_dedup']
+        self.assertFalse(Config.from_dict(config_dict).artifact_dedup)
+        config_dict['artifact_dedup'] = 'yes'
+        with self.assertRaises(InvalidConfigException):
+            Config.from_dict(config_dict)
+
+    def test_from_dict_with_rdf_format(self):
+        config_dict = {
+            'artifact_path': '/tmp/altimeter_single_account',
+            'pruner_max_age_min': 4320,
+            'graph_name': 'alti',
+            'rdf_format': 'nquads',
+            'access': {},
+            'concurrency': {
+                'max_account_scan_threads': 1,
+                'max_accounts_per_thread': 1,
+                'max_svc_scan_threads': 64,
+            },
+            'scan': {
+                'accounts': ('1234',),
+                'regions': (),
+                'scan_sub_accounts': False,
+                'preferred_account_scan_regions': ('us-west-1',),
+            },
+        }
+        self.assertEqual(Config.from_dict(config_dict).rdf_format, 'nquads')
+        del config_dict['rdf_format']
+        self.assertEqual(Config.from_dict(config_dict).rdf_format, 'rdfxml')
+        config_dict['rdf_format'] = 'turtle'
+        with self.assertRaises(InvalidConfigException):
+            Config.from_dict(config_dict)
+
+    def test_from_dict_with_rdf_max_shard_size(self):
+        config_dict = {
+            'artifact_path': '/tmp/altimeter_single_account',
+            'pruner_max_age_min': 4320,
+            'graph_name': 'alti',
+            'rdf_format': 'ntriples',
+            'rdf_max_shard_size': 1073741824,
+            'access': {},
+            'concurrency': {
+                'max_account_scan_threads': 1,
+                'max_accounts_per_thread': 1,
+                'max_svc_scan_threads': 64,
+            },
+            'scan': {
+                'accounts': ('1234',),
+                'regions': (),
+                'scan_sub_accounts': False,
+                'preferred_account_scan_regions': ('us-west-1',),
+            },
+        }
+        self.assertEqual(Config.from_dict(config_dict).rdf_max_shard_size, 1073741824)
+        config_dict['rdf_max_shard_size'] = 0
+        with self.assertRaises(InvalidConfigException):
+            Config.from_dict(config_dict)
+        config_dict['rdf_max_shard_size'] = 1073741824
+        config_dict['rdf_format'] = 'rdfxml'
+        with self.assertRaises(InvalidConfigException):
+            Config.from_dict(config_dict)
@@ -0,0 +1,60 @@
+import io
+import json
+from unittest import TestCase
+
+from altimeter.core.json_stream import JSONStreamParser
+
+
+DOC = {
+    "name": "test",
+    "count": 1234567890,
+    "ratio": -1.5e-10,
+    "flags": [True, False, None],
+    "items": {"a": {"b": ["x", "y"]}, "é中": "ü😀", "empty": {}},
+    "escaped": 'quote " and \\ backslash',
+}
+
+
+def read_items(parser):
+    items = {}
+    for key in parser.iter_object():
+        if key == "items":
+            items[key] = {item_key: parser.read_value() for item_key in parser.iter_object()}
+        else:
+            items[key] = parser.read_value()
+    parser.read_end()
+    return items
+
+
+class TestJSONStreamParser(TestCase):
+    def test_small_chunks(self):
+        doc_str = json.dumps(DOC, ensure_ascii=False, indent=2)
+        for chunk_size in (1, 2, 3, 7, 64):
+            parser = JSONStreamParser(io.StringIO(doc_str), chunk_size=chunk_size)
+            self.assertDictEqual(read_items(parser), DOC)
+
+    def test_binary_multibyte_split(self):
+        doc_bytes = json.dumps(DOC, ensure_ascii=False).encode("utf-8")
+        for chunk_size in (1, 2, 3, 5):
+            parser = JSONStreamParser(io.BytesIO(doc_bytes), chunk_size=chunk_size)
+            self.assertDictEqual(read_items(parser), DOC)
+
+    def test_number_at_chunk_boundary(self):
+        parser = JSONStreamParser(io.StringIO("12345"), chunk_size=2)
+        self.assertEqual(parser.read_value(), 12345)
+
+    def test_empty_object(self):
+        parser = JSONStreamParser(io.StringIO(" { } "))
+        self.assertListEqual(list(parser.iter_object()), [])
+        parser.read_end()
+
+    def test_invalid_documents(self):
+        for doc_str in ("[1, 2]", '{"a": 1 "b": 2}', '{"a" 1}', "{1: 2}", '{"a": 1', '{"a": }'):
+            parser = JSONStreamParser(io.StringIO(doc_str), chunk_size=2)
+            with self.assertRaises(json.JSONDecodeError):
+                read_items(parser)
+
+    def test_extra_data(self):
+        parser = JSONStreamParser(io.StringIO('{"a": 1} {}'))
+        with self.assertRaises(json.JSONDecodeError):
+            read_items(parser)